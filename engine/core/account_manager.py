@@ -42,6 +42,7 @@ class GitHubAccount:
     token_file: str
     token_env: str
     capabilities: List[str]
+    hourly_api_budget: Optional[int] = None  # Shared GitHub API budget per hour (None = default)
     _token: Optional[str] = None
     
     @property
@@ -68,6 +69,10 @@ class GitHubAccount:
         logger.warning(f"No token found for {self.username} (env: {self.token_env}, file: {self.token_file})")
         return None
     
+    def has_token_source(self) -> bool:
+        """Check if a token is configured (without warning when it is missing)."""
+        return bool(self._token or os.getenv(self.token_env) or Path(self.token_file).exists())
+    
     def has_capability(self, capability: str) -> bool:
         """Check if account has specific capability."""
         return capability in self.capabilities
@@ -108,7 +113,8 @@ class AccountManager:
                     description=account_data['description'],
                     token_file=account_data['token_file'],
                     token_env=account_data['token_env'],
-                    capabilities=account_data.get('capabilities', [])
+                    capabilities=account_data.get('capabilities', []),
+                    hourly_api_budget=account_data.get('hourly_api_budget')
                 )
             
             logger.info(f"✅ Loaded {len(self._accounts)} GitHub accounts from {self.config_path}")
@@ -133,6 +139,21 @@ class AccountManager:
         """
         return self._accounts.get(username)
     
+    def get_account_by_token(self, token: str) -> Optional[GitHubAccount]:
+        """
+        Find the account a GitHub token belongs to.
+        
+        Args:
+            token: GitHub token
+        
+        Returns:
+            GitHubAccount using this token, None if unknown
+        """
+        for account in self._accounts.values():
+            if account.has_token_source() and account.token == token:
+                return account
+        return None
+    
     def get_group(self, group_name: str) -> List[str]:
         """
         Get list of usernames in a group.
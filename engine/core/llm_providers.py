@@ -2,18 +2,89 @@
 """
 LLM Provider Implementations for Agent-Forge
 Multi-provider LLM support with unified interface (Issue #31)
+
+Every provider offers the same four call styles:
+- chat_completion() / stream_chat_completion(): blocking, for existing sync callers
+- achat_completion() / astream_chat_completion(): async, for event-loop callers
+
+HTTP providers (HTTPLLMProvider subclasses) only describe their wire format
+(_build_request, _parse_response, _parse_stream_line); the HTTP calls go
+through process-wide pooled clients (a keep-alive requests.Session and one
+aiohttp.ClientSession per event loop), so repeated calls to the same API reuse
+connections instead of paying a TCP and TLS handshake each time. Other
+providers implement chat_completion() and get the async and streaming calls
+through a worker thread.
+
+Deterministic (temperature 0) non-streaming completions are served from the
+content-addressed response cache (engine.core.llm_response_cache) when the
+same request was answered before; pass cache=True to also reuse sampled
+completions, or cache=False for calls whose output must not be reused.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+import os
+import threading
+import weakref
+from typing import List, Dict, Optional, Any, Iterator, AsyncIterator, Tuple
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+from engine.core.llm_response_cache import LLMResponseCache, get_llm_response_cache, make_key
+
 logger = logging.getLogger(__name__)
 
 
+# Connections kept per host by the shared HTTP clients
+HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "32"))
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+_aio_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def get_http_session() -> requests.Session:
+    """Shared keep-alive requests session used by all sync provider calls."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_aio_session():
+    """Shared aiohttp session for the running event loop (created on first use).
+
+    aiohttp sessions are bound to the loop they were created on, so there is
+    one per loop; call close_aio_session() before the loop shuts down.
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _aio_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=None)
+        )
+        _aio_sessions[loop] = session
+    return session
+
+
+async def close_aio_session():
+    """Close the running loop's shared aiohttp session."""
+    session = _aio_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
 @dataclass
 class LLMMessage:
     """Standard message format for LLM interactions"""
@@ -32,21 +103,94 @@ class LLMResponse:
     raw_response: Optional[Dict] = None
 
 
+@dataclass
+class LLMStreamChunk:
+    """Incremental piece of a streamed completion"""
+    content: str  # Text delta (may be empty, e.g. on the final chunk)
+    finish_reason: Optional[str] = None  # Set on the last chunk if the provider reports it
+    usage: Optional[Dict[str, int]] = None
+
+
+@dataclass
+class ProviderRequest:
+    """HTTP call for one completion, as built by a provider"""
+    url: str
+    payload: Dict[str, Any]
+    model: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    timeout: float = 60
+    label: str = "LLM API"  # Used in error logs
+
+
 class LLMProvider(ABC):
     """
     Base class for LLM providers.
-    
+
     All providers must implement:
     - chat_completion(): Generate text completion
     - test_connection(): Test API key validity
     - get_available_models(): List available models
+
+    achat_completion() and the streaming methods run chat_completion() in a
+    worker thread and yield its result as one chunk. Providers that speak
+    HTTP should subclass HTTPLLMProvider instead, which makes all four calls
+    natively over the pooled clients.
     """
-    
+
+    response_cache: Optional[LLMResponseCache] = None  # None: the global cache
+
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         self.api_key = api_key
         self.base_url = base_url
         self.provider_name = self.__class__.__name__.replace("Provider", "").lower()
-    
+
+    def _cache_key(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        cache: Optional[bool],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[LLMResponseCache], Optional[str]]:
+        """Response cache and key for a completion ((None, None) when not cached)
+
+        cache=None caches only deterministic (temperature 0) completions.
+        """
+        if cache is None:
+            cache = temperature == 0
+        response_cache = (self.response_cache or get_llm_response_cache()) if cache else None
+        if response_cache is None:
+            return None, None
+        key = make_key(
+            f"{self.provider_name}:{self.base_url or ''}",
+            model,
+            messages,
+            {"temperature": temperature, "max_tokens": max_tokens, **kwargs}
+        )
+        return response_cache, key
+
+    @staticmethod
+    def _cached_response(response_cache: Optional[LLMResponseCache], key: Optional[str]) -> Optional[LLMResponse]:
+        if response_cache is None:
+            return None
+        entry = response_cache.get(key)
+        if entry is None:
+            return None
+        logger.debug(f"💾 LLM response cache hit ({entry['provider']}/{entry['model']})")
+        return LLMResponse(**entry)
+
+    @staticmethod
+    def _store_response(response_cache: Optional[LLMResponseCache], key: Optional[str], response: LLMResponse):
+        if response_cache is not None and response.content:
+            response_cache.put(key, {
+                "content": response.content,
+                "model": response.model,
+                "provider": response.provider,
+                "finish_reason": response.finish_reason,
+                "usage": response.usage
+            })
+
     @abstractmethod
     def chat_completion(
         self,
@@ -54,257 +198,487 @@ class LLMProvider(ABC):
         model: str,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        cache: Optional[bool] = None,
         **kwargs
     ) -> LLMResponse:
         """Generate chat completion"""
         pass
-    
+
+    async def achat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        cache: Optional[bool] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate chat completion without blocking the event loop (in a worker thread)"""
+        return await asyncio.to_thread(
+            self.chat_completion, messages, model,
+            temperature=temperature, max_tokens=max_tokens, cache=cache, **kwargs
+        )
+
+    def stream_chat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ) -> Iterator[LLMStreamChunk]:
+        """Stream a chat completion (the whole response as one chunk)"""
+        response = self.chat_completion(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        yield LLMStreamChunk(response.content, response.finish_reason, response.usage)
+
+    async def astream_chat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream a chat completion (the whole response as one chunk, async)"""
+        response = await self.achat_completion(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        yield LLMStreamChunk(response.content, response.finish_reason, response.usage)
+
     @abstractmethod
     def test_connection(self) -> bool:
         """Test if API key is valid"""
         pass
-    
+
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Get list of available models"""
         pass
 
 
-class OpenAIProvider(LLMProvider):
+class HTTPLLMProvider(LLMProvider):
+    """
+    Base class for providers that call a JSON-over-HTTP API.
+
+    Subclasses implement _build_request(), _parse_response() and
+    _parse_stream_line() and inherit the sync, async and streaming calls,
+    all made over the shared pooled clients.
+    """
+
+    @abstractmethod
+    def _build_request(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        **kwargs
+    ) -> ProviderRequest:
+        """Build the provider's HTTP request for a completion"""
+        pass
+
+    @abstractmethod
+    def _parse_response(self, request: ProviderRequest, data: Any) -> LLMResponse:
+        """Convert the provider's JSON response into an LLMResponse"""
+        pass
+
+    @abstractmethod
+    def _parse_stream_line(self, line: str) -> Optional[LLMStreamChunk]:
+        """Convert one line of a streamed response (None = nothing to emit)"""
+        pass
+
+    def chat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        cache: Optional[bool] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate chat completion (blocking, over the shared keep-alive session)
+
+        Only temperature-0 calls are cached unless cache=True; cache=False bypasses the cache.
+        """
+        response_cache, key = self._cache_key(messages, model, temperature, max_tokens, cache, kwargs)
+        cached = self._cached_response(response_cache, key)
+        if cached is not None:
+            return cached
+
+        request = self._build_request(messages, model, temperature, max_tokens, stream=False, **kwargs)
+        try:
+            response = get_http_session().post(
+                request.url,
+                headers=request.headers,
+                json=request.payload,
+                timeout=request.timeout
+            )
+            response.raise_for_status()
+            result = self._parse_response(request, response.json())
+
+        except Exception as e:
+            logger.error(f"{request.label} error: {e}")
+            raise
+
+        self._store_response(response_cache, key, result)
+        return result
+
+    async def achat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        cache: Optional[bool] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate chat completion without blocking the event loop
+
+        Only temperature-0 calls are cached unless cache=True; cache=False bypasses the cache.
+        """
+        import aiohttp
+
+        # SQLite lookups may wait on other writers: keep them off the event loop
+        response_cache, key = self._cache_key(messages, model, temperature, max_tokens, cache, kwargs)
+        if response_cache is not None:
+            cached = await asyncio.to_thread(self._cached_response, response_cache, key)
+            if cached is not None:
+                return cached
+
+        request = self._build_request(messages, model, temperature, max_tokens, stream=False, **kwargs)
+        try:
+            async with get_aio_session().post(
+                request.url,
+                headers=request.headers,
+                json=request.payload,
+                timeout=aiohttp.ClientTimeout(total=request.timeout)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+            result = self._parse_response(request, data)
+
+        except Exception as e:
+            logger.error(f"{request.label} error: {e}")
+            raise
+
+        if response_cache is not None:
+            await asyncio.to_thread(self._store_response, response_cache, key, result)
+        return result
+
+    def stream_chat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ) -> Iterator[LLMStreamChunk]:
+        """Stream a chat completion chunk by chunk (blocking iterator)"""
+        request = self._build_request(messages, model, temperature, max_tokens, stream=True, **kwargs)
+        try:
+            with get_http_session().post(
+                request.url,
+                headers=request.headers,
+                json=request.payload,
+                timeout=request.timeout,  # Applies between chunks
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for raw_line in response.iter_lines():
+                    chunk = self._parse_stream_line(raw_line.decode("utf-8", errors="replace").strip())
+                    if chunk is not None:
+                        yield chunk
+
+        except Exception as e:
+            logger.error(f"{request.label} stream error: {e}")
+            raise
+
+    async def astream_chat_completion(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream a chat completion chunk by chunk (async iterator)"""
+        import aiohttp
+
+        request = self._build_request(messages, model, temperature, max_tokens, stream=True, **kwargs)
+        try:
+            async with get_aio_session().post(
+                request.url,
+                headers=request.headers,
+                json=request.payload,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=request.timeout)
+            ) as response:
+                response.raise_for_status()
+                async for raw_line in response.content:
+                    chunk = self._parse_stream_line(raw_line.decode("utf-8", errors="replace").strip())
+                    if chunk is not None:
+                        yield chunk
+
+        except Exception as e:
+            logger.error(f"{request.label} stream error: {e}")
+            raise
+
+    @staticmethod
+    def _sse_data(line: str) -> Optional[Any]:
+        """JSON payload of a server-sent-events `data:` line (None for other lines and [DONE])"""
+        if not line.startswith("data:"):
+            return None
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            return None
+        return json.loads(data)
+
+
+class OpenAIProvider(HTTPLLMProvider):
     """OpenAI GPT provider (GPT-4, GPT-4 Turbo, GPT-3.5, GPT-5)"""
-    
+
     # Models that use the new /v1/responses endpoint
     RESPONSES_API_MODELS = [
         'gpt-5-pro',
         'gpt-5-pro-2025-10-06',
         'gpt-5-codex'
     ]
-    
+
     def __init__(self, api_key: str, base_url: Optional[str] = None, org_id: Optional[str] = None):
         super().__init__(api_key, base_url or "https://api.openai.com/v1")
         self.org_id = org_id
-    
+
     def _uses_responses_api(self, model: str) -> bool:
         """Check if model uses the new /v1/responses endpoint"""
         return any(model.startswith(m) or model == m for m in self.RESPONSES_API_MODELS)
-    
-    def _responses_completion(
+
+    def _build_request(
         self,
         messages: List[LLMMessage],
         model: str,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
         **kwargs
-    ) -> LLMResponse:
+    ) -> ProviderRequest:
+        """Build a /v1/chat/completions or /v1/responses request"""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        if self.org_id:
+            headers["OpenAI-Organization"] = self.org_id
+
+        if self._uses_responses_api(model):
+            logger.debug(f"🔄 Using /v1/responses endpoint for {model}")
+            return self._responses_request(messages, model, headers, stream)
+
+        # Standard /v1/chat/completions endpoint
+        payload = {
+            "model": model,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        if stream:
+            payload["stream"] = True
+
+        return ProviderRequest(
+            url=f"{self.base_url}/chat/completions",
+            payload=payload,
+            model=model,
+            headers=headers,
+            timeout=60,
+            label="OpenAI API"
+        )
+
+    def _responses_request(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        headers: Dict[str, str],
+        stream: bool
+    ) -> ProviderRequest:
         """
-        Generate completion using OpenAI /v1/responses endpoint
+        Build a request for the OpenAI /v1/responses endpoint
         Used for GPT-5 Pro and other advanced models
-        
+
         API Differences:
         - Uses 'input' parameter instead of 'messages'
         - No temperature/max_tokens support
         - Different response structure
         """
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            if self.org_id:
-                headers["OpenAI-Organization"] = self.org_id
-            
-            # Combine messages into single input string
-            # Format: "System: {system}\n\nUser: {user}"
-            input_parts = []
-            for msg in messages:
-                if msg.role == "system":
-                    input_parts.append(f"System: {msg.content}")
-                elif msg.role == "user":
-                    input_parts.append(f"User: {msg.content}")
-                elif msg.role == "assistant":
-                    input_parts.append(f"Assistant: {msg.content}")
-            
-            input_text = "\n\n".join(input_parts)
-            
-            payload = {
-                "model": model,
-                "input": input_text
-            }
-            
-            logger.debug(f"🌐 Querying OpenAI /v1/responses: {model}...")
-            
-            response = requests.post(
-                f"{self.base_url}/responses",
-                headers=headers,
-                json=payload,
-                timeout=180  # Longer timeout for complex responses
-            )
-            response.raise_for_status()
-            
-            # Parse response
-            response_data = response.json()
-            
-            # GPT-5 Pro returns a list of items with different types
-            # Example: [{'type': 'reasoning', ...}, {'type': 'message', 'content': [...]}]
-            content = ""
-            
-            if isinstance(response_data, list):
-                # New format: list of items
-                for item in response_data:
-                    if item.get('type') == 'message':
-                        # Extract text from content array
-                        content_items = item.get('content', [])
-                        for content_item in content_items:
-                            if content_item.get('type') == 'output_text':
-                                content += content_item.get('text', '')
-            elif 'content' in response_data:
-                content = response_data['content']
-            elif 'response' in response_data:
-                content = response_data['response']
-            elif 'output' in response_data:
-                content = response_data['output']
-            elif 'choices' in response_data and len(response_data['choices']) > 0:
-                choice = response_data['choices'][0]
-                if 'message' in choice:
-                    content = choice['message'].get('content', '')
-                elif 'text' in choice:
-                    content = choice['text']
-                else:
-                    content = str(choice)
-            
-            if not content:
-                # Fallback: convert entire response to string
-                content = json.dumps(response_data, indent=2)
-            
-            # Parse usage - handle both old and new formats
-            usage = {}
-            if isinstance(response_data, list):
-                # New format doesn't include usage in response
-                # Estimate based on content
-                usage = {
-                    'prompt_tokens': len(input_text) // 4,
-                    'completion_tokens': len(content) // 4,
-                    'total_tokens': (len(input_text) + len(content)) // 4
-                }
-            elif 'usage' in response_data:
-                raw_usage = response_data['usage']
-                # Handle new token format (input_tokens, output_tokens)
-                if 'input_tokens' in raw_usage:
-                    usage = {
-                        'prompt_tokens': raw_usage.get('input_tokens', 0),
-                        'completion_tokens': raw_usage.get('output_tokens', 0),
-                        'total_tokens': raw_usage.get('total_tokens', 0)
-                    }
-                else:
-                    usage = raw_usage
+        # Combine messages into single input string
+        # Format: "System: {system}\n\nUser: {user}"
+        input_parts = []
+        for msg in messages:
+            if msg.role == "system":
+                input_parts.append(f"System: {msg.content}")
+            elif msg.role == "user":
+                input_parts.append(f"User: {msg.content}")
+            elif msg.role == "assistant":
+                input_parts.append(f"Assistant: {msg.content}")
+
+        payload = {
+            "model": model,
+            "input": "\n\n".join(input_parts)
+        }
+        if stream:
+            payload["stream"] = True
+
+        logger.debug(f"🌐 Querying OpenAI /v1/responses: {model}...")
+
+        return ProviderRequest(
+            url=f"{self.base_url}/responses",
+            payload=payload,
+            model=model,
+            headers=headers,
+            timeout=180,  # Longer timeout for complex responses
+            label="OpenAI /v1/responses API"
+        )
+
+    def _parse_response(self, request: ProviderRequest, data: Any) -> LLMResponse:
+        """Parse a chat completion or /v1/responses result"""
+        if request.url.endswith("/responses"):
+            return self._parse_responses_result(data, request.model, request.payload["input"])
+
+        choice = data["choices"][0]
+
+        return LLMResponse(
+            content=choice["message"]["content"],
+            model=data["model"],
+            provider="openai",
+            finish_reason=choice["finish_reason"],
+            usage=data["usage"],
+            raw_response=data
+        )
+
+    def _parse_responses_result(self, response_data: Any, model: str, input_text: str) -> LLMResponse:
+        """Parse an OpenAI /v1/responses result"""
+        # GPT-5 Pro returns a list of items with different types
+        # Example: [{'type': 'reasoning', ...}, {'type': 'message', 'content': [...]}]
+        content = ""
+
+        if isinstance(response_data, list):
+            # New format: list of items
+            for item in response_data:
+                if item.get('type') == 'message':
+                    # Extract text from content array
+                    content_items = item.get('content', [])
+                    for content_item in content_items:
+                        if content_item.get('type') == 'output_text':
+                            content += content_item.get('text', '')
+        elif 'content' in response_data:
+            content = response_data['content']
+        elif 'response' in response_data:
+            content = response_data['response']
+        elif 'output' in response_data:
+            content = response_data['output']
+        elif 'choices' in response_data and len(response_data['choices']) > 0:
+            choice = response_data['choices'][0]
+            if 'message' in choice:
+                content = choice['message'].get('content', '')
+            elif 'text' in choice:
+                content = choice['text']
             else:
+                content = str(choice)
+
+        if not content:
+            # Fallback: convert entire response to string
+            content = json.dumps(response_data, indent=2)
+
+        # Parse usage - handle both old and new formats
+        usage = {}
+        if isinstance(response_data, list):
+            # New format doesn't include usage in response
+            # Estimate based on content
+            usage = {
+                'prompt_tokens': len(input_text) // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (len(input_text) + len(content)) // 4
+            }
+        elif 'usage' in response_data:
+            raw_usage = response_data['usage']
+            # Handle new token format (input_tokens, output_tokens)
+            if 'input_tokens' in raw_usage:
                 usage = {
-                    'prompt_tokens': len(input_text) // 4,
-                    'completion_tokens': len(content) // 4,
-                    'total_tokens': (len(input_text) + len(content)) // 4
+                    'prompt_tokens': raw_usage.get('input_tokens', 0),
+                    'completion_tokens': raw_usage.get('output_tokens', 0),
+                    'total_tokens': raw_usage.get('total_tokens', 0)
                 }
-            
-            # Extract model name
-            model_name = model
-            finish_reason = 'stop'
-            
-            if isinstance(response_data, list):
-                # New format: extract from message item
-                for item in response_data:
-                    if item.get('type') == 'message':
-                        finish_reason = item.get('status', 'completed')
-                        break
             else:
-                model_name = response_data.get('model', model)
-                finish_reason = response_data.get('finish_reason', 'stop')
-            
-            return LLMResponse(
-                content=content,
-                model=model_name,
-                provider="openai-responses",
-                finish_reason=finish_reason,
-                usage=usage,
-                raw_response={'response': response_data} if isinstance(response_data, list) else response_data
-            )
-        
-        except Exception as e:
-            logger.error(f"OpenAI /v1/responses API error: {e}")
-            raise
-    
-    def chat_completion(
-        self,
-        messages: List[LLMMessage],
-        model: str,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
-        **kwargs
-    ) -> LLMResponse:
-        """Generate OpenAI chat completion"""
-        
-        # Check if model uses the new /v1/responses endpoint
-        if self._uses_responses_api(model):
-            logger.debug(f"🔄 Using /v1/responses endpoint for {model}")
-            return self._responses_completion(messages, model, **kwargs)
-        
-        # Standard /v1/chat/completions endpoint
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            if self.org_id:
-                headers["OpenAI-Organization"] = self.org_id
-            
-            payload = {
-                "model": model,
-                "messages": [{"role": m.role, "content": m.content} for m in messages],
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                **kwargs
+                usage = raw_usage
+        else:
+            usage = {
+                'prompt_tokens': len(input_text) // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (len(input_text) + len(content)) // 4
             }
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            choice = data["choices"][0]
-            
-            return LLMResponse(
-                content=choice["message"]["content"],
-                model=data["model"],
-                provider="openai",
-                finish_reason=choice["finish_reason"],
-                usage=data["usage"],
-                raw_response=data
-            )
-        
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
-    
+
+        # Extract model name
+        model_name = model
+        finish_reason = 'stop'
+
+        if isinstance(response_data, list):
+            # New format: extract from message item
+            for item in response_data:
+                if item.get('type') == 'message':
+                    finish_reason = item.get('status', 'completed')
+                    break
+        else:
+            model_name = response_data.get('model', model)
+            finish_reason = response_data.get('finish_reason', 'stop')
+
+        return LLMResponse(
+            content=content,
+            model=model_name,
+            provider="openai-responses",
+            finish_reason=finish_reason,
+            usage=usage,
+            raw_response={'response': response_data} if isinstance(response_data, list) else response_data
+        )
+
+    def _parse_stream_line(self, line: str) -> Optional[LLMStreamChunk]:
+        """Parse a chat.completion.chunk or /v1/responses stream event"""
+        event = self._sse_data(line)
+        if not event:
+            return None
+
+        # /v1/responses events
+        if event.get("type") == "response.output_text.delta":
+            return LLMStreamChunk(content=event.get("delta", ""))
+        if event.get("type") == "response.completed":
+            return LLMStreamChunk(content="", finish_reason="completed")
+
+        # chat.completion.chunk
+        choices = event.get("choices") or []
+        if not choices:
+            return LLMStreamChunk(content="", usage=event["usage"]) if event.get("usage") else None
+        choice = choices[0]
+        return LLMStreamChunk(
+            content=(choice.get("delta") or {}).get("content") or "",
+            finish_reason=choice.get("finish_reason"),
+            usage=event.get("usage")
+        )
+
     def test_connection(self) -> bool:
         """Test OpenAI API key"""
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}"
             }
-            
-            response = requests.get(
+
+            response = get_http_session().get(
                 f"{self.base_url}/models",
                 headers=headers,
                 timeout=10
             )
-            
+
             return response.status_code == 200
         except Exception as e:
             logger.error(f"OpenAI connection test failed: {e}")
             return False
-    
+
     def get_available_models(self) -> List[str]:
         """Get available OpenAI models"""
         return [
@@ -329,76 +703,92 @@ class OpenAIProvider(LLMProvider):
         ]
 
 
-class AnthropicProvider(LLMProvider):
+class AnthropicProvider(HTTPLLMProvider):
     """Anthropic Claude provider (Claude 3.5 Sonnet, Claude 3 Opus/Haiku)"""
-    
+
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         super().__init__(api_key, base_url or "https://api.anthropic.com")
-    
-    def chat_completion(
+
+    def _build_request(
         self,
         messages: List[LLMMessage],
         model: str,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
         **kwargs
-    ) -> LLMResponse:
-        """Generate Anthropic chat completion"""
-        try:
-            headers = {
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json"
-            }
-            
-            # Anthropic uses different format - extract system message
-            system_message = ""
-            user_messages = []
-            
-            for msg in messages:
-                if msg.role == "system":
-                    system_message = msg.content
-                else:
-                    user_messages.append({"role": msg.role, "content": msg.content})
-            
-            payload = {
-                "model": model,
-                "messages": user_messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                **kwargs
-            }
-            
-            if system_message:
-                payload["system"] = system_message
-            
-            response = requests.post(
-                f"{self.base_url}/v1/messages",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            return LLMResponse(
-                content=data["content"][0]["text"],
-                model=data["model"],
-                provider="anthropic",
-                finish_reason=data["stop_reason"],
-                usage={
-                    "prompt_tokens": data["usage"]["input_tokens"],
-                    "completion_tokens": data["usage"]["output_tokens"],
-                    "total_tokens": data["usage"]["input_tokens"] + data["usage"]["output_tokens"]
-                },
-                raw_response=data
+    ) -> ProviderRequest:
+        """Build a /v1/messages request"""
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json"
+        }
+
+        # Anthropic uses different format - extract system message
+        system_message = ""
+        user_messages = []
+
+        for msg in messages:
+            if msg.role == "system":
+                system_message = msg.content
+            else:
+                user_messages.append({"role": msg.role, "content": msg.content})
+
+        payload = {
+            "model": model,
+            "messages": user_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **kwargs
+        }
+
+        if system_message:
+            payload["system"] = system_message
+        if stream:
+            payload["stream"] = True
+
+        return ProviderRequest(
+            url=f"{self.base_url}/v1/messages",
+            payload=payload,
+            model=model,
+            headers=headers,
+            timeout=60,
+            label="Anthropic API"
+        )
+
+    def _parse_response(self, request: ProviderRequest, data: Any) -> LLMResponse:
+        """Parse a /v1/messages result"""
+        return LLMResponse(
+            content=data["content"][0]["text"],
+            model=data["model"],
+            provider="anthropic",
+            finish_reason=data["stop_reason"],
+            usage={
+                "prompt_tokens": data["usage"]["input_tokens"],
+                "completion_tokens": data["usage"]["output_tokens"],
+                "total_tokens": data["usage"]["input_tokens"] + data["usage"]["output_tokens"]
+            },
+            raw_response=data
+        )
+
+    def _parse_stream_line(self, line: str) -> Optional[LLMStreamChunk]:
+        """Parse a /v1/messages stream event (content_block_delta, message_delta)"""
+        event = self._sse_data(line)
+        if not event:
+            return None
+
+        if event.get("type") == "content_block_delta":
+            return LLMStreamChunk(content=event.get("delta", {}).get("text", ""))
+        if event.get("type") == "message_delta":
+            output_tokens = event.get("usage", {}).get("output_tokens")
+            return LLMStreamChunk(
+                content="",
+                finish_reason=event.get("delta", {}).get("stop_reason"),
+                usage={"completion_tokens": output_tokens} if output_tokens is not None else None
             )
-        
-        except Exception as e:
-            logger.error(f"Anthropic API error: {e}")
-            raise
-    
+        return None
+
     def test_connection(self) -> bool:
         """Test Anthropic API key"""
         try:
@@ -409,7 +799,7 @@ class AnthropicProvider(LLMProvider):
         except Exception as e:
             logger.error(f"Anthropic connection test failed: {e}")
             return False
-    
+
     def get_available_models(self) -> List[str]:
         """Get available Anthropic models"""
         return [
@@ -420,70 +810,85 @@ class AnthropicProvider(LLMProvider):
         ]
 
 
-class GoogleProvider(LLMProvider):
+class GoogleProvider(HTTPLLMProvider):
     """Google Gemini provider"""
-    
+
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         super().__init__(api_key, base_url or "https://generativelanguage.googleapis.com/v1")
-    
-    def chat_completion(
+
+    def _build_request(
         self,
         messages: List[LLMMessage],
         model: str,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
         **kwargs
-    ) -> LLMResponse:
-        """Generate Google Gemini completion"""
-        try:
-            # Gemini format
-            contents = []
-            for msg in messages:
-                role = "user" if msg.role in ["user", "system"] else "model"
-                contents.append({
-                    "role": role,
-                    "parts": [{"text": msg.content}]
-                })
-            
-            payload = {
-                "contents": contents,
-                "generationConfig": {
-                    "temperature": temperature,
-                    "maxOutputTokens": max_tokens,
-                }
+    ) -> ProviderRequest:
+        """Build a generateContent / streamGenerateContent request"""
+        # Gemini format
+        contents = []
+        for msg in messages:
+            role = "user" if msg.role in ["user", "system"] else "model"
+            contents.append({
+                "role": role,
+                "parts": [{"text": msg.content}]
+            })
+
+        payload = {
+            "contents": contents,
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens,
             }
-            
-            response = requests.post(
-                f"{self.base_url}/models/{model}:generateContent?key={self.api_key}",
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            candidate = data["candidates"][0]
-            
-            return LLMResponse(
-                content=candidate["content"]["parts"][0]["text"],
-                model=model,
-                provider="google",
-                finish_reason=candidate.get("finishReason", "STOP"),
-                usage={
-                    "prompt_tokens": data.get("usageMetadata", {}).get("promptTokenCount", 0),
-                    "completion_tokens": data.get("usageMetadata", {}).get("candidatesTokenCount", 0),
-                    "total_tokens": data.get("usageMetadata", {}).get("totalTokenCount", 0)
-                },
-                raw_response=data
-            )
-        
-        except Exception as e:
-            logger.error(f"Google API error: {e}")
-            raise
-    
+        }
+
+        if stream:
+            url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        else:
+            url = f"{self.base_url}/models/{model}:generateContent?key={self.api_key}"
+
+        return ProviderRequest(url=url, payload=payload, model=model, timeout=60, label="Google API")
+
+    def _parse_response(self, request: ProviderRequest, data: Any) -> LLMResponse:
+        """Parse a generateContent result"""
+        candidate = data["candidates"][0]
+
+        return LLMResponse(
+            content=candidate["content"]["parts"][0]["text"],
+            model=request.model,
+            provider="google",
+            finish_reason=candidate.get("finishReason", "STOP"),
+            usage=self._usage(data),
+            raw_response=data
+        )
+
+    def _parse_stream_line(self, line: str) -> Optional[LLMStreamChunk]:
+        """Parse a streamGenerateContent server-sent event"""
+        event = self._sse_data(line)
+        if not event or not event.get("candidates"):
+            return None
+
+        candidate = event["candidates"][0]
+        parts = candidate.get("content", {}).get("parts", [])
+        return LLMStreamChunk(
+            content="".join(part.get("text", "") for part in parts),
+            finish_reason=candidate.get("finishReason"),
+            usage=self._usage(event) if "usageMetadata" in event else None
+        )
+
+    @staticmethod
+    def _usage(data: Dict) -> Dict[str, int]:
+        return {
+            "prompt_tokens": data.get("usageMetadata", {}).get("promptTokenCount", 0),
+            "completion_tokens": data.get("usageMetadata", {}).get("candidatesTokenCount", 0),
+            "total_tokens": data.get("usageMetadata", {}).get("totalTokenCount", 0)
+        }
+
     def test_connection(self) -> bool:
         """Test Google API key"""
         try:
-            response = requests.get(
+            response = get_http_session().get(
                 f"{self.base_url}/models?key={self.api_key}",
                 timeout=10
             )
@@ -491,7 +896,7 @@ class GoogleProvider(LLMProvider):
         except Exception as e:
             logger.error(f"Google connection test failed: {e}")
             return False
-    
+
     def get_available_models(self) -> List[str]:
         """Get available Google models"""
         return [
@@ -502,62 +907,85 @@ class GoogleProvider(LLMProvider):
         ]
 
 
-class LocalProvider(LLMProvider):
+class LocalProvider(HTTPLLMProvider):
     """Local LLM provider (Ollama, LM Studio, etc.)"""
-    
+
     def __init__(self, api_key: str = "", base_url: str = "http://localhost:11434"):
         super().__init__(api_key, base_url)
-    
-    def chat_completion(
+
+    def _build_request(
         self,
         messages: List[LLMMessage],
         model: str,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+        timeout: float = 120,
         **kwargs
-    ) -> LLMResponse:
-        """Generate local LLM completion (Ollama format)"""
-        try:
-            payload = {
-                "model": model,
-                "messages": [{"role": m.role, "content": m.content} for m in messages],
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            return LLMResponse(
-                content=data["message"]["content"],
-                model=data["model"],
-                provider="local",
-                finish_reason=data.get("done_reason", "stop"),
-                usage={
-                    "prompt_tokens": data.get("prompt_eval_count", 0),
-                    "completion_tokens": data.get("eval_count", 0),
-                    "total_tokens": data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
-                },
-                raw_response=data
-            )
-        
-        except Exception as e:
-            logger.error(f"Local LLM error: {e}")
-            raise
-    
+    ) -> ProviderRequest:
+        """Build an Ollama /api/chat request
+
+        temperature/max_tokens of None leave the setting to the model's
+        defaults (no "options" are sent when both are None).
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "stream": stream
+        }
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        if options:
+            payload["options"] = options
+
+        return ProviderRequest(
+            url=f"{self.base_url}/api/chat",
+            payload=payload,
+            model=model,
+            timeout=timeout,
+            label="Local LLM"
+        )
+
+    def _parse_response(self, request: ProviderRequest, data: Any) -> LLMResponse:
+        """Parse an Ollama /api/chat result"""
+        return LLMResponse(
+            content=data["message"]["content"],
+            model=data["model"],
+            provider="local",
+            finish_reason=data.get("done_reason", "stop"),
+            usage=self._usage(data),
+            raw_response=data
+        )
+
+    def _parse_stream_line(self, line: str) -> Optional[LLMStreamChunk]:
+        """Parse one line of Ollama's newline-delimited JSON stream"""
+        if not line:
+            return None
+
+        data = json.loads(line)
+        if not data.get("done"):
+            return LLMStreamChunk(content=data.get("message", {}).get("content", ""))
+        return LLMStreamChunk(
+            content=data.get("message", {}).get("content", ""),
+            finish_reason=data.get("done_reason", "stop"),
+            usage=self._usage(data)
+        )
+
+    @staticmethod
+    def _usage(data: Dict) -> Dict[str, int]:
+        return {
+            "prompt_tokens": data.get("prompt_eval_count", 0),
+            "completion_tokens": data.get("eval_count", 0),
+            "total_tokens": data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
+        }
+
     def test_connection(self) -> bool:
         """Test local LLM connection"""
         try:
-            response = requests.get(
+            response = get_http_session().get(
                 f"{self.base_url}/api/tags",
                 timeout=5
             )
@@ -565,17 +993,17 @@ class LocalProvider(LLMProvider):
         except Exception as e:
             logger.error(f"Local LLM connection test failed: {e}")
             return False
-    
+
     def get_available_models(self) -> List[str]:
         """Get available local models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = get_http_session().get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return [model["name"] for model in data.get("models", [])]
         except:
             pass
-        
+
         return ["llama3", "mistral", "codellama", "qwen2.5-coder"]
 
 
@@ -0,0 +1,328 @@
+"""Content-addressed cache for LLM completions.
+
+Identical prompts are sent again and again: re-polled issues, re-reviewed
+draft PRs, retried file edits. This cache stores completions on disk, keyed by
+a SHA-256 of the provider, model, normalized messages and sampling parameters,
+so a repeated request is answered locally instead of by the model.
+
+Messages are normalized before hashing (line endings, trailing whitespace,
+runs of blank lines, surrounding whitespace) so that prompts differing only in
+formatting noise share an entry; leading indentation is kept because it is
+significant in code.
+
+Entries expire after a TTL and the least recently used entries are evicted
+once the stored responses exceed the size limit. The cache lives in a SQLite
+database shared by all processes on the host. Providers only cache
+deterministic (temperature 0) calls unless a caller opts in with cache=True;
+calls whose output must not be reused (retries after a bad answer) pass
+cache=False, so rejected answers are never stored.
+
+Configuration (environment):
+    LLM_RESPONSE_CACHE          "0"/"false"/"off" disables the cache
+    LLM_RESPONSE_CACHE_PATH     Database path (default data/llm_response_cache.db)
+    LLM_RESPONSE_CACHE_TTL      Entry lifetime in seconds (default 7 days)
+    LLM_RESPONSE_CACHE_MAX_MB   Size limit of stored responses (default 256)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_PATH = "data/llm_response_cache.db"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MB = 256
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize prompt text for cache keys.
+
+    Unifies line endings, strips trailing whitespace on every line, collapses
+    runs of blank lines and strips surrounding whitespace.
+
+    Args:
+        text: Message content
+
+    Returns:
+        Normalized text
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def make_key(
+    namespace: str,
+    model: str,
+    messages: Sequence[Any],
+    params: Optional[Mapping[str, Any]] = None
+) -> str:
+    """Build a content-addressed cache key.
+
+    Args:
+        namespace: Provider name and endpoint (e.g. "openai:https://api.openai.com/v1")
+        model: Model name
+        messages: LLMMessage objects or {"role", "content"} dicts
+        params: Sampling parameters (temperature, max_tokens, provider options)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = []
+    for message in messages:
+        role = message["role"] if isinstance(message, Mapping) else message.role
+        content = message["content"] if isinstance(message, Mapping) else message.content
+        content = normalize_text(content or "")
+        if role == "system" and not content:
+            continue
+        normalized.append([role.lower(), content])
+
+    params = dict(params or {})
+    if isinstance(params.get("temperature"), float):
+        params["temperature"] = round(params["temperature"], 4)
+
+    material = json.dumps(
+        {"namespace": namespace, "model": model, "messages": normalized, "params": params},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters of one process"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LLMResponseCache:
+    """Persistent, TTL- and size-bounded cache of LLM completions."""
+
+    PRUNE_INTERVAL = 50  # Stores between eviction passes
+    REPORT_INTERVAL = 5.0  # Seconds between hit-rate reports to the monitor
+    MONITOR_NAME = "llm_responses"
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        """Initialize LLM response cache.
+
+        The database file is created lazily on the first store.
+
+        Args:
+            db_path: Path to SQLite database file
+            ttl: Seconds an entry stays valid
+            max_bytes: Size limit of stored responses (least recently used are evicted)
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stores_since_prune = 0
+        self._last_report = 0.0
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Shared connection, opened (and the schema created) on first use."""
+        if self._conn is None:
+            if not create and not self.db_path.exists():
+                return None
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Stored response dict, or None if absent or expired
+        """
+        now = time.time()
+        entry = None
+        try:
+            with self._lock:
+                conn = self._connect(create=False)
+                row = None
+                if conn is not None:
+                    row = conn.execute(
+                        "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                if row and now - row[1] <= self.ttl:
+                    conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    entry = json.loads(row[0])
+                elif row:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ LLM response cache read failed: {e}")
+
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        self._report()
+        return entry
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            response: JSON-serializable response fields
+        """
+        data = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect(create=True)
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now)
+                )
+                self.stats.stores += 1
+                self._stores_since_prune += 1
+                if self._stores_since_prune >= self.PRUNE_INTERVAL:
+                    self._prune(conn, now)
+                    self._stores_since_prune = 0
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM response cache write failed: {e}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones beyond max_bytes."""
+        expired = conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)).rowcount
+        evicted = conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS used FROM responses) "
+            "WHERE used > ?)",
+            (self.max_bytes,)
+        ).rowcount
+        self.stats.evictions += expired + evicted
+        if evicted:
+            logger.info(f"🧹 LLM response cache evicted {evicted} least recently used entries")
+
+    def info(self) -> Dict[str, Any]:
+        """Hit-rate counters of this process plus entry count and size on disk."""
+        entries, size = 0, 0
+        try:
+            with self._lock:
+                conn = self._connect(create=False)
+                if conn is not None:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                    ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM response cache stats failed: {e}")
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "stores": self.stats.stores,
+            "evictions": self.stats.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl
+        }
+
+    def _report(self, force: bool = False) -> None:
+        """Publish hit-rate counters to the agent monitor (at most every REPORT_INTERVAL)."""
+        now = time.time()
+        if not force and now - self._last_report < self.REPORT_INTERVAL:
+            return
+        self._last_report = now
+        try:
+            from engine.runners.monitor_service import get_monitor
+
+            get_monitor().update_cache_metrics(self.MONITOR_NAME, {
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "hit_rate": round(self.stats.hit_rate, 4),
+                "stores": self.stats.stores,
+                "evictions": self.stats.evictions
+            })
+        except Exception as e:
+            logger.debug(f"LLM response cache metrics not reported: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is not None:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+
+    def close(self) -> None:
+        """Report final counters and close the database connection."""
+        self._report(force=True)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global cache instance
+_global_llm_cache: Optional[LLMResponseCache] = None
+_global_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Get or create the global LLM response cache (None if disabled).
+
+    See the module docstring for the environment variables.
+    """
+    global _global_llm_cache
+    if os.getenv("LLM_RESPONSE_CACHE", "1").lower() in ("0", "false", "off", "no"):
+        return None
+    with _global_llm_cache_lock:
+        if _global_llm_cache is None:
+            _global_llm_cache = LLMResponseCache(
+                db_path=os.getenv("LLM_RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=float(os.getenv("LLM_RESPONSE_CACHE_TTL", DEFAULT_TTL)),
+                max_bytes=int(float(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+            )
+        return _global_llm_cache
@@ -20,6 +20,7 @@ Date: 2025-10-10
 """
 
 import asyncio
+import inspect
 import logging
 import os
 import re
@@ -30,6 +31,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import traceback
 
+from engine.operations.env_cache import EnvCacheError, EnvCacheManager, get_env_cache
+from engine.operations.repo_cache import RepoCacheError, RepoCacheManager, get_repo_cache
+
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +78,14 @@ class PipelineConfig:
     token_env_vars: Optional[List[str]] = None
     token_config_path: Optional[str] = None
     
+    # Repository cache (None = shared global cache, see engine.operations.repo_cache)
+    repo_cache_dir: Optional[str] = None
+    repo_cache_max_gb: float = 20.0
+    
+    # Test venv cache (None = shared global cache, see engine.operations.env_cache)
+    env_cache_dir: Optional[str] = None
+    env_cache_max_gb: float = 10.0
+    
     # Retry configuration
     max_retries: int = 3
     retry_delay: int = 60  # seconds
@@ -153,6 +165,24 @@ class PipelineOrchestrator:
         self._pr_reviewer = None
         self._github_api = None
         
+        # Bare mirrors + per-run worktrees instead of a fresh clone per run
+        if self.config.repo_cache_dir:
+            self.repo_cache = RepoCacheManager(
+                cache_dir=self.config.repo_cache_dir,
+                max_disk_bytes=int(self.config.repo_cache_max_gb * 1024 ** 3)
+            )
+        else:
+            self.repo_cache = get_repo_cache()
+        
+        # Test venvs keyed by requirements hash instead of pip installs per run
+        if self.config.env_cache_dir:
+            self.env_cache = EnvCacheManager(
+                cache_dir=self.config.env_cache_dir,
+                max_disk_bytes=int(self.config.env_cache_max_gb * 1024 ** 3)
+            )
+        else:
+            self.env_cache = get_env_cache()
+        
         logger.info("🔧 Pipeline Orchestrator initialized")
         logger.debug(f"🔍 Token sources: {self.config.token_env_vars}")
         logger.debug(f"🔍 Default repos: {self.config.default_repos}")
@@ -487,6 +517,29 @@ class PipelineOrchestrator:
             if issue_key in self.active_pipelines:
                 pipeline_state['completed_at'] = datetime.utcnow().isoformat()
 
+    async def _query_llm(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        cache: Optional[bool] = None
+    ) -> str:
+        """Query the agent's LLM without blocking the event loop.
+
+        Uses the agent's async client (CodeAgent.aquery_llm) when available,
+        otherwise runs the blocking query_llm() in a worker thread.
+
+        Args:
+            prompt: User prompt text
+            system_prompt: Optional system prompt
+            cache: LLM response cache policy (False for answers that get validated and retried)
+        """
+        aquery = getattr(self.agent, 'aquery_llm', None)
+        if inspect.iscoroutinefunction(aquery):
+            return await aquery(prompt, system_prompt=system_prompt, cache=cache) or ''
+        return await asyncio.to_thread(
+            self.agent.query_llm, prompt, system_prompt=system_prompt, stream=False, cache=cache
+        ) or ''
+
     async def _handle_generic_issue(
         self,
         repo: str,
@@ -500,16 +553,13 @@ class PipelineOrchestrator:
         """Fallback handler for issues that require changes across existing files.
 
         Implementation strategy (optimized for local LLMs):
-        - Clone repo to a temp workspace
-        - Create a branch
+        - Check out a branch in a worktree from the cached repo mirror
         - PRIMARY: Ask LLM for JSON file operations (full file content)
         - FALLBACK: Ask for unified diff patch if JSON fails
         - Apply changes, run tests (optional), commit, push
         - Open PR
         """
         import subprocess
-        import tempfile
-        import shutil
         import requests
         from pathlib import Path
 
@@ -559,44 +609,18 @@ class PipelineOrchestrator:
                 excerpt_lines = excerpt_lines[:max_lines]
             return "\n".join(excerpt_lines)
 
-        workspace = tempfile.mkdtemp(prefix=f"{repo_name}-generic-")
+        try:
+            checkout = await asyncio.to_thread(self.repo_cache.checkout, repo, branch_name, token=token)
+        except RepoCacheError as e:
+            return {'success': False, 'error': f"Checkout failed: {e}"}
+        workspace = str(checkout.path)
+        base_ref = checkout.base_ref
         logger.info(f"📁 Generic workspace: {workspace}")
 
         try:
-            clone_url = f"https://{token}@github.com/{owner}/{repo_name}.git"
-            clone_res = subprocess.run(
-                ['git', 'clone', '--depth=1', clone_url, workspace],
-                capture_output=True,
-                text=True,
-            )
-            if clone_res.returncode != 0:
-                return {'success': False, 'error': f"Clone failed: {clone_res.stderr.strip()}"}
-
-            # Determine base branch (origin/HEAD)
-            base_ref = 'main'
-            head_ref_res = subprocess.run(
-                ['git', 'symbolic-ref', 'refs/remotes/origin/HEAD'],
-                cwd=workspace,
-                capture_output=True,
-                text=True,
-            )
-            if head_ref_res.returncode == 0:
-                ref = (head_ref_res.stdout or '').strip()
-                if ref.startswith('refs/remotes/origin/'):
-                    base_ref = ref.split('refs/remotes/origin/', 1)[1]
-
-            co_res = subprocess.run(
-                ['git', 'checkout', '-b', branch_name],
-                cwd=workspace,
-                capture_output=True,
-                text=True,
-            )
-            if co_res.returncode != 0:
-                return {'success': False, 'error': f"Branch creation failed: {co_res.stderr.strip()}"}
-
             # Configure git identity (required for commits)
-            subprocess.run(['git', 'config', 'user.email', 'agent-forge@example.com'], cwd=workspace, capture_output=True)
-            subprocess.run(['git', 'config', 'user.name', 'Agent-Forge'], cwd=workspace, capture_output=True)
+            await asyncio.to_thread(subprocess.run, ['git', 'config', 'user.email', 'agent-forge@example.com'], cwd=workspace, capture_output=True)
+            await asyncio.to_thread(subprocess.run, ['git', 'config', 'user.name', 'Agent-Forge'], cwd=workspace, capture_output=True)
 
             # Build minimal context for LLM
             title = issue_data.get('title', '')
@@ -640,7 +664,7 @@ class PipelineOrchestrator:
                     continue
 
             # Provide a short file list to help navigation
-            ls_res = subprocess.run(
+            ls_res = await asyncio.to_thread(subprocess.run,
                 ['git', 'ls-files'],
                 cwd=workspace,
                 capture_output=True,
@@ -693,7 +717,7 @@ class PipelineOrchestrator:
                 "Implement this. Return JSON array with file operations."
                 + constraints_block
             )
-            raw_ops = self.agent.query_llm(json_prompt, system_prompt=json_system, stream=False) or ''
+            raw_ops = await self._query_llm(json_prompt, system_prompt=json_system, cache=False)
             ops_text = _sanitize_json(raw_ops)
             try:
                 ops = json.loads(ops_text)
@@ -721,7 +745,7 @@ class PipelineOrchestrator:
                             except Exception:
                                 continue
                     # Check if changes were made
-                    status_check = subprocess.run(['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
+                    status_check = await asyncio.to_thread(subprocess.run, ['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
                     if (status_check.stdout or '').strip():
                         apply_ok = True
                         logger.info("✅ JSON file operations applied successfully")
@@ -753,14 +777,14 @@ class PipelineOrchestrator:
                 )
 
                 for attempt in range(3):  # 3 attempts for patch
-                    raw_patch = self.agent.query_llm(patch_prompt, system_prompt=patch_system, stream=False) or ''
+                    raw_patch = await self._query_llm(patch_prompt, system_prompt=patch_system, cache=False)
                     patch_text = _sanitize_patch(raw_patch)
                     if not patch_text or 'diff --git' not in patch_text:
                         last_error = "LLM did not return a valid unified diff patch"
                         logger.warning(f"⚠️ Patch attempt {attempt+1}/3: {last_error}")
                         continue
 
-                    apply_res = subprocess.run(
+                    apply_res = await asyncio.to_thread(subprocess.run,
                         ['git', 'apply', '--whitespace=nowarn', '-'],
                         cwd=workspace,
                         input=patch_text,
@@ -788,48 +812,29 @@ class PipelineOrchestrator:
             if not apply_ok:
                 return {'success': False, 'error': f"Both strategies failed. Last error: {last_error}"}
 
-            status_res = subprocess.run(['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
+            status_res = await asyncio.to_thread(subprocess.run, ['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
             if not (status_res.stdout or '').strip():
                 return {'success': False, 'error': 'Changes applied but produced no git diff'}
 
             tests_required = self.config.require_tests_passing if require_tests is None else bool(require_tests)
             if tests_required:
-                try:
-                    # Install dependencies if requirements.txt exists
-                    req_file = Path(workspace) / 'requirements.txt'
-                    if req_file.exists():
-                        logger.info("📦 Installing dependencies from requirements.txt...")
-                        install_res = subprocess.run(
-                            [sys.executable, '-m', 'pip', 'install', '-q', '--break-system-packages', '-r', 'requirements.txt'],
-                            cwd=workspace,
-                            capture_output=True,
-                            text=True,
-                            timeout=300,
-                        )
-                        if install_res.returncode != 0:
-                            logger.warning(f"⚠️ pip install failed: {install_res.stderr}")
-                    test_res = subprocess.run(
-                        [sys.executable, '-m', 'pytest', '-q'],
-                        cwd=workspace,
-                        capture_output=True,
-                        text=True,
-                        timeout=600,
-                    )
-                    # pytest returns 5 when no tests are collected; treat as pass
-                    if test_res.returncode not in (0, 5):
-                        out = (test_res.stdout or '') + (test_res.stderr or '')
-                        out = out[-2000:]
-                        return {'success': False, 'error': f'Tests failed (pytest -q):\n{out}'}
-                except Exception as e:
-                    return {'success': False, 'error': f'Test run failed: {e}'}
-
-            subprocess.run(['git', 'add', '-A'], cwd=workspace, capture_output=True)
+                test_error = await asyncio.to_thread(self._run_workspace_tests, repo, workspace)
+                if test_error:
+                    return {'success': False, 'error': test_error}
+
+            await asyncio.to_thread(subprocess.run, ['git', 'add', '-A'], cwd=workspace, capture_output=True)
             commit_msg = f"fix: Resolve issue #{issue_number} - {title}\n\nGenerated by Agent-Forge autonomous pipeline."
-            commit_res = subprocess.run(['git', 'commit', '-m', commit_msg], cwd=workspace, capture_output=True, text=True)
+            commit_res = await asyncio.to_thread(subprocess.run, ['git', 'commit', '-m', commit_msg], cwd=workspace, capture_output=True, text=True)
             if commit_res.returncode != 0:
                 return {'success': False, 'error': f"Git commit failed: {(commit_res.stderr or '').strip()}"}
 
-            push_res = subprocess.run(['git', 'push', 'origin', branch_name], cwd=workspace, capture_output=True, text=True)
+            push_res = await asyncio.to_thread(subprocess.run,
+                ['git', 'push', 'origin', branch_name],
+                cwd=workspace,
+                env=checkout.env,
+                capture_output=True,
+                text=True,
+            )
             if push_res.returncode != 0:
                 return {'success': False, 'error': f"Push failed: {(push_res.stderr or '').strip()}"}
 
@@ -846,7 +851,7 @@ class PipelineOrchestrator:
                 'base': base_ref
             }
 
-            response = requests.post(pr_url, headers=headers, json=pr_data, timeout=30)
+            response = await asyncio.to_thread(requests.post, pr_url, headers=headers, json=pr_data, timeout=30)
             if response.status_code not in (200, 201):
                 return {'success': False, 'error': f"PR creation failed: {response.status_code} {response.text}"}
 
@@ -860,10 +865,49 @@ class PipelineOrchestrator:
 
         finally:
             try:
-                shutil.rmtree(workspace)
-                logger.info(f"🧹 Cleaned up workspace: {workspace}")
+                await asyncio.to_thread(self.repo_cache.release, checkout)
             except Exception as cleanup_error:
-                logger.warning(f"⚠️  Failed to cleanup workspace: {cleanup_error}")
+                logger.warning(f"⚠️  Failed to release worktree: {cleanup_error}")
+
+    def _run_workspace_tests(self, repo: str, workspace: str) -> Optional[str]:
+        """Run pytest in a workspace, using a cached venv when requirements.txt exists.
+
+        Args:
+            repo: Repository the workspace belongs to (owner/repo)
+            workspace: Checkout directory
+
+        Returns:
+            Error message if tests failed or could not run, None if they passed
+        """
+        import subprocess
+
+        def _pytest(python: str) -> Optional[str]:
+            test_res = subprocess.run(
+                [python, '-m', 'pytest', '-q'],
+                cwd=workspace,
+                capture_output=True,
+                text=True,
+                timeout=600,
+            )
+            # pytest returns 5 when no tests are collected; treat as pass
+            if test_res.returncode not in (0, 5):
+                out = (test_res.stdout or '') + (test_res.stderr or '')
+                out = out[-2000:]
+                return f'Tests failed (pytest -q):\n{out}'
+            return None
+
+        try:
+            req_file = Path(workspace) / 'requirements.txt'
+            if not req_file.exists():
+                return _pytest(sys.executable)
+            try:
+                with self.env_cache.environment(repo, req_file) as env:
+                    return _pytest(str(env.python))
+            except EnvCacheError as e:
+                logger.warning(f"⚠️ Cached venv unavailable, running tests with {sys.executable}: {e}")
+                return _pytest(sys.executable)
+        except Exception as e:
+            return f'Test run failed: {e}'
 
     async def handle_pr_change_request(
         self,
@@ -1022,7 +1066,7 @@ class PipelineOrchestrator:
                 'Accept': 'application/vnd.github+json',
                 'X-GitHub-Api-Version': '2022-11-28'
             }
-            response = requests.get(pr_url, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.get, pr_url, headers=headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -1039,53 +1083,31 @@ class PipelineOrchestrator:
         mention_instructions: str,
         token: str,
     ) -> Dict[str, Any]:
-        """Clone the PR head branch, generate/apply a patch, commit, and push."""
+        """Check out the PR head branch, generate/apply a patch, commit, and push."""
         import subprocess
-        import tempfile
-        import shutil
-
-        workspace = tempfile.mkdtemp(prefix=f"pr-{pr_number}-")
-        logger.info(f"📁 PR workspace: {workspace}")
 
+        logger.info(f"📥 Checking out {head_repo_full_name}@{head_ref}")
         try:
-            clone_url = f"https://{token}@github.com/{head_repo_full_name}.git"
-            logger.info(f"📥 Cloning {head_repo_full_name}@{head_ref}")
-
-            # NOTE: Avoid shallow clones here. We need sufficient history to compute
-            # diffs against the base branch, otherwise changed-file detection can
-            # incorrectly return 0 and starve the LLM of context.
-            clone_res = subprocess.run(
-                ['git', 'clone', '--branch', head_ref, clone_url, workspace],
-                capture_output=True,
-                text=True,
+            # Full-history mirror: diffs against the base branch need the merge base,
+            # otherwise changed-file detection can return 0 and starve the LLM of context.
+            checkout = await asyncio.to_thread(self.repo_cache.checkout,
+                head_repo_full_name,
+                head_ref,
+                token=token,
+                start_point=f"origin/{head_ref}",
             )
-            if clone_res.returncode != 0:
-                logger.warning(f"⚠️  Branch clone failed, retrying full clone: {clone_res.stderr.strip()}")
-                clone_res = subprocess.run(
-                    ['git', 'clone', clone_url, workspace],
-                    capture_output=True,
-                    text=True,
-                )
-                if clone_res.returncode != 0:
-                    raise RuntimeError(f"Clone failed: {clone_res.stderr.strip()}")
-                co_res = subprocess.run(
-                    ['git', 'checkout', head_ref],
-                    capture_output=True,
-                    text=True,
-                    cwd=workspace,
-                )
-                if co_res.returncode != 0:
-                    raise RuntimeError(f"Checkout failed: {co_res.stderr.strip()}")
+        except RepoCacheError as e:
+            raise RuntimeError(f"Checkout failed: {e}")
+        workspace = str(checkout.path)
+        logger.info(f"📁 PR workspace: {workspace}")
 
+        try:
             # Configure git identity (required for commits)
-            subprocess.run(['git', 'config', 'user.email', 'agent-forge@example.com'], cwd=workspace, capture_output=True)
-            subprocess.run(['git', 'config', 'user.name', 'Agent-Forge'], cwd=workspace, capture_output=True)
-
-            # Fetch base ref for diff context
-            subprocess.run(['git', 'fetch', 'origin', base_ref], cwd=workspace, capture_output=True)
+            await asyncio.to_thread(subprocess.run, ['git', 'config', 'user.email', 'agent-forge@example.com'], cwd=workspace, capture_output=True)
+            await asyncio.to_thread(subprocess.run, ['git', 'config', 'user.name', 'Agent-Forge'], cwd=workspace, capture_output=True)
 
             # Build context: changed files vs base
-            name_only = subprocess.run(
+            name_only = await asyncio.to_thread(subprocess.run,
                 ['git', 'diff', '--name-only', f'origin/{base_ref}...HEAD'],
                 cwd=workspace,
                 capture_output=True,
@@ -1095,7 +1117,7 @@ class PipelineOrchestrator:
 
             # Fallback: if merge-base diff fails (e.g. odd histories), use last-commit files.
             if not changed_files:
-                show_only = subprocess.run(
+                show_only = await asyncio.to_thread(subprocess.run,
                     ['git', 'show', '--name-only', '--pretty=format:', 'HEAD'],
                     cwd=workspace,
                     capture_output=True,
@@ -1104,7 +1126,7 @@ class PipelineOrchestrator:
                 changed_files = [ln.strip() for ln in (show_only.stdout or '').splitlines() if ln.strip()]
             logger.info(f"📊 Changed files in PR: {len(changed_files)}")
 
-            diff_res = subprocess.run(
+            diff_res = await asyncio.to_thread(subprocess.run,
                 ['git', 'diff', f'origin/{base_ref}...HEAD'],
                 cwd=workspace,
                 capture_output=True,
@@ -1202,7 +1224,7 @@ class PipelineOrchestrator:
                 "Create the minimal set of file operations to implement the change request. "
                 "For any file you modify, include the COMPLETE updated file content."
             )
-            raw_ops = self.agent.query_llm(json_prompt, system_prompt=json_system, stream=False) or ''
+            raw_ops = await self._query_llm(json_prompt, system_prompt=json_system, cache=False)
             ops_text = _sanitize_json(raw_ops)
             try:
                 ops = json.loads(ops_text)
@@ -1230,7 +1252,7 @@ class PipelineOrchestrator:
                             except Exception:
                                 continue
                     # Check if changes were made
-                    status_check = subprocess.run(['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
+                    status_check = await asyncio.to_thread(subprocess.run, ['git', 'status', '--porcelain'], cwd=workspace, capture_output=True, text=True)
                     if (status_check.stdout or '').strip():
                         apply_ok = True
                         logger.info("✅ JSON file operations applied successfully")
@@ -1285,14 +1307,14 @@ class PipelineOrchestrator:
                 )
 
                 for attempt in range(3):  # 3 attempts for patch
-                    raw_patch = self.agent.query_llm(patch_prompt, system_prompt=patch_system, stream=False) or ''
+                    raw_patch = await self._query_llm(patch_prompt, system_prompt=patch_system, cache=False)
                     patch_text = _sanitize_patch(raw_patch)
                     if not patch_text or 'diff --git' not in patch_text:
                         last_error = "LLM did not return a valid unified diff patch"
                         logger.warning(f"⚠️ Patch attempt {attempt+1}/3: {last_error}")
                         continue
 
-                    apply_res = subprocess.run(
+                    apply_res = await asyncio.to_thread(subprocess.run,
                         ['git', 'apply', '--whitespace=nowarn', '-'],
                         cwd=workspace,
                         input=patch_text,
@@ -1317,7 +1339,7 @@ class PipelineOrchestrator:
             if not apply_ok:
                 return {'success': False, 'error': f"Both strategies failed. Last error: {last_error}"}
 
-            status_res = subprocess.run(
+            status_res = await asyncio.to_thread(subprocess.run,
                 ['git', 'status', '--porcelain'],
                 cwd=workspace,
                 capture_output=True,
@@ -1327,38 +1349,13 @@ class PipelineOrchestrator:
                 return {'success': False, 'error': 'Changes applied but produced no git diff'}
 
             if self.config.require_tests_passing:
-                try:
-                    # Install dependencies if requirements.txt exists
-                    req_file = Path(workspace) / 'requirements.txt'
-                    if req_file.exists():
-                        logger.info("📦 Installing dependencies from requirements.txt...")
-                        install_res = subprocess.run(
-                            [sys.executable, '-m', 'pip', 'install', '-q', '--break-system-packages', '-r', 'requirements.txt'],
-                            cwd=workspace,
-                            capture_output=True,
-                            text=True,
-                            timeout=300,
-                        )
-                        if install_res.returncode != 0:
-                            logger.warning(f"⚠️ pip install failed: {install_res.stderr}")
-                    test_res = subprocess.run(
-                        [sys.executable, '-m', 'pytest', '-q'],
-                        cwd=workspace,
-                        capture_output=True,
-                        text=True,
-                        timeout=600,
-                    )
-                    # pytest returns 5 when no tests are collected; treat as pass
-                    if test_res.returncode not in (0, 5):
-                        out = (test_res.stdout or '') + (test_res.stderr or '')
-                        out = out[-2000:]
-                        return {'success': False, 'error': f'Tests failed (pytest -q):\n{out}'}
-                except Exception as e:
-                    return {'success': False, 'error': f'Test run failed: {e}'}
-
-            subprocess.run(['git', 'add', '-A'], cwd=workspace, capture_output=True)
+                test_error = await asyncio.to_thread(self._run_workspace_tests, head_repo_full_name, workspace)
+                if test_error:
+                    return {'success': False, 'error': test_error}
+
+            await asyncio.to_thread(subprocess.run, ['git', 'add', '-A'], cwd=workspace, capture_output=True)
             commit_msg = f"chore: address PR change request (#{pr_number})"
-            commit_res = subprocess.run(
+            commit_res = await asyncio.to_thread(subprocess.run,
                 ['git', 'commit', '-m', commit_msg],
                 cwd=workspace,
                 capture_output=True,
@@ -1367,9 +1364,10 @@ class PipelineOrchestrator:
             if commit_res.returncode != 0:
                 raise RuntimeError(f"Git commit failed: {(commit_res.stderr or '').strip()}")
 
-            push_res = subprocess.run(
+            push_res = await asyncio.to_thread(subprocess.run,
                 ['git', 'push', 'origin', head_ref],
                 cwd=workspace,
+                env=checkout.env,
                 capture_output=True,
                 text=True,
             )
@@ -1382,10 +1380,9 @@ class PipelineOrchestrator:
             return {'success': False, 'error': 'Tests timed out'}
         finally:
             try:
-                shutil.rmtree(workspace)
-                logger.info(f"🧹 Cleaned up PR workspace: {workspace}")
+                await asyncio.to_thread(self.repo_cache.release, checkout)
             except Exception as cleanup_error:
-                logger.warning(f"⚠️  Failed to cleanup workspace: {cleanup_error}")
+                logger.warning(f"⚠️  Failed to release worktree: {cleanup_error}")
     
     async def _fetch_issue_details(self, repo: str, issue_number: int, token: str) -> Optional[Dict]:
         """Fetch issue details from GitHub API."""
@@ -1401,7 +1398,7 @@ class PipelineOrchestrator:
                 'X-GitHub-Api-Version': '2022-11-28'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await asyncio.to_thread(requests.get, url, headers=headers, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -1577,7 +1574,7 @@ class PipelineOrchestrator:
             # Run pytest on test files
             cmd = ['pytest'] + test_files + ['-v', '--tb=short']
             
-            result = subprocess.run(
+            result = await asyncio.to_thread(subprocess.run,
                 cmd,
                 capture_output=True,
                 text=True,
@@ -1643,8 +1640,6 @@ class PipelineOrchestrator:
         try:
             import requests
             import subprocess
-            import tempfile
-            import shutil
             
             owner, repo_name = repo.split('/')
             
@@ -1661,41 +1656,20 @@ class PipelineOrchestrator:
             
             logger.info(f"🌿 Creating branch: {branch_name}")
             
-            # Create temporary workspace for target repository
-            workspace = tempfile.mkdtemp(prefix=f"{repo_name}-")
+            # Check out a worktree from the cached mirror of the target repository
+            try:
+                checkout = await asyncio.to_thread(self.repo_cache.checkout, repo, branch_name, token=token)
+            except RepoCacheError as e:
+                logger.error(f"Failed to check out repository: {e}")
+                return {
+                    'success': False,
+                    'error': f'Checkout failed: {e}'
+                }
+            workspace = str(checkout.path)
+            base_ref = checkout.base_ref
             logger.info(f"📁 Workspace: {workspace}")
             
             try:
-                # Clone target repository with authentication
-                clone_url = f"https://{token}@github.com/{owner}/{repo_name}.git"
-                clone_result = subprocess.run(
-                    ['git', 'clone', '--depth=1', clone_url, workspace],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if clone_result.returncode != 0:
-                    logger.error(f"Failed to clone repository: {clone_result.stderr}")
-                    return {
-                        'success': False,
-                        'error': f'Clone failed: {clone_result.stderr}'
-                    }
-                
-                # Create and checkout new branch
-                result = subprocess.run(
-                    ['git', 'checkout', '-b', branch_name],
-                    capture_output=True,
-                    text=True,
-                    cwd=workspace
-                )
-                
-                if result.returncode != 0:
-                    logger.error(f"Failed to create branch: {result.stderr}")
-                    return {
-                        'success': False,
-                        'error': f'Branch creation failed: {result.stderr}'
-                    }
-                
                 # Write generated files
                 module_path = generation_result.get('module_path')
                 test_path = generation_result.get('test_path')
@@ -1715,7 +1689,7 @@ class PipelineOrchestrator:
                     logger.info(f"📝 Wrote {test_path}")
                 
                 # Git add
-                add_result = subprocess.run(
+                add_result = await asyncio.to_thread(subprocess.run,
                     ['git', 'add'] + files, 
                     capture_output=True, 
                     text=True,
@@ -1732,12 +1706,12 @@ class PipelineOrchestrator:
                 logger.info(f"✅ Added files to git: {', '.join(files)}")
                 
                 # Configure git user for this repo (required for commit)
-                subprocess.run(
+                await asyncio.to_thread(subprocess.run,
                     ['git', 'config', 'user.email', 'agent-forge@example.com'],
                     capture_output=True,
                     cwd=workspace
                 )
-                subprocess.run(
+                await asyncio.to_thread(subprocess.run,
                     ['git', 'config', 'user.name', 'Agent-Forge'],
                     capture_output=True,
                     cwd=workspace
@@ -1745,7 +1719,7 @@ class PipelineOrchestrator:
                 
                 # Git commit
                 commit_msg = f"fix: Resolve issue #{issue_number} - {issue_data.get('title', 'Unknown')}\n\nGenerated by Agent-Forge autonomous pipeline."
-                commit_result = subprocess.run(
+                commit_result = await asyncio.to_thread(subprocess.run,
                     ['git', 'commit', '-m', commit_msg],
                     capture_output=True,
                     text=True,
@@ -1762,11 +1736,12 @@ class PipelineOrchestrator:
                 logger.info(f"✅ Committed changes: {commit_msg.split(chr(10))[0]}")
                 
                 # Git push
-                result = subprocess.run(
+                result = await asyncio.to_thread(subprocess.run,
                     ['git', 'push', 'origin', branch_name],
                     capture_output=True,
                     text=True,
-                    cwd=workspace
+                    cwd=workspace,
+                    env=checkout.env
                 )
                 
                 if result.returncode != 0:
@@ -1779,12 +1754,11 @@ class PipelineOrchestrator:
                 logger.info(f"✅ Pushed branch: {branch_name}")
                 
             finally:
-                # Cleanup workspace
+                # Release worktree (also deletes the local branch)
                 try:
-                    shutil.rmtree(workspace)
-                    logger.info(f"🧹 Cleaned up workspace: {workspace}")
+                    await asyncio.to_thread(self.repo_cache.release, checkout)
                 except Exception as cleanup_error:
-                    logger.warning(f"⚠️  Failed to cleanup workspace: {cleanup_error}")
+                    logger.warning(f"⚠️  Failed to release worktree: {cleanup_error}")
             
             # Create PR via GitHub API
             pr_url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls"
@@ -1793,7 +1767,7 @@ class PipelineOrchestrator:
                 'title': f"Fix: {issue_data.get('title', 'Unknown')}",
                 'body': f"Resolves #{issue_number}\n\nAutomatically generated by Agent-Forge pipeline.\n\n**Generated Files:**\n" + '\n'.join([f"- `{f}`" for f in files]),
                 'head': branch_name,
-                'base': 'main'
+                'base': base_ref
             }
             
             headers = {
@@ -1802,7 +1776,7 @@ class PipelineOrchestrator:
                 'X-GitHub-Api-Version': '2022-11-28'
             }
             
-            response = requests.post(pr_url, json=pr_data, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.post, pr_url, json=pr_data, headers=headers, timeout=30)
             response.raise_for_status()
             
             pr_result = response.json()
@@ -1822,13 +1796,7 @@ class PipelineOrchestrator:
             logger.error(f"❌ Error creating PR: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            
-            # Try to cleanup branch
-            try:
-                subprocess.run(['git', 'checkout', 'main'], capture_output=True)
-                subprocess.run(['git', 'branch', '-D', branch_name], capture_output=True)
-            except:
-                pass
+
             
             return {
                 'success': False,
@@ -1852,13 +1820,13 @@ class PipelineOrchestrator:
                 'X-GitHub-Api-Version': '2022-11-28'
             }
             
-            response = requests.get(pr_url, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.get, pr_url, headers=headers, timeout=30)
             response.raise_for_status()
             pr_data = response.json()
             
             # Fetch PR files
             files_url = f"{pr_url}/files"
-            response = requests.get(files_url, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.get, files_url, headers=headers, timeout=30)
             response.raise_for_status()
             files = response.json()
             
@@ -1928,7 +1896,7 @@ class PipelineOrchestrator:
                 'merge_method': 'squash'  # Squash commits for clean history
             }
             
-            response = requests.put(merge_url, json=merge_data, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.put, merge_url, json=merge_data, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -2038,7 +2006,7 @@ class PipelineOrchestrator:
                 'X-GitHub-Api-Version': '2022-11-28'
             }
             
-            response = requests.post(comment_url, json={'body': comment_body}, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.post, comment_url, json={'body': comment_body}, headers=headers, timeout=30)
             response.raise_for_status()
             logger.debug(f"Posted comment to {repo}#{issue_number}")
         except Exception as e:
@@ -2091,7 +2059,7 @@ The fix has been merged and is now available in the main branch.
             }
             
             comment_data = {'body': summary}
-            response = requests.post(comment_url, json=comment_data, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.post, comment_url, json=comment_data, headers=headers, timeout=30)
             response.raise_for_status()
             
             logger.info(f"✅ Posted summary comment to issue #{issue_number}")
@@ -2103,7 +2071,7 @@ The fix has been merged and is now available in the main branch.
                 'state_reason': 'completed'
             }
             
-            response = requests.patch(issue_url, json=close_data, headers=headers, timeout=30)
+            response = await asyncio.to_thread(requests.patch, issue_url, json=close_data, headers=headers, timeout=30)
             response.raise_for_status()
             
             logger.info(f"✅ Closed issue #{issue_number}")
@@ -11,6 +11,7 @@ Prevents spam and abuse by:
 
 import time
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -70,6 +71,84 @@ class RateLimitConfig:
     max_burst_operations: int = 10  # Max 10 operations per minute
 
 
+class SlidingWindowCounter:
+    """
+    Bucketed ring counter for events in a trailing time window.
+    
+    The window is split into fixed buckets; a running total is kept and
+    expired buckets are subtracted as time advances, so add() and count()
+    are O(1) amortized regardless of how many events were recorded.
+    Counts are exact to bucket granularity (an event may stay counted for
+    up to one bucket longer than the window). add() and count() are
+    thread-safe.
+    """
+    
+    def __init__(self, window_seconds: float, bucket_seconds: float = 1.0):
+        """
+        Initialize counter.
+        
+        Args:
+            window_seconds: Length of the trailing window
+            bucket_seconds: Bucket resolution (window is rounded up to whole buckets)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, int(-(-window_seconds // bucket_seconds)))
+        self._buckets: List[int] = [0] * self.num_buckets
+        self._total = 0
+        self._head: Optional[int] = None  # Absolute index of newest bucket
+        self._lock = threading.Lock()
+    
+    def _advance(self, now: float):
+        """Expire buckets that fell out of the window."""
+        slot = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head = slot
+            return
+        if slot <= self._head:
+            # Same bucket (or clock went backwards): keep counting in the newest bucket
+            return
+        if slot - self._head >= self.num_buckets:
+            self._buckets = [0] * self.num_buckets
+            self._total = 0
+        else:
+            for expired in range(self._head + 1, slot + 1):
+                idx = expired % self.num_buckets
+                self._total -= self._buckets[idx]
+                self._buckets[idx] = 0
+        self._head = slot
+    
+    def add(self, now: float, count: int = 1):
+        """Record events at timestamp now."""
+        with self._lock:
+            self._advance(now)
+            self._buckets[self._head % self.num_buckets] += count
+            self._total += count
+    
+    def count(self, now: float) -> int:
+        """Number of events within the window ending at now."""
+        with self._lock:
+            self._advance(now)
+            return self._total
+
+
+class OperationCounters:
+    """Last-minute / last-hour / last-day counters for one operation stream."""
+    
+    def __init__(self):
+        self.minute = SlidingWindowCounter(60, bucket_seconds=1)
+        self.hour = SlidingWindowCounter(3600, bucket_seconds=60)
+        self.day = SlidingWindowCounter(86400, bucket_seconds=900)
+    
+    def add(self, now: float):
+        self.minute.add(now)
+        self.hour.add(now)
+        self.day.add(now)
+    
+    def counts(self, now: float) -> Tuple[int, int, int]:
+        """Return (last_minute, last_hour, last_day)."""
+        return self.minute.count(now), self.hour.count(now), self.day.count(now)
+
+
 @dataclass
 class OperationRecord:
     """Record of a single operation."""
@@ -90,6 +169,9 @@ class RateLimiter:
     - Duplicate operation detection
     - Burst protection
     - Cooldown enforcement
+    
+    Shared by the review executor threads, so every public method holds
+    an internal lock while it reads or updates the tracking state.
     """
     
     def __init__(self, config: Optional[RateLimitConfig] = None):
@@ -101,14 +183,19 @@ class RateLimiter:
         """
         self.config = config or RateLimitConfig()
         
-        # Operation history tracking
+        # Operation history (audit trail only; limit checks use the counters below)
         self.operations: deque = deque(maxlen=10000)  # Keep last 10k operations
         
-        # Per-type operation tracking
+        # Per-type operation history
         self.operations_by_type: Dict[OperationType, deque] = defaultdict(
             lambda: deque(maxlen=1000)
         )
         
+        # Sliding-window counters (O(1) checks and stats)
+        self.operation_counts = OperationCounters()
+        self.operation_counts_by_type: Dict[OperationType, OperationCounters] = defaultdict(OperationCounters)
+        self.burst_counter = SlidingWindowCounter(self.config.burst_window, bucket_seconds=1)
+        
         # Last operation timestamps (for cooldowns)
         self.last_operation_time: Dict[OperationType, float] = {}
         
@@ -119,6 +206,12 @@ class RateLimiter:
         self.api_calls_remaining: int = self.config.github_api_hourly_limit
         self.api_reset_time: Optional[float] = None
         
+        # Conditional request (ETag) cache counters
+        # hits: cached validator sent, misses: no cached entry, not_modified: 304 served from cache
+        self.conditional_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0, "not_modified": 0}
+        
+        self._lock = threading.RLock()
+        
         logger.info("🛡️ Rate limiter initialized with anti-spam protection")
     
     def check_rate_limit(
@@ -145,36 +238,37 @@ class RateLimiter:
             logger.debug(f"🔓 Rate limit bypassed for {operation_type.value} on {target}")
             return True, None
         
-        now = time.time()
-        
-        # 1. Check GitHub API limits
-        if self.api_calls_remaining < 100:
-            return False, f"GitHub API rate limit low ({self.api_calls_remaining} remaining)"
-        
-        # 2. Check cooldown period
-        if operation_type in self.last_operation_time:
-            cooldown = self._get_cooldown(operation_type)
-            time_since_last = now - self.last_operation_time[operation_type]
-            if time_since_last < cooldown:
-                wait_time = int(cooldown - time_since_last)
-                return False, f"Cooldown active. Wait {wait_time}s before next {operation_type.value}"
-        
-        # 3. Check operation-specific limits
-        allowed, reason = self._check_operation_limits(operation_type, now)
-        if not allowed:
-            return False, reason
-        
-        # 4. Check for duplicates
-        if content:
-            content_hash = self._hash_content(content)
-            if self._is_duplicate(content_hash, now):
-                return False, "Duplicate operation detected (same content within 1 hour)"
-        
-        # 5. Check burst protection
-        if self._is_burst_detected(now):
-            return False, "Burst detected. Too many operations in short time"
-        
-        return True, None
+        with self._lock:
+            now = time.time()
+            
+            # 1. Check GitHub API limits
+            if self.api_calls_remaining < 100:
+                return False, f"GitHub API rate limit low ({self.api_calls_remaining} remaining)"
+            
+            # 2. Check cooldown period
+            if operation_type in self.last_operation_time:
+                cooldown = self._get_cooldown(operation_type)
+                time_since_last = now - self.last_operation_time[operation_type]
+                if time_since_last < cooldown:
+                    wait_time = int(cooldown - time_since_last)
+                    return False, f"Cooldown active. Wait {wait_time}s before next {operation_type.value}"
+            
+            # 3. Check operation-specific limits
+            allowed, reason = self._check_operation_limits(operation_type, now)
+            if not allowed:
+                return False, reason
+            
+            # 4. Check for duplicates
+            if content:
+                content_hash = self._hash_content(content)
+                if self._is_duplicate(content_hash, now):
+                    return False, "Duplicate operation detected (same content within 1 hour)"
+            
+            # 5. Check burst protection
+            if self._is_burst_detected(now):
+                return False, "Burst detected. Too many operations in short time"
+            
+            return True, None
     
     def record_operation(
         self,
@@ -203,18 +297,24 @@ class RateLimiter:
             success=success
         )
         
-        # Add to global history
-        self.operations.append(record)
-        
-        # Add to type-specific history
-        self.operations_by_type[operation_type].append(record)
-        
-        # Update last operation time
-        self.last_operation_time[operation_type] = now
-        
-        # Track content hash
-        if content_hash:
-            self.content_hashes[content_hash].append(now)
+        with self._lock:
+            # Add to global history
+            self.operations.append(record)
+            
+            # Add to type-specific history
+            self.operations_by_type[operation_type].append(record)
+            
+            # Update window counters
+            self.operation_counts.add(now)
+            self.operation_counts_by_type[operation_type].add(now)
+            self.burst_counter.add(now)
+            
+            # Update last operation time
+            self.last_operation_time[operation_type] = now
+            
+            # Track content hash
+            if content_hash:
+                self.content_hashes[content_hash].append(now)
         
         logger.debug(f"📊 Recorded {operation_type.value} operation on {target}")
     
@@ -226,38 +326,55 @@ class RateLimiter:
             remaining: Remaining API calls
             reset_time: Unix timestamp when limit resets
         """
-        self.api_calls_remaining = remaining
-        self.api_reset_time = reset_time
+        with self._lock:
+            self.api_calls_remaining = remaining
+            self.api_reset_time = reset_time
         
         if remaining < 1000:
             logger.warning(f"⚠️ GitHub API rate limit low: {remaining} remaining")
     
+    def record_conditional_request(self, cache_hit: bool, not_modified: bool = False):
+        """
+        Record outcome of a conditional (ETag / Last-Modified) GET request.
+        
+        Args:
+            cache_hit: Whether a cached validator was sent with the request
+            not_modified: Whether GitHub answered 304 and the cached body was served
+        """
+        with self._lock:
+            if cache_hit:
+                self.conditional_cache_stats["hits"] += 1
+            else:
+                self.conditional_cache_stats["misses"] += 1
+            if not_modified:
+                self.conditional_cache_stats["not_modified"] += 1
+    
     def get_stats(self) -> Dict:
         """Get rate limiter statistics."""
         now = time.time()
         
-        # Count operations in time windows
-        last_minute = sum(1 for op in self.operations if now - op.timestamp < 60)
-        last_hour = sum(1 for op in self.operations if now - op.timestamp < 3600)
-        last_day = sum(1 for op in self.operations if now - op.timestamp < 86400)
-        
-        # Count by type (last hour)
-        by_type = {}
-        for op_type in OperationType:
-            count = sum(
-                1 for op in self.operations_by_type[op_type]
-                if now - op.timestamp < 3600
-            )
-            by_type[op_type.value] = count
-        
-        return {
-            "operations_last_minute": last_minute,
-            "operations_last_hour": last_hour,
-            "operations_last_day": last_day,
-            "by_type": by_type,
-            "github_api_remaining": self.api_calls_remaining,
-            "api_reset_time": datetime.fromtimestamp(self.api_reset_time).isoformat() if self.api_reset_time else None
-        }
+        with self._lock:
+            # Count operations in time windows
+            last_minute, last_hour, last_day = self.operation_counts.counts(now)
+            
+            # Count by type (last hour)
+            by_type = {
+                op_type.value: (
+                    self.operation_counts_by_type[op_type].hour.count(now)
+                    if op_type in self.operation_counts_by_type else 0
+                )
+                for op_type in OperationType
+            }
+            
+            return {
+                "operations_last_minute": last_minute,
+                "operations_last_hour": last_hour,
+                "operations_last_day": last_day,
+                "by_type": by_type,
+                "github_api_remaining": self.api_calls_remaining,
+                "api_reset_time": datetime.fromtimestamp(self.api_reset_time).isoformat() if self.api_reset_time else None,
+                "conditional_cache": dict(self.conditional_cache_stats)
+            }
     
     def _get_cooldown(self, operation_type: OperationType) -> int:
         """Get cooldown period for operation type."""
@@ -277,12 +394,8 @@ class RateLimiter:
         now: float
     ) -> Tuple[bool, Optional[str]]:
         """Check operation-specific limits."""
-        ops = self.operations_by_type[operation_type]
-        
         # Count in different time windows
-        last_minute = sum(1 for op in ops if now - op.timestamp < 60)
-        last_hour = sum(1 for op in ops if now - op.timestamp < 3600)
-        last_day = sum(1 for op in ops if now - op.timestamp < 86400)
+        last_minute, last_hour, last_day = self.operation_counts_by_type[operation_type].counts(now)
         
         # Check limits based on operation type
         if operation_type in (OperationType.ISSUE_COMMENT, OperationType.PR_COMMENT):
@@ -324,11 +437,7 @@ class RateLimiter:
     
     def _is_burst_detected(self, now: float) -> bool:
         """Check if burst activity is detected."""
-        recent_ops = sum(
-            1 for op in self.operations
-            if now - op.timestamp < self.config.burst_window
-        )
-        return recent_ops >= self.config.max_burst_operations
+        return self.burst_counter.count(now) >= self.config.max_burst_operations
     
     @staticmethod
     def _hash_content(content: str) -> str:
@@ -347,13 +456,14 @@ class RateLimiter:
         cutoff = now - (max_age_hours * 3600)
         
         # Clean content hashes
-        for content_hash in list(self.content_hashes.keys()):
-            self.content_hashes[content_hash] = [
-                ts for ts in self.content_hashes[content_hash]
-                if ts > cutoff
-            ]
-            if not self.content_hashes[content_hash]:
-                del self.content_hashes[content_hash]
+        with self._lock:
+            for content_hash in list(self.content_hashes.keys()):
+                self.content_hashes[content_hash] = [
+                    ts for ts in self.content_hashes[content_hash]
+                    if ts > cutoff
+                ]
+                if not self.content_hashes[content_hash]:
+                    del self.content_hashes[content_hash]
         
         logger.debug(f"🧹 Cleaned up operation records older than {max_age_hours}h")
 
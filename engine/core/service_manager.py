@@ -196,7 +196,11 @@ class ServiceManager:
                 watch_labels=polling_config_data.get('watch_labels', ["agent-ready", "auto-assign"]),
                 max_concurrent_issues=polling_config_data.get('max_concurrent_issues', 3),
                 claim_timeout_minutes=polling_config_data.get('claim_timeout_minutes', 60),
-                state_file=state_file
+                state_file=state_file,
+                webhooks_enabled=bool((polling_config_data.get('webhooks') or {}).get('enabled', False)),
+                webhook_reconcile_interval_seconds=int(
+                    (polling_config_data.get('webhooks') or {}).get('reconcile_interval_seconds', 1800)
+                )
             )
             
             # Create service with monitoring enabled
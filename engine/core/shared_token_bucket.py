@@ -0,0 +1,327 @@
+"""
+Host-wide token-bucket limiter for the GitHub API budget
+
+RateLimiter (get_rate_limiter()) is per-process, so the polling service,
+agent runtime, BotAgent and the scripts/launch_* entry points each had their
+own view of the remaining budget and together overshot GitHub's 5000/h limit.
+
+SharedTokenBucket keeps one bucket per GitHub account in a small SQLite
+database (WAL mode) that every Agent-Forge process on the host consults:
+- Capacity and refill rate come from the account's hourly budget
+  (AccountManager, `hourly_api_budget` in github_accounts.yaml)
+- Tokens are taken atomically (BEGIN IMMEDIATE), so concurrent processes
+  never double-spend
+- X-RateLimit-Remaining / X-RateLimit-Reset headers seen by any process
+  clamp the shared bucket, so GitHub's own accounting wins when it is lower
+- Callers can await (or block) until a token is available instead of
+  getting a hard refusal
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Resolved against the project root so every process shares one file regardless of its cwd
+DEFAULT_BUCKET_PATH = str(Path(__file__).resolve().parent.parent.parent / "data" / "github_token_buckets.db")
+DEFAULT_HOURLY_BUDGET = 4500  # Matches RateLimitConfig.github_api_safety_threshold
+
+
+class SharedTokenBucket:
+    """Token buckets per GitHub account, shared across processes via SQLite."""
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_BUCKET_PATH,
+        default_budget: int = DEFAULT_HOURLY_BUDGET,
+        reserve: int = 100,
+        max_sleep: float = 5.0
+    ):
+        """
+        Initialize shared token bucket.
+
+        The database file is created lazily on first use.
+
+        Args:
+            db_path: Path to SQLite database file (same path = same budget)
+            default_budget: Hourly budget for accounts without a configured one
+            reserve: Tokens left untouched according to GitHub's own remaining count
+            max_sleep: Longest single sleep while waiting (re-checks shared state after)
+        """
+        self.db_path = Path(db_path)
+        self.default_budget = default_budget
+        self.reserve = reserve
+        self.max_sleep = max_sleep
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        if not self._schema_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; transactions are managed explicitly
+        conn = sqlite3.connect(str(self.db_path), timeout=10, isolation_level=None)
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS buckets (
+                    account TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    capacity REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    blocked_until REAL NOT NULL DEFAULT 0
+                )"""
+            )
+            self._schema_ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _load(self, conn: sqlite3.Connection, account: str, budget: int, now: float) -> Tuple[float, float]:
+        """Return (tokens, blocked_until) refilled up to now; caller holds the write lock."""
+        row = conn.execute(
+            "SELECT tokens, capacity, updated_at, blocked_until FROM buckets WHERE account = ?",
+            (account,)
+        ).fetchone()
+        if row is None:
+            return float(budget), 0.0
+
+        tokens, _, updated_at, blocked_until = row
+        elapsed = max(0.0, now - updated_at)
+        tokens = min(float(budget), tokens + elapsed * budget / 3600.0)
+        return tokens, blocked_until
+
+    def _save(self, conn: sqlite3.Connection, account: str, tokens: float, budget: int, now: float, blocked_until: float):
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (account, tokens, capacity, updated_at, blocked_until) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (account, tokens, float(budget), now, blocked_until)
+        )
+
+    def try_acquire(self, account: str, budget: Optional[int] = None, tokens: int = 1) -> Tuple[bool, float]:
+        """
+        Take tokens if available.
+
+        Args:
+            account: Bucket key (GitHub username or token hash)
+            budget: Hourly budget (capacity and refill per hour)
+            tokens: Tokens to take
+
+        Returns:
+            Tuple of (acquired, seconds until enough tokens are expected)
+        """
+        budget = budget or self.default_budget
+        now = time.time()
+
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                available, blocked_until = self._load(conn, account, budget, now)
+
+                if blocked_until > now:
+                    conn.execute("ROLLBACK")
+                    return False, blocked_until - now
+
+                if available >= tokens:
+                    self._save(conn, account, available - tokens, budget, now, 0.0)
+                    conn.execute("COMMIT")
+                    return True, 0.0
+
+                conn.execute("ROLLBACK")
+                return False, (tokens - available) * 3600.0 / budget
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Never take the API down because the shared store is unavailable
+            logger.warning(f"⚠️ Shared token bucket unavailable, allowing request: {e}")
+            return True, 0.0
+
+    async def acquire(
+        self,
+        account: str,
+        budget: Optional[int] = None,
+        tokens: int = 1,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait until tokens are available and take them.
+
+        Args:
+            account: Bucket key
+            budget: Hourly budget
+            tokens: Tokens to take
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # SQLite may wait on another process's lock: keep it off the event loop
+            acquired, wait = await asyncio.to_thread(self.try_acquire, account, budget, tokens)
+            if acquired:
+                return True
+            sleep_for = self._next_sleep(account, wait, deadline)
+            if sleep_for is None:
+                return False
+            await asyncio.sleep(sleep_for)
+
+    def acquire_blocking(
+        self,
+        account: str,
+        budget: Optional[int] = None,
+        tokens: int = 1,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """Synchronous variant of acquire() for blocking callers."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            acquired, wait = self.try_acquire(account, budget, tokens)
+            if acquired:
+                return True
+            sleep_for = self._next_sleep(account, wait, deadline)
+            if sleep_for is None:
+                return False
+            time.sleep(sleep_for)
+
+    def _next_sleep(self, account: str, wait: float, deadline: Optional[float]) -> Optional[float]:
+        """Compute next sleep while waiting, or None when the deadline has passed."""
+        sleep_for = min(wait, self.max_sleep)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"⏳ GitHub API budget for {account} exhausted, gave up waiting")
+                return None
+            sleep_for = min(sleep_for, remaining)
+        logger.debug(f"⏳ Waiting {sleep_for:.1f}s for GitHub API token ({account})")
+        return max(sleep_for, 0.01)
+
+    def refund(self, account: str, budget: Optional[int] = None, tokens: int = 1):
+        """
+        Return tokens for requests GitHub did not charge (e.g. 304 Not Modified).
+
+        Args:
+            account: Bucket key
+            budget: Hourly budget
+            tokens: Tokens to return
+        """
+        budget = budget or self.default_budget
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                available, blocked_until = self._load(conn, account, budget, now)
+                self._save(conn, account, min(float(budget), available + tokens), budget, now, blocked_until)
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared token bucket refund failed: {e}")
+
+    def observe(self, account: str, remaining: int, reset_time: int, budget: Optional[int] = None):
+        """
+        Reconcile the shared bucket with GitHub's rate limit headers.
+
+        Lowers the bucket to GitHub's remaining count (minus the reserve); when
+        GitHub reports the reserve reached, all processes wait for reset_time.
+
+        Args:
+            account: Bucket key
+            remaining: X-RateLimit-Remaining
+            reset_time: X-RateLimit-Reset (Unix timestamp)
+            budget: Hourly budget
+        """
+        budget = budget or self.default_budget
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                available, blocked_until = self._load(conn, account, budget, now)
+                usable = max(0, remaining - self.reserve)
+                if usable < available:
+                    available = float(usable)
+                if usable == 0 and reset_time > now:
+                    blocked_until = max(blocked_until, float(reset_time))
+                    logger.warning(
+                        f"⚠️ GitHub API budget for {account} exhausted "
+                        f"({remaining} remaining), all processes pause until reset"
+                    )
+                self._save(conn, account, available, budget, now, blocked_until)
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared token bucket update failed: {e}")
+
+    def available(self, account: str, budget: Optional[int] = None) -> float:
+        """Current tokens for an account (for stats and monitoring)."""
+        budget = budget or self.default_budget
+        try:
+            conn = self._connect()
+            try:
+                tokens, _ = self._load(conn, account, budget, time.time())
+                return tokens
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return float(budget)
+
+
+def resolve_bucket_account(token: Optional[str]) -> Tuple[str, int]:
+    """
+    Map a GitHub token to its bucket key and hourly budget.
+
+    Tokens belonging to an AccountManager account share that account's bucket
+    and configured budget; unknown tokens are keyed by a hash of the token.
+
+    Args:
+        token: GitHub token
+
+    Returns:
+        Tuple of (bucket key, hourly budget)
+    """
+    from engine.core.account_manager import get_account_manager
+
+    try:
+        account = get_account_manager().get_account_by_token(token) if token else None
+    except Exception as e:
+        logger.debug(f"Account lookup for token bucket failed: {e}")
+        account = None
+
+    if account is not None:
+        return account.username, account.hourly_api_budget or DEFAULT_HOURLY_BUDGET
+
+    token_hash = hashlib.sha256((token or "").encode()).hexdigest()[:16]
+    return f"token:{token_hash}", DEFAULT_HOURLY_BUDGET
+
+
+# Global shared bucket instance
+_global_token_bucket: Optional[SharedTokenBucket] = None
+
+
+def get_shared_token_bucket() -> SharedTokenBucket:
+    """
+    Get or create global shared token bucket.
+
+    The location can be overridden with GITHUB_TOKEN_BUCKET_PATH.
+    """
+    global _global_token_bucket
+    if _global_token_bucket is None:
+        _global_token_bucket = SharedTokenBucket(
+            db_path=os.getenv("GITHUB_TOKEN_BUCKET_PATH", DEFAULT_BUCKET_PATH)
+        )
+    return _global_token_bucket
+
+
+def reset_shared_token_bucket():
+    """Reset global shared token bucket (for testing)."""
+    global _global_token_bucket
+    _global_token_bucket = None
@@ -0,0 +1,411 @@
+"""Async GitHub REST API helper for agent-forge services.
+
+asyncio-native counterpart of GitHubAPIHelper. All requests share one pooled
+httpx.AsyncClient, so concurrent calls reuse keep-alive connections instead of
+forking a gh CLI process (or opening a new TLS session) per request. Returns
+the same gh CLI-style dictionaries as the synchronous helper.
+
+Includes the same anti-spam protection, rate limiting and ETag conditional
+request cache (shared with the synchronous helper). REST calls wait (up to
+max_token_wait) for a token from the host-wide SharedTokenBucket instead of
+failing as soon as the account's hourly budget is spent. Both stores are
+SQLite files, so their reads and writes run in worker threads.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from engine.core.rate_limiter import get_rate_limiter, OperationType
+from engine.core.shared_token_bucket import SharedTokenBucket, get_shared_token_bucket, resolve_bucket_account
+from engine.operations.github_api_helper import format_issue, format_comment
+from engine.operations.github_response_cache import ConditionalRequestCache, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGitHubAPIHelper:
+    """Async helper class for GitHub REST API interactions with rate limiting."""
+
+    BASE_URL = "https://api.github.com"
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        response_cache: Optional[ConditionalRequestCache] = None,
+        token_bucket: Optional[SharedTokenBucket] = None,
+        max_token_wait: float = 60.0
+    ):
+        """Initialize async GitHub API helper.
+
+        Args:
+            token: GitHub personal access token (reads from env if not provided)
+            max_connections: Size of the keep-alive connection pool
+            timeout: Per-request timeout in seconds
+            response_cache: Conditional request cache (uses shared global cache if None)
+            token_bucket: Host-wide API budget (uses shared global bucket if None)
+            max_token_wait: Seconds to wait for an API token before refusing
+        """
+        self.token = token or os.getenv("BOT_GITHUB_TOKEN") or os.getenv("GITHUB_TOKEN")
+        if not self.token:
+            raise ValueError("GitHub token not provided and not found in environment")
+
+        self.headers = {
+            'Authorization': f'Bearer {self.token}',
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28'
+        }
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+
+        # Client is created lazily because it binds to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Get rate limiter instance
+        self.rate_limiter = get_rate_limiter()
+
+        # ETag / Last-Modified cache shared with GitHubAPIHelper
+        self.response_cache = response_cache or get_response_cache()
+
+        # Hourly API budget shared by all processes using this account
+        self.token_bucket = token_bucket or get_shared_token_bucket()
+        self.bucket_account, self.bucket_budget = resolve_bucket_account(self.token)
+        self.max_token_wait = max_token_wait
+
+        logger.info("🔒 Async GitHub API helper initialized with rate limiting")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client for the current event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            try:
+                await self._client.aclose()
+            except RuntimeError:
+                # Owning event loop already closed; connections are gone with it
+                pass
+        self._client = None
+        self._client_loop = None
+
+    async def __aenter__(self) -> "AsyncGitHubAPIHelper":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _update_rate_limit_from_response(self, response: httpx.Response):
+        """Update rate limiter and shared budget from GitHub API response headers."""
+        remaining = int(response.headers.get('X-RateLimit-Remaining', 5000))
+        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+
+        if reset_time:
+            self.rate_limiter.update_github_rate_limit(remaining, reset_time)
+            await asyncio.to_thread(
+                self.token_bucket.observe, self.bucket_account, remaining, reset_time, self.bucket_budget
+            )
+
+    async def _acquire_api_token(self):
+        """Wait (up to max_token_wait) for a token from the shared hourly API budget.
+
+        Raises:
+            RuntimeError: If no token became available in time
+        """
+        if not await self.token_bucket.acquire(self.bucket_account, self.bucket_budget, timeout=self.max_token_wait):
+            logger.warning(f"🛡️ GitHub API budget for {self.bucket_account} exhausted")
+            raise RuntimeError(f"GitHub API budget for {self.bucket_account} exhausted")
+
+    def _check_rate_limit(
+        self,
+        operation_type: OperationType,
+        target: str,
+        content: Optional[str] = None,
+        bypass: bool = False
+    ) -> bool:
+        """Check if operation is allowed by rate limiter.
+
+        Args:
+            operation_type: Type of operation
+            target: Target (repo, issue, etc.)
+            content: Optional content for duplicate detection
+            bypass: If True, bypass rate limits (for internal operations)
+        """
+        allowed, reason = self.rate_limiter.check_rate_limit(
+            operation_type, target, content, bypass=bypass
+        )
+
+        if not allowed:
+            logger.warning(f"🛡️ Rate limit blocked: {reason}")
+            return False
+
+        return True
+
+    def _record_operation(self, operation_type: OperationType, target: str, content: Optional[str] = None, success: bool = True):
+        """Record operation in rate limiter."""
+        self.rate_limiter.record_operation(operation_type, target, content, success)
+
+    async def _conditional_get(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET a JSON resource using the conditional request cache.
+
+        Args:
+            path: API path relative to BASE_URL
+            params: Query parameters
+
+        Returns:
+            Decoded JSON body (cached body on 304 Not Modified)
+
+        Raises:
+            httpx.HTTPError: On HTTP errors
+            RuntimeError: If the API budget stays exhausted for max_token_wait
+        """
+        key = self.response_cache.make_key(f"{self.BASE_URL}{path}", params, self.token)
+        cached = await asyncio.to_thread(self.response_cache.get, key)
+
+        await self._acquire_api_token()
+        response = await self._get_client().get(
+            path,
+            params=params,
+            headers=self.response_cache.conditional_headers(cached)
+        )
+        await self._update_rate_limit_from_response(response)
+
+        if response.status_code == 304 and cached is not None:
+            # GitHub does not charge 304s against the rate limit
+            await asyncio.to_thread(self.token_bucket.refund, self.bucket_account, self.bucket_budget)
+            self.rate_limiter.record_conditional_request(cache_hit=True, not_modified=True)
+            logger.debug(f"♻️ 304 Not Modified, serving cached body for {path}")
+            return cached.body
+
+        response.raise_for_status()
+        self.rate_limiter.record_conditional_request(cache_hit=cached is not None)
+
+        body = response.json()
+        await asyncio.to_thread(self.response_cache.store, key, response.headers, body)
+        return body
+
+    async def graphql(self, query: str, variables: Optional[Dict] = None, target: str = "graphql") -> Dict:
+        """Execute a GitHub GraphQL query.
+
+        GraphQL has its own point-based budget, so the REST rate limit
+        counters are not updated from these responses.
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+            target: Target recorded in the rate limiter (e.g. owner/repo)
+
+        Returns:
+            The ``data`` object of the response
+
+        Raises:
+            httpx.HTTPError: On HTTP errors
+            RuntimeError: If the response contains GraphQL errors
+        """
+        try:
+            response = await self._get_client().post(
+                "/graphql",
+                json={'query': query, 'variables': variables or {}}
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self._record_operation(OperationType.API_READ, target, success=False)
+            logger.error(f"GraphQL request failed for {target}: {e}")
+            raise
+
+        payload = response.json()
+        if payload.get('errors'):
+            self._record_operation(OperationType.API_READ, target, success=False)
+            messages = '; '.join(err.get('message', str(err)) for err in payload['errors'])
+            raise RuntimeError(f"GraphQL errors for {target}: {messages}")
+
+        self._record_operation(OperationType.API_READ, target, success=True)
+        return payload.get('data') or {}
+
+    async def list_issues(
+        self,
+        owner: str,
+        repo: str,
+        assignee: Optional[str] = None,
+        state: str = "open",
+        labels: Optional[List[str]] = None,
+        per_page: int = 100,
+        bypass_rate_limit: bool = False
+    ) -> List[Dict]:
+        """List issues in a repository.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            assignee: Filter by assignee username
+            state: Issue state (open, closed, all)
+            labels: Filter by label names
+            per_page: Results per page (max 100)
+            bypass_rate_limit: Bypass rate limits (for internal polling)
+
+        Returns:
+            List of issue dictionaries (pull requests excluded)
+        """
+        target = f"{owner}/{repo}"
+
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=bypass_rate_limit):
+            logger.warning(f"⚠️ Rate limit prevents listing issues for {target}")
+            return []
+
+        params = {
+            'state': state,
+            'per_page': min(per_page, 100)
+        }
+
+        if assignee:
+            params['assignee'] = assignee
+
+        if labels:
+            params['labels'] = ','.join(labels)
+
+        try:
+            issues = await self._conditional_get(f"/repos/{owner}/{repo}/issues", params=params)
+            self._record_operation(OperationType.API_READ, target, success=True)
+
+            # Skip pull requests (they appear in issues endpoint)
+            return [
+                format_issue(issue)
+                for issue in issues
+                if 'pull_request' not in issue
+            ]
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to list issues for {owner}/{repo}: {e}")
+            raise
+
+    async def get_issue_comments(
+        self,
+        owner: str,
+        repo: str,
+        issue_number: int
+    ) -> List[Dict]:
+        """Get comments for an issue.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            issue_number: Issue number
+
+        Returns:
+            List of comment dictionaries
+        """
+        try:
+            comments = await self._conditional_get(
+                f"/repos/{owner}/{repo}/issues/{issue_number}/comments"
+            )
+            return [format_comment(comment) for comment in comments]
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get comments for {owner}/{repo}#{issue_number}: {e}")
+            raise
+
+    async def create_issue_comment(
+        self,
+        owner: str,
+        repo: str,
+        issue_number: int,
+        body: str
+    ) -> Dict:
+        """Create a comment on an issue.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            issue_number: Issue number
+            body: Comment text
+
+        Returns:
+            Created comment dictionary
+
+        Raises:
+            RuntimeError: If rate limit or an exhausted API budget blocks the operation
+        """
+        target = f"{owner}/{repo}#{issue_number}"
+
+        # Check rate limit BEFORE making API call
+        if not self._check_rate_limit(OperationType.ISSUE_COMMENT, target, body):
+            raise RuntimeError(f"Rate limit prevents comment on {target}")
+
+        try:
+            await self._acquire_api_token()
+            response = await self._get_client().post(
+                f"/repos/{owner}/{repo}/issues/{issue_number}/comments",
+                json={'body': body}
+            )
+            response.raise_for_status()
+
+            await self._update_rate_limit_from_response(response)
+            self._record_operation(OperationType.ISSUE_COMMENT, target, body, success=True)
+
+            logger.info(f"✅ Comment added to {target}")
+            return response.json()
+
+        except httpx.HTTPError as e:
+            self._record_operation(OperationType.ISSUE_COMMENT, target, body, success=False)
+
+            logger.error(f"Failed to comment on {owner}/{repo}#{issue_number}: {e}")
+            raise
+
+    async def list_pull_requests(
+        self,
+        owner: str,
+        repo: str,
+        state: str = 'open',
+        bypass_rate_limit: bool = False
+    ) -> List[Dict]:
+        """List pull requests in a repository.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            state: PR state filter ('open', 'closed', 'all')
+            bypass_rate_limit: Bypass rate limits (for internal polling)
+
+        Returns:
+            List of PR dictionaries
+        """
+        target = f"{owner}/{repo}"
+
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=bypass_rate_limit):
+            raise RuntimeError(f"Rate limit exceeded for {target}")
+
+        try:
+            prs = await self._conditional_get(
+                f"/repos/{owner}/{repo}/pulls",
+                params={'state': state, 'per_page': 100}
+            )
+
+            self._record_operation(OperationType.API_READ, target,
+                                 f"Listed {state} PRs", success=True)
+
+            logger.debug(f"🔍 Retrieved {len(prs)} {state} PRs from {target}")
+            return prs
+
+        except httpx.HTTPError as e:
+            self._record_operation(OperationType.API_READ, target,
+                                 f"Failed to list PRs", success=False)
+            logger.error(f"Failed to list PRs in {target}: {e}")
+            raise
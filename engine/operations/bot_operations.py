@@ -24,6 +24,26 @@ from typing import Optional, List, Dict, Any
 from engine.core.account_manager import get_bot_account, get_account_manager
 
 
+def extract_critical_issues(comments: List[Dict[str, Any]]) -> List[str]:
+    """Extract critical issue lines from PR review comments.
+    
+    Args:
+        comments: Comment dicts with a 'body' field
+        
+    Returns:
+        Lines flagged with ❌ or CRITICAL
+    """
+    critical_issues = []
+    for comment in comments:
+        body = comment.get('body', '') or ''
+        if 'CRITICAL' in body or '❌' in body:
+            # Parse issue lines
+            for line in body.split('\n'):
+                if '❌' in line or 'CRITICAL' in line:
+                    critical_issues.append(line.strip())
+    return critical_issues
+
+
 class BotOperations:
     """Handle GitHub administrative operations via bot account."""
     
@@ -399,14 +419,7 @@ class BotOperations:
             comments = comments_response.json() if comments_response.ok else []
             
             # Extract critical issues from comments
-            critical_issues = []
-            for comment in comments:
-                body = comment.get('body', '')
-                if 'CRITICAL' in body or '❌' in body:
-                    # Parse issue lines
-                    for line in body.split('\n'):
-                        if '❌' in line or 'CRITICAL' in line:
-                            critical_issues.append(line.strip())
+            critical_issues = extract_critical_issues(comments)
             
             pr_data['latest_review_state'] = latest_review
             pr_data['critical_issues'] = critical_issues
@@ -7,10 +7,10 @@ Critical for understanding existing implementations before making changes.
 Author: Agent Forge
 """
 
-import subprocess
 from pathlib import Path
 from typing import Optional, List, Dict, Tuple
-import re
+
+from engine.operations.trigram_index import TrigramIndex, get_trigram_index
 
 
 class CodebaseSearch:
@@ -18,7 +18,8 @@ class CodebaseSearch:
     Search codebase for patterns and semantic matches.
     
     Features:
-    - grep-based pattern matching (fast, exact)
+    - Trigram-indexed pattern matching (fast, exact, no subprocesses)
+    - .gitignore-aware file enumeration
     - File type filtering
     - Context lines (before/after matches)
     - Result ranking and limiting
@@ -32,6 +33,14 @@ class CodebaseSearch:
             project_root: Root directory for search operations
         """
         self.project_root = Path(project_root).resolve()
+        self._index: Optional[TrigramIndex] = None
+    
+    @property
+    def index(self) -> TrigramIndex:
+        """Trigram index of the project, shared by all searches on the same root."""
+        if self._index is None:
+            self._index = get_trigram_index(str(self.project_root))
+        return self._index
     
     def grep_search(
         self,
@@ -43,14 +52,17 @@ class CodebaseSearch:
         max_results: int = 50
     ) -> List[Dict]:
         """
-        Search codebase using grep (fast pattern matching).
+        Search codebase for a pattern (fast, in-process).
         
-        Similar to GitHub Copilot's grep_search tool.
+        Similar to GitHub Copilot's grep_search tool. Uses the shared trigram
+        index of the project (see trigram_index.py): only files containing the
+        pattern's literals are read, files ignored by .gitignore are skipped and
+        the index is refreshed incrementally from file mtimes.
         
         Args:
             pattern: Pattern to search for
             file_pattern: Glob pattern for files (e.g., "*.py", "src/**/*.js")
-            regex: If True, treat pattern as regex
+            regex: If True, treat pattern as regex (Python syntax)
             ignore_case: If True, case-insensitive search
             context_lines: Number of lines before/after match to include
             max_results: Maximum number of results to return
@@ -58,182 +70,23 @@ class CodebaseSearch:
         Returns:
             List of dicts with: file, line_num, line_content, context_before, context_after
         """
-        results = []
-        
         try:
-            # Build grep command
-            cmd = ['grep', '-rn']  # Recursive, line numbers
-            
-            if regex:
-                cmd.append('-E')  # Extended regex
-            else:
-                cmd.append('-F')  # Fixed string (faster)
-            
-            if ignore_case:
-                cmd.append('-i')
-            
-            if context_lines > 0:
-                cmd.extend(['-C', str(context_lines)])  # Context lines
-            
-            # Add pattern
-            cmd.append(pattern)
-            
-            # Add path
-            if file_pattern:
-                # Use find to filter by pattern first
-                find_cmd = ['find', str(self.project_root), '-type', 'f', '-name', file_pattern]
-                find_result = subprocess.run(
-                    find_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if find_result.returncode == 0:
-                    files = find_result.stdout.strip().split('\n')
-                    # Search each file
-                    for file_path in files[:max_results]:
-                        if file_path and Path(file_path).exists():
-                            file_results = self._grep_file(
-                                file_path,
-                                pattern,
-                                regex,
-                                ignore_case,
-                                context_lines
-                            )
-                            results.extend(file_results)
-                            if len(results) >= max_results:
-                                break
-            else:
-                # Search all files
-                cmd.append(str(self.project_root))
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if result.returncode == 0 or result.returncode == 1:  # 1 = no matches
-                    results = self._parse_grep_output(result.stdout, context_lines)
-            
-            # Limit results
-            results = results[:max_results]
+            results = self.index.search(
+                pattern,
+                regex=regex,
+                ignore_case=ignore_case,
+                context_lines=context_lines,
+                max_results=max_results,
+                file_pattern=file_pattern
+            )
             
             print(f"🔍 Found {len(results)} match(es) for '{pattern}'")
             return results
             
-        except subprocess.TimeoutExpired:
-            print(f"⏱️  Search timed out for pattern: {pattern}")
-            return []
         except Exception as e:
             print(f"❌ Search error: {e}")
             return []
     
-    def _grep_file(
-        self,
-        file_path: str,
-        pattern: str,
-        regex: bool,
-        ignore_case: bool,
-        context_lines: int
-    ) -> List[Dict]:
-        """Grep a single file and return results."""
-        results = []
-        
-        try:
-            cmd = ['grep', '-n']
-            
-            if regex:
-                cmd.append('-E')
-            else:
-                cmd.append('-F')
-            
-            if ignore_case:
-                cmd.append('-i')
-            
-            if context_lines > 0:
-                cmd.extend(['-C', str(context_lines)])
-            
-            cmd.extend([pattern, file_path])
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                results = self._parse_grep_output(result.stdout, context_lines)
-            
-        except:
-            pass
-        
-        return results
-    
-    def _parse_grep_output(self, output: str, context_lines: int) -> List[Dict]:
-        """Parse grep output into structured results."""
-        results = []
-        lines = output.split('\n')
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Parse grep line: filename:line_num:content or filename:line_num-content (context)
-            match = re.match(r'^([^:]+):(\d+)[:-](.*)$', line)
-            if match:
-                file_path = match.group(1)
-                line_num = int(match.group(2))
-                content = match.group(3)
-                
-                # Make path relative to project root
-                try:
-                    rel_path = Path(file_path).relative_to(self.project_root)
-                except:
-                    rel_path = Path(file_path)
-                
-                # Collect context lines
-                context_before = []
-                context_after = []
-                
-                # Look back for context
-                j = i - 1
-                while j >= 0 and len(context_before) < context_lines:
-                    prev_line = lines[j].strip()
-                    if prev_line and prev_line.startswith(file_path):
-                        context_match = re.match(r'^[^:]+:\d+[:-](.*)$', prev_line)
-                        if context_match:
-                            context_before.insert(0, context_match.group(1))
-                    j -= 1
-                
-                # Look forward for context
-                j = i + 1
-                while j < len(lines) and len(context_after) < context_lines:
-                    next_line = lines[j].strip()
-                    if next_line and next_line.startswith(file_path):
-                        context_match = re.match(r'^[^:]+:\d+[:-](.*)$', next_line)
-                        if context_match:
-                            context_after.append(context_match.group(1))
-                    j += 1
-                
-                results.append({
-                    'file': str(rel_path),
-                    'line_num': line_num,
-                    'line_content': content,
-                    'context_before': context_before,
-                    'context_after': context_after
-                })
-            
-            i += 1
-        
-        return results
-    
     def find_function(self, function_name: str, language: str = 'python') -> List[Dict]:
         """
         Find function definitions across codebase.
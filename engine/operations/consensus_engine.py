@@ -19,11 +19,11 @@ Usage:
 
 import os
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
-import difflib
 
+from engine.operations.fix_similarity import FixSimilarity
 from engine.operations.multi_llm_orchestrator import LLMResponse, LLMProvider
 
 # Debug flag
@@ -65,6 +65,7 @@ class ConsensusEngine:
         self.min_confidence = min_confidence
         self.min_agreement = min_agreement
         self.similarity_threshold = similarity_threshold
+        self.fix_similarity = FixSimilarity()
         
         if DEBUG:
             logger.debug(f"🔍 ConsensusEngine initialized")
@@ -72,31 +73,23 @@ class ConsensusEngine:
             logger.debug(f"  - Min agreement: {min_agreement} LLMs")
             logger.debug(f"  - Similarity threshold: {similarity_threshold}")
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
+    def _calculate_similarity(self, text1: str, text2: str, threshold: Optional[float] = None) -> float:
         """
         Calculate similarity between two text strings
         
-        Uses SequenceMatcher for code similarity comparison
+        Uses FixSimilarity: token-level difflib ratio behind length, token
+        multiset and MinHash pre-filters, with sketches and scores cached
+        per fix text (see engine/operations/fix_similarity.py)
         
         Args:
             text1: First text
             text2: Second text
+            threshold: Grouping threshold; enables the pre-filters
         
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        if not text1 or not text2:
-            return 0.0
-        
-        # Normalize whitespace
-        normalized1 = ' '.join(text1.split())
-        normalized2 = ' '.join(text2.split())
-        
-        # Calculate similarity
-        matcher = difflib.SequenceMatcher(None, normalized1, normalized2)
-        similarity = matcher.ratio()
-        
-        return similarity
+        return self.fix_similarity.similarity(text1, text2, threshold)
     
     def _group_similar_fixes(
         self,
@@ -131,7 +124,8 @@ class ConsensusEngine:
             for group in groups:
                 similarity = self._calculate_similarity(
                     response.proposed_fix,
-                    group['fix']
+                    group['fix'],
+                    self.similarity_threshold
                 )
                 
                 if similarity >= self.similarity_threshold:
@@ -355,6 +349,65 @@ class ConsensusEngine:
             conflicts=conflicts
         )
     
+    async def reach_consensus_streaming(
+        self,
+        responses: AsyncIterator[LLMResponse],
+        provider_weights: Dict[LLMProvider, float],
+        expected_providers: Optional[List[LLMProvider]] = None
+    ) -> Tuple[ConsensusDecision, List[LLMResponse]]:
+        """
+        Reach consensus while responses are still arriving
+        
+        Re-evaluates after each response and stops as soon as consensus is reached
+        and no outstanding response could change the decision:
+        - the leading fix cannot be overtaken: its weight must exceed the best
+          alternative plus every outstanding provider voting for that
+          alternative at full confidence
+        - the leading fix keeps min_confidence even if every outstanding
+          provider joins it at zero confidence
+        The response iterator is then closed, which cancels the outstanding
+        calls (see MultiLLMOrchestrator.iter_bug_analyses).
+        
+        Args:
+            responses: Async iterator of LLM responses, in completion order
+            provider_weights: Weight for each provider
+            expected_providers: Providers still to answer (default: all weighted providers)
+        
+        Returns:
+            Tuple of (ConsensusDecision, responses received before the decision)
+        """
+        pending = set(expected_providers if expected_providers is not None else provider_weights)
+        received: List[LLMResponse] = []
+        
+        async for response in responses:
+            received.append(response)
+            pending.discard(response.provider)
+            
+            valid = [r for r in received if not r.error and r.proposed_fix]
+            if not pending or len(valid) < self.min_agreement:
+                continue
+            
+            groups = self._group_similar_fixes(valid, provider_weights)
+            lead = groups[0]['total_weight']
+            runner_up = groups[1]['total_weight'] if len(groups) > 1 else 0.0
+            outstanding = sum(provider_weights.get(p, 0.5) for p in pending)
+            if lead <= runner_up + outstanding:
+                continue
+            worst_confidence = lead / (sum(groups[0]['weights']) + outstanding)
+            if worst_confidence < self.min_confidence:
+                continue
+            
+            decision = self.reach_consensus(received, provider_weights)
+            if decision.has_consensus:
+                await responses.aclose()
+                logger.info(
+                    f"⚡ Early consensus after {len(received)} responses, "
+                    f"cancelled {', '.join(sorted(p.value for p in pending))}"
+                )
+                return decision, received
+        
+        return self.reach_consensus(received, provider_weights), received
+    
     def explain_decision(self, decision: ConsensusDecision) -> str:
         """
         Generate human-readable explanation of consensus decision
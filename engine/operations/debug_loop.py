@@ -96,7 +96,9 @@ class DebugLoop:
         project_root: str,
         max_iterations: int = 5,
         min_confidence: float = 0.6,
-        min_agreement: int = 2
+        min_agreement: int = 2,
+        streaming_consensus: bool = True,
+        hedge: bool = False
     ):
         """
         Initialize debug loop
@@ -106,9 +108,13 @@ class DebugLoop:
             max_iterations: Maximum fix-test iterations (default 5)
             min_confidence: Minimum consensus confidence (default 0.6)
             min_agreement: Minimum LLMs that must agree (default 2)
+            streaming_consensus: Decide as soon as consensus is certain and cancel slower LLMs (default True)
+            hedge: Re-send requests that exceed a provider's p95 latency to its backup_endpoint (default False)
         """
         self.project_root = Path(project_root).resolve()
         self.max_iterations = max_iterations
+        self.streaming_consensus = streaming_consensus
+        self.hedge = hedge
         
         # Initialize components
         # Note: TestRunner needs a terminal_ops instance
@@ -227,17 +233,27 @@ class DebugLoop:
         
         # Step 4: Call multi-LLM orchestrator
         print(f"🤖 Analyzing with {len(self.orchestrator.providers_config)} LLMs...")
-        llm_responses = await self.orchestrator.analyze_bug(
+        analysis_args = dict(
             bug_description=bug_description,
             code_context=code_context,
             test_failures=[test_failures_text],
-            previous_attempts=previous_attempts
+            previous_attempts=previous_attempts,
+            hedge=self.hedge
         )
+        provider_weights = self.orchestrator.get_provider_weights()
         
         # Step 5: Reach consensus
-        print(f"🗳️  Reaching consensus...")
-        provider_weights = self.orchestrator.get_provider_weights()
-        consensus = self.consensus_engine.reach_consensus(llm_responses, provider_weights)
+        if self.streaming_consensus:
+            print(f"🗳️  Reaching consensus as responses arrive...")
+            consensus, llm_responses = await self.consensus_engine.reach_consensus_streaming(
+                self.orchestrator.iter_bug_analyses(**analysis_args),
+                provider_weights,
+                expected_providers=list(self.orchestrator.providers_config)
+            )
+        else:
+            llm_responses = await self.orchestrator.analyze_bug(**analysis_args)
+            print(f"🗳️  Reaching consensus...")
+            consensus = self.consensus_engine.reach_consensus(llm_responses, provider_weights)
         
         # Print consensus explanation
         print(self.consensus_engine.explain_decision(consensus))
@@ -313,6 +329,19 @@ class DebugLoop:
         Returns:
             DebugLoopResult with complete debugging session results
         """
+        try:
+            return await self._fix_until_passes(test_files, bug_description, initial_context)
+        finally:
+            # The orchestrator's keep-alive connections are reused across iterations; release them at the end
+            await self.orchestrator.aclose()
+    
+    async def _fix_until_passes(
+        self,
+        test_files: Optional[List[str]],
+        bug_description: str,
+        initial_context: Optional[Dict[str, str]]
+    ) -> DebugLoopResult:
+        """Debug loop body of fix_until_passes()."""
         import time
         start_time = time.time()
         
@@ -451,6 +480,8 @@ if __name__ == "__main__":
     parser.add_argument("--max-iterations", type=int, default=5, help="Maximum iterations")
     parser.add_argument("--min-confidence", type=float, default=0.6, help="Minimum consensus confidence")
     parser.add_argument("--min-agreement", type=int, default=2, help="Minimum LLMs that must agree")
+    parser.add_argument("--no-early-exit", action="store_true", help="Wait for every LLM before reaching consensus")
+    parser.add_argument("--hedge", action="store_true", help="Re-send LLM requests that exceed the provider's p95 latency to its backup_endpoint")
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
     
     args = parser.parse_args()
@@ -467,7 +498,9 @@ if __name__ == "__main__":
             project_root=args.project_root,
             max_iterations=args.max_iterations,
             min_confidence=args.min_confidence,
-            min_agreement=args.min_agreement
+            min_agreement=args.min_agreement,
+            streaming_consensus=not args.no_early_exit,
+            hedge=args.hedge
         )
         
         result = await loop.fix_until_passes(
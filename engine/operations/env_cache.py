@@ -0,0 +1,282 @@
+"""Cached virtualenvs for pipeline test runs.
+
+When require_tests_passing is set, PipelineOrchestrator used to run
+`pip install -r requirements.txt` into the system interpreter
+(--break-system-packages) on every pipeline run before pytest. EnvCacheManager
+instead builds one isolated venv per (repository, requirements hash, Python
+version) and reuses it across runs; on a cache hit the install step is skipped.
+
+Layout (under cache_dir, default <project root>/data/env_cache):
+    <owner>__<repo>/<key>/         venv (key = py<major>.<minor>-<sha256[:16]>)
+    <owner>__<repo>/<key>.lock     flock: exclusive while building, shared while in use
+                                   (cache hits only ever take it shared)
+    <owner>__<repo>/<key>/agent-forge-env-ready   written after a successful build,
+                                   mtime = last use (LRU order)
+
+Housekeeping (gc()):
+- Venvs are evicted least-recently-used first while the cache exceeds
+  max_disk_bytes; venvs in use by a running pipeline are never evicted
+- Half-built venvs (no ready marker) are rebuilt on next use
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = str(Path(__file__).resolve().parent.parent.parent / "data" / "env_cache")
+READY_MARKER = "agent-forge-env-ready"
+
+
+class EnvCacheError(RuntimeError):
+    """Raised when a virtualenv cannot be built."""
+
+
+@dataclass
+class CachedEnv:
+    """Virtualenv handed to one pipeline test run."""
+    repo: str
+    key: str
+    path: Path
+    python: Path
+    cache_hit: bool
+
+
+class EnvCacheManager:
+    """Virtualenv cache keyed by requirements hash."""
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_disk_bytes: int = 10 * 1024 ** 3,
+        install_timeout: int = 300,
+        extra_packages: Sequence[str] = ('pytest',),
+        base_python: str = sys.executable
+    ):
+        """Initialize env cache manager.
+
+        Args:
+            cache_dir: Root directory for cached venvs
+            max_disk_bytes: Disk quota for the whole cache
+            install_timeout: Timeout for venv creation + pip install (seconds)
+            extra_packages: Packages installed next to the requirements (test runner)
+            base_python: Interpreter used to create venvs
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_disk_bytes = max_disk_bytes
+        self.install_timeout = install_timeout
+        self.extra_packages = list(extra_packages)
+        self.base_python = base_python
+
+    @staticmethod
+    def _slug(repo: str) -> str:
+        return repo.replace('/', '__')
+
+    def _python_version(self) -> str:
+        if self.base_python == sys.executable:
+            return f"{sys.version_info.major}.{sys.version_info.minor}"
+        result = subprocess.run(
+            [self.base_python, '-c', 'import sys; print("%d.%d" % sys.version_info[:2])'],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise EnvCacheError(f"Cannot run {self.base_python}: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def env_key(self, requirements_file: Path) -> str:
+        """Cache key for a requirements file and the base interpreter.
+
+        Args:
+            requirements_file: Path to requirements.txt
+
+        Returns:
+            Key like ``py3.11-0123456789abcdef``
+        """
+        digest = hashlib.sha256()
+        digest.update(Path(requirements_file).read_bytes())
+        digest.update('\n'.join(self.extra_packages).encode())
+        return f"py{self._python_version()}-{digest.hexdigest()[:16]}"
+
+    @staticmethod
+    def _venv_python(env_dir: Path) -> Path:
+        return env_dir / 'bin' / 'python'
+
+    def _build(self, env_dir: Path, requirements_file: Path):
+        """Create the venv and install requirements (exclusive lock held)."""
+        if env_dir.exists():
+            shutil.rmtree(env_dir)  # Leftover from an interrupted build
+
+        start = time.time()
+        try:
+            result = subprocess.run(
+                [self.base_python, '-m', 'venv', str(env_dir)],
+                capture_output=True,
+                text=True,
+                timeout=self.install_timeout
+            )
+            if result.returncode != 0:
+                raise EnvCacheError(f"venv creation failed: {result.stderr.strip()}")
+
+            remaining = max(1, self.install_timeout - int(time.time() - start))
+            result = subprocess.run(
+                [str(self._venv_python(env_dir)), '-m', 'pip', 'install', '-q',
+                 '--disable-pip-version-check', '-r', str(requirements_file)] + self.extra_packages,
+                cwd=str(requirements_file.parent),
+                capture_output=True,
+                text=True,
+                timeout=remaining
+            )
+            if result.returncode != 0:
+                raise EnvCacheError(f"pip install failed: {result.stderr.strip()[-2000:]}")
+        except subprocess.TimeoutExpired:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            raise EnvCacheError(f"venv build timed out after {self.install_timeout}s")
+        except EnvCacheError:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            raise
+
+        (env_dir / READY_MARKER).touch()
+        logger.info(f"✅ Built venv {env_dir.name} in {time.time() - start:.1f}s")
+
+    @contextmanager
+    def environment(self, repo: str, requirements_file: Path) -> Iterator[CachedEnv]:
+        """Get a venv with the requirements installed, building it on a miss.
+
+        The venv is protected from eviction while the context is open.
+
+        Args:
+            repo: Repository (owner/repo)
+            requirements_file: Path to requirements.txt in the workspace
+
+        Yields:
+            CachedEnv whose python runs the tests
+
+        Raises:
+            EnvCacheError: If the venv cannot be built
+        """
+        requirements_file = Path(requirements_file)
+        key = self.env_key(requirements_file)
+        repo_dir = self.cache_dir / self._slug(repo)
+        env_dir = repo_dir / key
+        repo_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(repo_dir / f"{key}.lock", 'w') as lock_file:
+            # Shared while in use: other runs may reuse it, gc() may not evict it
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            try:
+                cache_hit = (env_dir / READY_MARKER).exists()
+                if cache_hit:
+                    logger.info(f"♻️  Reusing cached venv for {repo}: {key}")
+                else:
+                    # Exclusive to build; another run may have built it meanwhile
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    cache_hit = (env_dir / READY_MARKER).exists()
+                    if not cache_hit:
+                        logger.info(f"📦 Building venv for {repo}: {key}")
+                        self._build(env_dir, requirements_file)
+                    fcntl.flock(lock_file, fcntl.LOCK_SH)
+                (env_dir / READY_MARKER).touch()
+                yield CachedEnv(
+                    repo=repo,
+                    key=key,
+                    path=env_dir,
+                    python=self._venv_python(env_dir),
+                    cache_hit=cache_hit
+                )
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        if not cache_hit:
+            self.gc()
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def disk_usage(self) -> int:
+        """Total bytes used by cached venvs."""
+        return self._dir_size(self.cache_dir) if self.cache_dir.exists() else 0
+
+    def gc(self) -> Dict[str, int]:
+        """Evict least recently used venvs until the cache fits the quota.
+
+        Returns:
+            Dict with count of evicted venvs and remaining bytes
+        """
+        evicted = 0
+        usage = self.disk_usage()
+        if usage <= self.max_disk_bytes:
+            return {'envs_evicted': 0, 'bytes_used': usage}
+
+        def last_used(env_dir: Path) -> float:
+            marker = env_dir / READY_MARKER
+            return marker.stat().st_mtime if marker.exists() else 0.0
+
+        env_dirs = [p for p in self.cache_dir.glob("*/*") if p.is_dir()]
+        for env_dir in sorted(env_dirs, key=last_used):
+            if usage <= self.max_disk_bytes:
+                break
+            with open(env_dir.parent / f"{env_dir.name}.lock", 'w') as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # Building or in use by a running pipeline
+                try:
+                    size = self._dir_size(env_dir)
+                    shutil.rmtree(env_dir, ignore_errors=True)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            usage -= size
+            evicted += 1
+            logger.info(f"🧹 Evicted venv {env_dir.parent.name}/{env_dir.name} ({size / 1024 ** 2:.0f} MB)")
+
+        if usage > self.max_disk_bytes:
+            logger.warning(
+                f"⚠️ Env cache still over quota ({usage / 1024 ** 3:.1f} GB > "
+                f"{self.max_disk_bytes / 1024 ** 3:.1f} GB), all venvs in use"
+            )
+
+        return {'envs_evicted': evicted, 'bytes_used': usage}
+
+
+# Global cache instance
+_global_env_cache: Optional[EnvCacheManager] = None
+
+
+def get_env_cache() -> EnvCacheManager:
+    """Get or create global env cache manager.
+
+    The location can be overridden with AGENT_FORGE_ENV_CACHE_DIR.
+    """
+    global _global_env_cache
+    if _global_env_cache is None:
+        _global_env_cache = EnvCacheManager(
+            cache_dir=os.getenv("AGENT_FORGE_ENV_CACHE_DIR", DEFAULT_CACHE_DIR)
+        )
+    return _global_env_cache
+
+
+def reset_env_cache():
+    """Reset global env cache manager (for testing)."""
+    global _global_env_cache
+    _global_env_cache = None
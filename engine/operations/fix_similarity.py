@@ -0,0 +1,214 @@
+"""
+Fix similarity scoring for consensus grouping
+
+ConsensusEngine groups proposed fixes that are "the same fix". Comparing
+multi-kilobyte patches character by character with difflib is slow, so fixes
+are compared as tokens behind a chain of cheap filters:
+
+1. Sketch per fix (cached): unified diffs are reduced to their added and
+   removed lines (context width, hunk line numbers and file headers differ
+   between providers for the same change), then split into per-line tokens,
+   a token multiset and a MinHash signature over token 3-shingles.
+2. real_quick_ratio bound from the token counts alone.
+3. quick_ratio bound from the token multisets.
+4. MinHash estimate of shingle Jaccard similarity: clearly disjoint fixes are
+   rejected and near-duplicates accepted without exact scoring.
+5. Exact score, cached per pair: difflib over lines, then over tokens only
+   inside replaced line blocks; matched tokens / total tokens as in ratio().
+
+Steps 2-4 only decide when the outcome against the grouping threshold is
+certain (2-3) or overwhelming (4); everything else gets the exact score.
+
+Usage:
+    similarity = FixSimilarity()
+    score = similarity.similarity(fix_a, fix_b, threshold=0.7)
+"""
+
+import difflib
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@", re.MULTILINE)
+
+SHINGLE_SIZE = 3  # Tokens per shingle
+NUM_PERMUTATIONS = 64  # MinHash signature length (estimate error ~1/sqrt(64) = 0.125)
+MINHASH_REJECT = 0.1  # Estimated Jaccard below this: not similar
+MINHASH_ACCEPT = 0.9  # Estimated Jaccard at or above this: similar
+
+_rng = np.random.default_rng(0x5EED)
+_SEEDS = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)  # Odd constant; xor + multiply mixes each seed's permutation
+
+
+def normalize_fix(text: str) -> List[str]:
+    """
+    Lines that carry the change, whitespace-normalized
+
+    For unified diffs only added/removed lines are kept (file headers, hunk
+    headers and context dropped); other text keeps all non-blank lines.
+    """
+    lines = text.splitlines()
+    if HUNK_HEADER_PATTERN.search(text):
+        lines = [
+            line for line in lines
+            if line[:1] in "+-" and not line.startswith(("+++ ", "--- "))
+        ]
+    return [" ".join(line.split()) for line in lines if line.strip()]
+
+
+def tokenize(line: str) -> List[str]:
+    """Split code into identifier/number and punctuation tokens (whitespace dropped)."""
+    return TOKEN_PATTERN.findall(line)
+
+
+def minhash_signature(tokens: List[str]) -> Optional[np.ndarray]:
+    """MinHash signature over token shingles (None for empty input)."""
+    if not tokens:
+        return None
+    size = min(SHINGLE_SIZE, len(tokens))
+    shingles = {hash(tuple(tokens[i:i + size])) for i in range(len(tokens) - size + 1)}
+    hashes = np.fromiter(shingles, dtype=np.int64, count=len(shingles)).view(np.uint64)
+    with np.errstate(over="ignore"):
+        permuted = (hashes[None, :] ^ _SEEDS[:, None]) * _MULTIPLIER
+    return permuted.min(axis=1)
+
+
+@dataclass
+class FixSketch:
+    """Cached representation of one proposed fix"""
+    lines: List[str]
+    line_tokens: List[List[str]]
+    tokens: List[str]
+    counts: Counter
+    signature: Optional[np.ndarray]
+
+
+@dataclass
+class SimilarityStats:
+    """How comparisons were decided"""
+    comparisons: int = 0
+    cached: int = 0
+    length_filtered: int = 0
+    quick_filtered: int = 0
+    minhash_decided: int = 0
+    exact: int = 0
+
+
+class FixSimilarity:
+    """Similarity of proposed fixes with per-fix sketches and cached pair scores"""
+
+    def __init__(self, max_cached: int = 512):
+        """
+        Initialize fix similarity scorer
+
+        Args:
+            max_cached: Maximum sketches and pair scores kept (cleared when exceeded)
+        """
+        self.max_cached = max_cached
+        self.stats = SimilarityStats()
+        self._sketches: Dict[str, FixSketch] = {}
+        self._scores: Dict[Tuple[str, str, Optional[float]], float] = {}
+
+    def sketch(self, text: str) -> FixSketch:
+        """Sketch of a fix (computed once per distinct text)"""
+        sketch = self._sketches.get(text)
+        if sketch is None:
+            if len(self._sketches) >= self.max_cached:
+                self._sketches.clear()
+            lines = normalize_fix(text)
+            line_tokens = [tokenize(line) for line in lines]
+            tokens = [token for line in line_tokens for token in line]
+            sketch = FixSketch(
+                lines=lines,
+                line_tokens=line_tokens,
+                tokens=tokens,
+                counts=Counter(tokens),
+                signature=minhash_signature(tokens)
+            )
+            self._sketches[text] = sketch
+        return sketch
+
+    def similarity(self, text1: str, text2: str, threshold: Optional[float] = None) -> float:
+        """
+        Similarity of two fixes (0.0 to 1.0)
+
+        With a threshold, cheap bounds and MinHash estimates may be returned
+        instead of the exact score when they already decide which side of the
+        threshold the pair falls on.
+
+        Args:
+            text1: First fix
+            text2: Second fix
+            threshold: Grouping threshold the caller compares against (optional)
+
+        Returns:
+            Similarity score (exact or deciding estimate)
+        """
+        if not text1 or not text2:
+            return 0.0
+
+        self.stats.comparisons += 1
+        # Estimates depend on the threshold, so it is part of the key
+        key = (text1, text2, threshold) if text1 <= text2 else (text2, text1, threshold)
+        score = self._scores.get(key)
+        if score is not None:
+            self.stats.cached += 1
+            return score
+
+        score = self._score(self.sketch(text1), self.sketch(text2), threshold)
+        if len(self._scores) >= self.max_cached:
+            self._scores.clear()
+        self._scores[key] = score
+        return score
+
+    def _score(self, a: FixSketch, b: FixSketch, threshold: Optional[float]) -> float:
+        len_a, len_b = len(a.tokens), len(b.tokens)
+        if not len_a or not len_b:
+            return 0.0
+        if a.tokens == b.tokens:
+            return 1.0
+
+        if threshold is not None:
+            # real_quick_ratio: matches cannot exceed the shorter sequence
+            bound = 2.0 * min(len_a, len_b) / (len_a + len_b)
+            if bound < threshold:
+                self.stats.length_filtered += 1
+                return bound
+
+            # quick_ratio: matches cannot exceed the multiset intersection
+            bound = 2.0 * sum((a.counts & b.counts).values()) / (len_a + len_b)
+            if bound < threshold:
+                self.stats.quick_filtered += 1
+                return bound
+
+            estimate = float(np.mean(a.signature == b.signature))
+            if estimate < min(MINHASH_REJECT, threshold) or estimate >= max(MINHASH_ACCEPT, threshold):
+                self.stats.minhash_decided += 1
+                return estimate
+
+        self.stats.exact += 1
+        return 2.0 * self._matched_tokens(a, b) / (len_a + len_b)
+
+    @staticmethod
+    def _matched_tokens(a: FixSketch, b: FixSketch) -> int:
+        """Tokens matched by a line-level diff refined token-wise inside replaced blocks"""
+        matched = 0
+        lines = difflib.SequenceMatcher(None, a.lines, b.lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in lines.get_opcodes():
+            if tag == "equal":
+                matched += sum(len(tokens) for tokens in a.line_tokens[i1:i2])
+            elif tag == "replace":
+                tokens_a = [token for line in a.line_tokens[i1:i2] for token in line]
+                tokens_b = [token for line in b.line_tokens[j1:j2] for token in line]
+                blocks = difflib.SequenceMatcher(None, tokens_a, tokens_b, autojunk=False).get_matching_blocks()
+                matched += sum(block.size for block in blocks)
+        return matched
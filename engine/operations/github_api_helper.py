@@ -4,30 +4,83 @@ This module provides a clean interface to GitHub's REST API without requiring
 the gh CLI tool. Designed to work in environments without persistent home directories
 (e.g., systemd DynamicUser services).
 
-Includes anti-spam protection and rate limiting.
+Includes anti-spam protection, rate limiting and ETag-based conditional
+request caching for frequently polled read endpoints. Every call takes a
+token from the host-wide SharedTokenBucket, waiting (up to max_token_wait)
+when the account's hourly budget is spent.
 """
 
 import os
 import requests
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from engine.core.rate_limiter import get_rate_limiter, OperationType
+from engine.core.shared_token_bucket import SharedTokenBucket, get_shared_token_bucket, resolve_bucket_account
+from engine.operations.github_response_cache import ConditionalRequestCache, get_response_cache
 
 logger = logging.getLogger(__name__)
 
 
+def format_issue(issue: Dict) -> Dict:
+    """Convert a REST issue payload to the gh CLI-style dict used by services.
+    
+    Args:
+        issue: Raw issue dictionary from the GitHub REST API
+        
+    Returns:
+        Issue dictionary with camelCase timestamps and trimmed label/assignee data
+    """
+    return {
+        'number': issue['number'],
+        'title': issue['title'],
+        'labels': [{'name': label['name']} for label in issue['labels']],
+        'assignees': [{'login': assignee['login']} for assignee in issue['assignees']],
+        'url': issue['html_url'],
+        'createdAt': issue['created_at'],
+        'updatedAt': issue['updated_at'],
+        'state': issue['state'],
+        'body': issue.get('body', '')
+    }
+
+
+def format_comment(comment: Dict) -> Dict:
+    """Convert a REST issue comment payload to the gh CLI-style dict.
+    
+    Args:
+        comment: Raw comment dictionary from the GitHub REST API
+        
+    Returns:
+        Comment dictionary with author, body and camelCase timestamps
+    """
+    return {
+        'author': {'login': comment['user']['login']},
+        'body': comment['body'],
+        'createdAt': comment['created_at'],
+        'updatedAt': comment['updated_at']
+    }
+
+
 class GitHubAPIHelper:
     """Helper class for GitHub REST API interactions with rate limiting."""
     
     BASE_URL = "https://api.github.com"
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        response_cache: Optional[ConditionalRequestCache] = None,
+        token_bucket: Optional[SharedTokenBucket] = None,
+        max_token_wait: float = 60.0
+    ):
         """Initialize GitHub API helper.
         
         Args:
             token: GitHub personal access token (reads from env if not provided)
+            response_cache: Conditional request cache (uses shared global cache if None)
+            token_bucket: Host-wide API budget (uses shared global bucket if None)
+            max_token_wait: Seconds to block waiting for an API token before refusing
         """
         self.token = token or os.getenv("BOT_GITHUB_TOKEN") or os.getenv("GITHUB_TOKEN")
         if not self.token:
@@ -43,8 +96,58 @@ class GitHubAPIHelper:
         # Get rate limiter instance
         self.rate_limiter = get_rate_limiter()
         
+        # ETag / Last-Modified cache for polled read endpoints
+        self.response_cache = response_cache or get_response_cache()
+        
+        # Hourly API budget shared by all processes using this account
+        self.token_bucket = token_bucket or get_shared_token_bucket()
+        self.bucket_account, self.bucket_budget = resolve_bucket_account(self.token)
+        self.max_token_wait = max_token_wait
+        
         logger.info("🔒 GitHub API helper initialized with rate limiting")
     
+    def _conditional_get(self, url: str, params: Optional[Dict] = None) -> Any:
+        """GET a JSON resource using the conditional request cache.
+        
+        Sends If-None-Match / If-Modified-Since when a cached copy exists and
+        serves the cached body on 304 (not charged against the rate limit).
+        Callers take the API token first (_check_rate_limit); a 304 refunds it.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            
+        Returns:
+            Decoded JSON body
+            
+        Raises:
+            requests.exceptions.RequestException: On HTTP errors
+        """
+        key = self.response_cache.make_key(url, params, self.token)
+        cached = self.response_cache.get(key)
+        
+        response = self.session.get(
+            url,
+            params=params,
+            headers=self.response_cache.conditional_headers(cached),
+            timeout=30
+        )
+        self._update_rate_limit_from_response(response)
+        
+        if response.status_code == 304 and cached is not None:
+            # GitHub does not charge 304s against the rate limit
+            self.token_bucket.refund(self.bucket_account, self.bucket_budget)
+            self.rate_limiter.record_conditional_request(cache_hit=True, not_modified=True)
+            logger.debug(f"♻️ 304 Not Modified, serving cached body for {url}")
+            return cached.body
+        
+        response.raise_for_status()
+        self.rate_limiter.record_conditional_request(cache_hit=cached is not None)
+        
+        body = response.json()
+        self.response_cache.store(key, response.headers, body)
+        return body
+    
     def _update_rate_limit_from_response(self, response: requests.Response):
         """Update rate limiter from GitHub API response headers."""
         remaining = int(response.headers.get('X-RateLimit-Remaining', 5000))
@@ -52,6 +155,7 @@ class GitHubAPIHelper:
         
         if reset_time:
             self.rate_limiter.update_github_rate_limit(remaining, reset_time)
+            self.token_bucket.observe(self.bucket_account, remaining, reset_time, self.bucket_budget)
     
     def _check_rate_limit(
         self, 
@@ -77,6 +181,11 @@ class GitHubAPIHelper:
             logger.warning(f"🛡️ Rate limit blocked: {reason}")
             return False
         
+        # Anti-spam bypass does not exempt calls from GitHub's hourly budget
+        if not self.token_bucket.acquire_blocking(self.bucket_account, self.bucket_budget, timeout=self.max_token_wait):
+            logger.warning(f"🛡️ GitHub API budget for {self.bucket_account} exhausted, blocked {target}")
+            return False
+        
         return True
     
     def _record_operation(self, operation_type: OperationType, target: str, content: Optional[str] = None, success: bool = True):
@@ -128,17 +237,11 @@ class GitHubAPIHelper:
             params['labels'] = ','.join(labels)
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Update rate limit from response
-            self._update_rate_limit_from_response(response)
+            issues = self._conditional_get(url, params=params)
             
             # Record operation
             self._record_operation(OperationType.API_READ, target, success=True)
             
-            issues = response.json()
-            
             # Convert to format matching gh CLI output
             formatted_issues = []
             for issue in issues:
@@ -146,17 +249,7 @@ class GitHubAPIHelper:
                 if 'pull_request' in issue:
                     continue
                 
-                formatted_issues.append({
-                    'number': issue['number'],
-                    'title': issue['title'],
-                    'labels': [{'name': label['name']} for label in issue['labels']],
-                    'assignees': [{'login': assignee['login']} for assignee in issue['assignees']],
-                    'url': issue['html_url'],
-                    'createdAt': issue['created_at'],
-                    'updatedAt': issue['updated_at'],
-                    'state': issue['state'],
-                    'body': issue.get('body', '')
-                })
+                formatted_issues.append(format_issue(issue))
             
             return formatted_issues
             
@@ -179,26 +272,21 @@ class GitHubAPIHelper:
             
         Returns:
             List of comment dictionaries
+            
+        Raises:
+            RuntimeError: If the API budget is exhausted
         """
+        target = f"{owner}/{repo}#{issue_number}"
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=True):
+            raise RuntimeError(f"Rate limit prevents reading comments of {target}")
+        
         url = f"{self.BASE_URL}/repos/{owner}/{repo}/issues/{issue_number}/comments"
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            comments = response.json()
+            comments = self._conditional_get(url)
             
             # Format to match gh CLI output
-            formatted_comments = []
-            for comment in comments:
-                formatted_comments.append({
-                    'author': {'login': comment['user']['login']},
-                    'body': comment['body'],
-                    'createdAt': comment['created_at'],
-                    'updatedAt': comment['updated_at']
-                })
-            
-            return formatted_comments
+            return [format_comment(comment) for comment in comments]
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get comments for {owner}/{repo}#{issue_number}: {e}")
@@ -272,12 +360,20 @@ class GitHubAPIHelper:
             
         Returns:
             Issue dictionary
+            
+        Raises:
+            RuntimeError: If the API budget is exhausted
         """
+        target = f"{owner}/{repo}#{issue_number}"
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=True):
+            raise RuntimeError(f"Rate limit prevents reading {target}")
+        
         url = f"{self.BASE_URL}/repos/{owner}/{repo}/issues/{issue_number}"
         
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
+            self._update_rate_limit_from_response(response)
             
             issue = response.json()
             
@@ -315,12 +411,20 @@ class GitHubAPIHelper:
             
         Returns:
             PR dictionary with metadata
+            
+        Raises:
+            RuntimeError: If the API budget is exhausted
         """
+        target = f"{owner}/{repo}#{pr_number}"
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=True):
+            raise RuntimeError(f"Rate limit prevents reading PR {target}")
+        
         url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}"
         
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
+            self._update_rate_limit_from_response(response)
             
             return response.json()
             
@@ -343,12 +447,20 @@ class GitHubAPIHelper:
             
         Returns:
             List of file change dictionaries with diffs
+            
+        Raises:
+            RuntimeError: If the API budget is exhausted
         """
+        target = f"{owner}/{repo}#{pr_number}"
+        if not self._check_rate_limit(OperationType.API_READ, target, bypass=True):
+            raise RuntimeError(f"Rate limit prevents reading files of PR {target}")
+        
         url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}/files"
         
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
+            self._update_rate_limit_from_response(response)
             
             return response.json()
             
@@ -556,14 +668,11 @@ class GitHubAPIHelper:
         params = {'state': state, 'per_page': 100}
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            self._update_rate_limit_from_response(response)
+            prs = self._conditional_get(url, params=params)
             
             self._record_operation(OperationType.API_READ, target,
                                  f"Listed {state} PRs", success=True)
             
-            prs = response.json()
             logger.debug(f"🔍 Retrieved {len(prs)} {state} PRs from {target}")
             return prs
             
@@ -625,11 +734,7 @@ class GitHubAPIHelper:
         url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}/files"
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            self._update_rate_limit_from_response(response)
-            
-            files = response.json()
+            files = self._conditional_get(url)
             logger.info(f"✅ Fetched {len(files)} changed files from PR #{pr_number}")
             return files
             
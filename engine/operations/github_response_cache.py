@@ -0,0 +1,215 @@
+"""Conditional request cache for GitHub REST API reads.
+
+Stores the ETag / Last-Modified validators and JSON body of GET responses so
+that repeated reads can be sent as conditional requests. GitHub answers
+unchanged resources with ``304 Not Modified``, which is not charged against
+the API rate limit; the cached body is then served instead.
+
+Entries are keyed by request URL (including query parameters) and a hash of
+the token, so different accounts never share cached bodies. The cache lives in
+a small SQLite database shared by all processes on the host.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+# Project-root data/ (like the polling state file), not relative to the working directory
+DEFAULT_CACHE_PATH = str(Path(__file__).resolve().parent.parent.parent / "data" / "github_etag_cache.db")
+
+
+@dataclass
+class CachedResponse:
+    """Cached GitHub response body with its validators."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+
+
+class ConditionalRequestCache:
+    """Persistent ETag / Last-Modified cache for GitHub GET requests."""
+
+    PRUNE_INTERVAL = 100  # Stores between size-limit enforcement passes
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_entries: int = 5000):
+        """Initialize conditional request cache.
+
+        The database file is created lazily on the first successful store.
+
+        Args:
+            db_path: Path to SQLite database file
+            max_entries: Maximum cached responses (least recently updated are evicted)
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self._stores_since_prune = 0
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        if not self._schema_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]], token: str) -> str:
+        """Build cache key from URL, query parameters and token.
+
+        Args:
+            url: Request URL (absolute or path)
+            params: Query parameters
+            token: GitHub token (only a hash is used)
+
+        Returns:
+            Cache key string
+        """
+        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+        query = urlencode(sorted((params or {}).items()))
+        return f"{token_hash}:{url}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Look up cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            CachedResponse if present, None otherwise
+        """
+        if not self._schema_ready and not self.db_path.exists():
+            return None
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT etag, last_modified, body FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ ETag cache read failed: {e}")
+            return None
+
+        if not row:
+            return None
+
+        etag, last_modified, body = row
+        return CachedResponse(etag=etag, last_modified=last_modified, body=json.loads(body))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Build conditional request headers for a cached entry.
+
+        Args:
+            entry: Cached response (or None)
+
+        Returns:
+            Dict with If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key: str, response_headers: Mapping[str, str], body: Any) -> None:
+        """Store response body if it carries a validator.
+
+        Args:
+            key: Cache key from make_key()
+            response_headers: Response headers (case-insensitive mapping)
+            body: Decoded JSON body
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, last_modified, body, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, etag, last_modified, json.dumps(body), time.time())
+                )
+                self._stores_since_prune += 1
+                if self._stores_since_prune >= self.PRUNE_INTERVAL:
+                    self._prune(conn)
+                    self._stores_since_prune = 0
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ ETag cache write failed: {e}")
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently updated entries beyond max_entries."""
+        conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY updated_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        if not self._schema_ready and not self.db_path.exists():
+            return
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# Global cache instance
+_global_response_cache: Optional[ConditionalRequestCache] = None
+
+
+def get_response_cache() -> ConditionalRequestCache:
+    """Get or create global conditional request cache.
+
+    The location can be overridden with GITHUB_ETAG_CACHE_PATH.
+    """
+    global _global_response_cache
+    if _global_response_cache is None:
+        _global_response_cache = ConditionalRequestCache(
+            db_path=os.getenv("GITHUB_ETAG_CACHE_PATH", DEFAULT_CACHE_PATH)
+        )
+    return _global_response_cache
+
+
+def reset_response_cache():
+    """Reset global conditional request cache (for testing)."""
+    global _global_response_cache
+    _global_response_cache = None
@@ -315,7 +315,11 @@ Respond with JSON:
 """
         
         try:
-            response = self.llm_agent.query(prompt)
+            if hasattr(self.llm_agent, 'query_llm'):
+                # Re-polled issues send the same prompt: reuse the cached answer
+                response = self.llm_agent.query_llm(prompt, cache=True)
+            else:
+                response = self.llm_agent.query(prompt)
             # Parse LLM response (simplified - needs proper JSON parsing)
             # This would need proper implementation
             return {}
@@ -132,10 +132,13 @@ class LLMFileEditor:
         
         # Call LLM using agent's query_qwen method
         try:
+            # The prompt embeds the current file content, so only a retry of the
+            # same instruction on an unchanged file is answered from the cache
             response = self.agent.query_qwen(
                 prompt=prompt,
                 stream=False,
-                system_prompt="You are an expert code editor. Generate precise, well-formatted code."
+                system_prompt="You are an expert code editor. Generate precise, well-formatted code.",
+                cache=True
             )
             
             if not response:
@@ -11,6 +11,8 @@ Architecture:
 - Error handling and fallback strategies
 - Response parsing and confidence scoring
 - Integration with secrets management
+- One long-lived HTTP session (keep-alive, per-host connection limit) with
+  per-provider latency histograms (connect / time-to-first-byte / total)
 
 Usage:
     orchestrator = MultiLLMOrchestrator()
@@ -19,14 +21,17 @@ Usage:
         code_context={"file_editor.py": "..."},
         test_failures=["test_edit_file failed"]
     )
+    await orchestrator.aclose()  # Or: async with MultiLLMOrchestrator() as orchestrator
 """
 
 import asyncio
+import bisect
 import os
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import aiohttp
 from pathlib import Path
@@ -67,23 +72,98 @@ class LLMConfig:
     api_endpoint: str
     timeout: int = 60
     max_tokens: int = 4000
+    backup_endpoint: Optional[str] = None  # Same API format; hedged requests need one distinct from api_endpoint
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket: everything above)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket containing the q-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': self.max_ms,
+            'buckets': {
+                f"le_{bound}ms" if bound is not None else "inf": n
+                for bound, n in zip(list(LATENCY_BUCKETS_MS) + [None], self.counts)
+            }
+        }
+
+
+@dataclass
+class ProviderLatency:
+    """Latency breakdown of one provider's HTTP calls"""
+    connect: LatencyHistogram = field(default_factory=LatencyHistogram)  # 0 when a pooled connection is reused
+    ttfb: LatencyHistogram = field(default_factory=LatencyHistogram)  # Request start to response headers
+    total: LatencyHistogram = field(default_factory=LatencyHistogram)  # Request start to full body
+    new_connections: int = 0
+    reused_connections: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0  # Hedged duplicate answered first
 
 
 class MultiLLMOrchestrator:
     """Orchestrates multiple LLM providers for parallel bug analysis"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        max_connections_per_host: int = 8,
+        keepalive_timeout: float = 60.0,
+        hedge_min_samples: int = 10
+    ):
         """
         Initialize the orchestrator
         
         Args:
             config_path: Path to multi_llm_debug.yaml config file
+            max_connections_per_host: Pooled connections per API host
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+            hedge_min_samples: Calls a provider needs before its p95 latency is used to hedge
         """
         self.config_path = config_path or os.path.join(
             os.path.dirname(__file__), '../../config/services/multi_llm_debug.yaml'
         )
         self.providers_config = self._load_config()
         self.api_keys = self._load_api_keys()
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.keepalive_timeout = keepalive_timeout
+        self.hedge_min_samples = hedge_min_samples
+        
+        # Session is created lazily because it binds to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.latency: Dict[LLMProvider, ProviderLatency] = {}
         
         if DEBUG:
             logger.debug(f"🔍 MultiLLMOrchestrator initialized with {len(self.providers_config)} providers")
@@ -200,6 +280,102 @@ class MultiLLMOrchestrator:
             return self.api_keys.get('openrouter')
         return None
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled session for the current event loop, creating it if needed.
+        
+        A session left over from another event loop is closed when it is replaced,
+        so its keep-alive connections are not leaked.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            stale, stale_loop = self._session, self._session_loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.max_connections_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300
+                ),
+                trace_configs=[self._latency_trace_config()]
+            )
+            self._session_loop = loop
+            if stale is not None and not stale.closed:
+                await self._close_stale_session(stale, stale_loop)
+        return self._session
+    
+    @staticmethod
+    async def _close_stale_session(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session that belongs to another event loop."""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it on its own loop, without waiting for that loop
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except RuntimeError:
+            # Owning loop already closed; its connections are gone with it
+            pass
+    
+    async def aclose(self):
+        """Close pooled connections (the next call opens a new session)."""
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except RuntimeError:
+                # Owning event loop already closed; connections are gone with it
+                pass
+        self._session = None
+        self._session_loop = None
+    
+    async def __aenter__(self) -> "MultiLLMOrchestrator":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    @staticmethod
+    def _latency_trace_config() -> aiohttp.TraceConfig:
+        """Record connect / time-to-first-byte timings into the request's trace context dict."""
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_request_start(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx['start'] = time.perf_counter()
+        
+        async def on_connection_create_start(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx['connect_start'] = time.perf_counter()
+        
+        async def on_connection_create_end(session, ctx, params):
+            if ctx.trace_request_ctx is not None and 'connect_start' in ctx.trace_request_ctx:
+                ctx.trace_request_ctx['connect'] = time.perf_counter() - ctx.trace_request_ctx['connect_start']
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx['reused'] = True
+        
+        async def on_request_end(session, ctx, params):
+            if ctx.trace_request_ctx is not None and 'start' in ctx.trace_request_ctx:
+                ctx.trace_request_ctx['ttfb'] = time.perf_counter() - ctx.trace_request_ctx['start']
+        
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+    
+    def _record_latency(self, provider: LLMProvider, timings: Dict[str, float], total: float):
+        """Add one completed HTTP exchange to the provider's histograms."""
+        stats = self.latency.setdefault(provider, ProviderLatency())
+        stats.connect.observe(timings.get('connect', 0.0))
+        stats.ttfb.observe(timings.get('ttfb', total))
+        stats.total.observe(total)
+        if timings.get('reused'):
+            stats.reused_connections += 1
+        elif 'connect' in timings:
+            stats.new_connections += 1
+    
     def _build_prompt(
         self,
         provider: LLMProvider,
@@ -284,8 +460,8 @@ Provide ONLY the JSON response, no other text.
         prompt: str
     ) -> LLMResponse:
         """Call a single LLM provider"""
-        import time
         start_time = time.time()
+        started = time.perf_counter()
         
         api_key = self._get_api_key(config)
         if not api_key:
@@ -335,74 +511,77 @@ Provide ONLY the JSON response, no other text.
                     headers["HTTP-Referer"] = "https://github.com/agent-forge"
                     headers["X-Title"] = "Agent-Forge Multi-LLM Debug"
             
-            # Make API call
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    config.api_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=config.timeout)
-                ) as response:
-                    response_time = time.time() - start_time
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        error_msg = f"API error {response.status}: {error_text}"
-                        logger.error(f"❌ {config.provider.value}: {error_msg}")
-                        return LLMResponse(
-                            provider=config.provider,
-                            analysis="",
-                            proposed_fix="",
-                            confidence=0.0,
-                            reasoning="",
-                            error=error_msg,
-                            response_time=response_time
-                        )
-                    
-                    result = await response.json()
-                    
-                    # Extract content based on provider
-                    if config.provider == LLMProvider.CLAUDE:
-                        content = result['content'][0]['text']
-                    else:
-                        content = result['choices'][0]['message']['content']
-                    
-                    # Parse JSON response
-                    try:
-                        # Extract JSON from markdown code blocks if present
-                        if '```json' in content:
-                            content = content.split('```json')[1].split('```')[0].strip()
-                        elif '```' in content:
-                            content = content.split('```')[1].split('```')[0].strip()
-                        
-                        parsed = json.loads(content)
-                        
-                        if DEBUG:
-                            logger.debug(f"✅ {config.provider.value} responded in {response_time:.2f}s")
-                        
-                        return LLMResponse(
-                            provider=config.provider,
-                            analysis=parsed.get('analysis', ''),
-                            proposed_fix=parsed.get('proposed_fix', ''),
-                            confidence=float(parsed.get('confidence', 0.5)),
-                            reasoning=parsed.get('reasoning', ''),
-                            response_time=response_time
-                        )
-                    
-                    except json.JSONDecodeError as e:
-                        logger.error(f"❌ {config.provider.value}: Failed to parse JSON: {e}")
-                        logger.debug(f"🐛 Raw response: {content[:500]}...")
-                        
-                        # Return partial response
-                        return LLMResponse(
-                            provider=config.provider,
-                            analysis=content,
-                            proposed_fix="",
-                            confidence=0.3,
-                            reasoning="Failed to parse structured response",
-                            error=f"JSON parse error: {str(e)}",
-                            response_time=response_time
-                        )
+            # Make API call over the pooled session
+            timings: Dict[str, float] = {}
+            session = await self._get_session()
+            async with session.post(
+                config.api_endpoint,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=config.timeout),
+                trace_request_ctx=timings
+            ) as response:
+                body = await response.text()
+            self._record_latency(config.provider, timings, time.perf_counter() - timings.get('start', started))
+            response_time = time.time() - start_time
+            
+            if response.status != 200:
+                error_msg = f"API error {response.status}: {body}"
+                logger.error(f"❌ {config.provider.value}: {error_msg}")
+                return LLMResponse(
+                    provider=config.provider,
+                    analysis="",
+                    proposed_fix="",
+                    confidence=0.0,
+                    reasoning="",
+                    error=error_msg,
+                    response_time=response_time
+                )
+            
+            result = json.loads(body)
+            
+            # Extract content based on provider
+            if config.provider == LLMProvider.CLAUDE:
+                content = result['content'][0]['text']
+            else:
+                content = result['choices'][0]['message']['content']
+            
+            # Parse JSON response
+            try:
+                # Extract JSON from markdown code blocks if present
+                if '```json' in content:
+                    content = content.split('```json')[1].split('```')[0].strip()
+                elif '```' in content:
+                    content = content.split('```')[1].split('```')[0].strip()
+                
+                parsed = json.loads(content)
+                
+                if DEBUG:
+                    logger.debug(f"✅ {config.provider.value} responded in {response_time:.2f}s")
+                
+                return LLMResponse(
+                    provider=config.provider,
+                    analysis=parsed.get('analysis', ''),
+                    proposed_fix=parsed.get('proposed_fix', ''),
+                    confidence=float(parsed.get('confidence', 0.5)),
+                    reasoning=parsed.get('reasoning', ''),
+                    response_time=response_time
+                )
+            
+            except json.JSONDecodeError as e:
+                logger.error(f"❌ {config.provider.value}: Failed to parse JSON: {e}")
+                logger.debug(f"🐛 Raw response: {content[:500]}...")
+                
+                # Return partial response
+                return LLMResponse(
+                    provider=config.provider,
+                    analysis=content,
+                    proposed_fix="",
+                    confidence=0.3,
+                    reasoning="Failed to parse structured response",
+                    error=f"JSON parse error: {str(e)}",
+                    response_time=response_time
+                )
         
         except asyncio.TimeoutError:
             error_msg = f"Timeout after {config.timeout}s"
@@ -429,13 +608,108 @@ Provide ONLY the JSON response, no other text.
                 response_time=time.time() - start_time
             )
     
+    def _hedge_delay(self, provider: LLMProvider) -> Optional[float]:
+        """Seconds after which a call to provider gets a hedged duplicate (its p95), None without enough samples."""
+        stats = self.latency.get(provider)
+        if stats is None or stats.total.count < self.hedge_min_samples:
+            return None
+        return stats.total.percentile(95) / 1000
+    
+    async def _call_provider_hedged(self, config: LLMConfig, prompt: str, hedge: bool) -> LLMResponse:
+        """
+        Call a provider; if hedging and the call outlives the provider's p95 latency,
+        send a duplicate request to its backup_endpoint and keep whichever answers
+        first. Without a distinct backup_endpoint there is no hedging: a duplicate
+        to the same, already slow endpoint only adds load to it. Only the same
+        provider is used as backup so each provider still casts exactly one vote.
+        """
+        has_backup = bool(config.backup_endpoint) and config.backup_endpoint != config.api_endpoint
+        delay = self._hedge_delay(config.provider) if hedge and has_backup else None
+        if delay is None or delay >= config.timeout:
+            return await self._call_provider(config, prompt)
+        
+        primary = asyncio.create_task(self._call_provider(config, prompt))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            
+            stats = self.latency.setdefault(config.provider, ProviderLatency())
+            stats.hedged_requests += 1
+            logger.info(f"🔁 {config.provider.value} exceeded p95 ({delay:.2f}s), sending hedged request")
+            backup_config = replace(config, api_endpoint=config.backup_endpoint)
+            backup = asyncio.create_task(self._call_provider(backup_config, prompt))
+            tasks.add(backup)
+            
+            result = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if not result.error:
+                        if task is backup:
+                            stats.hedge_wins += 1
+                        return result
+            return result  # Both failed: report the last error
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let the losers finish cancelling so their connections go back to the pool
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _build_prompts(
+        self,
+        bug_description: str,
+        code_context: Dict[str, str],
+        test_failures: List[str],
+        previous_attempts: Optional[List[str]],
+        providers: Optional[List[LLMProvider]]
+    ) -> Dict[LLMProvider, str]:
+        """Build the prompt for each selected, configured provider"""
+        if DEBUG:
+            logger.debug(f"🐛 Starting multi-LLM bug analysis")
+            logger.debug(f"🔍 Bug: {bug_description[:100]}...")
+            logger.debug(f"📊 Code context: {len(code_context)} files")
+            logger.debug(f"❌ Test failures: {len(test_failures)}")
+        
+        # Select providers
+        if providers is None:
+            providers = list(self.providers_config.keys())
+        
+        return {
+            provider: self._build_prompt(
+                provider,
+                bug_description,
+                code_context,
+                test_failures,
+                previous_attempts
+            )
+            for provider in providers
+            if provider in self.providers_config
+        }
+    
+    @staticmethod
+    def _exception_response(provider: LLMProvider, exc: BaseException) -> LLMResponse:
+        """Error response for a provider call that raised"""
+        logger.error(f"❌ {provider.value} raised exception: {exc}")
+        return LLMResponse(
+            provider=provider,
+            analysis="",
+            proposed_fix="",
+            confidence=0.0,
+            reasoning="",
+            error=str(exc)
+        )
+    
     async def analyze_bug(
         self,
         bug_description: str,
         code_context: Dict[str, str],
         test_failures: List[str],
         previous_attempts: Optional[List[str]] = None,
-        providers: Optional[List[LLMProvider]] = None
+        providers: Optional[List[LLMProvider]] = None,
+        hedge: bool = False
     ) -> List[LLMResponse]:
         """
         Analyze a bug using multiple LLMs in parallel
@@ -446,58 +720,26 @@ Provide ONLY the JSON response, no other text.
             test_failures: List of test failure messages
             previous_attempts: Previous fix attempts that failed
             providers: Specific providers to use (default: all)
+            hedge: Send a duplicate request when a call exceeds the provider's p95 latency
         
         Returns:
             List of LLMResponse objects
         """
-        if DEBUG:
-            logger.debug(f"🐛 Starting multi-LLM bug analysis")
-            logger.debug(f"🔍 Bug: {bug_description[:100]}...")
-            logger.debug(f"📊 Code context: {len(code_context)} files")
-            logger.debug(f"❌ Test failures: {len(test_failures)}")
-        
-        # Select providers
-        if providers is None:
-            providers = list(self.providers_config.keys())
-        
-        # Build prompts for each provider
-        prompts = {}
-        for provider in providers:
-            if provider in self.providers_config:
-                prompt = self._build_prompt(
-                    provider,
-                    bug_description,
-                    code_context,
-                    test_failures,
-                    previous_attempts
-                )
-                prompts[provider] = prompt
+        prompts = self._build_prompts(bug_description, code_context, test_failures, previous_attempts, providers)
         
         # Call all providers in parallel
         tasks = [
-            self._call_provider(self.providers_config[provider], prompts[provider])
-            for provider in prompts.keys()
+            self._call_provider_hedged(self.providers_config[provider], prompt, hedge)
+            for provider, prompt in prompts.items()
         ]
         
         responses = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Filter out exceptions and convert to list
-        valid_responses = []
-        for i, response in enumerate(responses):
-            if isinstance(response, Exception):
-                provider = list(prompts.keys())[i]
-                logger.error(f"❌ {provider.value} raised exception: {response}")
-                # Create error response
-                valid_responses.append(LLMResponse(
-                    provider=provider,
-                    analysis="",
-                    proposed_fix="",
-                    confidence=0.0,
-                    reasoning="",
-                    error=str(response)
-                ))
-            else:
-                valid_responses.append(response)
+        # Convert exceptions to error responses
+        valid_responses = [
+            self._exception_response(provider, response) if isinstance(response, Exception) else response
+            for provider, response in zip(prompts, responses)
+        ]
         
         # Log summary
         successful = [r for r in valid_responses if not r.error]
@@ -508,12 +750,67 @@ Provide ONLY the JSON response, no other text.
         
         return valid_responses
     
+    async def iter_bug_analyses(
+        self,
+        bug_description: str,
+        code_context: Dict[str, str],
+        test_failures: List[str],
+        previous_attempts: Optional[List[str]] = None,
+        providers: Optional[List[LLMProvider]] = None,
+        hedge: bool = False
+    ) -> AsyncIterator[LLMResponse]:
+        """
+        Analyze a bug with multiple LLMs in parallel, yielding responses as they complete
+        
+        Same arguments as analyze_bug(). Stop early with `await iterator.aclose()`:
+        provider calls that are still running are cancelled.
+        
+        Yields:
+            LLMResponse objects, fastest provider first
+        """
+        prompts = self._build_prompts(bug_description, code_context, test_failures, previous_attempts, providers)
+        tasks = {
+            asyncio.create_task(self._call_provider_hedged(self.providers_config[provider], prompt, hedge)): provider
+            for provider, prompt in prompts.items()
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: list(prompts).index(tasks[t])):
+                    if task.exception() is not None:
+                        yield self._exception_response(tasks[task], task.exception())
+                    else:
+                        yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                if DEBUG:
+                    logger.debug(f"🛑 Cancelled {len(pending)} outstanding provider call(s)")
+    
     def get_provider_weights(self) -> Dict[LLMProvider, float]:
         """Get configured weights for each provider"""
         return {
             provider: config.weight
             for provider, config in self.providers_config.items()
         }
+    
+    def get_provider_latency_stats(self) -> Dict[LLMProvider, Dict[str, Any]]:
+        """Get latency histograms (connect / ttfb / total) and connection reuse per provider"""
+        return {
+            provider: {
+                'connect': stats.connect.to_dict(),
+                'ttfb': stats.ttfb.to_dict(),
+                'total': stats.total.to_dict(),
+                'new_connections': stats.new_connections,
+                'reused_connections': stats.reused_connections,
+                'hedged_requests': stats.hedged_requests,
+                'hedge_wins': stats.hedge_wins
+            }
+            for provider, stats in self.latency.items()
+        }
 
 
 # CLI for testing
@@ -548,13 +845,13 @@ if __name__ == "__main__":
     
     # Run analysis
     async def main():
-        orchestrator = MultiLLMOrchestrator()
-        responses = await orchestrator.analyze_bug(
-            bug_description=args.bug,
-            code_context=code_context,
-            test_failures=[args.test_failure],
-            providers=providers
-        )
+        async with MultiLLMOrchestrator() as orchestrator:
+            responses = await orchestrator.analyze_bug(
+                bug_description=args.bug,
+                code_context=code_context,
+                test_failures=[args.test_failure],
+                providers=providers
+            )
         
         print("\n" + "="*80)
         print("MULTI-LLM ANALYSIS RESULTS")
@@ -461,7 +461,13 @@ class PRReviewAgent:
             'output': result['output']
         }
     
-    def _llm_review_file(self, filename: str, patch: str, file_content: Optional[str] = None) -> List[str]:
+    def _llm_review_file(
+        self,
+        filename: str,
+        patch: str,
+        file_content: Optional[str] = None,
+        cache: Optional[bool] = None
+    ) -> List[str]:
         """
         Perform LLM-powered code review of a file.
         
@@ -471,11 +477,12 @@ class PRReviewAgent:
             filename: Name of the file being reviewed
             patch: Git diff patch
             file_content: Full file content (optional, for context)
+            cache: LLM response cache policy (see ReviewLogic.llm_review_file)
         
         Returns:
             List of LLM-identified issues
         """
-        return self.review_logic.llm_review_file(filename, patch, file_content)
+        return self.review_logic.llm_review_file(filename, patch, file_content, cache=cache)
     
     def assign_reviewers(self, repo: str, pr_number: int, reviewers: list) -> bool:
         """Assign reviewers to a PR.
@@ -10,6 +10,8 @@ import logging
 from typing import List, Dict, Optional
 import requests
 
+from engine.core.llm_response_cache import get_llm_response_cache, make_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,7 +114,8 @@ class ReviewLogic:
             
             # If LLM review is enabled, get LLM feedback
             if self.use_llm:
-                llm_issues = self.llm_review_file(filename, patch, file_content)
+                # Unchanged files of a re-reviewed PR get the cached review
+                llm_issues = self.llm_review_file(filename, patch, file_content, cache=True)
                 issues.extend(llm_issues)
         
         except Exception as e:
@@ -177,7 +180,8 @@ class ReviewLogic:
         self,
         filename: str,
         patch: str,
-        file_content: Optional[str] = None
+        file_content: Optional[str] = None,
+        cache: Optional[bool] = None
     ) -> List[str]:
         """
         Perform LLM-powered code review of a file.
@@ -186,6 +190,9 @@ class ReviewLogic:
             filename: Name of the file being reviewed
             patch: Git diff patch
             file_content: Full file content (optional, for context)
+            cache: True serves a repeated review from the LLM response cache,
+                False bypasses it, None (default) caches only deterministic
+                (temperature 0) reviews
         
         Returns:
             List of LLM-identified issues
@@ -220,24 +227,42 @@ Provide feedback in this format:
 
 Be concise. Only report real issues, not nitpicks."""
 
-            # Query Ollama
-            response = requests.post(
-                self.ollama_url,
-                json={
-                    "model": self.llm_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,  # Lower temperature for more focused reviews
-                        "num_predict": 500   # Limit response length
-                    }
-                },
-                timeout=30
-            )
+            options = {
+                "temperature": 0.3,  # Lower temperature for more focused reviews
+                "num_predict": 500   # Limit response length
+            }
             
-            if response.status_code == 200:
-                llm_response = response.json().get('response', '').strip()
-                
+            if cache is None:
+                cache = options["temperature"] == 0
+            response_cache = get_llm_response_cache() if cache else None
+            cache_key = None
+            if response_cache is not None:
+                cache_key = make_key(
+                    f"ollama:{self.ollama_url}", self.llm_model, [{"role": "user", "content": prompt}], options
+                )
+            cached = response_cache.get(cache_key) if response_cache else None
+            
+            if cached is not None:
+                status_code, llm_response = 200, cached["content"]
+                logger.info(f"   💾 Using cached review for {filename}")
+            else:
+                # Query Ollama
+                response = requests.post(
+                    self.ollama_url,
+                    json={
+                        "model": self.llm_model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": options
+                    },
+                    timeout=30
+                )
+                status_code = response.status_code
+                llm_response = response.json().get('response', '').strip() if status_code == 200 else ""
+                if response_cache and llm_response:
+                    response_cache.put(cache_key, {"content": llm_response, "model": self.llm_model})
+            
+            if status_code == 200:
                 if llm_response and len(llm_response) > 10:
                     # Parse LLM response into issues
                     lines = llm_response.split('\n')
@@ -252,7 +277,7 @@ Be concise. Only report real issues, not nitpicks."""
                     
                     logger.info(f"   Found {len(issues)} LLM-identified issue(s)")
             else:
-                logger.warning(f"   LLM API error: status {response.status_code}")
+                logger.warning(f"   LLM API error: status {status_code}")
         
         except requests.exceptions.Timeout:
             logger.warning(f"   LLM review timeout for {filename}")
@@ -7,6 +7,7 @@ Includes mandatory security audits for PRs from non-trusted accounts.
 """
 
 import asyncio
+import inspect
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -484,7 +485,12 @@ class PRReviewer:
         prompt = self._generate_review_prompt(filename, patch)
         
         try:
-            response = await self.llm_agent.generate(prompt)
+            aquery = getattr(self.llm_agent, 'aquery_llm', None)
+            if inspect.iscoroutinefunction(aquery):
+                # Unchanged files of a re-reviewed draft PR produce the same prompt
+                response = await aquery(prompt, cache=True)
+            else:
+                response = await self.llm_agent.generate(prompt)
             return self._parse_llm_comments(response, filename)
         except Exception as e:
             logger.warning(f"LLM review failed: {e}")
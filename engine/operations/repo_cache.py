@@ -0,0 +1,363 @@
+"""Persistent git mirror cache with per-run worktrees.
+
+PipelineOrchestrator used to `git clone` the target repository into a fresh
+temp directory for every issue and change request, which dominates wall-clock
+time and bandwidth on large repositories. RepoCacheManager instead keeps one
+bare mirror per repository, updates it with an incremental `git fetch` and
+hands out `git worktree` checkouts per pipeline run.
+
+Layout (under cache_dir, default <project root>/data/repo_cache):
+    mirrors/<owner>__<repo>.git    bare repository, origin/* remote-tracking refs
+    mirrors/<owner>__<repo>.lock   flock serializing fetch / worktree changes
+    worktrees/<owner>__<repo>/<run-id>/   checkout for one pipeline run
+
+Tokens are never written to disk: authentication is passed to git through
+GIT_CONFIG_* environment variables (RepoCheckout.env), so pushes from a
+worktree must run with that environment.
+
+Housekeeping (gc()):
+- Worktrees older than stale_after_seconds (crashed runs) are removed
+- Mirrors are evicted least-recently-used first while the cache exceeds
+  max_disk_bytes; mirrors with live worktrees are never evicted
+"""
+
+import base64
+import fcntl
+import logging
+import os
+import shutil
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = str(Path(__file__).resolve().parent.parent.parent / "data" / "repo_cache")
+GITHUB_URL_TEMPLATE = "https://github.com/{repo}.git"
+LAST_USED_MARKER = "agent-forge-last-used"
+
+
+class RepoCacheError(RuntimeError):
+    """Raised when a mirror or worktree cannot be prepared."""
+
+
+@dataclass
+class RepoCheckout:
+    """Worktree checkout handed to one pipeline run."""
+    repo: str
+    path: Path
+    branch: str
+    base_ref: str
+    mirror: Path
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+class RepoCacheManager:
+    """Bare mirror cache handing out git worktrees."""
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_disk_bytes: int = 20 * 1024 ** 3,
+        stale_after_seconds: int = 6 * 3600,
+        url_template: str = GITHUB_URL_TEMPLATE,
+        gc_interval_seconds: int = 600
+    ):
+        """Initialize repo cache manager.
+
+        Args:
+            cache_dir: Root directory for mirrors and worktrees
+            max_disk_bytes: Disk quota for the whole cache
+            stale_after_seconds: Age after which abandoned worktrees are removed
+            url_template: Remote URL for a repository (``{repo}`` = owner/name);
+                tests point this at local bare repositories
+            gc_interval_seconds: Minimum time between automatic gc() runs on release
+        """
+        self.cache_dir = Path(cache_dir)
+        self.mirrors_dir = self.cache_dir / "mirrors"
+        self.worktrees_dir = self.cache_dir / "worktrees"
+        self.max_disk_bytes = max_disk_bytes
+        self.stale_after_seconds = stale_after_seconds
+        self.url_template = url_template
+        self.gc_interval_seconds = gc_interval_seconds
+        self._last_gc = 0.0
+
+    @staticmethod
+    def _slug(repo: str) -> str:
+        return repo.replace('/', '__')
+
+    def mirror_path(self, repo: str) -> Path:
+        return self.mirrors_dir / f"{self._slug(repo)}.git"
+
+    def git_env(self, token: Optional[str] = None) -> Dict[str, str]:
+        """Environment for git commands, carrying auth without persisting it.
+
+        Args:
+            token: GitHub token (None = no auth header)
+
+        Returns:
+            Copy of os.environ with GIT_CONFIG_* auth entries
+        """
+        env = os.environ.copy()
+        env['GIT_TERMINAL_PROMPT'] = '0'
+        if token:
+            basic = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+            env['GIT_CONFIG_COUNT'] = '1'
+            env['GIT_CONFIG_KEY_0'] = 'http.https://github.com/.extraheader'
+            env['GIT_CONFIG_VALUE_0'] = f"AUTHORIZATION: basic {basic}"
+        return env
+
+    @staticmethod
+    def _git(args: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
+             check: bool = True) -> subprocess.CompletedProcess:
+        result = subprocess.run(
+            ['git'] + args,
+            cwd=str(cwd) if cwd else None,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if check and result.returncode != 0:
+            raise RepoCacheError(f"git {args[0]} failed: {(result.stderr or '').strip()}")
+        return result
+
+    @contextmanager
+    def _locked(self, repo: str, blocking: bool = True) -> Iterator[bool]:
+        """Serialize mirror updates across threads and processes.
+
+        With blocking=False, yields False instead of waiting for a held lock.
+        """
+        self.mirrors_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = self.mirrors_dir / f"{self._slug(repo)}.lock"
+        with open(lock_path, 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _ensure_mirror_locked(self, repo: str, env: Dict[str, str]) -> Path:
+        """Create the bare mirror or fetch it incrementally (lock held)."""
+        mirror = self.mirror_path(repo)
+        url = self.url_template.format(repo=repo)
+
+        if not (mirror / "HEAD").exists():
+            logger.info(f"📥 Creating mirror for {repo}")
+            if mirror.exists():
+                shutil.rmtree(mirror)  # Leftover from an interrupted clone
+            mirror.mkdir(parents=True)
+            self._git(['init', '--bare', '--quiet'], cwd=mirror)
+            self._git(['remote', 'add', 'origin', url], cwd=mirror)
+            # Remote-tracking refs keep local worktree branches separate from GitHub's
+            self._git(['config', 'remote.origin.fetch', '+refs/heads/*:refs/remotes/origin/*'], cwd=mirror)
+            start = time.time()
+            try:
+                self._git(['fetch', '--quiet', '--prune', 'origin'], cwd=mirror, env=env)
+            except RepoCacheError:
+                shutil.rmtree(mirror, ignore_errors=True)
+                raise
+            self._git(['remote', 'set-head', 'origin', '--auto'], cwd=mirror, env=env, check=False)
+            logger.info(f"✅ Mirror for {repo} created in {time.time() - start:.1f}s")
+        else:
+            start = time.time()
+            self._git(['fetch', '--quiet', '--prune', 'origin'], cwd=mirror, env=env)
+            logger.debug(f"🔄 Fetched {repo} in {time.time() - start:.1f}s")
+
+        (mirror / LAST_USED_MARKER).touch()
+        return mirror
+
+    def ensure_mirror(self, repo: str, token: Optional[str] = None) -> Path:
+        """Create or incrementally update the mirror for a repository.
+
+        Args:
+            repo: Repository (owner/repo)
+            token: GitHub token for the fetch
+
+        Returns:
+            Path to the bare mirror
+        """
+        with self._locked(repo):
+            return self._ensure_mirror_locked(repo, self.git_env(token))
+
+    def _default_branch(self, mirror: Path) -> str:
+        result = self._git(['symbolic-ref', 'refs/remotes/origin/HEAD'], cwd=mirror, check=False)
+        ref = (result.stdout or '').strip()
+        if result.returncode == 0 and ref.startswith('refs/remotes/origin/'):
+            return ref.split('refs/remotes/origin/', 1)[1]
+        return 'main'
+
+    def checkout(
+        self,
+        repo: str,
+        branch: str,
+        token: Optional[str] = None,
+        start_point: Optional[str] = None
+    ) -> RepoCheckout:
+        """Fetch the mirror and create a worktree on a branch.
+
+        The branch is (re)created from start_point, so stale local branches
+        from earlier runs never leak into a new run.
+
+        Args:
+            repo: Repository (owner/repo)
+            branch: Local branch to check out in the worktree
+            token: GitHub token for fetch (and later push via RepoCheckout.env)
+            start_point: Ref to branch from (default: origin/<default branch>)
+
+        Returns:
+            RepoCheckout for the new worktree
+
+        Raises:
+            RepoCacheError: If fetching or creating the worktree fails
+        """
+        env = self.git_env(token)
+        run_dir = self.worktrees_dir / self._slug(repo) / f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        run_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._locked(repo):
+            mirror = self._ensure_mirror_locked(repo, env)
+            base_ref = self._default_branch(mirror)
+            start = start_point or f"origin/{base_ref}"
+            self._git(['worktree', 'add', '--quiet', '-B', branch, str(run_dir), start], cwd=mirror)
+
+        logger.info(f"📁 Worktree for {repo}@{branch}: {run_dir}")
+        return RepoCheckout(repo=repo, path=run_dir, branch=branch, base_ref=base_ref, mirror=mirror, env=env)
+
+    def release(self, checkout: RepoCheckout):
+        """Remove a worktree and its local branch.
+
+        Args:
+            checkout: Checkout returned by checkout()
+        """
+        with self._locked(checkout.repo):
+            self._git(['worktree', 'remove', '--force', str(checkout.path)], cwd=checkout.mirror, check=False)
+            if checkout.path.exists():
+                shutil.rmtree(checkout.path, ignore_errors=True)
+            self._git(['worktree', 'prune'], cwd=checkout.mirror, check=False)
+            self._git(['branch', '-D', checkout.branch], cwd=checkout.mirror, check=False)
+        logger.info(f"🧹 Released worktree: {checkout.path}")
+
+        if time.time() - self._last_gc >= self.gc_interval_seconds:
+            self.gc()
+
+    @contextmanager
+    def workspace(
+        self,
+        repo: str,
+        branch: str,
+        token: Optional[str] = None,
+        start_point: Optional[str] = None
+    ) -> Iterator[RepoCheckout]:
+        """Context manager around checkout() / release()."""
+        checkout = self.checkout(repo, branch, token=token, start_point=start_point)
+        try:
+            yield checkout
+        finally:
+            self.release(checkout)
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def disk_usage(self) -> int:
+        """Total bytes used by mirrors and worktrees."""
+        return self._dir_size(self.cache_dir) if self.cache_dir.exists() else 0
+
+    def gc(self) -> Dict[str, int]:
+        """Remove stale worktrees and enforce the disk quota.
+
+        Returns:
+            Dict with counts of removed worktrees and evicted mirrors
+        """
+        self._last_gc = time.time()
+        removed_worktrees = 0
+        evicted_mirrors = 0
+        if not self.cache_dir.exists():
+            return {'worktrees_removed': 0, 'mirrors_evicted': 0}
+
+        # 1. Stale worktrees from crashed or killed runs
+        cutoff = time.time() - self.stale_after_seconds
+        for repo_dir in self.worktrees_dir.glob("*") if self.worktrees_dir.exists() else []:
+            repo = repo_dir.name.replace('__', '/', 1)
+            mirror = self.mirror_path(repo)
+            for run_dir in repo_dir.iterdir():
+                if run_dir.stat().st_mtime >= cutoff:
+                    continue
+                with self._locked(repo):
+                    if mirror.exists():
+                        self._git(['worktree', 'remove', '--force', str(run_dir)], cwd=mirror, check=False)
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                removed_worktrees += 1
+                logger.info(f"🧹 Removed stale worktree: {run_dir}")
+            if mirror.exists():
+                self._git(['worktree', 'prune'], cwd=mirror, check=False)
+
+        # 2. Disk quota: evict least recently used idle mirrors
+        usage = self.disk_usage()
+        if usage > self.max_disk_bytes and self.mirrors_dir.exists():
+            def last_used(mirror: Path) -> float:
+                marker = mirror / LAST_USED_MARKER
+                return marker.stat().st_mtime if marker.exists() else 0.0
+
+            for mirror in sorted(self.mirrors_dir.glob("*.git"), key=last_used):
+                if usage <= self.max_disk_bytes:
+                    break
+                slug = mirror.name[:-len(".git")]
+                repo_worktrees = self.worktrees_dir / slug
+                with self._locked(slug.replace('__', '/', 1), blocking=False) as locked:
+                    if not locked:
+                        continue  # Being fetched or checked out right now
+                    if repo_worktrees.exists() and any(repo_worktrees.iterdir()):
+                        continue  # In use by a running pipeline
+                    size = self._dir_size(mirror)
+                    shutil.rmtree(mirror, ignore_errors=True)
+                usage -= size
+                evicted_mirrors += 1
+                logger.info(f"🧹 Evicted mirror {mirror.name} ({size / 1024 ** 2:.0f} MB) to stay under quota")
+
+            if usage > self.max_disk_bytes:
+                logger.warning(
+                    f"⚠️ Repo cache still over quota ({usage / 1024 ** 3:.1f} GB > "
+                    f"{self.max_disk_bytes / 1024 ** 3:.1f} GB), all mirrors in use"
+                )
+
+        return {'worktrees_removed': removed_worktrees, 'mirrors_evicted': evicted_mirrors}
+
+
+# Global cache instance
+_global_repo_cache: Optional[RepoCacheManager] = None
+
+
+def get_repo_cache() -> RepoCacheManager:
+    """Get or create global repo cache manager.
+
+    The location can be overridden with AGENT_FORGE_REPO_CACHE_DIR.
+    """
+    global _global_repo_cache
+    if _global_repo_cache is None:
+        _global_repo_cache = RepoCacheManager(
+            cache_dir=os.getenv("AGENT_FORGE_REPO_CACHE_DIR", DEFAULT_CACHE_DIR)
+        )
+    return _global_repo_cache
+
+
+def reset_repo_cache():
+    """Reset global repo cache manager (for testing)."""
+    global _global_repo_cache
+    _global_repo_cache = None
@@ -0,0 +1,225 @@
+"""GraphQL-backed repository snapshots for the polling service.
+
+A single paginated GraphQL query per repository returns everything one poll
+cycle needs:
+
+- Open issues carrying any of the requested labels, with their latest comments
+  (used for claim detection)
+- Open pull requests with head SHA, draft flag, labels, latest review state
+  and latest comments (used for PR review and draft PR handling)
+
+This replaces one REST call per watch label, one per PR list, one comments
+call per actionable issue and several calls per draft PR with one query
+(plus extra pages for very busy repositories).
+
+Issues and PRs are converted to the same dictionary shapes the REST helpers
+return, so downstream filters do not need to know where data came from.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from engine.operations.async_github_api_helper import AsyncGitHubAPIHelper
+from engine.operations.bot_operations import extract_critical_issues
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_QUERY = """
+query RepoSnapshot(
+  $owner: String!, $name: String!, $labels: [String!],
+  $issueCursor: String, $prCursor: String,
+  $withIssues: Boolean!, $withPRs: Boolean!,
+  $pageSize: Int!, $commentCount: Int!
+) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $pageSize, after: $issueCursor, states: OPEN, labels: $labels,
+           orderBy: {field: CREATED_AT, direction: ASC}) @include(if: $withIssues) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title body url state createdAt updatedAt
+        labels(first: 30) { nodes { name } }
+        assignees(first: 10) { nodes { login } }
+        comments(last: $commentCount) {
+          nodes { author { login } body createdAt updatedAt }
+        }
+      }
+    }
+    pullRequests(first: $pageSize, after: $prCursor, states: OPEN,
+                 orderBy: {field: CREATED_AT, direction: ASC}) @include(if: $withPRs) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title url isDraft headRefOid headRefName baseRefName createdAt updatedAt
+        author { login }
+        labels(first: 30) { nodes { name } }
+        reviews(last: 1) { nodes { state } }
+        comments(last: $commentCount) { nodes { body } }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass
+class RepoSnapshot:
+    """Point-in-time view of a repository's open issues and pull requests."""
+
+    repository: str
+    issues: List[Dict] = field(default_factory=list)  # gh CLI format + 'comments'
+    pull_requests: List[Dict] = field(default_factory=list)  # REST format + review info
+    fetched_at: float = field(default_factory=time.time)
+    pages: int = 0  # GraphQL requests used to build the snapshot
+
+    def issues_with_labels(self, labels: List[str]) -> List[Dict]:
+        """Return issues carrying any of the given labels."""
+        wanted = set(labels)
+        return [
+            issue for issue in self.issues
+            if any(label['name'] in wanted for label in issue.get('labels', []))
+        ]
+
+    def draft_prs_by_author(self, author: str) -> List[Dict]:
+        """Return draft PRs opened by the given user."""
+        return [
+            pr for pr in self.pull_requests
+            if pr.get('draft') and pr.get('user', {}).get('login') == author
+        ]
+
+
+def _login(node: Optional[Dict]) -> str:
+    """Return login of a possibly deleted (null) GraphQL actor."""
+    return (node or {}).get('login') or 'ghost'
+
+
+def _convert_issue(node: Dict, repository: str) -> Dict:
+    """Convert a GraphQL issue node to the gh CLI-style issue dict."""
+    return {
+        'number': node['number'],
+        'title': node['title'],
+        'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+        'assignees': [{'login': user['login']} for user in node['assignees']['nodes']],
+        'url': node['url'],
+        'createdAt': node['createdAt'],
+        'updatedAt': node['updatedAt'],
+        'state': node['state'].lower(),
+        'body': node.get('body', ''),
+        'repository': repository,
+        'comments': [
+            {
+                'author': {'login': _login(comment.get('author'))},
+                'body': comment['body'],
+                'createdAt': comment['createdAt'],
+                'updatedAt': comment['updatedAt']
+            }
+            for comment in node['comments']['nodes']
+        ]
+    }
+
+
+def _convert_pull_request(node: Dict) -> Dict:
+    """Convert a GraphQL pull request node to a REST-style PR dict."""
+    reviews = node['reviews']['nodes']
+    critical_issues = extract_critical_issues(node['comments']['nodes'])
+    return {
+        'number': node['number'],
+        'title': node['title'],
+        'html_url': node['url'],
+        'draft': node['isDraft'],
+        'user': {'login': _login(node.get('author'))},
+        'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+        'head': {'sha': node['headRefOid'], 'ref': node['headRefName']},
+        'base': {'ref': node['baseRefName']},
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'latest_review_state': reviews[-1]['state'] if reviews else None,
+        'critical_issues': critical_issues,
+        'has_unresolved_issues': len(critical_issues) > 0
+    }
+
+
+class RepoSnapshotFetcher:
+    """Fetches RepoSnapshot objects via the GitHub GraphQL API."""
+
+    def __init__(
+        self,
+        github_api: AsyncGitHubAPIHelper,
+        page_size: int = 50,
+        comment_count: int = 20
+    ):
+        """Initialize snapshot fetcher.
+
+        Args:
+            github_api: Async GitHub helper used for GraphQL requests
+            page_size: Issues / PRs per page (max 100)
+            comment_count: Latest comments fetched per issue / PR
+        """
+        self.github_api = github_api
+        self.page_size = min(page_size, 100)
+        self.comment_count = comment_count
+
+    async def fetch(
+        self,
+        repo: str,
+        labels: List[str],
+        include_pull_requests: bool = True
+    ) -> RepoSnapshot:
+        """Fetch snapshot for one repository.
+
+        Args:
+            repo: Repository (owner/repo)
+            labels: Only issues carrying any of these labels are included
+            include_pull_requests: Whether to include open pull requests
+
+        Returns:
+            RepoSnapshot for the repository
+        """
+        owner, name = repo.split('/')
+        snapshot = RepoSnapshot(repository=repo)
+
+        issue_cursor = None
+        pr_cursor = None
+        with_issues = bool(labels)
+        with_prs = include_pull_requests
+
+        while with_issues or with_prs:
+            data = await self.github_api.graphql(
+                SNAPSHOT_QUERY,
+                {
+                    'owner': owner,
+                    'name': name,
+                    'labels': list(labels),
+                    'issueCursor': issue_cursor,
+                    'prCursor': pr_cursor,
+                    'withIssues': with_issues,
+                    'withPRs': with_prs,
+                    'pageSize': self.page_size,
+                    'commentCount': self.comment_count
+                },
+                target=repo
+            )
+            snapshot.pages += 1
+
+            repository = data.get('repository')
+            if repository is None:
+                raise RuntimeError(f"Repository {repo} not found or not accessible")
+
+            if with_issues:
+                issues = repository['issues']
+                snapshot.issues.extend(_convert_issue(node, repo) for node in issues['nodes'])
+                with_issues = issues['pageInfo']['hasNextPage']
+                issue_cursor = issues['pageInfo']['endCursor']
+
+            if with_prs:
+                prs = repository['pullRequests']
+                snapshot.pull_requests.extend(_convert_pull_request(node) for node in prs['nodes'])
+                with_prs = prs['pageInfo']['hasNextPage']
+                pr_cursor = prs['pageInfo']['endCursor']
+
+        logger.debug(
+            f"📸 Snapshot {repo}: {len(snapshot.issues)} issues, "
+            f"{len(snapshot.pull_requests)} PRs in {snapshot.pages} request(s)"
+        )
+        return snapshot
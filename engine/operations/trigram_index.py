@@ -0,0 +1,399 @@
+"""
+Trigram index for in-process codebase search.
+
+CodebaseSearch used to fork `find` plus one `grep` per matched file. This
+module keeps an index of the workspace in memory instead:
+
+- Files are enumerated in-process, honoring .gitignore files (nested,
+  negated, directory-only and anchored patterns) and .git/info/exclude;
+  binary files and files over max_file_bytes are skipped.
+- Every file contributes its set of lowercase trigrams. The literals a query
+  requires (the fixed string itself, or the literal runs of the regex parse
+  tree) select candidate files by intersecting posting lists; only those
+  files are read and verified line by line with the real regex.
+- refresh() re-stats the tree and re-reads only files whose mtime or size
+  changed. Every search refreshes first (the stat walk is cheap next to the
+  reads it saves), so a search right after a write sees the new content;
+  refresh_interval can throttle this for very large trees.
+
+Results use the dict format CodebaseSearch always returned (file, line_num,
+line_content, context_before, context_after).
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+
+MAX_FILE_BYTES = 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+ALWAYS_SKIP = {'.git'}
+
+
+def trigrams(text: str) -> Set[str]:
+    """Lowercase trigrams of text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def required_literals(pattern: str) -> List[str]:
+    """Literal substrings every match of a regex must contain.
+
+    Conservative: alternations, classes and optional parts end a literal run,
+    so the result may be empty (no filtering possible) but is never wrong.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return []
+    literals: List[str] = []
+    _collect_literals(parsed, literals)
+    return literals
+
+
+def _collect_literals(items, literals: List[str]):
+    run: List[str] = []
+
+    def flush():
+        if run:
+            literals.append(''.join(run))
+            run.clear()
+
+    for op, arg in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _collect_literals(arg[-1], literals)
+        elif op in _REPEATS and arg[0] >= 1:
+            _collect_literals(arg[2], literals)
+    flush()
+
+
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') if hasattr(sre_parse, name)
+)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without leading/trailing slash) into a regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        c = pattern[i]
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[' and pattern.find(']', i + 2) != -1:
+            end = pattern.find(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end
+        elif c == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 1
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+class GitIgnore:
+    """Rules of one .gitignore file, matched against paths relative to its directory."""
+
+    def __init__(self, lines: List[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negate, dir_only)
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if not line.endswith('\\ '):
+                line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            regex = _glob_to_regex(line)
+            self.rules.append((re.compile(f"^{regex}$" if anchored else f"^(?:.*/)?{regex}$"), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path) -> Optional['GitIgnore']:
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                rules = cls(f.readlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True = ignored, False = re-included, None = no rule matched (last rule wins)."""
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+@dataclass
+class _IndexedFile:
+    signature: Tuple[int, int]  # (mtime_ns, size)
+    grams: Optional[FrozenSet[str]]  # None: binary or unreadable, never searched
+
+
+class TrigramIndex:
+    """In-memory trigram index over a workspace."""
+
+    def __init__(
+        self,
+        root: str,
+        refresh_interval: float = 0.0,
+        max_file_bytes: int = MAX_FILE_BYTES
+    ):
+        """Create an index (built on the first search or refresh).
+
+        Args:
+            root: Workspace root
+            refresh_interval: Minimum seconds between automatic re-stats of the tree
+                (0: every search sees the latest writes)
+            max_file_bytes: Larger files are not indexed
+        """
+        self.root = Path(root).resolve()
+        self.refresh_interval = refresh_interval
+        self.max_file_bytes = max_file_bytes
+
+        self._files: Dict[str, _IndexedFile] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._refreshed_at: Optional[float] = None
+
+    def refresh(self, force: bool = False) -> int:
+        """Bring the index up to date with the workspace.
+
+        Args:
+            force: Re-stat even if the last refresh is more recent than refresh_interval
+
+        Returns:
+            Number of files (re)indexed or removed
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return 0
+
+            started = time.perf_counter()
+            current = self._enumerate()
+            removed = [rel for rel in self._files if rel not in current]
+            for rel in removed:
+                self._remove(rel)
+            changed = [rel for rel, sig in current.items() if rel not in self._files or self._files[rel].signature != sig]
+            for rel in changed:
+                self._add(rel, current[rel])
+
+            self._refreshed_at = time.monotonic()
+            if changed or removed:
+                logger.debug(
+                    f"📇 Trigram index {self.root.name}: {len(changed)} updated, {len(removed)} removed, "
+                    f"{len(self._files)} files ({(time.perf_counter() - started) * 1000:.0f} ms)"
+                )
+            return len(changed) + len(removed)
+
+    def search(
+        self,
+        pattern: str,
+        regex: bool = False,
+        ignore_case: bool = True,
+        context_lines: int = 2,
+        max_results: int = 50,
+        file_pattern: Optional[str] = None
+    ) -> List[Dict]:
+        """Search indexed files line by line.
+
+        Args:
+            pattern: Fixed string, or Python regex if regex=True
+            regex: Treat pattern as regex
+            ignore_case: Case-insensitive match
+            context_lines: Lines before/after each match to include
+            max_results: Stop after this many matches
+            file_pattern: Glob on the file name (e.g. "*.py") or relative path (e.g. "src/**/*.js")
+
+        Returns:
+            List of dicts with: file, line_num, line_content, context_before, context_after
+
+        Raises:
+            re.error: If pattern is an invalid regex
+        """
+        compiled = re.compile(pattern if regex else re.escape(pattern), re.IGNORECASE if ignore_case else 0)
+        literals = required_literals(pattern) if regex else [pattern]
+
+        self.refresh()
+        results: List[Dict] = []
+        for rel in self._candidates(literals):
+            if file_pattern and not _matches_file_pattern(rel, file_pattern):
+                continue
+            try:
+                with open(self.root / rel, encoding='utf-8', errors='replace') as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+
+            for i, line in enumerate(lines):
+                if not compiled.search(line):
+                    continue
+                results.append({
+                    'file': rel,
+                    'line_num': i + 1,
+                    'line_content': line.rstrip(),
+                    'context_before': [l.rstrip() for l in lines[max(0, i - context_lines):i]] if context_lines > 0 else [],
+                    'context_after': [l.rstrip() for l in lines[i + 1:i + 1 + context_lines]] if context_lines > 0 else []
+                })
+                if len(results) >= max_results:
+                    return results
+        return results
+
+    @property
+    def file_count(self) -> int:
+        """Number of searchable (text) files."""
+        with self._lock:
+            return sum(1 for entry in self._files.values() if entry.grams is not None)
+
+    def _candidates(self, literals: List[str]) -> List[str]:
+        """Files containing every trigram of the required literals, sorted by path."""
+        grams: Set[str] = set()
+        for literal in literals:
+            grams |= trigrams(literal)
+
+        with self._lock:
+            if not grams:
+                return sorted(rel for rel, entry in self._files.items() if entry.grams is not None)
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+        return sorted(candidates)
+
+    def _add(self, rel: str, signature: Tuple[int, int]):
+        if rel in self._files:
+            self._remove(rel)
+        grams = None
+        try:
+            with open(self.root / rel, 'rb') as f:
+                data = f.read(self.max_file_bytes + 1)
+            if b'\0' not in data[:BINARY_SNIFF_BYTES] and len(data) <= self.max_file_bytes:
+                grams = frozenset(trigrams(data.decode('utf-8', errors='replace')))
+        except OSError:
+            pass
+        self._files[rel] = _IndexedFile(signature, grams)
+        for gram in grams or ():
+            self._postings.setdefault(gram, set()).add(rel)
+
+    def _remove(self, rel: str):
+        entry = self._files.pop(rel)
+        for gram in entry.grams or ():
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(rel)
+                if not posting:
+                    del self._postings[gram]
+
+    def _enumerate(self) -> Dict[str, Tuple[int, int]]:
+        """Non-ignored regular files (relative posix path -> (mtime_ns, size))."""
+        files: Dict[str, Tuple[int, int]] = {}
+        root_rules = []
+        exclude = GitIgnore.from_file(self.root / '.git' / 'info' / 'exclude')
+        if exclude:
+            root_rules.append(('', exclude))
+
+        stack: List[Tuple[str, str, List[Tuple[str, GitIgnore]]]] = [(str(self.root), '', root_rules)]
+        while stack:
+            dir_path, rel_dir, rules = stack.pop()
+            gitignore = GitIgnore.from_file(Path(dir_path) / '.gitignore')
+            if gitignore:
+                rules = rules + [(rel_dir, gitignore)]
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name in ALWAYS_SKIP:
+                    continue
+                rel = rel_dir + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if _ignored(rel, is_dir, rules):
+                        continue
+                    if is_dir:
+                        stack.append((entry.path, rel + '/', rules))
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_size <= self.max_file_bytes:
+                            files[rel] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return files
+
+
+def _ignored(rel: str, is_dir: bool, rules: List[Tuple[str, GitIgnore]]) -> bool:
+    """Apply .gitignore files from the root down; deeper files override."""
+    ignored = False
+    for base, gitignore in rules:
+        result = gitignore.match(rel[len(base):], is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def _matches_file_pattern(rel: str, file_pattern: str) -> bool:
+    if '/' not in file_pattern:
+        return fnmatch.fnmatchcase(rel.rsplit('/', 1)[-1], file_pattern)
+    return fnmatch.fnmatchcase(rel, file_pattern) or fnmatch.fnmatchcase(rel, file_pattern.replace('**/', ''))
+
+
+_indexes: Dict[Path, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_trigram_index(root: str) -> TrigramIndex:
+    """Shared index per workspace root (all CodebaseSearch instances reuse it)."""
+    key = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = TrigramIndex(str(key))
+        return index
@@ -0,0 +1,263 @@
+"""
+GitHub webhook ingestion for event-driven dispatch.
+
+Provides:
+- POST /api/webhooks/github - Receives GitHub webhook deliveries
+
+Deliveries are verified against the shared secret (X-Hub-Signature-256),
+deduplicated by delivery ID and pushed onto an in-process WebhookEventQueue.
+PollingService consumes the queue and dispatches to the same
+start_issue_workflow / trigger_pr_review paths used by polling, which then
+only serves as a slow reconciliation sweep.
+
+Environment Variables:
+    GITHUB_WEBHOOK_SECRET - Shared secret configured on the GitHub webhook
+    GITHUB_WEBHOOK_RECORD_DIR - Optional directory where verified deliveries
+        are saved for offline replay (see scripts/replay_webhooks.py)
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+
+# Events PollingService knows how to dispatch
+SUPPORTED_EVENTS = {"issues", "issue_comment", "pull_request"}
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+
+
+def compute_signature(secret: str, body: bytes) -> str:
+    """Compute GitHub-style HMAC-SHA256 signature for a payload.
+
+    Args:
+        secret: Webhook secret
+        body: Raw request body
+
+    Returns:
+        Signature header value (``sha256=<hex>``)
+    """
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Verify X-Hub-Signature-256 header against the raw body.
+
+    Args:
+        secret: Webhook secret
+        body: Raw request body
+        signature: Value of the X-Hub-Signature-256 header
+
+    Returns:
+        True if the signature matches
+    """
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(compute_signature(secret, body), signature)
+
+
+@dataclass
+class WebhookEvent:
+    """A verified GitHub webhook delivery."""
+    event: str  # X-GitHub-Event (issues, pull_request, ...)
+    delivery_id: str  # X-GitHub-Delivery
+    payload: Dict[str, Any]
+    received_at: float = field(default_factory=time.time)
+
+    @property
+    def action(self) -> Optional[str]:
+        return self.payload.get('action')
+
+    @property
+    def repository(self) -> Optional[str]:
+        return (self.payload.get('repository') or {}).get('full_name')
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize for recording / replay."""
+        return {
+            'event': self.event,
+            'delivery_id': self.delivery_id,
+            'received_at': self.received_at,
+            'payload': self.payload
+        }
+
+
+class WebhookEventQueue:
+    """In-process queue of webhook events with delivery-ID deduplication.
+
+    GitHub redelivers on timeouts and allows manual redelivery, so recently
+    seen delivery IDs are remembered and duplicates dropped.
+    """
+
+    def __init__(self, maxsize: int = 1000, dedup_window: int = 5000):
+        """Initialize event queue.
+
+        Args:
+            maxsize: Maximum queued events (new events are rejected when full)
+            dedup_window: Number of recent delivery IDs remembered
+        """
+        self.maxsize = maxsize
+        self.dedup_window = dedup_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.stats = {"received": 0, "duplicates": 0, "dropped": 0}
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the loop that first uses it
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def put(self, event: WebhookEvent) -> bool:
+        """Enqueue an event without blocking.
+
+        Args:
+            event: Verified webhook event
+
+        Returns:
+            True if queued, False if duplicate or queue full
+        """
+        if event.delivery_id and event.delivery_id in self._seen:
+            self.stats["duplicates"] += 1
+            logger.debug(f"♻️ Duplicate webhook delivery {event.delivery_id}, ignoring")
+            return False
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"⚠️ Webhook queue full, dropping {event.event} delivery {event.delivery_id}")
+            return False
+
+        if event.delivery_id:
+            self._seen[event.delivery_id] = None
+            while len(self._seen) > self.dedup_window:
+                self._seen.popitem(last=False)
+        self.stats["received"] += 1
+        return True
+
+    async def get(self) -> WebhookEvent:
+        """Wait for the next event."""
+        return await self.queue.get()
+
+    def task_done(self):
+        """Mark the last retrieved event as processed."""
+        self.queue.task_done()
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+
+# Global queue instance
+_global_webhook_queue: Optional[WebhookEventQueue] = None
+
+
+def get_webhook_queue() -> WebhookEventQueue:
+    """Get or create global webhook event queue."""
+    global _global_webhook_queue
+    if _global_webhook_queue is None:
+        _global_webhook_queue = WebhookEventQueue()
+    return _global_webhook_queue
+
+
+def reset_webhook_queue():
+    """Reset global webhook queue (for testing)."""
+    global _global_webhook_queue
+    _global_webhook_queue = None
+
+
+def record_event(event: WebhookEvent, record_dir: Path) -> Optional[Path]:
+    """Save a delivery to disk for later replay.
+
+    Args:
+        event: Verified webhook event
+        record_dir: Target directory
+
+    Returns:
+        Path of the written file, or None on failure
+    """
+    try:
+        record_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{int(event.received_at * 1000)}-{event.event}-{event.delivery_id or 'unknown'}.json"
+        path = record_dir / name
+        path.write_text(json.dumps(event.to_record(), indent=2), encoding='utf-8')
+        return path
+    except OSError as e:
+        logger.warning(f"⚠️ Failed to record webhook delivery: {e}")
+        return None
+
+
+def setup_webhook_routes(
+    app: FastAPI,
+    queue: Optional[WebhookEventQueue] = None,
+    secret: Optional[str] = None,
+    record_dir: Optional[str] = None
+):
+    """
+    Setup GitHub webhook routes on FastAPI app.
+
+    Args:
+        app: FastAPI application instance
+        queue: Event queue (uses global queue if None)
+        secret: Webhook secret (reads GITHUB_WEBHOOK_SECRET if None)
+        record_dir: Directory for recorded deliveries (reads GITHUB_WEBHOOK_RECORD_DIR if None)
+    """
+
+    @app.post("/api/webhooks/github", status_code=202)
+    async def github_webhook(request: Request):
+        """
+        Receive a GitHub webhook delivery.
+
+        Requires a valid X-Hub-Signature-256 header. Supported events are
+        queued for dispatch; ping and other events are acknowledged only.
+        """
+        webhook_secret = secret or os.getenv("GITHUB_WEBHOOK_SECRET")
+        if not webhook_secret:
+            # Never accept unsigned deliveries
+            raise HTTPException(status_code=503, detail="Webhook secret not configured")
+
+        body = await request.body()
+        if not verify_signature(webhook_secret, body, request.headers.get(SIGNATURE_HEADER)):
+            logger.warning("🛡️ Rejected webhook delivery with invalid signature")
+            raise HTTPException(status_code=401, detail="Invalid signature")
+
+        event_name = request.headers.get("X-GitHub-Event", "")
+        delivery_id = request.headers.get("X-GitHub-Delivery", "")
+
+        if event_name == "ping":
+            return {"status": "pong"}
+
+        if event_name not in SUPPORTED_EVENTS:
+            return {"status": "ignored", "event": event_name}
+
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+        event = WebhookEvent(event=event_name, delivery_id=delivery_id, payload=payload)
+
+        directory = record_dir or os.getenv("GITHUB_WEBHOOK_RECORD_DIR")
+        if directory:
+            record_event(event, Path(directory))
+
+        event_queue = queue or get_webhook_queue()
+        if not event_queue.put(event):
+            return {"status": "skipped", "delivery_id": delivery_id}
+
+        logger.info(f"📬 Queued {event_name}.{event.action} for {event.repository} (delivery {delivery_id})")
+        return {"status": "queued", "delivery_id": delivery_id}
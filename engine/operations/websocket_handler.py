@@ -8,6 +8,7 @@ Provides:
 - /api/agents/{agent_id}/status - Agent status endpoint
 - /api/agents/{agent_id}/logs - Historical logs endpoint
 - /api/activity - Activity timeline endpoint
+- /api/webhooks/github - GitHub webhook receiver (see webhook_handler.py)
 """
 
 import sys
@@ -20,6 +21,7 @@ from typing import Optional, List
 import json
 
 from engine.runners.monitor_service import get_monitor, AgentStatus
+from engine.operations.webhook_handler import setup_webhook_routes
 
 
 def setup_monitoring_routes(app: FastAPI):
@@ -235,6 +237,31 @@ def setup_monitoring_routes(app: FastAPI):
             "total": len(services)
         }
     
+    @app.get("/api/caches")
+    async def get_caches():
+        """
+        Get cache hit-rate metrics.
+        
+        Includes the LLM response cache with its current entry count and size.
+        
+        Returns:
+            Dict with per-cache metrics
+        """
+        from engine.core.llm_response_cache import get_llm_response_cache
+        
+        llm_cache = get_llm_response_cache()
+        caches = monitor.get_cache_metrics()
+        if llm_cache is not None:
+            caches[llm_cache.MONITOR_NAME] = {
+                **caches.get(llm_cache.MONITOR_NAME, {}),
+                **llm_cache.info()
+            }
+        
+        return {
+            "caches": caches,
+            "total": len(caches)
+        }
+    
     @app.get("/api/config/polling")
     async def get_polling_config():
         """
@@ -383,6 +410,7 @@ def create_monitoring_app() -> FastAPI:
     
     # Setup routes
     setup_monitoring_routes(app)
+    setup_webhook_routes(app)
     
     # Startup/shutdown events
     @app.on_event("startup")
@@ -0,0 +1,308 @@
+"""
+BM25 Index - local lexical (inverted) index for hybrid RAG retrieval
+
+Dense embeddings are weak at exact identifiers, error strings and file paths.
+Each collection ("code", "docs", "issues") therefore also gets a BM25 index,
+written by the indexers next to the vector store and fused with the vector
+results in RAGRetriever (reciprocal-rank fusion).
+
+One SQLite file per collection under index_dir (see bm25_dir_for: bm25/ inside
+an embedded store's persist_dir, otherwise RAG_BM25_DIR, default data/bm25):
+    docs      doc rowid, chunk id, token count, content, metadata
+    terms     term id, term, document frequency
+    postings  (term id, doc rowid) -> term frequency, WITHOUT ROWID (compact)
+    state     total token count, write generation
+
+Tokens are lowercased words and identifiers plus the parts of snake_case,
+camelCase and dotted/slashed names, so "get_repo_cache" matches both the
+identifier and "repo cache".
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from heapq import nlargest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .vector_store import SearchResult
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BM25_DIR = "data/bm25"
+LOOKUP_BATCH = 500  # SQLite host-parameter batch for IN (...) lookups
+
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or "
+    "that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase BM25 terms (identifiers plus their parts)."""
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        lower = word.lower()
+        if len(lower) > 1 and lower not in STOPWORDS:
+            tokens.append(lower)
+        parts = _PART_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(
+                part.lower() for part in parts
+                if len(part) > 1 and part.lower() not in STOPWORDS
+            )
+    return tokens
+
+
+def default_bm25_dir() -> Path:
+    """BM25 index directory (RAG_BM25_DIR env, default data/bm25)."""
+    return Path(os.getenv("RAG_BM25_DIR", DEFAULT_BM25_DIR))
+
+
+def bm25_dir_for(vector_store: Any) -> Path:
+    """BM25 index directory paired with a vector store.
+
+    Stores with a persist_dir (embedded backend) keep their BM25 indexes next
+    to the vectors so both are always replaced together.
+    """
+    persist_dir = getattr(vector_store, 'persist_dir', None)
+    if persist_dir:
+        return Path(persist_dir) / "bm25"
+    return default_bm25_dir()
+
+
+class BM25Index:
+    """Persistent BM25 index for one collection."""
+
+    def __init__(
+        self,
+        collection: str,
+        index_dir: Optional[Path] = None,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """Open (or create) the BM25 index of a collection.
+
+        Args:
+            collection: Collection name ('code', 'docs', 'issues')
+            index_dir: Directory of index files (default: default_bm25_dir())
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.collection = collection
+        self.index_dir = Path(index_dir) if index_dir else default_bm25_dir()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.index_dir / f"{collection}.db"
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "doc INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, length INTEGER NOT NULL, "
+            "content TEXT, metadata TEXT);"
+            "CREATE TABLE IF NOT EXISTS terms ("
+            "term_id INTEGER PRIMARY KEY, term TEXT UNIQUE NOT NULL, df INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term_id INTEGER NOT NULL, doc INTEGER NOT NULL, tf INTEGER NOT NULL, "
+            "PRIMARY KEY (term_id, doc)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);"
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER NOT NULL);"
+            "INSERT OR IGNORE INTO state VALUES ('total_length', 0);"
+            "INSERT OR IGNORE INTO state VALUES ('generation', 0);"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def exists(collection: str, index_dir: Optional[Path] = None) -> bool:
+        """Whether an index file exists for the collection."""
+        return ((Path(index_dir) if index_dir else default_bm25_dir()) / f"{collection}.db").exists()
+
+    def _state(self, key: str) -> int:
+        return self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()[0]
+
+    def _bump(self, length_delta: int):
+        self._db.execute("UPDATE state SET value = value + ? WHERE key = 'total_length'", (length_delta,))
+        self._db.execute("UPDATE state SET value = value + 1 WHERE key = 'generation'")
+
+    def _remove_docs(self, ids: List[str]) -> int:
+        """Remove documents and their postings (transaction held by caller)."""
+        removed = 0
+        length_delta = 0
+        for start in range(0, len(ids), LOOKUP_BATCH):
+            batch = ids[start:start + LOOKUP_BATCH]
+            rows = self._db.execute(
+                f"SELECT doc, length FROM docs WHERE id IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            for doc, length in rows:
+                term_ids = [(term_id,) for (term_id,) in self._db.execute(
+                    "SELECT term_id FROM postings WHERE doc = ?", (doc,)
+                )]
+                self._db.executemany("UPDATE terms SET df = df - 1 WHERE term_id = ?", term_ids)
+                self._db.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+                self._db.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+                length_delta -= length
+            removed += len(rows)
+        if removed:
+            self._db.execute("DELETE FROM terms WHERE df <= 0")
+            self._bump(length_delta)
+        return removed
+
+    def add(self, ids: List[str], contents: List[str], metadata: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Index documents, replacing existing documents with the same IDs.
+
+        Args:
+            ids: Chunk IDs (same IDs as in the vector store)
+            contents: Text per chunk
+            metadata: Metadata dict per chunk
+
+        Returns:
+            Number of documents indexed
+        """
+        metadata = metadata or [{} for _ in ids]
+        if not (len(ids) == len(contents) == len(metadata)):
+            raise ValueError("All input lists must have the same length")
+        if not ids:
+            return 0
+
+        # Last occurrence wins, as with a vector store upsert
+        docs = {doc_id: (content, meta) for doc_id, content, meta in zip(ids, contents, metadata)}
+        term_counts = {doc_id: Counter(tokenize(content)) for doc_id, (content, _) in docs.items()}
+
+        with self._lock, self._db:
+            self._remove_docs(list(docs))
+
+            vocabulary = sorted({term for counts in term_counts.values() for term in counts})
+            self._db.executemany("INSERT OR IGNORE INTO terms (term, df) VALUES (?, 0)", [(t,) for t in vocabulary])
+            term_ids = {}
+            for start in range(0, len(vocabulary), LOOKUP_BATCH):
+                batch = vocabulary[start:start + LOOKUP_BATCH]
+                term_ids.update(self._db.execute(
+                    f"SELECT term, term_id FROM terms WHERE term IN ({','.join('?' * len(batch))})", batch
+                ))
+
+            total_length = 0
+            df_delta: Counter = Counter()
+            postings = []
+            for doc_id, (content, meta) in docs.items():
+                counts = term_counts[doc_id]
+                length = sum(counts.values())
+                total_length += length
+                doc = self._db.execute(
+                    "INSERT INTO docs (id, length, content, metadata) VALUES (?, ?, ?, ?)",
+                    (doc_id, length, content, json.dumps(meta))
+                ).lastrowid
+                for term, tf in counts.items():
+                    postings.append((term_ids[term], doc, tf))
+                    df_delta[term_ids[term]] += 1
+
+            self._db.executemany("INSERT INTO postings (term_id, doc, tf) VALUES (?, ?, ?)", postings)
+            self._db.executemany(
+                "UPDATE terms SET df = df + ? WHERE term_id = ?", [(n, t) for t, n in df_delta.items()]
+            )
+            self._bump(total_length)
+
+        return len(docs)
+
+    def delete(self, ids: List[str]) -> int:
+        """Delete documents by chunk ID.
+
+        Returns:
+            Number of documents deleted
+        """
+        if not ids:
+            return 0
+        with self._lock, self._db:
+            return self._remove_docs(list(ids))
+
+    def clear(self):
+        """Remove all documents."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM postings")
+            self._db.execute("DELETE FROM terms")
+            self._db.execute("DELETE FROM docs")
+            self._db.execute("UPDATE state SET value = 0 WHERE key = 'total_length'")
+            self._db.execute("UPDATE state SET value = value + 1 WHERE key = 'generation'")
+
+    def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
+        """Rank documents for a query with BM25.
+
+        Args:
+            query: Free text, identifiers, paths or error messages
+            top_k: Number of results
+
+        Returns:
+            SearchResult list (score = BM25 score), highest first
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            if not n_docs:
+                return []
+            avg_length = max(self._state('total_length') / n_docs, 1.0)
+
+            term_rows = []
+            for start in range(0, len(terms), LOOKUP_BATCH):
+                batch = terms[start:start + LOOKUP_BATCH]
+                term_rows += self._db.execute(
+                    f"SELECT term_id, df FROM terms WHERE term IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+
+            scores: Dict[int, float] = {}
+            for term_id, df in term_rows:
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc, tf, length in self._db.execute(
+                    "SELECT p.doc, p.tf, d.length FROM postings p JOIN docs d ON d.doc = p.doc "
+                    "WHERE p.term_id = ?", (term_id,)
+                ):
+                    norm = tf + self.k1 * (1.0 - self.b + self.b * length / avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1.0) / norm
+
+            top = nlargest(top_k, scores.items(), key=lambda item: item[1])
+            rows = {}
+            for start in range(0, len(top), LOOKUP_BATCH):
+                batch = [doc for doc, _ in top[start:start + LOOKUP_BATCH]]
+                for doc, doc_id, content, meta in self._db.execute(
+                    f"SELECT doc, id, content, metadata FROM docs WHERE doc IN ({','.join('?' * len(batch))})", batch
+                ):
+                    rows[doc] = (doc_id, content, meta)
+
+        return [
+            SearchResult(
+                id=rows[doc][0],
+                content=rows[doc][1],
+                metadata=json.loads(rows[doc][2]) if rows[doc][2] else {},
+                score=float(score),
+                collection=self.collection
+            )
+            for doc, score in top
+        ]
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def version(self) -> int:
+        """Write generation (changes on every add/delete, from any process)."""
+        with self._lock:
+            return self._state('generation')
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,669 @@
+"""
+Embedded Vector Store - in-process RAG backend (no Milvus server)
+
+Each collection lives in its own directory under persist_dir:
+    vectors.bin   row-major matrix of L2-normalized vectors (float32, float16 or
+                  int8), memory-mapped for search and appended on insert
+    scales.bin    int8 only: float32 scale per row (symmetric scalar quantization)
+    vectors.f32.bin  float16/int8 only: full-precision copy used to rerank the
+                  top candidates; only those rows are read per query
+    chunks.db     SQLite sidecar: id/content/metadata per matrix row, plus state
+                  (dim, dtype, full_precision, row count, generation)
+    ivf.npz       optional IVF index (k-means centroids + inverted lists)
+    .lock         flock: shared for searches, exclusive for writes
+
+Search is a batched matrix-vector product over the memory-mapped matrix with
+top-k selection (brute force). Quantized collections score with the compact
+matrix and rescore top_k * rerank_factor candidates at full precision.
+With index_type="ivf" collections above
+ivf_min_rows also build an IVF index and only probe the nprobe closest lists
+(plus rows appended since the index was built).
+
+Deleted and overwritten rows stay in vectors.bin as dead rows until the
+collection is compacted (automatically once dead rows dominate).
+
+Filter/delete expressions support the subset of Milvus syntax used in this
+repo: ``id in [...]``, ``id == '...'``, ``id != '...'`` and
+``metadata["key"] == / != / in ...``, joined with ``and``.
+"""
+
+import ast
+import fcntl
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .vector_store import SearchResult, VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STORE_DIR = "data/vector_store"
+SEARCH_BLOCK_ROWS = 65536  # Rows scored per matrix product (bounds temp memory)
+QUANTIZED_BLOCK_ROWS = 512  # float16/int8 rows converted per product (stays in CPU cache)
+
+_CLAUSE_RE = re.compile(
+    r"""^\s*(?:(id)|metadata\[\s*["']([A-Za-z0-9_]+)["']\s*\])\s*(==|!=|in)\s*(.+?)\s*$""",
+    re.DOTALL
+)
+
+
+def _expr_to_sql(expr: str) -> Tuple[str, List[Any]]:
+    """Translate a (subset) Milvus boolean expression into a SQL WHERE clause.
+
+    Args:
+        expr: Expression like ``id in ["a", "b"]`` or ``metadata["file_path"] == "x.py"``
+
+    Returns:
+        (where_sql, params)
+
+    Raises:
+        ValueError: If the expression uses unsupported syntax
+    """
+    clauses = []
+    params: List[Any] = []
+    for part in re.split(r"\s+and\s+", expr.strip()):
+        match = _CLAUSE_RE.match(part)
+        if not match:
+            raise ValueError(f"Unsupported filter expression: {part!r}")
+        is_id, key, op, raw_value = match.groups()
+        try:
+            value = ast.literal_eval(raw_value)
+        except (ValueError, SyntaxError):
+            raise ValueError(f"Unsupported filter value: {raw_value!r}")
+
+        column = "id" if is_id else "json_extract(metadata, ?)"
+        if not is_id:
+            params.append(f"$.{key}")
+
+        if op == "in":
+            values = list(value)
+            if not values:
+                clauses.append("0")
+                if not is_id:
+                    params.pop()
+                continue
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} {'=' if op == '==' else '!='} ?")
+            params.append(value)
+
+    return " AND ".join(clauses), params
+
+
+class _Collection:
+    """On-disk state of one collection (guarded by its own lock)."""
+
+    def __init__(self, path: Path, dim: int, dtype: str, full_precision: bool = True):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = path / "vectors.bin"
+        self.scales_path = path / "scales.bin"
+        self.full_path = path / "vectors.f32.bin"
+        self.ivf_path = path / "ivf.npz"
+        self.lock = threading.Lock()
+        self.lock_path = path / ".lock"
+
+        self.db = sqlite3.connect(str(path / "chunks.db"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, content TEXT, "
+            "metadata TEXT, timestamp INTEGER)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("INSERT OR IGNORE INTO state VALUES ('dim', ?)", (str(dim),))
+        self.db.execute("INSERT OR IGNORE INTO state VALUES ('dtype', ?)", (dtype,))
+        # Collections written before full-precision copies existed have rows but no copy
+        has_rows = self.db.execute("SELECT 1 FROM state WHERE key = 'rows' AND value != '0'").fetchone()
+        keep_full = full_precision and self._state('dtype') != 'float32' and not has_rows
+        self.db.execute("INSERT OR IGNORE INTO state VALUES ('full_precision', ?)", ('1' if keep_full else '0',))
+        self.db.execute("INSERT OR IGNORE INTO state VALUES ('rows', '0')")
+        self.db.execute("INSERT OR IGNORE INTO state VALUES ('generation', '0')")
+        self.db.commit()
+
+        self.dim = int(self._state('dim'))
+        self.dtype = np.dtype(self._state('dtype'))
+        self.full_precision = self._state('full_precision') == '1'
+        self.block_rows = SEARCH_BLOCK_ROWS if self.dtype == np.float32 else QUANTIZED_BLOCK_ROWS
+        if self.dim != dim:
+            raise ValueError(
+                f"Collection {path.name} stores {self.dim}D vectors, got embedding_dim={dim}; "
+                f"drop {path} and reindex"
+            )
+
+        # Cached view, refreshed when the generation changes
+        self.generation = -1
+        self.rows = 0
+        self.matrix: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.full: Optional[np.ndarray] = None
+        self.alive: np.ndarray = np.zeros(0, dtype=bool)
+        self.ivf: Optional[Dict[str, np.ndarray]] = None
+
+    def _state(self, key: str) -> str:
+        return self.db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()[0]
+
+    @contextmanager
+    def locked(self, exclusive: bool) -> Iterator[None]:
+        """Serialize against other threads and processes using this collection."""
+        with self.lock, open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Reload the matrix view and live-row mask if another writer changed them."""
+        generation = int(self._state('generation'))
+        if generation == self.generation:
+            return
+        self.rows = int(self._state('rows'))
+        self.matrix = self.scales = self.full = None
+        if self.rows:
+            self.matrix = np.memmap(self.vectors_path, dtype=self.dtype, mode='r', shape=(self.rows, self.dim))
+            if self.dtype == np.int8:
+                self.scales = np.memmap(self.scales_path, dtype=np.float32, mode='r', shape=(self.rows,))
+            if self.full_precision:
+                self.full = np.memmap(self.full_path, dtype=np.float32, mode='r', shape=(self.rows, self.dim))
+        self.alive = np.zeros(self.rows, dtype=bool)
+        live_rows = np.fromiter((r for (r,) in self.db.execute("SELECT row FROM chunks")), dtype=np.int64)
+        self.alive[live_rows] = True
+        self.ivf = None
+        if self.ivf_path.exists():
+            with np.load(self.ivf_path) as data:
+                self.ivf = {name: data[name] for name in data.files}
+        self.generation = generation
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Convert normalized float32 vectors to the storage dtype (+ int8 row scales)."""
+        if self.dtype == np.int8:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(self.dtype), None
+
+    def append(self, vectors: np.ndarray, rows: int):
+        """Append normalized vectors after the first `rows` rows of every vector file."""
+        data, scales = self.encode(vectors)
+        parts = [(self.vectors_path, data)]
+        if scales is not None:
+            parts.append((self.scales_path, scales))
+        if self.full_precision:
+            parts.append((self.full_path, vectors.astype(np.float32)))
+        for path, array in parts:
+            with open(path, 'ab') as f:
+                f.truncate(rows * array[:1].nbytes)  # Drop torn writes
+                f.write(np.ascontiguousarray(array).tobytes())
+
+    def stored_arrays(self) -> List[Tuple[Path, np.ndarray]]:
+        """Memory-mapped per-row files (matrix, scales, full-precision copy)."""
+        arrays = [(self.vectors_path, self.matrix)]
+        if self.scales is not None:
+            arrays.append((self.scales_path, self.scales))
+        if self.full is not None:
+            arrays.append((self.full_path, self.full))
+        return arrays
+
+    def score(self, index, query: np.ndarray) -> np.ndarray:
+        """Approximate inner products of stored rows (slice or sorted row array) with query."""
+        scores = self.matrix[index].astype(np.float32, copy=False) @ query
+        if self.scales is not None:
+            scores *= self.scales[index]
+        return scores
+
+    def vectors(self, index) -> np.ndarray:
+        """Stored rows as float32 (full precision when kept, else dequantized)."""
+        if self.full is not None:
+            return np.asarray(self.full[index], dtype=np.float32)
+        block = np.asarray(self.matrix[index], dtype=np.float32)
+        if self.scales is not None:
+            block *= self.scales[index][:, None]
+        return block
+
+    def bump(self, rows: Optional[int] = None):
+        """Record a write (caller commits)."""
+        if rows is not None:
+            self.db.execute("UPDATE state SET value = ? WHERE key = 'rows'", (str(rows),))
+        self.db.execute(
+            "UPDATE state SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE key = 'generation'"
+        )
+
+    def close(self):
+        self.matrix = self.scales = self.full = None
+        self.db.close()
+
+
+class EmbeddedVectorStore(VectorStore):
+    """In-process vector store on memory-mapped NumPy matrices."""
+
+    def __init__(
+        self,
+        embedding_dim: int = 768,
+        persist_dir: Optional[str] = None,
+        dtype: str = "float32",
+        index_type: str = "flat",
+        ivf_min_rows: int = 50000,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        rerank_factor: int = 4
+    ):
+        """Initialize embedded vector store.
+
+        Args:
+            embedding_dim: Dimension of embedding vectors
+            persist_dir: Storage directory (default: RAG_VECTOR_STORE_DIR env, then data/vector_store)
+            dtype: Storage precision for new collections ('float32', 'float16' or 'int8')
+            index_type: 'flat' (brute force) or 'ivf'
+            ivf_min_rows: Collections smaller than this are always searched brute force
+            nlist: Number of IVF lists (default: 4 * sqrt(rows))
+            nprobe: Number of IVF lists probed per query
+            rerank_factor: Quantized collections rescore top_k * rerank_factor candidates
+                at full precision (<= 1: no rerank and no full-precision copy for new collections)
+        """
+        if dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"Unsupported index_type: {index_type}")
+
+        self.embedding_dim = embedding_dim
+        self.persist_dir = Path(persist_dir or os.getenv("RAG_VECTOR_STORE_DIR", DEFAULT_STORE_DIR))
+        self.dtype = dtype
+        self.index_type = index_type
+        self.ivf_min_rows = ivf_min_rows
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.rerank_factor = rerank_factor
+
+        self._collections: Dict[str, _Collection] = {}
+        self._collections_lock = threading.Lock()
+
+        logger.info(f"✅ Embedded vector store at {self.persist_dir} ({dtype}, {index_type})")
+
+    def _collection(self, name: str, create: bool = True) -> Optional[_Collection]:
+        """Open a collection, creating its directory on first write."""
+        with self._collections_lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                path = self.persist_dir / name
+                if not create and not (path / "chunks.db").exists():
+                    return None
+                collection = _Collection(path, self.embedding_dim, self.dtype, full_precision=self.rerank_factor > 1)
+                self._collections[name] = collection
+            return collection
+
+    def insert(
+        self,
+        collection_name: str,
+        ids: List[str],
+        embeddings: np.ndarray,
+        contents: List[str],
+        metadata: List[Dict[str, Any]]
+    ) -> int:
+        """Insert (or overwrite by ID) vectors into collection.
+
+        Args:
+            collection_name: Target collection
+            ids: Unique IDs for each vector
+            embeddings: Embedding vectors (shape: [n, embedding_dim])
+            contents: Text content for each embedding
+            metadata: Metadata dict for each embedding
+
+        Returns:
+            Number of vectors inserted
+        """
+        if len(ids) == 0:
+            return 0
+        vectors = self._prepare_embeddings(ids, embeddings, contents, metadata)
+        if vectors.shape[1] != self.embedding_dim:
+            raise ValueError(f"Expected {self.embedding_dim}D embeddings, got {vectors.shape[1]}D")
+
+        # Last occurrence wins for duplicate IDs within one batch
+        last_index = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        keep = sorted(last_index.values())
+
+        collection = self._collection(collection_name)
+        with collection.locked(exclusive=True):
+            rows = int(collection._state('rows'))
+            collection.append(vectors[keep], rows)
+
+            timestamp = int(datetime.now().timestamp())
+            with collection.db:
+                collection.db.executemany(
+                    "DELETE FROM chunks WHERE id = ?", [(ids[i],) for i in keep]
+                )
+                collection.db.executemany(
+                    "INSERT INTO chunks (row, id, content, metadata, timestamp) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (rows + n, ids[i], contents[i], json.dumps(metadata[i], default=str), timestamp)
+                        for n, i in enumerate(keep)
+                    ]
+                )
+                collection.bump(rows=rows + len(keep))
+
+            self._maintain(collection)
+
+        logger.info(f"✅ Inserted {len(keep)} vectors into '{collection_name}'")
+        return len(keep)
+
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        filter_expr: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Search for similar vectors.
+
+        Args:
+            collection_name: Collection to search
+            query_embedding: Query vector (shape: [embedding_dim])
+            top_k: Number of results to return
+            filter_expr: Optional filter expression (Milvus syntax subset)
+
+        Returns:
+            List of SearchResult objects, sorted by similarity (highest first)
+        """
+        collection = self._collection(collection_name, create=False)
+        if collection is None:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with collection.locked(exclusive=False):
+            collection.refresh()
+            if not collection.rows:
+                return []
+
+            if filter_expr:
+                where, params = _expr_to_sql(filter_expr)
+                candidates = np.fromiter(
+                    (r for (r,) in collection.db.execute(f"SELECT row FROM chunks WHERE {where}", params)),
+                    dtype=np.int64
+                )
+            else:
+                candidates = self._ivf_candidates(collection, query)
+
+            if candidates is None:
+                scores = self._score_all(collection, query)
+                rows = np.arange(collection.rows)
+            else:
+                candidates = candidates[collection.alive[candidates]] if len(candidates) else candidates
+                rows = np.sort(candidates)
+                scores = self._score_rows(collection, rows, query)
+
+            if collection.full is not None and self.rerank_factor > 1 and len(rows) > top_k:
+                rows, scores = self._rerank(collection, rows, scores, query, top_k * self.rerank_factor)
+
+            if not len(rows):
+                return []
+            k = min(top_k, len(rows))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            best = best[np.isfinite(scores[best])]
+            hits = [(int(rows[i]), float(scores[i])) for i in best]
+
+            by_row = {}
+            if hits:
+                placeholders = ','.join('?' * len(hits))
+                for row, chunk_id, content, meta in collection.db.execute(
+                    f"SELECT row, id, content, metadata FROM chunks WHERE row IN ({placeholders})",
+                    [row for row, _ in hits]
+                ):
+                    by_row[row] = (chunk_id, content, json.loads(meta) if meta else {})
+
+        results = [
+            SearchResult(
+                id=by_row[row][0],
+                content=by_row[row][1],
+                metadata=by_row[row][2],
+                score=score,
+                collection=collection_name
+            )
+            for row, score in hits if row in by_row
+        ]
+        logger.debug(f"🔍 Found {len(results)} results in '{collection_name}'")
+        return results
+
+    @staticmethod
+    def _score_all(collection: _Collection, query: np.ndarray) -> np.ndarray:
+        """Brute-force inner product against every row; dead rows score -inf."""
+        scores = np.empty(collection.rows, dtype=np.float32)
+        block_rows = collection.block_rows
+        for start in range(0, collection.rows, block_rows):
+            end = min(start + block_rows, collection.rows)
+            scores[start:end] = collection.score(slice(start, end), query)
+        scores[~collection.alive] = -np.inf
+        return scores
+
+    @staticmethod
+    def _score_rows(collection: _Collection, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Inner product against selected rows (sorted, for sequential reads)."""
+        scores = np.empty(len(rows), dtype=np.float32)
+        block_rows = collection.block_rows
+        for start in range(0, len(rows), block_rows):
+            chunk = rows[start:start + block_rows]
+            scores[start:start + len(chunk)] = collection.score(chunk, query)
+        return scores
+
+    @staticmethod
+    def _rerank(
+        collection: _Collection,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        query: np.ndarray,
+        n_candidates: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rescore the best approximate candidates against the full-precision copy."""
+        n_candidates = min(n_candidates, len(rows))
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        candidates = np.sort(candidates[np.isfinite(scores[candidates])])
+        rows = rows[candidates]
+        return rows, collection.full[rows] @ query
+
+    def _ivf_candidates(self, collection: _Collection, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows in the nprobe closest IVF lists plus rows added after the build (None = brute force)."""
+        ivf = collection.ivf
+        if self.index_type != "ivf" or ivf is None:
+            return None
+        centroids, offsets, order = ivf['centroids'], ivf['offsets'], ivf['order']
+        built_rows = int(ivf['built_rows'])
+        if built_rows > collection.rows:
+            return None  # Stale (collection was rebuilt)
+
+        nprobe = min(self.nprobe, len(centroids))
+        probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        parts = [order[offsets[i]:offsets[i + 1]] for i in probe]
+        parts.append(np.arange(built_rows, collection.rows))
+        return np.concatenate(parts)
+
+    def _maintain(self, collection: _Collection):
+        """Compact dead rows and (re)build the IVF index after writes (exclusive lock held)."""
+        collection.refresh()
+        dead = collection.rows - int(collection.alive.sum())
+        if dead > 1000 and dead > collection.rows * 0.3:
+            self._compact(collection)
+
+        if self.index_type != "ivf":
+            return
+        live = int(collection.alive.sum())
+        built_rows = int(collection.ivf['built_rows']) if collection.ivf is not None else 0
+        if live >= self.ivf_min_rows and (collection.rows - built_rows) > 0.25 * max(built_rows, 1):
+            self._build_ivf(collection)
+
+    def _compact(self, collection: _Collection):
+        """Rewrite vectors.bin with live rows only and renumber rows."""
+        live_rows = np.flatnonzero(collection.alive)
+        rewritten = []
+        for path, array in collection.stored_arrays():
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                for start in range(0, len(live_rows), SEARCH_BLOCK_ROWS):
+                    f.write(np.ascontiguousarray(array[live_rows[start:start + SEARCH_BLOCK_ROWS]]).tobytes())
+            rewritten.append((tmp_path, path))
+
+        with collection.db:
+            # Ascending order: each row moves to a lower, already-vacated number
+            collection.db.executemany(
+                "UPDATE chunks SET row = ? WHERE row = ?",
+                [(new, int(old)) for new, old in enumerate(live_rows) if new != old]
+            )
+            collection.bump(rows=len(live_rows))
+            collection.matrix = collection.scales = collection.full = None
+            for tmp_path, path in rewritten:
+                os.replace(tmp_path, path)
+            if collection.ivf_path.exists():
+                collection.ivf_path.unlink()
+
+        logger.info(f"🧹 Compacted '{collection.path.name}': {collection.rows} -> {len(live_rows)} rows")
+        collection.refresh()
+
+    def _build_ivf(self, collection: _Collection, iterations: int = 10):
+        """Train spherical k-means centroids and write inverted lists."""
+        live_rows = np.flatnonzero(collection.alive)
+        nlist = self.nlist or max(1, int(4 * np.sqrt(len(live_rows))))
+        nlist = min(nlist, len(live_rows))
+        rng = np.random.default_rng(0)
+
+        sample = np.sort(rng.choice(live_rows, size=min(len(live_rows), nlist * 64), replace=False))
+        train = collection.vectors(sample)
+        centroids = train[rng.choice(len(train), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(train @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = train[assign == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        assign = np.empty(len(live_rows), dtype=np.int32)
+        for start in range(0, len(live_rows), SEARCH_BLOCK_ROWS):
+            chunk = live_rows[start:start + SEARCH_BLOCK_ROWS]
+            assign[start:start + len(chunk)] = np.argmax(collection.vectors(chunk) @ centroids.T, axis=1)
+        order_idx = np.argsort(assign, kind='stable')
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assign, minlength=nlist))
+
+        tmp_path = collection.path / "ivf.tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=centroids,
+            offsets=offsets,
+            order=live_rows[order_idx],
+            built_rows=np.int64(collection.rows)
+        )
+        os.replace(tmp_path, collection.ivf_path)
+        with collection.db:
+            collection.bump()
+        collection.refresh()
+        logger.info(f"📇 Built IVF index for '{collection.path.name}' ({nlist} lists, {len(live_rows)} rows)")
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        expr: Optional[str] = None
+    ) -> int:
+        """Delete vectors by ID list or filter expression.
+
+        Args:
+            collection_name: Target collection
+            ids: List of IDs to delete (mutually exclusive with expr)
+            expr: Filter expression selecting entities to delete
+
+        Returns:
+            Number of vectors deleted
+        """
+        if ids is None and expr is None:
+            raise ValueError("Either ids or expr must be provided for deletion")
+
+        if ids is not None and expr is not None:
+            raise ValueError("Provide either ids or expr, not both")
+
+        collection = self._collection(collection_name, create=False)
+        if collection is None or (ids is not None and not ids):
+            return 0
+
+        if ids is not None:
+            where, params = f"id IN ({','.join('?' * len(ids))})", list(ids)
+        else:
+            where, params = _expr_to_sql(expr)
+
+        with collection.locked(exclusive=True):
+            with collection.db:
+                deleted = collection.db.execute(f"DELETE FROM chunks WHERE {where}", params).rowcount
+                if deleted:
+                    collection.bump()
+            if deleted:
+                self._maintain(collection)
+
+        logger.info("✅ Deleted %s vectors from '%s'", deleted, collection_name)
+        return deleted
+
+    def count(self, collection_name: str) -> int:
+        """Get number of vectors in collection.
+
+        Args:
+            collection_name: Target collection
+
+        Returns:
+            Number of vectors in collection
+        """
+        collection = self._collection(collection_name, create=False)
+        if collection is None:
+            return 0
+        with collection.lock:
+            return collection.db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def collection_version(self, collection_name: str) -> int:
+        """Write generation of a collection (shared by all processes using the directory).
+
+        Args:
+            collection_name: Target collection
+
+        Returns:
+            Generation counter (0 for a missing collection)
+        """
+        collection = self._collection(collection_name, create=False)
+        if collection is None:
+            return 0
+        with collection.lock:
+            return int(collection._state('generation'))
+
+    def build_index(self, collection_name: str):
+        """Build (or rebuild) the IVF index for a collection now.
+
+        Args:
+            collection_name: Target collection
+        """
+        collection = self._collection(collection_name, create=False)
+        if collection is None:
+            return
+        with collection.locked(exclusive=True):
+            collection.refresh()
+            if collection.alive.any():
+                self._build_ivf(collection)
+
+    def close(self):
+        """Close all collection databases."""
+        with self._collections_lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
+        logger.info("👋 Embedded vector store closed")
+
@@ -0,0 +1,263 @@
+"""
+Embedding Cache - persistent, size-bounded cache of computed embeddings
+
+Embeddings are keyed by (backend, model name, SHA-256 of the text), so
+reindexing unchanged code and repeating queries costs no model time.
+
+Layout (one namespace directory per backend + model under cache_dir):
+    vectors.f32   append-only float32 matrix, memory-mapped for lookups
+                  (vectors.<generation>.f32 after compactions)
+    index.db      SQLite: text digest -> matrix row, last-used timestamp,
+                  row count and current matrix generation
+    .lock         flock: shared for lookups, exclusive for writes
+
+When the matrix exceeds max_bytes the least recently used entries are evicted
+and the matrix is compacted down to 80% of the limit. The compacted matrix is
+written to a new generation file; the SQLite commit that installs the new row
+mapping also switches to that file, so a crash leaves either the old or the
+new mapping together with its own file.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+LOOKUP_BATCH = 500  # SQLite host-parameter batch for IN (...) lookups
+
+
+def text_digest(text: str) -> bytes:
+    """SHA-256 digest used as cache key for a text."""
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """Disk-backed embedding cache for one (backend, model) pair."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        backend: str,
+        model_name: str,
+        embedding_dim: int,
+        max_bytes: int = 2 * 1024 ** 3
+    ):
+        """Initialize embedding cache.
+
+        Args:
+            cache_dir: Root cache directory (EmbeddingService.cache_dir)
+            backend: Embedding backend name
+            model_name: Model name (part of the key)
+            embedding_dim: Dimension of cached vectors
+            max_bytes: Size limit of the vector matrix
+        """
+        namespace = re.sub(r'[^A-Za-z0-9_.-]+', '_', f"{backend}__{model_name}")
+        self.path = Path(cache_dir) / namespace
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path / ".lock"
+        self.embedding_dim = embedding_dim
+        self.max_bytes = max_bytes
+        self.row_bytes = embedding_dim * 4
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path / "index.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, row INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("INSERT OR IGNORE INTO state VALUES ('dim', ?)", (str(embedding_dim),))
+        self._db.execute("INSERT OR IGNORE INTO state VALUES ('rows', '0')")
+        self._db.execute("INSERT OR IGNORE INTO state VALUES ('generation', '0')")
+        self._db.commit()
+
+        stored_dim = int(self._state('dim'))
+        if stored_dim != embedding_dim:
+            logger.warning(f"⚠️ Embedding cache {namespace} has {stored_dim}D vectors, expected {embedding_dim}D; clearing")
+            with self._locked(exclusive=True), self._db:
+                self._db.execute("DELETE FROM entries")
+                self._db.execute("UPDATE state SET value = ? WHERE key = 'dim'", (str(embedding_dim),))
+                self._db.execute("UPDATE state SET value = '0' WHERE key = 'rows'")
+                self.vectors_path.unlink(missing_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _state(self, key: str) -> str:
+        return self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()[0]
+
+    def _vectors_file(self, generation: int) -> Path:
+        return self.path / ("vectors.f32" if generation == 0 else f"vectors.{generation}.f32")
+
+    @property
+    def vectors_path(self) -> Path:
+        """Vector matrix file of the current generation."""
+        return self._vectors_file(int(self._state('generation')))
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _matrix(self, rows: int) -> Optional[np.ndarray]:
+        if not rows:
+            return None
+        return np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.embedding_dim))
+
+    def get_many(self, keys: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """Look up many keys at once.
+
+        Args:
+            keys: Text digests (see text_digest)
+
+        Returns:
+            (vectors [n, dim] float32, found mask [n]); rows of missing keys are zero
+        """
+        vectors = np.zeros((len(keys), self.embedding_dim), dtype=np.float32)
+        found = np.zeros(len(keys), dtype=bool)
+        if not keys:
+            return vectors, found
+
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+        unique = list(positions)
+
+        with self._locked(exclusive=False):
+            rows = int(self._state('rows'))
+            matrix = self._matrix(rows)
+            hit_keys = []
+            for start in range(0, len(unique), LOOKUP_BATCH):
+                batch = unique[start:start + LOOKUP_BATCH]
+                for key, row in self._db.execute(
+                    f"SELECT key, row FROM entries WHERE key IN ({','.join('?' * len(batch))})", batch
+                ):
+                    if matrix is None or row >= rows:
+                        continue
+                    for i in positions[bytes(key)]:
+                        vectors[i] = matrix[row]
+                        found[i] = True
+                    hit_keys.append(key)
+
+            if hit_keys:
+                now = int(time.time())
+                with self._db:
+                    self._db.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in hit_keys]
+                    )
+
+        self.hits += int(found.sum())
+        self.misses += int((~found).sum())
+        return vectors, found
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray):
+        """Store embeddings for keys (existing keys are left untouched).
+
+        Args:
+            keys: Text digests
+            vectors: Embeddings (shape: [n, dim])
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        if not keys or vectors.shape[1] != self.embedding_dim:
+            return
+
+        first = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+
+        with self._locked(exclusive=True):
+            existing = set()
+            unique = list(first)
+            for start in range(0, len(unique), LOOKUP_BATCH):
+                batch = unique[start:start + LOOKUP_BATCH]
+                existing.update(
+                    bytes(key) for (key,) in self._db.execute(
+                        f"SELECT key FROM entries WHERE key IN ({','.join('?' * len(batch))})", batch
+                    )
+                )
+            new = [key for key in unique if key not in existing]
+            if not new:
+                return
+
+            rows = int(self._state('rows'))
+            with open(self.vectors_path, 'ab') as f:
+                f.truncate(rows * self.row_bytes)  # Drop torn writes
+                f.write(np.ascontiguousarray(vectors[[first[key] for key in new]]).tobytes())
+
+            now = int(time.time())
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                    [(key, rows + n, now) for n, key in enumerate(new)]
+                )
+                self._db.execute("UPDATE state SET value = ? WHERE key = 'rows'", (str(rows + len(new)),))
+
+            if (rows + len(new)) * self.row_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries and compact to 80% of max_bytes (exclusive lock held)."""
+        rows = int(self._state('rows'))
+        keep_rows = int(self.max_bytes * 0.8) // self.row_bytes
+        kept = self._db.execute(
+            "SELECT key, row, last_used FROM entries ORDER BY last_used DESC, row DESC LIMIT ?", (keep_rows,)
+        ).fetchall()
+        kept.sort(key=lambda entry: entry[1])
+
+        generation = int(self._state('generation'))
+        old_path = self._vectors_file(generation)
+        new_path = self._vectors_file(generation + 1)
+        self._remove_orphans(keep=old_path)
+
+        matrix = self._matrix(rows)
+        with open(new_path, 'wb') as f:
+            if kept:
+                f.write(np.ascontiguousarray(matrix[[row for _, row, _ in kept]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        del matrix
+
+        # Row mapping and matrix file switch in one commit
+        with self._db:
+            self._db.execute("DELETE FROM entries")
+            self._db.executemany(
+                "INSERT INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                [(key, n, last_used) for n, (key, _, last_used) in enumerate(kept)]
+            )
+            self._db.execute("UPDATE state SET value = ? WHERE key = 'rows'", (str(len(kept)),))
+            self._db.execute("UPDATE state SET value = ? WHERE key = 'generation'", (str(generation + 1),))
+        old_path.unlink(missing_ok=True)
+
+        logger.info(f"🧹 Embedding cache evicted {rows - len(kept)} entries ({self.path.name})")
+
+    def _remove_orphans(self, keep: Path):
+        """Delete matrix files left by compactions that crashed before committing (exclusive lock held)."""
+        for path in list(self.path.glob("vectors*.f32")) + list(self.path.glob("vectors*.tmp")):
+            if path != keep:
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
@@ -7,13 +7,23 @@ Generates vector embeddings for text and code using either:
 3. OpenAI embeddings (cloud, highest quality)
 
 Default: sentence-transformers with all-MiniLM-L6-v2 model
+
+Computed embeddings are cached on disk (EmbeddingCache) keyed by backend,
+model and text hash; embed() only sends cache misses to the backend.
+
+Ollama texts are sent in batches to /api/embed over a pooled session, with up
+to max_concurrency batches in flight; aembed() is the asyncio equivalent.
 """
 
+import asyncio
 import logging
-from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import numpy as np
 
+from .embedding_cache import EmbeddingCache, text_digest
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +35,12 @@ class EmbeddingService:
         backend: str = "sentence-transformers",
         model_name: Optional[str] = None,
         device: str = "cpu",
-        cache_dir: Optional[Path] = None
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True,
+        cache_max_bytes: int = 2 * 1024 ** 3,
+        ollama_url: str = "http://localhost:11434",
+        batch_size: int = 64,
+        max_concurrency: int = 4
     ):
         """Initialize embedding service.
         
@@ -34,25 +49,54 @@ class EmbeddingService:
             model_name: Model to use (backend-specific defaults if None)
             device: Device for computation ('cpu', 'cuda')
             cache_dir: Directory for caching models/embeddings
+            use_cache: Cache embeddings on disk by (backend, model, text hash)
+            cache_max_bytes: Size limit of the embedding cache (LRU eviction)
+            ollama_url: Ollama server URL
+            batch_size: Texts per Ollama embedding request
+            max_concurrency: Maximum Ollama batch requests in flight
         """
         self.backend = backend
         self.device = device
+        self.ollama_url = ollama_url.rstrip('/')
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
         self.cache_dir = cache_dir or Path.home() / ".cache" / "agent-forge" / "embeddings"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Model initialization
         self.model = None
+        self.model_name = None
         self.embedding_dim = None
+        self.cache: Optional[EmbeddingCache] = None
+        
+        # Ollama transport (created by _init_ollama / aembed)
+        self._session = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ollama_batch_api = True
+        self._aio_session = None
+        self._aio_loop = None
         
         if backend == "sentence-transformers":
-            self._init_sentence_transformers(model_name or "jinaai/jina-embeddings-v2-base-code")
+            self.model_name = model_name or "jinaai/jina-embeddings-v2-base-code"
+            self._init_sentence_transformers(self.model_name)
         elif backend == "ollama":
-            self._init_ollama(model_name or "nomic-embed-text")
+            self.model_name = model_name or "nomic-embed-text"
+            self._init_ollama(self.model_name)
         elif backend == "openai":
-            self._init_openai(model_name or "text-embedding-3-small")
+            self.model_name = model_name or "text-embedding-3-small"
+            self._init_openai(self.model_name)
         else:
             raise ValueError(f"Unsupported backend: {backend}")
         
+        if use_cache and self.embedding_dim:
+            self.cache = EmbeddingCache(
+                cache_dir=self.cache_dir,
+                backend=backend,
+                model_name=self.model_name,
+                embedding_dim=self.embedding_dim,
+                max_bytes=cache_max_bytes
+            )
+        
         logger.info(f"✅ Embedding service initialized: {backend} ({self.embedding_dim}D)")
     
     def _init_sentence_transformers(self, model_name: str):
@@ -72,9 +116,15 @@ class EmbeddingService:
         """Initialize Ollama embeddings backend."""
         try:
             import requests
+            from requests.adapters import HTTPAdapter
+            
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
             
             # Test Ollama connection
-            response = requests.get("http://localhost:11434/api/tags")
+            response = self._session.get(f"{self.ollama_url}/api/tags", timeout=10)
             if response.status_code != 200:
                 raise ConnectionError("Ollama server not reachable")
             
@@ -128,6 +178,66 @@ class EmbeddingService:
         if not texts:
             return np.array([])
         
+        if self.cache is None:
+            return self._embed_uncached(texts)
+        
+        embeddings, misses = self._lookup_cache(texts)
+        if misses:
+            computed = self._embed_uncached([texts[positions[0]] for positions in misses.values()])
+            self._store_misses(embeddings, misses, computed)
+        return embeddings
+    
+    async def aembed(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Async variant of embed() for callers running in an event loop.
+        
+        Ollama batches are sent concurrently with aiohttp; other backends run
+        in a worker thread so the loop is never blocked.
+        
+        Args:
+            texts: Single text or list of texts to embed
+            
+        Returns:
+            numpy array of embeddings (shape: [n_texts, embedding_dim])
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        if not texts:
+            return np.array([])
+        
+        if self.cache is None:
+            return await self._aembed_uncached(texts)
+        
+        embeddings, misses = await asyncio.to_thread(self._lookup_cache, texts)
+        if misses:
+            computed = await self._aembed_uncached([texts[positions[0]] for positions in misses.values()])
+            await asyncio.to_thread(self._store_misses, embeddings, misses, computed)
+        return embeddings
+    
+    def _lookup_cache(self, texts: List[str]) -> Tuple[np.ndarray, Dict[bytes, List[int]]]:
+        """Resolve cache hits in one batch.
+        
+        Returns:
+            (embeddings with hits filled in, unique miss key -> input positions)
+        """
+        keys = [text_digest(text) for text in texts]
+        embeddings, found = self.cache.get_many(keys)
+        misses: Dict[bytes, List[int]] = {}
+        for i in np.flatnonzero(~found):
+            misses.setdefault(keys[i], []).append(i)
+        if misses:
+            logger.debug(f"🧠 Embedding {len(misses)} texts ({int(found.sum())} cache hits)")
+        return embeddings, misses
+    
+    def _store_misses(self, embeddings: np.ndarray, misses: Dict[bytes, List[int]], computed: np.ndarray):
+        """Cache freshly computed embeddings and place them at their input positions."""
+        computed = np.asarray(computed, dtype=np.float32)
+        self.cache.put_many(list(misses), computed)
+        for positions, vector in zip(misses.values(), computed):
+            embeddings[positions] = vector
+    
+    def _embed_uncached(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings with the configured backend."""
         if self.backend == "sentence-transformers":
             return self._sentence_transformers_embed(texts)
         elif self.backend == "ollama":
@@ -135,6 +245,11 @@ class EmbeddingService:
         elif self.backend == "openai":
             return self._openai_embed(texts)
     
+    async def _aembed_uncached(self, texts: List[str]) -> np.ndarray:
+        if self.backend == "ollama":
+            return await self._ollama_aembed(texts)
+        return await asyncio.to_thread(self._embed_uncached, texts)
+    
     def _sentence_transformers_embed(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using sentence-transformers."""
         embeddings = self.model.encode(
@@ -145,20 +260,87 @@ class EmbeddingService:
         )
         return embeddings
     
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+    
     def _ollama_embed(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings using Ollama."""
-        import requests
+        """Generate embeddings using Ollama (batched, bounded concurrency)."""
+        batches = self._batches(texts)
+        if len(batches) == 1:
+            return np.array(self._ollama_embed_batch(batches[0]))
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="ollama-embed"
+            )
+        embeddings = []
+        for batch_embeddings in self._executor.map(self._ollama_embed_batch, batches):
+            embeddings.extend(batch_embeddings)
+        return np.array(embeddings)
+    
+    def _ollama_embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch via /api/embed (per-text /api/embeddings on older servers)."""
+        if self._ollama_batch_api:
+            response = self._session.post(
+                f"{self.ollama_url}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=300
+            )
+            if response.status_code != 404:
+                response.raise_for_status()
+                return response.json()["embeddings"]
+            logger.warning("⚠️ Ollama server has no /api/embed, falling back to per-text /api/embeddings")
+            self._ollama_batch_api = False
         
         embeddings = []
         for text in texts:
-            response = requests.post(
-                "http://localhost:11434/api/embeddings",
-                json={"model": self.model, "prompt": text}
+            response = self._session.post(
+                f"{self.ollama_url}/api/embeddings",
+                json={"model": self.model, "prompt": text},
+                timeout=300
             )
             response.raise_for_status()
             embeddings.append(response.json()["embedding"])
+        return embeddings
+    
+    async def _ollama_aembed(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings using Ollama from an event loop."""
+        import aiohttp
         
-        return np.array(embeddings)
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session.closed or self._aio_loop is not loop:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=300)
+            )
+            self._aio_loop = loop
+        session = self._aio_session
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                if self._ollama_batch_api:
+                    async with session.post(
+                        f"{self.ollama_url}/api/embed",
+                        json={"model": self.model, "input": batch}
+                    ) as response:
+                        if response.status != 404:
+                            response.raise_for_status()
+                            return (await response.json())["embeddings"]
+                    self._ollama_batch_api = False
+                
+                embeddings = []
+                for text in batch:
+                    async with session.post(
+                        f"{self.ollama_url}/api/embeddings",
+                        json={"model": self.model, "prompt": text}
+                    ) as response:
+                        response.raise_for_status()
+                        embeddings.append((await response.json())["embedding"])
+                return embeddings
+        
+        results = await asyncio.gather(*(embed_batch(batch) for batch in self._batches(texts)))
+        return np.array([embedding for batch_embeddings in results for embedding in batch_embeddings])
     
     def _openai_embed(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using OpenAI."""
@@ -198,6 +380,23 @@ class EmbeddingService:
         # Add language context
         return f"# {language} code:\n{code_clean}"
     
+    def close(self):
+        """Release HTTP sessions, worker threads and the embedding cache."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+    
+    async def aclose(self):
+        """Close the aiohttp session used by aembed()."""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+    
     def compute_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Compute cosine similarity between two embeddings.
         
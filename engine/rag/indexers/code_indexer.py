@@ -8,7 +8,15 @@ Indexes Python source code by:
 4. Generating embeddings
 5. Storing in vector database
 
-Supports incremental updates and file watching.
+Supports incremental updates: a persistent manifest (file hash -> chunk IDs,
+last indexed commit) lets index_workspace() re-embed only changed files and
+delete the chunks of changed and removed files.
+
+Files are parsed in a process pool and their chunks streamed through the
+embedding and insert stages (see pipeline.run_pipeline).
+
+Chunks are also written to a BM25 index (lexical search for identifiers and
+paths), kept in sync with the vector store through the same manifest.
 """
 
 import logging
@@ -18,8 +26,19 @@ from pathlib import Path
 from dataclasses import dataclass
 import hashlib
 
+from ..bm25_index import BM25Index, bm25_dir_for
 from ..embedding_service import EmbeddingService
-from ..vector_store import MilvusVectorStore
+from ..vector_store import VectorStore, create_vector_store
+from .pipeline import PipelineStats, run_pipeline
+from .index_manifest import (
+    IndexManifest,
+    default_manifest_path,
+    file_hash,
+    git_changed_files,
+    git_dirty_files,
+    git_head,
+    store_signature,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -39,45 +58,187 @@ class CodeChunk:
     language: str = "python"
 
 
+def generate_chunk_id(file_path: Path, line: int, chunk_type: str) -> str:
+    """Generate unique ID for code chunk."""
+    content = f"{file_path}:{line}:{chunk_type}"
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+def parse_python_file(file_path: Path, root_dir: Path) -> List[CodeChunk]:
+    """Parse Python file and extract code chunks.
+    
+    Module-level (picklable) so the indexing pipeline can run it in worker
+    processes. The source is split into lines once per file.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    
+    try:
+        tree = ast.parse(source, filename=str(file_path))
+    except SyntaxError as e:
+        logger.warning(f"⚠️ Syntax error in {file_path}: {e}")
+        return []
+    
+    lines = source.split('\n')
+    rel_path = str(Path(file_path).relative_to(root_dir))
+    chunks = []
+    
+    # Extract functions and classes
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            chunk = _extract_node(node, lines, file_path, rel_path, "function", min_size=20, max_size=10000)
+            if chunk:
+                chunks.append(chunk)
+        
+        elif isinstance(node, ast.ClassDef):
+            # Very large classes are indexed via their methods
+            chunk = _extract_node(node, lines, file_path, rel_path, "class", min_size=0, max_size=15000)
+            if chunk:
+                chunks.append(chunk)
+    
+    # Also add module-level docstring if exists
+    module_doc = ast.get_docstring(tree)
+    if module_doc:
+        chunks.append(CodeChunk(
+            id=generate_chunk_id(file_path, 0, "module"),
+            content=module_doc + "\n\n" + source[:500],  # Docstring + first 500 chars of module
+            file_path=rel_path,
+            chunk_type="module",
+            name=Path(file_path).stem,
+            docstring=module_doc,
+            start_line=1,
+            end_line=1,
+            language="python"
+        ))
+    
+    return chunks
+
+
+def _extract_node(
+    node: ast.AST,
+    lines: List[str],
+    file_path: Path,
+    rel_path: str,
+    chunk_type: str,
+    min_size: int,
+    max_size: int
+) -> Optional[CodeChunk]:
+    """Extract function or class definition as code chunk."""
+    try:
+        start_line = node.lineno - 1
+        end_line = node.end_lineno if node.end_lineno else start_line + 1
+        
+        node_source = '\n'.join(lines[start_line:end_line])
+        
+        # Skip very small or very large definitions
+        if len(node_source) < min_size or len(node_source) > max_size:
+            return None
+        
+        return CodeChunk(
+            id=generate_chunk_id(file_path, start_line, chunk_type),
+            content=node_source,
+            file_path=rel_path,
+            chunk_type=chunk_type,
+            name=node.name,
+            docstring=ast.get_docstring(node),
+            start_line=start_line + 1,
+            end_line=end_line,
+            language="python"
+        )
+    except Exception as e:
+        logger.debug(f"Failed to extract {chunk_type}: {e}")
+        return None
+
+
+def _parse_task(task: Tuple[str, str]) -> List[CodeChunk]:
+    """Pipeline parse stage: (file path, root dir) -> chunks, never raises."""
+    file_path, root_dir = task
+    try:
+        return parse_python_file(Path(file_path), Path(root_dir))
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to parse {file_path}: {e}")
+        return []
+
+
 class CodeIndexer:
     """Index Python code for RAG retrieval."""
     
+    # Directory names never indexed
+    EXCLUDE_DIRS = {'venv', '.venv', 'env', '__pycache__', '.git', 'node_modules', 'site-packages'}
+    
     def __init__(
         self,
         root_dir: Path,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[MilvusVectorStore] = None
+        vector_store: Optional[VectorStore] = None,
+        manifest_path: Optional[Path] = None,
+        parse_workers: Optional[int] = None,
+        batch_size: int = 256,
+        lexical: bool = True
     ):
         """Initialize code indexer.
         
         Args:
             root_dir: Root directory to index
             embedding_service: EmbeddingService instance (creates default if None)
-            vector_store: MilvusVectorStore instance (creates default if None)
+            vector_store: VectorStore instance (creates default backend if None)
+            manifest_path: Incremental index manifest (default: data/rag_manifests/code-<root hash>.json)
+            parse_workers: Parse processes (default: RAG_PARSE_WORKERS env, then CPU count)
+            batch_size: Chunks per embedding/insert batch
+            lexical: Also maintain the BM25 index used for hybrid retrieval
         """
         self.root_dir = Path(root_dir)
         self.embedding_service = embedding_service or EmbeddingService()
-        self.vector_store = vector_store or MilvusVectorStore(
+        self.vector_store = vector_store or create_vector_store(
             embedding_dim=self.embedding_service.embedding_dim or 384
         )
+        self.lexical_index = BM25Index("code", bm25_dir_for(self.vector_store)) if lexical else None
         
         # Tracking
-        self.indexed_files: Dict[str, str] = {}  # file_path -> hash
+        self.manifest = IndexManifest(
+            Path(manifest_path) if manifest_path else default_manifest_path("code", self.root_dir),
+            store_signature=self._store_signature()
+        )
+        self.parse_workers = parse_workers
+        self.batch_size = batch_size
         self.total_chunks = 0
+        self.last_stats: Dict[str, int] = {}
+        self.pipeline_stats: Optional[PipelineStats] = None
+    
+    @property
+    def indexed_files(self) -> Dict[str, str]:
+        """Indexed files (relative path -> content hash)."""
+        return {path: entry['hash'] for path, entry in self.manifest.files.items()}
+    
+    def _store_signature(self) -> str:
+        """Identify the vector store so a manifest is never applied to another store."""
+        return store_signature(self.vector_store)
     
     def index_workspace(
         self,
         exclude_patterns: Optional[List[str]] = None,
-        max_file_size_kb: int = 500
+        max_file_size_kb: int = 500,
+        full: bool = False
     ) -> int:
-        """Index all Python files in workspace.
+        """Index changed Python files in workspace.
+        
+        Only files whose content hash differs from the manifest are parsed and
+        embedded; chunks of changed and removed files are deleted first. In a
+        git checkout the candidates come from the diff between the last indexed
+        commit and HEAD plus uncommitted changes, so unchanged files are not even
+        hashed.
         
         Args:
             exclude_patterns: Patterns to exclude (e.g., ['*/tests/*', '*/venv/*'])
             max_file_size_kb: Skip files larger than this
+            full: Drop the manifest's chunks and reindex every file
             
         Returns:
             Number of chunks indexed
+            
+        Raises:
+            The first embed or insert error; chunks stored by this run are
+            deleted again and the manifest is left unsaved.
         """
         logger.info(f"🔍 Indexing Python files in {self.root_dir}")
         
@@ -87,199 +248,170 @@ class CodeIndexer:
             "**/node_modules/**", "**/site-packages/**"
         ]
         
-        python_files = self._find_python_files(exclude_patterns, max_file_size_kb)
+        # Manifest predates the BM25 index (or it was removed): rebuild both
+        if (not full and self.lexical_index is not None and not self.lexical_index.count()
+                and self.manifest.chunk_ids(list(self.manifest.files))):
+            logger.info("♻️ BM25 index is empty, reindexing all files")
+            full = True
         
-        all_chunks = []
-        for file_path in python_files:
-            try:
-                chunks = self._parse_file(file_path)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to parse {file_path}: {e}")
+        if full and self.manifest.files:
+            self._delete_chunks(self.manifest.chunk_ids(list(self.manifest.files)))
+            self.manifest.files = {}
+            self.manifest.commit = None
         
-        if all_chunks:
-            self._store_chunks(all_chunks)
+        head = git_head(self.root_dir)
+        dirty = git_dirty_files(self.root_dir) if head else None
+        candidates = self._git_candidates(head, dirty)
         
-        logger.info(f"✅ Indexed {len(python_files)} files, {len(all_chunks)} chunks")
-        self.total_chunks = len(all_chunks)
+        if candidates is None:
+            # Full scan: hash every file, compare with manifest
+            current = {self._rel(p): p for p in self._find_python_files(exclude_patterns, max_file_size_kb)}
+            removed = [rel for rel in self.manifest.files if rel not in current]
+        else:
+            current = {}
+            removed = []
+            for rel in candidates:
+                path = self.root_dir / rel
+                if path.exists() and self._should_index(path, max_file_size_kb):
+                    current[rel] = path
+                elif rel in self.manifest.files:
+                    removed.append(rel)
         
-        return len(all_chunks)
-    
-    def _find_python_files(
-        self,
-        exclude_patterns: List[str],
-        max_size_kb: int
-    ) -> List[Path]:
-        """Find all Python files in workspace."""
-        files = []
+        changed = {}
+        for rel, path in current.items():
+            try:
+                content_hash = file_hash(path)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to read {path}: {e}")
+                continue
+            entry = self.manifest.files.get(rel)
+            if not entry or entry['hash'] != content_hash:
+                changed[rel] = (path, content_hash)
         
-        # Convert patterns to string parts for matching
-        exclude_parts = ['venv', '.venv', 'env', '__pycache__', '.git', 'node_modules', 'site-packages']
+        # Old chunks of changed and removed files go first (IDs may be reused)
+        deleted = self._delete_chunks(self.manifest.chunk_ids(list(changed) + removed))
+        for rel in removed:
+            self.manifest.remove_file(rel)
         
-        for path in self.root_dir.rglob("*.py"):
-            # Check exclusions (simple string matching)
-            path_str = str(path)
-            if any(part in path_str for part in exclude_parts):
-                continue
-            
-            # Check size
-            if path.stat().st_size > max_size_kb * 1024:
-                logger.debug(f"⏭️ Skipping large file: {path}")
-                continue
-            
-            files.append(path)
+        # Parse (process pool) -> embed -> insert, stages overlapping
+        inserted: List[str] = []
+        
+        def insert_batch(chunks: List[CodeChunk], embedded: Tuple[List[str], Any]):
+            inserted.extend(chunk.id for chunk in chunks)
+            self._insert_chunks(chunks, embedded)
         
-        return files
-    
-    def _parse_file(self, file_path: Path) -> List[CodeChunk]:
-        """Parse Python file and extract code chunks."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-            
-            tree = ast.parse(source, filename=str(file_path))
-            chunks = []
-            
-            # Extract functions and classes
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    chunk = self._extract_function(node, source, file_path)
-                    if chunk:
-                        chunks.append(chunk)
-                
-                elif isinstance(node, ast.ClassDef):
-                    chunk = self._extract_class(node, source, file_path)
-                    if chunk:
-                        chunks.append(chunk)
-            
-            # Also add module-level docstring if exists
-            module_doc = ast.get_docstring(tree)
-            if module_doc:
-                chunks.append(self._create_module_chunk(source, file_path, module_doc))
-            
-            return chunks
-            
-        except SyntaxError as e:
-            logger.warning(f"⚠️ Syntax error in {file_path}: {e}")
-            return []
-    
-    def _extract_function(
-        self,
-        node: ast.FunctionDef,
-        source: str,
-        file_path: Path
-    ) -> Optional[CodeChunk]:
-        """Extract function definition as code chunk."""
         try:
-            # Get source code for this function
-            lines = source.split('\n')
-            start_line = node.lineno - 1
-            end_line = node.end_lineno if node.end_lineno else start_line + 1
-            
-            function_source = '\n'.join(lines[start_line:end_line])
-            
-            # Skip very small or very large functions
-            if len(function_source) < 20 or len(function_source) > 10000:
-                return None
-            
-            # Generate unique ID
-            chunk_id = self._generate_chunk_id(file_path, start_line, "function")
-            
-            return CodeChunk(
-                id=chunk_id,
-                content=function_source,
-                file_path=str(file_path.relative_to(self.root_dir)),
-                chunk_type="function",
-                name=node.name,
-                docstring=ast.get_docstring(node),
-                start_line=start_line + 1,
-                end_line=end_line,
-                language="python"
+            results, self.pipeline_stats = run_pipeline(
+                tasks=[(str(path), str(self.root_dir)) for path, _ in changed.values()],
+                parse_fn=_parse_task,
+                embed_fn=self._embed_chunks,
+                insert_fn=insert_batch,
+                workers=self.parse_workers,
+                batch_size=self.batch_size
             )
-        except Exception as e:
-            logger.debug(f"Failed to extract function: {e}")
-            return None
+        except Exception:
+            # The manifest is not saved, so stored batches would be untracked
+            logger.error(f"❌ Indexing failed, removing {len(inserted)} chunks stored by this run")
+            self._delete_chunks(inserted)
+            raise
+        
+        chunks_indexed = 0
+        for (rel, (_, content_hash)), chunks in zip(changed.items(), results):
+            self.manifest.set_file(rel, content_hash, [chunk.id for chunk in chunks])
+            chunks_indexed += len(chunks)
+        self.manifest.commit = head
+        self.manifest.dirty = sorted(dirty) if dirty else []
+        self.manifest.save()
+        
+        self.last_stats = {
+            'files_changed': len(changed),
+            'files_removed': len(removed),
+            'chunks_indexed': chunks_indexed,
+            'chunks_deleted': deleted,
+            'files_total': len(self.manifest.files)
+        }
+        logger.info(
+            f"✅ Indexed {len(changed)} changed files ({chunks_indexed} chunks), "
+            f"removed {len(removed)} files ({deleted} chunks); {len(self.manifest.files)} files tracked"
+        )
+        self.total_chunks = sum(len(entry['chunks']) for entry in self.manifest.files.values())
+        
+        return chunks_indexed
     
-    def _extract_class(
-        self,
-        node: ast.ClassDef,
-        source: str,
-        file_path: Path
-    ) -> Optional[CodeChunk]:
-        """Extract class definition as code chunk."""
-        try:
-            lines = source.split('\n')
-            start_line = node.lineno - 1
-            end_line = node.end_lineno if node.end_lineno else start_line + 1
-            
-            class_source = '\n'.join(lines[start_line:end_line])
-            
-            # Skip very large classes (will be indexed via methods)
-            if len(class_source) > 15000:
-                return None
-            
-            chunk_id = self._generate_chunk_id(file_path, start_line, "class")
-            
-            return CodeChunk(
-                id=chunk_id,
-                content=class_source,
-                file_path=str(file_path.relative_to(self.root_dir)),
-                chunk_type="class",
-                name=node.name,
-                docstring=ast.get_docstring(node),
-                start_line=start_line + 1,
-                end_line=end_line,
-                language="python"
-            )
-        except Exception as e:
-            logger.debug(f"Failed to extract class: {e}")
+    def _git_candidates(self, head: Optional[str], dirty: Optional[set]) -> Optional[List[str]]:
+        """Python files that may have changed since the last index (None = scan everything)."""
+        if not head or dirty is None or not self.manifest.commit or not self.manifest.files:
+            return None
+        changed = git_changed_files(self.root_dir, self.manifest.commit)
+        if changed is None:
+            logger.info(f"♻️ Last indexed commit {self.manifest.commit[:8]} not found, scanning all files")
             return None
+        # Files dirty at the last run may have been reverted since
+        candidates = changed | dirty | set(self.manifest.dirty)
+        return sorted(path for path in candidates if path.endswith('.py'))
     
-    def _create_module_chunk(
-        self,
-        source: str,
-        file_path: Path,
-        docstring: str
-    ) -> CodeChunk:
-        """Create chunk for module-level docstring."""
-        chunk_id = self._generate_chunk_id(file_path, 0, "module")
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.root_dir).as_posix()
+    
+    def _should_index(self, path: Path, max_size_kb: int) -> bool:
+        """Apply directory exclusions and size limit to a file."""
+        if any(part in self.EXCLUDE_DIRS for part in path.relative_to(self.root_dir).parts[:-1]):
+            return False
         
-        # Include docstring + first 500 chars of module
-        content = docstring + "\n\n" + source[:500]
+        if path.stat().st_size > max_size_kb * 1024:
+            logger.debug(f"⏭️ Skipping large file: {path}")
+            return False
         
-        return CodeChunk(
-            id=chunk_id,
-            content=content,
-            file_path=str(file_path.relative_to(self.root_dir)),
-            chunk_type="module",
-            name=file_path.stem,
-            docstring=docstring,
-            start_line=1,
-            end_line=1,
-            language="python"
-        )
+        return True
     
-    def _generate_chunk_id(self, file_path: Path, line: int, chunk_type: str) -> str:
-        """Generate unique ID for code chunk."""
-        content = f"{file_path}:{line}:{chunk_type}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def _find_python_files(
+        self,
+        exclude_patterns: List[str],
+        max_size_kb: int
+    ) -> List[Path]:
+        """Find all Python files in workspace."""
+        return [
+            path for path in self.root_dir.rglob("*.py")
+            if path.is_file() and self._should_index(path, max_size_kb)
+        ]
+    
+    def _delete_chunks(self, chunk_ids: List[str]) -> int:
+        """Delete chunks from the code collection in bounded batches."""
+        deleted = 0
+        for i in range(0, len(chunk_ids), 1000):
+            batch = chunk_ids[i:i + 1000]
+            try:
+                deleted += self.vector_store.delete(collection_name="code", ids=batch)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to delete {len(batch)} stale chunks: {e}")
+            if self.lexical_index is not None:
+                self.lexical_index.delete(batch)
+        return deleted
+    
+    def _parse_file(self, file_path: Path) -> List[CodeChunk]:
+        """Parse Python file and extract code chunks."""
+        return parse_python_file(file_path, self.root_dir)
     
     def _store_chunks(self, chunks: List[CodeChunk]):
         """Generate embeddings and store chunks in vector database."""
         logger.info(f"📦 Storing {len(chunks)} code chunks...")
+        self._insert_chunks(chunks, self._embed_chunks(chunks))
+    
+    def _embed_chunks(self, chunks: List[CodeChunk]) -> Tuple[List[str], Any]:
+        """Generate embeddings for chunks (pipeline embed stage).
         
-        # Prepare data for batch insertion
-        ids = []
-        contents = []
-        metadata_list = []
-        
-        for chunk in chunks:
-            # Create rich content for embedding (code + docstring + context)
-            embedding_content = self._create_embedding_content(chunk)
-            
-            ids.append(chunk.id)
-            contents.append(embedding_content)
-            metadata_list.append({
+        Returns:
+            (embedding contents, embeddings)
+        """
+        # Create rich content for embedding (code + docstring + context)
+        contents = [self._create_embedding_content(chunk) for chunk in chunks]
+        return contents, self.embedding_service.embed(contents)
+    
+    def _insert_chunks(self, chunks: List[CodeChunk], embedded: Tuple[List[str], Any]):
+        """Store embedded chunks in the code collection (pipeline insert stage)."""
+        contents, embeddings = embedded
+        metadata_list = [
+            {
                 "file_path": chunk.file_path,
                 "chunk_type": chunk.chunk_type,
                 "name": chunk.name,
@@ -287,13 +419,11 @@ class CodeIndexer:
                 "end_line": chunk.end_line,
                 "docstring": chunk.docstring or "",
                 "language": chunk.language
-            })
-        
-        # Generate embeddings in batch
-        logger.info("🧠 Generating embeddings...")
-        embeddings = self.embedding_service.embed(contents)
+            }
+            for chunk in chunks
+        ]
         
-        # Store in vector database
+        ids = [chunk.id for chunk in chunks]
         self.vector_store.insert(
             collection_name="code",
             ids=ids,
@@ -301,6 +431,8 @@ class CodeIndexer:
             contents=contents,
             metadata=metadata_list
         )
+        if self.lexical_index is not None:
+            self.lexical_index.add(ids, contents, metadata_list)
     
     def _create_embedding_content(self, chunk: CodeChunk) -> str:
         """Create rich content for embedding generation.
@@ -328,26 +460,39 @@ class CodeIndexer:
         """Update index for a single file.
         
         Args:
-            file_path: Path to file that changed
+            file_path: Path to file that changed (or was removed)
             
         Returns:
             Number of chunks updated
         """
         logger.info(f"🔄 Updating index for {file_path}")
         
+        file_path = Path(file_path)
+        if not file_path.is_absolute():
+            file_path = self.root_dir / file_path
+        rel = self._rel(file_path)
+        
         # Remove old chunks for this file
-        # (In production, would query by file_path metadata and delete)
+        self._delete_chunks(self.manifest.chunk_ids([rel]))
+        self.manifest.remove_file(rel)
         
         # Re-index file
-        chunks = self._parse_file(file_path)
-        if chunks:
-            self._store_chunks(chunks)
+        chunks = []
+        if file_path.exists():
+            content_hash = file_hash(file_path)
+            chunks = self._parse_file(file_path)
+            if chunks:
+                self._store_chunks(chunks)
+            self.manifest.set_file(rel, content_hash, [chunk.id for chunk in chunks])
+        self.manifest.save()
         
         return len(chunks)
     
     def close(self):
         """Clean up resources."""
         self.vector_store.close()
+        if self.lexical_index is not None:
+            self.lexical_index.close()
         logger.info("👋 Code indexer closed")
 
 
@@ -7,6 +7,10 @@ Indexes markdown files into RAG system:
 3. Chunks by headings for context
 4. Generates embeddings
 5. Stores in vector database
+
+Files are parsed in a process pool and their chunks streamed through the
+embedding and insert stages (see pipeline.run_pipeline). Chunks are also
+written to the docs BM25 index for hybrid retrieval.
 """
 
 import os
@@ -14,11 +18,14 @@ import logging
 import re
 import hashlib
 from pathlib import Path
+from functools import partial
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+from ..bm25_index import BM25Index, bm25_dir_for
 from ..embedding_service import EmbeddingService
-from ..vector_store import MilvusVectorStore
+from ..vector_store import VectorStore, create_vector_store
+from .pipeline import PipelineStats, run_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +41,189 @@ class DocChunk:
     metadata: Dict[str, Any]
 
 
+def parse_markdown_file(file_path: str, min_chunk_length: int = 50, max_chunk_length: int = 8000) -> List[DocChunk]:
+    """Parse markdown file into chunks.
+    
+    Module-level (picklable) so the indexing pipeline can run it in worker
+    processes.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to read {file_path}: {e}")
+        return []
+
+    # Skip empty or very small files
+    if len(content.strip()) < min_chunk_length:
+        return []
+
+    chunks = []
+
+    # Split by headings
+    sections = _split_by_headings(content)
+
+    for section_data in sections:
+        heading = section_data['heading']
+        level = section_data['level']
+        section_content = section_data['content']
+        hierarchy = section_data['hierarchy']
+
+        # Skip empty sections
+        if len(section_content.strip()) < min_chunk_length:
+            continue
+
+        # Split long sections into smaller chunks
+        if len(section_content) > max_chunk_length:
+            sub_chunks = _split_long_section(section_content, max_chunk_length)
+            for i, sub_chunk in enumerate(sub_chunks):
+                chunk = _create_chunk(
+                    content=sub_chunk,
+                    file_path=file_path,
+                    section=hierarchy,
+                    level=level,
+                    chunk_index=i
+                )
+                chunks.append(chunk)
+        else:
+            chunk = _create_chunk(
+                content=section_content,
+                file_path=file_path,
+                section=hierarchy,
+                level=level
+            )
+            chunks.append(chunk)
+
+    return chunks
+
+
+def _split_by_headings(content: str) -> List[Dict[str, Any]]:
+    """Split content by markdown headings."""
+    # Regex to match markdown headings
+    heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+
+    sections = []
+    current_heading = "Introduction"
+    current_level = 1
+    current_content = []
+    heading_stack = [""]  # Track heading hierarchy
+
+    lines = content.split('\n')
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+        match = heading_pattern.match(line)
+
+        if match:
+            # Save previous section
+            if current_content:
+                sections.append({
+                    'heading': current_heading,
+                    'level': current_level,
+                    'content': '\n'.join(current_content).strip(),
+                    'hierarchy': ' > '.join(filter(None, heading_stack))
+                })
+                current_content = []
+
+            # Start new section
+            hashes = match.group(1)
+            current_level = len(hashes)
+            current_heading = match.group(2).strip()
+
+            # Update heading hierarchy
+            heading_stack = heading_stack[:current_level]
+            if len(heading_stack) < current_level:
+                heading_stack.extend([''] * (current_level - len(heading_stack)))
+            heading_stack[current_level - 1] = current_heading
+        else:
+            current_content.append(line)
+
+        i += 1
+
+    # Add final section
+    if current_content:
+        sections.append({
+            'heading': current_heading,
+            'level': current_level,
+            'content': '\n'.join(current_content).strip(),
+            'hierarchy': ' > '.join(filter(None, heading_stack))
+        })
+
+    return sections
+
+
+def _split_long_section(content: str, max_chunk_length: int) -> List[str]:
+    """Split long section into smaller chunks."""
+    chunks = []
+
+    # Try to split by paragraphs
+    paragraphs = content.split('\n\n')
+    current_chunk = []
+    current_length = 0
+
+    for para in paragraphs:
+        para_length = len(para)
+
+        if current_length + para_length > max_chunk_length and current_chunk:
+            # Save current chunk
+            chunks.append('\n\n'.join(current_chunk))
+            current_chunk = [para]
+            current_length = para_length
+        else:
+            current_chunk.append(para)
+            current_length += para_length + 2  # +2 for \n\n
+
+    # Add final chunk
+    if current_chunk:
+        chunks.append('\n\n'.join(current_chunk))
+
+    return chunks
+
+
+def _create_chunk(
+    content: str,
+    file_path: str,
+    section: str,
+    level: int,
+    chunk_index: int = 0
+) -> DocChunk:
+    """Create documentation chunk with metadata."""
+    # Generate unique ID
+    content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()[:8]
+    chunk_id = f"docs_{content_hash}_{chunk_index}"
+
+    # Create metadata
+    metadata = {
+        'file_path': file_path,
+        'section': section,
+        'level': level,
+        'chunk_index': chunk_index,
+        'char_count': len(content),
+        'file_name': os.path.basename(file_path)
+    }
+
+    return DocChunk(
+        content=content,
+        file_path=file_path,
+        section=section,
+        level=level,
+        chunk_id=chunk_id,
+        metadata=metadata
+    )
+
+
+def _parse_task(file_path: str, min_chunk_length: int, max_chunk_length: int) -> List[DocChunk]:
+    """Pipeline parse stage: file path -> chunks, never raises."""
+    try:
+        chunks = parse_markdown_file(file_path, min_chunk_length, max_chunk_length)
+        logger.debug(f"📄 Parsed {len(chunks)} chunks from {os.path.basename(file_path)}")
+        return chunks
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to parse {file_path}: {e}")
+        return []
+
+
 class DocsIndexer:
     """Index markdown documentation into RAG system."""
     
@@ -52,9 +242,12 @@ class DocsIndexer:
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[MilvusVectorStore] = None,
+        vector_store: Optional[VectorStore] = None,
         min_chunk_length: int = 50,
-        max_chunk_length: int = 8000
+        max_chunk_length: int = 8000,
+        parse_workers: Optional[int] = None,
+        batch_size: int = 256,
+        lexical: bool = True
     ):
         """Initialize documentation indexer.
         
@@ -63,13 +256,20 @@ class DocsIndexer:
             vector_store: Vector database instance
             min_chunk_length: Minimum chunk length in characters
             max_chunk_length: Maximum chunk length in characters
+            parse_workers: Parse processes (default: RAG_PARSE_WORKERS env, then CPU count)
+            batch_size: Chunks per embedding/insert batch
+            lexical: Also maintain the BM25 index used for hybrid retrieval
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.vector_store = vector_store or MilvusVectorStore(
+        self.vector_store = vector_store or create_vector_store(
             embedding_dim=self.embedding_service.embedding_dim
         )
+        self.lexical_index = BM25Index("docs", bm25_dir_for(self.vector_store)) if lexical else None
         self.min_chunk_length = min_chunk_length
         self.max_chunk_length = max_chunk_length
+        self.parse_workers = parse_workers
+        self.batch_size = batch_size
+        self.pipeline_stats: Optional[PipelineStats] = None
         
         logger.info("📚 Documentation indexer initialized")
     
@@ -90,52 +290,48 @@ class DocsIndexer:
         logger.info(f"📂 Indexing documentation from: {workspace_path}")
         
         workspace_path = os.path.abspath(workspace_path)
-        all_chunks = []
-        
-        # Index main workspace
-        main_chunks = self._scan_directory(workspace_path)
-        all_chunks.extend(main_chunks)
         
-        # Index additional paths
+        # Main workspace plus additional paths
+        files = self._find_markdown_files(workspace_path)
         if additional_paths:
             for path in additional_paths:
                 if not os.path.isabs(path):
                     path = os.path.join(workspace_path, path)
                 
                 if os.path.isfile(path):
-                    chunks = self._parse_file(path)
-                    all_chunks.extend(chunks)
+                    files.append(path)
                 elif os.path.isdir(path):
-                    chunks = self._scan_directory(path)
-                    all_chunks.extend(chunks)
-        
-        # Store chunks
-        total_stored = self._store_chunks(all_chunks)
+                    files.extend(self._find_markdown_files(path))
+        
+        # Parse (process pool) -> embed -> insert, stages overlapping
+        results, self.pipeline_stats = run_pipeline(
+            tasks=files,
+            parse_fn=partial(_parse_task, min_chunk_length=self.min_chunk_length, max_chunk_length=self.max_chunk_length),
+            embed_fn=self._embed_chunks,
+            insert_fn=self._insert_chunks,
+            workers=self.parse_workers,
+            batch_size=self.batch_size
+        )
+        total_stored = sum(len(chunks) for chunks in results)
         
-        logger.info(f"✅ Indexed {total_stored} documentation chunks")
+        logger.info(f"✅ Indexed {total_stored} documentation chunks from {len(files)} files")
         return total_stored
     
-    def _scan_directory(self, root_path: str) -> List[DocChunk]:
+    def _find_markdown_files(self, root_path: str) -> List[str]:
         """Recursively scan directory for markdown files."""
-        all_chunks = []
+        files = []
         
         for dirpath, dirnames, filenames in os.walk(root_path):
             # Remove excluded directories
             dirnames[:] = [d for d in dirnames if d not in self.EXCLUDE_DIRS]
             
-            # Process markdown files
-            for filename in filenames:
-                if self._is_markdown_file(filename):
-                    file_path = os.path.join(dirpath, filename)
-                    
-                    try:
-                        chunks = self._parse_file(file_path)
-                        all_chunks.extend(chunks)
-                        logger.debug(f"📄 Parsed {len(chunks)} chunks from {filename}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to parse {file_path}: {e}")
+            files.extend(
+                os.path.join(dirpath, filename)
+                for filename in filenames
+                if self._is_markdown_file(filename)
+            )
         
-        return all_chunks
+        return files
     
     def _is_markdown_file(self, filename: str) -> bool:
         """Check if file is a markdown file."""
@@ -152,168 +348,7 @@ class DocsIndexer:
     
     def _parse_file(self, file_path: str) -> List[DocChunk]:
         """Parse markdown file into chunks."""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to read {file_path}: {e}")
-            return []
-        
-        # Skip empty or very small files
-        if len(content.strip()) < self.min_chunk_length:
-            return []
-        
-        chunks = []
-        
-        # Split by headings
-        sections = self._split_by_headings(content)
-        
-        for section_data in sections:
-            heading = section_data['heading']
-            level = section_data['level']
-            section_content = section_data['content']
-            hierarchy = section_data['hierarchy']
-            
-            # Skip empty sections
-            if len(section_content.strip()) < self.min_chunk_length:
-                continue
-            
-            # Split long sections into smaller chunks
-            if len(section_content) > self.max_chunk_length:
-                sub_chunks = self._split_long_section(section_content)
-                for i, sub_chunk in enumerate(sub_chunks):
-                    chunk = self._create_chunk(
-                        content=sub_chunk,
-                        file_path=file_path,
-                        section=hierarchy,
-                        level=level,
-                        chunk_index=i
-                    )
-                    chunks.append(chunk)
-            else:
-                chunk = self._create_chunk(
-                    content=section_content,
-                    file_path=file_path,
-                    section=hierarchy,
-                    level=level
-                )
-                chunks.append(chunk)
-        
-        return chunks
-    
-    def _split_by_headings(self, content: str) -> List[Dict[str, Any]]:
-        """Split content by markdown headings."""
-        # Regex to match markdown headings
-        heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
-        
-        sections = []
-        current_heading = "Introduction"
-        current_level = 1
-        current_content = []
-        heading_stack = [""]  # Track heading hierarchy
-        
-        lines = content.split('\n')
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i]
-            match = heading_pattern.match(line)
-            
-            if match:
-                # Save previous section
-                if current_content:
-                    sections.append({
-                        'heading': current_heading,
-                        'level': current_level,
-                        'content': '\n'.join(current_content).strip(),
-                        'hierarchy': ' > '.join(filter(None, heading_stack))
-                    })
-                    current_content = []
-                
-                # Start new section
-                hashes = match.group(1)
-                current_level = len(hashes)
-                current_heading = match.group(2).strip()
-                
-                # Update heading hierarchy
-                heading_stack = heading_stack[:current_level]
-                if len(heading_stack) < current_level:
-                    heading_stack.extend([''] * (current_level - len(heading_stack)))
-                heading_stack[current_level - 1] = current_heading
-            else:
-                current_content.append(line)
-            
-            i += 1
-        
-        # Add final section
-        if current_content:
-            sections.append({
-                'heading': current_heading,
-                'level': current_level,
-                'content': '\n'.join(current_content).strip(),
-                'hierarchy': ' > '.join(filter(None, heading_stack))
-            })
-        
-        return sections
-    
-    def _split_long_section(self, content: str) -> List[str]:
-        """Split long section into smaller chunks."""
-        chunks = []
-        
-        # Try to split by paragraphs
-        paragraphs = content.split('\n\n')
-        current_chunk = []
-        current_length = 0
-        
-        for para in paragraphs:
-            para_length = len(para)
-            
-            if current_length + para_length > self.max_chunk_length and current_chunk:
-                # Save current chunk
-                chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [para]
-                current_length = para_length
-            else:
-                current_chunk.append(para)
-                current_length += para_length + 2  # +2 for \n\n
-        
-        # Add final chunk
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
-        
-        return chunks
-    
-    def _create_chunk(
-        self,
-        content: str,
-        file_path: str,
-        section: str,
-        level: int,
-        chunk_index: int = 0
-    ) -> DocChunk:
-        """Create documentation chunk with metadata."""
-        # Generate unique ID
-        content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()[:8]
-        chunk_id = f"docs_{content_hash}_{chunk_index}"
-        
-        # Create metadata
-        metadata = {
-            'file_path': file_path,
-            'section': section,
-            'level': level,
-            'chunk_index': chunk_index,
-            'char_count': len(content),
-            'file_name': os.path.basename(file_path)
-        }
-        
-        return DocChunk(
-            content=content,
-            file_path=file_path,
-            section=section,
-            level=level,
-            chunk_id=chunk_id,
-            metadata=metadata
-        )
+        return parse_markdown_file(file_path, self.min_chunk_length, self.max_chunk_length)
     
     def _store_chunks(self, chunks: List[DocChunk]) -> int:
         """Store documentation chunks in vector database."""
@@ -321,43 +356,35 @@ class DocsIndexer:
             return 0
         
         logger.info(f"💾 Storing {len(chunks)} documentation chunks...")
+        self._insert_chunks(chunks, self._embed_chunks(chunks))
         
-        # Prepare data for batch insertion
-        ids = []
-        contents = []
-        metadatas = []
-        
-        for chunk in chunks:
-            ids.append(chunk.chunk_id)
-            contents.append(chunk.content)
-            metadatas.append(chunk.metadata)
-        
-        # Generate embeddings in batches
-        batch_size = 32
-        all_embeddings = []
-        
-        for i in range(0, len(contents), batch_size):
-            batch = contents[i:i + batch_size]
-            embeddings = self.embedding_service.embed(batch)
-            all_embeddings.extend(embeddings)
-            
-            logger.debug(f"📊 Embedded batch {i // batch_size + 1}/{(len(contents) + batch_size - 1) // batch_size}")
-        
-        # Insert into vector store
+        logger.info(f"✅ Stored {len(chunks)} documentation chunks")
+        return len(chunks)
+    
+    def _embed_chunks(self, chunks: List[DocChunk]):
+        """Generate embeddings for chunks (pipeline embed stage)."""
+        return self.embedding_service.embed([chunk.content for chunk in chunks])
+    
+    def _insert_chunks(self, chunks: List[DocChunk], embeddings):
+        """Store embedded chunks in the docs collection (pipeline insert stage)."""
+        ids = [chunk.chunk_id for chunk in chunks]
+        contents = [chunk.content for chunk in chunks]
+        metadata = [chunk.metadata for chunk in chunks]
         self.vector_store.insert(
             collection_name="docs",
             ids=ids,
-            embeddings=all_embeddings,
+            embeddings=embeddings,
             contents=contents,
-            metadatas=metadatas
+            metadata=metadata
         )
-        
-        logger.info(f"✅ Stored {len(chunks)} documentation chunks")
-        return len(chunks)
+        if self.lexical_index is not None:
+            self.lexical_index.add(ids, contents, metadata)
     
     def close(self):
         """Clean up resources."""
         self.vector_store.close()
+        if self.lexical_index is not None:
+            self.lexical_index.close()
         logger.info("👋 Documentation indexer closed")
 
 
@@ -0,0 +1,215 @@
+"""
+Index Manifest - persistent record of what an indexer has stored
+
+Maps each indexed file (relative path) to its content hash and the chunk IDs
+it produced, plus the git commit the index was built from. Indexers use it to
+re-embed only changed files and to delete the chunks of changed and removed
+files from the vector store.
+
+IssueCheckpoint plays the same role for issue indexing: the updatedAt cursor
+the last run reached, per repository.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MANIFEST_DIR = "data/rag_manifests"
+MANIFEST_VERSION = 1
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_manifest_path(kind: str, root_dir: Path) -> Path:
+    """Manifest location for an indexer kind and workspace root.
+
+    The directory can be overridden with RAG_MANIFEST_DIR.
+    """
+    root_key = hashlib.sha256(str(Path(root_dir).resolve()).encode()).hexdigest()[:12]
+    manifest_dir = Path(os.getenv("RAG_MANIFEST_DIR", DEFAULT_MANIFEST_DIR))
+    return manifest_dir / f"{kind}-{root_key}.json"
+
+
+def store_signature(vector_store) -> str:
+    """Identify a vector store so a manifest is never applied to another store."""
+    persist_dir = getattr(vector_store, 'persist_dir', None)
+    if persist_dir:
+        location = str(Path(persist_dir).resolve())
+    else:
+        location = f"{getattr(vector_store, 'host', '')}:{getattr(vector_store, 'port', '')}"
+    return f"{type(vector_store).__name__}:{location}"
+
+
+class IndexManifest:
+    """File hash -> chunk IDs manifest for incremental indexing."""
+
+    def __init__(self, path: Path, store_signature: str = ""):
+        """Load manifest (empty if missing, unreadable or built for another store).
+
+        Args:
+            path: Manifest JSON file
+            store_signature: Identifies the vector store the chunks live in
+        """
+        self.path = Path(path)
+        self.store_signature = store_signature
+        self.commit: Optional[str] = None
+        self.dirty: List[str] = []  # Uncommitted files at last index time
+        self.files: Dict[str, Dict] = {}  # rel_path -> {'hash': str, 'chunks': [ids]}
+
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable manifest {self.path}: {e}")
+            return
+        if data.get('version') != MANIFEST_VERSION or data.get('store') != store_signature:
+            logger.info(f"♻️ Manifest {self.path.name} is for another store or version, reindexing")
+            return
+        self.commit = data.get('commit')
+        self.dirty = data.get('dirty', [])
+        self.files = data.get('files', {})
+
+    def chunk_ids(self, rel_paths) -> List[str]:
+        """All chunk IDs recorded for the given files."""
+        ids = []
+        for rel_path in rel_paths:
+            entry = self.files.get(rel_path)
+            if entry:
+                ids.extend(entry['chunks'])
+        return ids
+
+    def set_file(self, rel_path: str, content_hash: str, chunk_ids: List[str]):
+        self.files[rel_path] = {'hash': content_hash, 'chunks': list(chunk_ids)}
+
+    def remove_file(self, rel_path: str):
+        self.files.pop(rel_path, None)
+
+    def save(self):
+        """Write manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'store': self.store_signature,
+                'commit': self.commit,
+                'dirty': self.dirty,
+                'files': self.files
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+class IssueCheckpoint:
+    """Per-repository resume point for incremental issue indexing.
+
+    Records the updatedAt timestamp of the last issue whose chunk was stored;
+    the next run asks GitHub only for issues updated since then.
+    """
+
+    def __init__(self, path: Path, store_signature: str = "", state: str = "closed"):
+        """Load checkpoint (empty if missing, unreadable, or for another store or state).
+
+        Args:
+            path: Checkpoint JSON file
+            store_signature: Identifies the vector store the chunks live in
+            state: Issue state filter the checkpoint was built with
+        """
+        self.path = Path(path)
+        self.store_signature = store_signature
+        self.state = state
+        self.since: Optional[str] = None  # ISO 8601 updatedAt of the last stored issue
+        self.since_numbers: List[int] = []  # Issues already processed at exactly `since`
+        self.indexed = 0
+
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable checkpoint {self.path}: {e}")
+            return
+        if (data.get('version') != MANIFEST_VERSION or data.get('store') != store_signature
+                or data.get('state') != state):
+            logger.info(f"♻️ Checkpoint {self.path.name} is for another store or state, reindexing")
+            return
+        self.since = data.get('since')
+        self.since_numbers = data.get('since_numbers', [])
+        self.indexed = data.get('indexed', 0)
+
+    def save(self):
+        """Write checkpoint atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'store': self.store_signature,
+                'state': self.state,
+                'since': self.since,
+                'since_numbers': self.since_numbers,
+                'indexed': self.indexed
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+def _git(root_dir: Path, args: List[str]) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(root_dir)] + args,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_head(root_dir: Path) -> Optional[str]:
+    """HEAD commit of root_dir, or None when it is not a git checkout."""
+    out = _git(root_dir, ['rev-parse', 'HEAD'])
+    return out.strip() if out else None
+
+
+def git_dirty_files(root_dir: Path) -> Optional[Set[str]]:
+    """Modified, staged and untracked files (paths relative to root_dir)."""
+    out = _git(root_dir, ['status', '--porcelain', '-z', '--untracked-files=all', '--no-renames', '--', '.'])
+    if out is None:
+        return None
+    prefix = _git(root_dir, ['rev-parse', '--show-prefix']) or ''
+    prefix = prefix.strip()
+    paths = set()
+    for entry in out.split('\0'):
+        if len(entry) > 3:
+            path = entry[3:]
+            paths.add(path[len(prefix):] if prefix and path.startswith(prefix) else path)
+    return paths
+
+
+def git_changed_files(root_dir: Path, since_commit: str) -> Optional[Set[str]]:
+    """Files changed between since_commit and HEAD (relative to root_dir).
+
+    Returns:
+        Set of paths, or None if the diff cannot be computed (e.g. unknown commit)
+    """
+    out = _git(root_dir, ['diff', '--name-only', '-z', '--no-renames', '--relative', since_commit, 'HEAD', '--', '.'])
+    if out is None:
+        return None
+    return {path for path in out.split('\0') if path}
@@ -2,27 +2,35 @@
 Issue History Indexer - Index resolved GitHub issues
 
 Indexes closed GitHub issues as problem-solution pairs:
-1. Fetches closed issues via GitHub API
+1. Streams closed issues page by page via GitHub API (since= checkpoint)
 2. Extracts problem description and resolution
 3. Links to related PRs and commits
 4. Generates embeddings
-5. Stores in vector database
+5. Stores in vector database (and the issues BM25 index for hybrid retrieval)
 """
 
 import os
 import logging
 import hashlib
-import json
-from typing import List, Dict, Any, Optional
+import subprocess
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Dict, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
 
+import requests
+
+from ..bm25_index import BM25Index, bm25_dir_for
 from ..embedding_service import EmbeddingService
-from ..vector_store import MilvusVectorStore
+from ..vector_store import VectorStore, create_vector_store
+from .index_manifest import DEFAULT_MANIFEST_DIR, IssueCheckpoint, store_signature
 
 logger = logging.getLogger(__name__)
 
 
+GITHUB_API_URL = "https://api.github.com"
+
+
 @dataclass
 class IssueChunk:
     """Issue history chunk with metadata."""
@@ -34,27 +42,89 @@ class IssueChunk:
     metadata: Dict[str, Any]
 
 
+def issue_chunk_id(owner: str, repo: str, number: int) -> str:
+    """Stable chunk ID of an issue (one chunk per issue)."""
+    content_hash = hashlib.md5(f"{owner}/{repo}#{number}".encode()).hexdigest()[:8]
+    return f"issue_{owner}_{repo}_{number}_{content_hash}"
+
+
+def default_checkpoint_path(owner: str, repo: str) -> Path:
+    """Checkpoint location for a repository (RAG_MANIFEST_DIR, default data/rag_manifests)."""
+    manifest_dir = Path(os.getenv("RAG_MANIFEST_DIR", DEFAULT_MANIFEST_DIR))
+    return manifest_dir / f"issues-{owner}-{repo}.json"
+
+
+def _normalize_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST issue payload to the gh CLI-style dict used by _create_chunk."""
+    return {
+        'number': issue.get('number'),
+        'title': issue.get('title') or '',
+        'body': issue.get('body') or '',
+        'state': (issue.get('state') or '').lower(),
+        'createdAt': issue.get('created_at') or '',
+        'updatedAt': issue.get('updated_at') or '',
+        'closedAt': issue.get('closed_at') or '',
+        'labels': [{'name': label.get('name', '')} for label in issue.get('labels') or [] if isinstance(label, dict)],
+        'assignees': [{'login': user.get('login', '')} for user in issue.get('assignees') or []],
+        'url': issue.get('html_url') or ''
+    }
+
+
+def _gh_auth_token() -> Optional[str]:
+    """Token of the logged-in GitHub CLI user, if gh is installed and authenticated."""
+    try:
+        result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
 class IssueIndexer:
-    """Index GitHub issue history into RAG system."""
+    """Index GitHub issue history into RAG system.
+    
+    Issues are streamed page by page (least recently updated first) and
+    embedded and stored in batches of batch_size. After each batch the
+    repository checkpoint advances to the last stored issue's updatedAt, so a
+    failed run resumes where it stopped and later runs fetch only issues
+    updated since (passed to GitHub as since=).
+    """
     
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[MilvusVectorStore] = None,
-        github_token: Optional[str] = None
+        vector_store: Optional[VectorStore] = None,
+        github_token: Optional[str] = None,
+        lexical: bool = True,
+        batch_size: int = 64,
+        page_size: int = 100,
+        checkpoint_dir: Optional[Path] = None,
+        api_url: str = GITHUB_API_URL
     ):
         """Initialize issue indexer.
         
         Args:
             embedding_service: Service for generating embeddings
             vector_store: Vector database instance
-            github_token: GitHub API token (uses GITHUB_TOKEN env if not provided)
+            github_token: GitHub API token (uses GITHUB_TOKEN env, then `gh auth token`)
+            lexical: Also maintain the BM25 index used for hybrid retrieval
+            batch_size: Issues per embedding/insert batch (and checkpoint)
+            page_size: Issues per GitHub API page (max 100)
+            checkpoint_dir: Checkpoint directory (default: RAG_MANIFEST_DIR or data/rag_manifests)
+            api_url: GitHub REST API base URL
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.vector_store = vector_store or MilvusVectorStore(
+        self.vector_store = vector_store or create_vector_store(
             embedding_dim=self.embedding_service.embedding_dim
         )
-        self.github_token = github_token or os.getenv('GITHUB_TOKEN')
+        self.lexical_index = BM25Index("issues", bm25_dir_for(self.vector_store)) if lexical else None
+        self.github_token = github_token or os.getenv('GITHUB_TOKEN') or _gh_auth_token()
+        self.batch_size = batch_size
+        self.page_size = min(page_size, 100)
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.api_url = api_url.rstrip('/')
+        self._session = None
         
         if not self.github_token:
             logger.warning("⚠️ No GitHub token provided - API rate limits will apply")
@@ -66,132 +136,175 @@ class IssueIndexer:
         owner: str,
         repo: str,
         state: str = "closed",
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        full: bool = False
     ) -> int:
         """Index issues from a GitHub repository.
         
+        Only issues updated since the last run's checkpoint are fetched. Their
+        chunks are replaced; issues that no longer match state (e.g. reopened)
+        or no longer qualify are removed from the index.
+        
         Args:
             owner: Repository owner
             repo: Repository name
             state: Issue state ('open', 'closed', 'all')
-            limit: Maximum number of issues to fetch
+            limit: Maximum number of issues to process in this run
+            full: Ignore the checkpoint and fetch every issue
             
         Returns:
             Number of issues indexed
         """
         logger.info(f"📂 Indexing issues from {owner}/{repo} (state={state})")
         
-        # Fetch issues using GitHub CLI or API
-        issues = self._fetch_issues(owner, repo, state, limit)
-        
-        if not issues:
-            logger.warning("⚠️ No issues found to index")
-            return 0
-        
-        # Convert to chunks
-        chunks = []
-        for issue_data in issues:
-            chunk = self._create_chunk(issue_data, owner, repo)
-            if chunk:
-                chunks.append(chunk)
+        checkpoint = IssueCheckpoint(
+            self._checkpoint_path(owner, repo),
+            store_signature=store_signature(self.vector_store),
+            state=state
+        )
+        # Resumed/incremental and full reruns overwrite existing chunks
+        replace = full or checkpoint.since is not None
+        if full:
+            checkpoint.since = None
+            checkpoint.indexed = 0
+        since = checkpoint.since
+        if since:
+            logger.info(f"⏩ Resuming from issues updated since {since}")
+        
+        # Incremental runs fetch every state so issues that left `state` get dropped
+        fetch_state = state if since is None else 'all'
+        
+        total_stored = 0
+        batch: List[IssueChunk] = []
+        stale_ids: List[str] = []
+        # since= is inclusive: skip issues already stored at exactly the cursor time
+        done_at_since = set(checkpoint.since_numbers) if since else set()
+        cursor, cursor_numbers = since, list(checkpoint.since_numbers) if since else []
+        try:
+            issues = (
+                issue for issue in self.iter_issues(owner, repo, fetch_state, since)
+                if not (issue.get('updatedAt') == since and issue.get('number') in done_at_since)
+            )
+            for issue_data in islice(issues, limit):
+                chunk = None
+                if state == 'all' or issue_data.get('state', '').lower() == state:
+                    chunk = self._create_chunk(issue_data, owner, repo)
+                if chunk:
+                    batch.append(chunk)
+                elif replace and issue_data.get('number'):
+                    stale_ids.append(issue_chunk_id(owner, repo, issue_data['number']))
+                updated_at = issue_data.get('updatedAt')
+                if updated_at and updated_at != cursor:
+                    cursor, cursor_numbers = updated_at, []
+                cursor_numbers.append(issue_data.get('number'))
+                
+                if len(batch) >= self.batch_size:
+                    total_stored += self._flush(batch, stale_ids, replace, checkpoint, cursor, cursor_numbers)
+                    batch, stale_ids = [], []
+        except requests.RequestException as e:
+            logger.error(f"❌ Failed to fetch issues via API: {e}")
         
-        # Store chunks
-        total_stored = self._store_chunks(chunks)
+        total_stored += self._flush(batch, stale_ids, replace, checkpoint, cursor, cursor_numbers)
         
+        if not total_stored:
+            logger.info("ℹ️ No new or updated issues to index")
         logger.info(f"✅ Indexed {total_stored} issues from {owner}/{repo}")
         return total_stored
     
-    def _fetch_issues(
+    def iter_issues(
         self,
         owner: str,
         repo: str,
-        state: str,
-        limit: Optional[int]
-    ) -> List[Dict[str, Any]]:
-        """Fetch issues from GitHub.
+        state: str = "closed",
+        since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream issues (pull requests excluded), least recently updated first.
         
-        Uses GitHub CLI (gh) if available, otherwise falls back to REST API.
-        """
-        # Try GitHub CLI first
-        try:
-            import subprocess
-            
-            cmd = [
-                'gh', 'issue', 'list',
-                '--repo', f"{owner}/{repo}",
-                '--state', state,
-                '--json', 'number,title,body,state,createdAt,closedAt,labels,assignees,url'
-            ]
+        Pages are fetched lazily by following the API's Link: next header, so
+        only one page is held in memory.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            state: Issue state ('open', 'closed', 'all')
+            since: Only issues updated at or after this ISO 8601 timestamp
             
-            if limit:
-                cmd.extend(['--limit', str(limit)])
+        Yields:
+            Issue dicts in gh CLI format (camelCase timestamps)
+        """
+        url = f"{self.api_url}/repos/{owner}/{repo}/issues"
+        params = {'state': state, 'sort': 'updated', 'direction': 'asc', 'per_page': self.page_size}
+        if since:
+            params['since'] = since
+        
+        session = self._get_session()
+        pages = 0
+        while url:
+            response = session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            pages += 1
+            logger.debug(f"📄 Fetched issue page {pages} ({len(response.content)} bytes)")
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            issues = json.loads(result.stdout)
+            for issue in response.json():
+                # Pull requests appear as issues in the API
+                if 'pull_request' not in issue:
+                    yield _normalize_issue(issue)
             
-            logger.info(f"✅ Fetched {len(issues)} issues via GitHub CLI")
-            return issues
+            # The next link already carries the query string
+            url = response.links.get('next', {}).get('url')
+            params = None
+    
+    def _get_session(self):
+        """Pooled HTTP session with retries on transient server errors."""
+        if self._session is None:
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
             
-        except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"⚠️ GitHub CLI failed, trying REST API: {e}")
-            return self._fetch_issues_api(owner, repo, state, limit)
+            self._session = requests.Session()
+            self._session.headers['Accept'] = 'application/vnd.github+json'
+            if self.github_token:
+                self._session.headers['Authorization'] = f'Bearer {self.github_token}'
+            retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(500, 502, 503, 504), allowed_methods=('GET',))
+            self._session.mount('https://', HTTPAdapter(max_retries=retry))
+            self._session.mount('http://', HTTPAdapter(max_retries=retry))
+        return self._session
     
-    def _fetch_issues_api(
+    def _checkpoint_path(self, owner: str, repo: str) -> Path:
+        if self.checkpoint_dir:
+            return self.checkpoint_dir / f"issues-{owner}-{repo}.json"
+        return default_checkpoint_path(owner, repo)
+    
+    def _flush(
         self,
-        owner: str,
-        repo: str,
-        state: str,
-        limit: Optional[int]
-    ) -> List[Dict[str, Any]]:
-        """Fetch issues via GitHub REST API."""
+        chunks: List[IssueChunk],
+        stale_ids: List[str],
+        replace: bool,
+        checkpoint: IssueCheckpoint,
+        cursor: Optional[str],
+        cursor_numbers: List[int]
+    ) -> int:
+        """Store a batch, then advance the checkpoint past it."""
+        if replace:
+            self._delete_chunks(stale_ids + [chunk.chunk_id for chunk in chunks])
+        stored = self._store_chunks(chunks)
+        
+        if cursor:
+            checkpoint.since = cursor
+            checkpoint.since_numbers = list(cursor_numbers)
+            checkpoint.indexed += stored
+            checkpoint.save()
+        return stored
+    
+    def _delete_chunks(self, chunk_ids: List[str]):
+        """Delete issue chunks from the vector store and BM25 index."""
+        if not chunk_ids:
+            return
         try:
-            import requests
-            
-            headers = {
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
-            
-            url = f'https://api.github.com/repos/{owner}/{repo}/issues'
-            params = {
-                'state': state,
-                'per_page': min(limit or 100, 100)
-            }
-            
-            all_issues = []
-            page = 1
-            
-            while True:
-                params['page'] = page
-                response = requests.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                
-                issues = response.json()
-                
-                if not issues:
-                    break
-                
-                # Filter out pull requests (they appear as issues in API)
-                issues = [i for i in issues if 'pull_request' not in i]
-                all_issues.extend(issues)
-                
-                if limit and len(all_issues) >= limit:
-                    all_issues = all_issues[:limit]
-                    break
-                
-                if len(issues) < params['per_page']:
-                    break
-                
-                page += 1
-            
-            logger.info(f"✅ Fetched {len(all_issues)} issues via REST API")
-            return all_issues
-            
+            self.vector_store.delete(collection_name="issues", ids=chunk_ids)
         except Exception as e:
-            logger.error(f"❌ Failed to fetch issues via API: {e}")
-            return []
+            logger.warning(f"⚠️ Failed to delete {len(chunk_ids)} issue chunks: {e}")
+        if self.lexical_index is not None:
+            self.lexical_index.delete(chunk_ids)
     
     def _create_chunk(
         self,
@@ -229,9 +342,7 @@ class IssueIndexer:
         
         content = "\n".join(content_parts)
         
-        # Generate unique ID
-        content_hash = hashlib.md5(f"{owner}/{repo}#{number}".encode()).hexdigest()[:8]
-        chunk_id = f"issue_{owner}_{repo}_{number}_{content_hash}"
+        chunk_id = issue_chunk_id(owner, repo, number)
         
         # Build metadata
         metadata = {
@@ -314,65 +425,61 @@ class IssueIndexer:
         return ""
     
     def _store_chunks(self, chunks: List[IssueChunk]) -> int:
-        """Store issue chunks in vector database."""
+        """Embed and store a batch of issue chunks."""
         if not chunks:
             return 0
         
         logger.info(f"💾 Storing {len(chunks)} issue chunks...")
         
-        # Prepare data
-        ids = []
-        contents = []
-        metadatas = []
-        
-        for chunk in chunks:
-            ids.append(chunk.chunk_id)
-            contents.append(chunk.content)
-            metadatas.append(chunk.metadata)
-        
-        # Generate embeddings in batches
-        batch_size = 32
-        all_embeddings = []
-        
-        for i in range(0, len(contents), batch_size):
-            batch = contents[i:i + batch_size]
-            embeddings = self.embedding_service.embed(batch)
-            all_embeddings.extend(embeddings)
-            
-            logger.debug(f"📊 Embedded batch {i // batch_size + 1}/{(len(contents) + batch_size - 1) // batch_size}")
+        ids = [chunk.chunk_id for chunk in chunks]
+        contents = [chunk.content for chunk in chunks]
+        metadatas = [chunk.metadata for chunk in chunks]
         
-        # Insert into vector store
         self.vector_store.insert(
             collection_name="issues",
             ids=ids,
-            embeddings=all_embeddings,
+            embeddings=self.embedding_service.embed(contents),
             contents=contents,
-            metadatas=metadatas
+            metadata=metadatas
         )
+        if self.lexical_index is not None:
+            self.lexical_index.add(ids, contents, metadatas)
         
         logger.info(f"✅ Stored {len(chunks)} issue chunks")
         return len(chunks)
     
     def close(self):
         """Clean up resources."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         self.vector_store.close()
+        if self.lexical_index is not None:
+            self.lexical_index.close()
         logger.info("👋 Issue indexer closed")
 
 
 # Convenience function for quick indexing
-def index_issues(owner: str, repo: str, state: str = "closed", limit: Optional[int] = None) -> int:
+def index_issues(
+    owner: str,
+    repo: str,
+    state: str = "closed",
+    limit: Optional[int] = None,
+    full: bool = False
+) -> int:
     """Quick issue indexing using default indexer.
     
     Args:
         owner: Repository owner
         repo: Repository name
         state: Issue state ('open', 'closed', 'all')
-        limit: Maximum number of issues to fetch
+        limit: Maximum number of issues to process
+        full: Ignore the checkpoint and fetch every issue
         
     Returns:
         Number of issues indexed
     """
     indexer = IssueIndexer()
-    count = indexer.index_repository(owner, repo, state, limit)
+    count = indexer.index_repository(owner, repo, state, limit, full=full)
     indexer.close()
     return count
@@ -0,0 +1,197 @@
+"""
+Indexing Pipeline - overlap parsing, embedding and insertion
+
+Indexers hand run_pipeline() a list of files plus three stage functions:
+    parse   runs in a process pool (one task per file, results in file order)
+    embed   runs in a worker thread on batches of chunks
+    insert  runs in a second worker thread on embedded batches
+
+Bounded queues connect the stages, so files are parsed while earlier batches
+are embedded and stored. Small jobs, single-core hosts and hosts where a
+process pool cannot be started parse in-process instead.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+MIN_PARALLEL_FILES = 16  # Below this, pool start-up costs more than it saves
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Work done by one pipeline stage."""
+    name: str
+    unit: str
+    items: int = 0
+    seconds: float = 0.0  # Time spent working (not waiting on other stages)
+
+    @property
+    def rate(self) -> float:
+        """Items per second of stage work."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.items} {self.unit} in {self.seconds:.2f}s ({self.rate:.0f} {self.unit}/s)"
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage throughput of one indexing run."""
+    parse: StageStats = field(default_factory=lambda: StageStats("parse", "files"))
+    embed: StageStats = field(default_factory=lambda: StageStats("embed", "chunks"))
+    insert: StageStats = field(default_factory=lambda: StageStats("insert", "chunks"))
+    workers: int = 1
+    wall_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return "\n".join([
+            f"{self.parse} [{self.workers} worker{'s' if self.workers != 1 else ''}]",
+            str(self.embed),
+            str(self.insert),
+            f"total: {self.wall_seconds:.2f}s wall time"
+        ])
+
+
+def parse_workers(requested: Optional[int] = None) -> int:
+    """Number of parse processes (RAG_PARSE_WORKERS env, default: CPU count)."""
+    if requested is None:
+        requested = int(os.getenv("RAG_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+    return max(1, requested)
+
+
+def _parse_stream(
+    tasks: Sequence[Any],
+    parse_fn: Callable[[Any], List[Any]],
+    workers: int
+) -> Tuple[Iterator[List[Any]], int, Optional[ProcessPoolExecutor]]:
+    """Start parsing tasks; returns (results in task order, workers used, pool)."""
+    if workers > 1 and len(tasks) >= MIN_PARALLEL_FILES:
+        pool = None
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(tasks) // (workers * 8))
+            return pool.map(parse_fn, tasks, chunksize=chunksize), workers, pool
+        except (OSError, NotImplementedError, ImportError) as e:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            logger.warning(f"⚠️ Process pool unavailable ({e}), parsing in-process")
+    return map(parse_fn, tasks), 1, None
+
+
+def run_pipeline(
+    tasks: Sequence[Any],
+    parse_fn: Callable[[Any], List[Any]],
+    embed_fn: Callable[[List[Any]], Any],
+    insert_fn: Callable[[List[Any], Any], None],
+    workers: Optional[int] = None,
+    batch_size: int = 256,
+    max_pending_batches: int = 4
+) -> Tuple[List[List[Any]], PipelineStats]:
+    """Parse tasks in parallel and stream their chunks through embed and insert.
+
+    Args:
+        tasks: One picklable task per file (e.g. a path)
+        parse_fn: Module-level function task -> chunks (must not raise)
+        embed_fn: Batch of chunks -> embeddings (passed on to insert_fn)
+        insert_fn: (batch of chunks, embeddings) -> None
+        workers: Parse processes (default: parse_workers())
+        batch_size: Chunks per embed/insert batch
+        max_pending_batches: Queue depth between stages (bounds memory)
+
+    Returns:
+        (chunks per task in task order, stage statistics)
+
+    Raises:
+        The first exception raised by embed_fn or insert_fn; later batches are
+        dropped and nothing is reported as stored.
+    """
+    stats = PipelineStats()
+    started = time.perf_counter()
+    embed_queue: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+    insert_queue: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+    errors: List[BaseException] = []
+    failed = threading.Event()
+
+    def embed_worker():
+        while True:
+            batch = embed_queue.get()
+            if batch is _DONE:
+                insert_queue.put(_DONE)
+                return
+            if failed.is_set():
+                continue  # Drain so the producer never blocks
+            try:
+                stage_start = time.perf_counter()
+                embeddings = embed_fn(batch)
+                stats.embed.seconds += time.perf_counter() - stage_start
+                stats.embed.items += len(batch)
+                insert_queue.put((batch, embeddings))
+            except BaseException as e:
+                errors.append(e)
+                failed.set()
+
+    def insert_worker():
+        while True:
+            item = insert_queue.get()
+            if item is _DONE:
+                return
+            if failed.is_set():
+                continue
+            batch, embeddings = item
+            try:
+                stage_start = time.perf_counter()
+                insert_fn(batch, embeddings)
+                stats.insert.seconds += time.perf_counter() - stage_start
+                stats.insert.items += len(batch)
+            except BaseException as e:
+                errors.append(e)
+                failed.set()
+
+    threads = [
+        threading.Thread(target=embed_worker, name="index-embed", daemon=True),
+        threading.Thread(target=insert_worker, name="index-insert", daemon=True)
+    ]
+    for thread in threads:
+        thread.start()
+
+    results: List[List[Any]] = []
+    stream, stats.workers, pool = _parse_stream(tasks, parse_fn, parse_workers(workers))
+    pending: List[Any] = []
+    try:
+        while not failed.is_set():
+            stage_start = time.perf_counter()
+            try:
+                chunks = next(stream)
+            except StopIteration:
+                break
+            stats.parse.seconds += time.perf_counter() - stage_start
+            stats.parse.items += 1
+            results.append(chunks)
+
+            pending.extend(chunks)
+            while len(pending) >= batch_size:
+                embed_queue.put(pending[:batch_size])
+                pending = pending[batch_size:]
+        if pending and not failed.is_set():
+            embed_queue.put(pending)
+    finally:
+        embed_queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    stats.wall_seconds = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+    return results, stats
@@ -6,18 +6,39 @@ Main interface for the RAG system. Handles:
 2. Vector search across collections
 3. Result reranking and filtering
 4. Context formatting for LLM prompts
+
+Collections are searched concurrently. Query embeddings and per-collection
+search results are kept in LRU caches; cached results expire after cache_ttl
+seconds or as soon as the collection's write version changes (reindex).
+retrieve_many() embeds a batch of queries in one model call.
+
+Hybrid mode: collections that have a BM25 index (written by the indexers, see
+bm25_index.py) are searched lexically as well. Per query, the vector hits of all
+searched collections form one ranking (cosine scores share the embedding space)
+and each BM25 index adds its own; a single reciprocal-rank fusion over these
+rankings puts every result on one score scale, normalized so a chunk ranked
+first by both its searches scores 1.0. min_score applies to the fused score.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
 import numpy as np
 
+from .bm25_index import BM25Index, bm25_dir_for
 from .embedding_service import EmbeddingService
-from .vector_store import MilvusVectorStore, SearchResult
+from .vector_store import COLLECTIONS, SearchResult, VectorStore, create_vector_store
 
 logger = logging.getLogger(__name__)
 
+# One collection's (vector hits, BM25 hits) for a query, each best first
+Rankings = Tuple[List[SearchResult], List[SearchResult]]
+
 
 @dataclass
 class RetrievalResult:
@@ -29,15 +50,53 @@ class RetrievalResult:
     formatted_context: str  # Ready-to-use context for LLM
 
 
+def reciprocal_rank_fusion(
+    result_lists: List[List[SearchResult]],
+    k: int = 60,
+    top_k: Optional[int] = None,
+    max_lists: Optional[int] = None
+) -> List[SearchResult]:
+    """Merge rankings with reciprocal-rank fusion.
+    
+    Each result scores sum(1 / (k + rank)) over the lists it appears in,
+    normalized by the best possible score (rank 1 in every list it can
+    appear in).
+    
+    Args:
+        result_lists: Rankings to merge, best first
+        k: RRF damping constant (higher = flatter)
+        top_k: Number of results to keep (None = all)
+        max_lists: Lists a single result can appear in (None = all of them)
+        
+    Returns:
+        Fused results (first occurrence kept per ID), best first
+    """
+    best = (max_lists or len(result_lists)) / (k + 1)
+    scores: Dict[str, float] = {}
+    first: Dict[str, SearchResult] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            scores[result.id] = scores.get(result.id, 0.0) + 1.0 / (k + rank)
+            first.setdefault(result.id, result)
+    
+    ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [replace(first[doc_id], score=scores[doc_id] / best) for doc_id in ranked]
+
+
 class RAGRetriever:
     """Main RAG retrieval interface."""
     
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[MilvusVectorStore] = None,
+        vector_store: Optional[VectorStore] = None,
         top_k: int = 5,
-        min_score: float = 0.5
+        min_score: Optional[float] = None,
+        cache_size: int = 256,
+        cache_ttl: float = 300.0,
+        hybrid: bool = True,
+        bm25_dir: Optional[Path] = None,
+        rrf_k: int = 60
     ):
         """Initialize RAG retriever.
         
@@ -45,14 +104,35 @@ class RAGRetriever:
             embedding_service: Service for generating embeddings
             vector_store: Vector database instance
             top_k: Number of results to retrieve
-            min_score: Minimum similarity score threshold
+            min_score: Minimum score of a returned result: the fused score in hybrid
+                mode (default 0.0), cosine similarity otherwise (default 0.5)
+            cache_size: Entries in the query-embedding and result LRU caches (0 disables)
+            cache_ttl: Seconds a cached search result stays valid
+            hybrid: Fuse vector results with BM25 results where a BM25 index exists
+            bm25_dir: BM25 index directory (default: next to the vector store)
+            rrf_k: Reciprocal-rank fusion constant
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.vector_store = vector_store or MilvusVectorStore(
+        self.vector_store = vector_store or create_vector_store(
             embedding_dim=self.embedding_service.embedding_dim
         )
         self.top_k = top_k
+        if min_score is None:
+            min_score = 0.0 if hybrid else 0.5
         self.min_score = min_score
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.hybrid = hybrid
+        self.bm25_dir = Path(bm25_dir) if bm25_dir else bm25_dir_for(self.vector_store)
+        self.rrf_k = rrf_k
+        self._lexical_indexes: Dict[str, BM25Index] = {}
+        
+        # query -> embedding; (query, source) -> (expires, version, top_k, (vector hits, BM25 hits))
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._result_cache: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[int, int], int, Rankings]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.cache_stats = {'embedding_hits': 0, 'embedding_misses': 0, 'result_hits': 0, 'result_misses': 0}
         
         logger.info("✅ RAG Retriever initialized")
     
@@ -75,44 +155,192 @@ class RAGRetriever:
             List of RetrievalResult objects, sorted by relevance
         """
         logger.info(f"🔍 Retrieving context for query: '{query[:100]}...'")
+        return self.retrieve_many([query], sources, top_k, include_metadata)[0]
+    
+    def retrieve_many(
+        self,
+        queries: Sequence[str],
+        sources: Optional[List[str]] = None,
+        top_k: Optional[int] = None,
+        include_metadata: bool = True
+    ) -> List[List[RetrievalResult]]:
+        """Retrieve context for several queries at once.
         
-        # Generate query embedding
-        query_embedding = self.embedding_service.embed(query)[0]
+        Uncached queries are embedded in a single model call and all
+        (query, collection) searches run concurrently.
+        
+        Args:
+            queries: Search queries
+            sources: Filter by sources (['code', 'docs', 'issues']). None = all
+            top_k: Override default top_k
+            include_metadata: Include metadata in formatted context
+            
+        Returns:
+            One list of RetrievalResult objects per query, sorted by relevance
+        """
+        if not queries:
+            return []
         
         # Determine which collections to search
-        sources = sources or ["code", "docs", "issues"]
+        sources = sources or list(COLLECTIONS)
         top_k = top_k or self.top_k
         
-        # Search collections
-        all_results = []
-        for source in sources:
-            try:
-                results = self.vector_store.search(
-                    collection_name=source,
-                    query_embedding=query_embedding,
-                    top_k=top_k
-                )
-                all_results.extend(results)
-            except Exception as e:
-                logger.warning(f"⚠️ Search failed for '{source}': {e}")
-        
-        # Filter by score
-        filtered_results = [r for r in all_results if r.score >= self.min_score]
+        # Whitespace variants of a query share cache entries
+        queries = [" ".join(query.split()) for query in queries]
+        embeddings = self._embed_queries(list(queries))
+        
+        # Fan out over unique queries x collections; cached results skip the search
+        searches = {}
+        found: Dict[Tuple[str, str], Rankings] = {}
+        for query, embedding in dict(zip(queries, embeddings)).items():
+            for source in sources:
+                cached = self._cached_results(query, source, top_k)
+                if cached is not None:
+                    found[(query, source)] = cached
+                else:
+                    searches[(query, source)] = self._search_executor().submit(
+                        self._search_collection, query, source, embedding, top_k
+                    )
+        for key, future in searches.items():
+            found[key] = future.result()
         
-        # Sort by score
-        filtered_results.sort(key=lambda x: x.score, reverse=True)
-        
-        # Take top K overall
-        final_results = filtered_results[:top_k]
+        all_results = []
+        for query in queries:
+            merged = self._merge_rankings([found[(query, source)] for source in sources], top_k)
+            all_results.append([self._format_result(r, include_metadata) for r in merged])
         
-        # Format results
-        retrieval_results = [
-            self._format_result(r, include_metadata)
-            for r in final_results
-        ]
+        logger.info(f"✅ Retrieved {sum(map(len, all_results))} relevant results for {len(queries)} queries")
+        return all_results
+    
+    def _merge_rankings(self, rankings: List[Rankings], top_k: int) -> List[SearchResult]:
+        """Merge per-collection rankings onto one score scale, then apply min_score and top_k."""
+        # Cosine scores are comparable across collections (one embedding space)
+        vector_hits = sorted((r for hits, _ in rankings for r in hits), key=lambda r: r.score, reverse=True)
+        if self.hybrid:
+            lexical = [hits for _, hits in rankings if hits]
+            # A chunk is in the vector ranking and at most its own collection's BM25 ranking
+            merged = reciprocal_rank_fusion([vector_hits] + lexical, k=self.rrf_k, max_lists=2)
+        else:
+            merged = vector_hits
+        return [r for r in merged if r.score >= self.min_score][:top_k]
+    
+    def _embed_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """Query embeddings from the LRU cache, embedding all misses in one call."""
+        embeddings: Dict[str, np.ndarray] = {}
+        with self._cache_lock:
+            for query in queries:
+                if query in self._embedding_cache:
+                    self._embedding_cache.move_to_end(query)
+                    embeddings[query] = self._embedding_cache[query]
+        
+        misses = list(dict.fromkeys(q for q in queries if q not in embeddings))
+        self.cache_stats['embedding_hits'] += len(queries) - len(misses)
+        self.cache_stats['embedding_misses'] += len(misses)
+        if misses:
+            for query, embedding in zip(misses, self.embedding_service.embed(misses)):
+                embeddings[query] = embedding
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    for query in misses:
+                        self._embedding_cache[query] = embeddings[query]
+                    while len(self._embedding_cache) > self.cache_size:
+                        self._embedding_cache.popitem(last=False)
+        
+        return [embeddings[query] for query in queries]
+    
+    def _cached_results(self, query: str, source: str, top_k: int) -> Optional[Rankings]:
+        """Cached search results, unless expired, too short or the collection changed since."""
+        key = (query, source)
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+        if entry is not None:
+            expires, version, cached_top_k, results = entry
+            valid = time.monotonic() < expires and version == self._collection_version(source)
+            if valid and cached_top_k >= top_k:
+                with self._cache_lock:
+                    if key in self._result_cache:
+                        self._result_cache.move_to_end(key)
+                self.cache_stats['result_hits'] += 1
+                vector_hits, lexical_hits = results
+                return vector_hits[:top_k], lexical_hits[:top_k]
+            if not valid:
+                with self._cache_lock:
+                    self._result_cache.pop(key, None)
+        self.cache_stats['result_misses'] += 1
+        return None
+    
+    def _search_collection(
+        self,
+        query: str,
+        source: str,
+        query_embedding: np.ndarray,
+        top_k: int
+    ) -> Rankings:
+        """Search one collection (vector, plus BM25 in hybrid mode) and cache both rankings.
         
-        logger.info(f"✅ Retrieved {len(retrieval_results)} relevant results")
-        return retrieval_results
+        Rankings are fused and score-filtered across collections in _merge_rankings().
+        """
+        version = self._collection_version(source)
+        try:
+            vector_hits = self.vector_store.search(
+                collection_name=source,
+                query_embedding=query_embedding,
+                top_k=top_k
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Search failed for '{source}': {e}")
+            vector_hits = []
+        
+        lexical_hits = []
+        lexical_index = self._lexical_index(source)
+        if lexical_index is not None:
+            try:
+                lexical_hits = lexical_index.search(query, top_k=top_k)
+            except Exception as e:
+                logger.warning(f"⚠️ BM25 search failed for '{source}': {e}")
+        
+        results = (vector_hits, lexical_hits)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._result_cache[(query, source)] = (time.monotonic() + self.cache_ttl, version, top_k, results)
+                while len(self._result_cache) > self.cache_size:
+                    self._result_cache.popitem(last=False)
+        return results
+    
+    def _collection_version(self, source: str) -> Tuple[int, int]:
+        """(vector store version, BM25 version); either changes on reindex."""
+        try:
+            version = self.vector_store.collection_version(source)
+        except Exception:
+            version = -1
+        lexical_index = self._lexical_index(source)
+        try:
+            lexical_version = lexical_index.version() if lexical_index is not None else 0
+        except Exception:
+            lexical_version = -1
+        return version, lexical_version
+    
+    def _lexical_index(self, source: str) -> Optional[BM25Index]:
+        """BM25 index of a collection, opened on first use once an indexer has built it."""
+        if not self.hybrid:
+            return None
+        with self._cache_lock:
+            if source not in self._lexical_indexes and BM25Index.exists(source, self.bm25_dir):
+                self._lexical_indexes[source] = BM25Index(source, self.bm25_dir)
+            return self._lexical_indexes.get(source)
+    
+    def _search_executor(self) -> ThreadPoolExecutor:
+        with self._cache_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(COLLECTIONS) * 2, thread_name_prefix="rag-search"
+                )
+            return self._executor
+    
+    def invalidate_cache(self):
+        """Drop cached search results (e.g. after reindexing through another store)."""
+        with self._cache_lock:
+            self._result_cache.clear()
     
     def _format_result(
         self,
@@ -304,6 +532,12 @@ class RAGRetriever:
     
     def close(self):
         """Clean up resources."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for lexical_index in self._lexical_indexes.values():
+            lexical_index.close()
+        self._lexical_indexes.clear()
         self.vector_store.close()
         logger.info("👋 RAG Retriever closed")
 
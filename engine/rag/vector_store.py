@@ -1,13 +1,23 @@
 """
-Vector Store for RAG System using Milvus
+Vector Store for RAG System
 
 Provides vector storage and similarity search capabilities for:
 - Code embeddings
 - Documentation embeddings
 - Issue history embeddings
+
+Backends (all implement VectorStore):
+- MilvusVectorStore: Milvus server (docker-compose-milvus.yml)
+- EmbeddedVectorStore: in-process, memory-mapped NumPy matrices (no server)
+
+Use create_vector_store() to pick a backend; RAG_VECTOR_BACKEND selects
+'milvus' (default) or 'embedded'.
 """
 
 import logging
+import os
+import threading
+from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -26,14 +36,122 @@ class SearchResult:
     collection: str
 
 
-class MilvusVectorStore:
+COLLECTIONS = ["code", "docs", "issues"]
+
+# Writes made by any store in this process, per collection (see collection_version)
+_local_write_versions: Dict[str, int] = {}
+_local_write_lock = threading.Lock()
+
+
+class VectorStore(ABC):
+    """Interface shared by all vector store backends."""
+
+    @abstractmethod
+    def insert(
+        self,
+        collection_name: str,
+        ids: List[str],
+        embeddings: np.ndarray,
+        contents: List[str],
+        metadata: List[Dict[str, Any]]
+    ) -> int:
+        """Insert vectors into collection. Returns number inserted."""
+
+    @abstractmethod
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        filter_expr: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Search for similar vectors, highest score first."""
+
+    @abstractmethod
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        expr: Optional[str] = None
+    ) -> int:
+        """Delete vectors by ID list or filter expression."""
+
+    @abstractmethod
+    def count(self, collection_name: str) -> int:
+        """Get number of vectors in collection."""
+
+    @abstractmethod
+    def close(self):
+        """Release backend resources."""
+
+    def collection_version(self, collection_name: str) -> int:
+        """Counter that changes whenever collection_name is written.
+        
+        Caches of search results compare it to detect reindexing. The default
+        only sees writes made in this process; backends that share state
+        between processes override it.
+        """
+        return _local_write_versions.get(collection_name, 0)
+
+    def _record_write(self, collection_name: str):
+        with _local_write_lock:
+            _local_write_versions[collection_name] = _local_write_versions.get(collection_name, 0) + 1
+
+    def search_all_collections(
+        self,
+        query_embedding: np.ndarray,
+        top_k_per_collection: int = 3
+    ) -> List[SearchResult]:
+        """Search across all collections and merge results.
+        
+        Args:
+            query_embedding: Query vector
+            top_k_per_collection: Results per collection
+            
+        Returns:
+            Merged and sorted list of SearchResult objects
+        """
+        all_results = []
+        
+        for collection_name in COLLECTIONS:
+            try:
+                results = self.search(
+                    collection_name=collection_name,
+                    query_embedding=query_embedding,
+                    top_k=top_k_per_collection
+                )
+                all_results.extend(results)
+            except Exception as e:
+                logger.warning(f"⚠️ Search failed for '{collection_name}': {e}")
+        
+        # Sort by score (highest first)
+        all_results.sort(key=lambda x: x.score, reverse=True)
+        
+        return all_results
+
+    @staticmethod
+    def _prepare_embeddings(ids: List[str], embeddings, contents: List[str], metadata: List[Dict[str, Any]]) -> np.ndarray:
+        """Validate insert arguments and L2-normalize embeddings (cosine via inner product)."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if not (len(ids) == len(embeddings) == len(contents) == len(metadata)):
+            raise ValueError("All input lists must have the same length")
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+
+class MilvusVectorStore(VectorStore):
     """Vector store implementation using Milvus."""
     
     def __init__(
         self,
         host: str = "localhost",
         port: int = 19530,
-        embedding_dim: int = 768  # Default for jina-embeddings-v2-base-code
+        embedding_dim: int = 768,  # Default for jina-embeddings-v2-base-code
+        quantization: str = "none",
+        rerank_factor: int = 4
     ):
         """Initialize Milvus vector store.
         
@@ -41,11 +159,20 @@ class MilvusVectorStore:
             host: Milvus server host
             port: Milvus server port
             embedding_dim: Dimension of embedding vectors
+            quantization: 'none' (IVF_FLAT) or 'int8' (IVF_SQ8 index) for new collections
+            rerank_factor: With int8, fetch top_k * rerank_factor candidates and rescore
+                them against the stored full-precision vectors (<= 1 disables)
         """
+        if quantization not in ("none", "int8"):
+            raise ValueError(f"Unsupported quantization for Milvus: {quantization}")
+        
         self.host = host
         self.port = port
         self.embedding_dim = embedding_dim
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
         self.client = None
+        self._loaded_collections = set()  # Collections already loaded into memory
         
         self._connect()
         self._init_collections()
@@ -111,10 +238,10 @@ class MilvusVectorStore:
                 schema=schema
             )
             
-            # Create index for vector search
+            # Create index for vector search (IVF_SQ8 keeps 1 byte per dimension in memory)
             index_params = {
                 "metric_type": "IP",  # Inner Product (cosine similarity for normalized vectors)
-                "index_type": "IVF_FLAT",
+                "index_type": "IVF_SQ8" if self.quantization == "int8" else "IVF_FLAT",
                 "params": {"nlist": 128}
             }
             collection.create_index(
@@ -146,11 +273,8 @@ class MilvusVectorStore:
         """
         from pymilvus import Collection
         
-        if len(ids) != len(embeddings) != len(contents) != len(metadata):
-            raise ValueError("All input lists must have the same length")
-        
         # Normalize embeddings for cosine similarity
-        embeddings_normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings_normalized = self._prepare_embeddings(ids, embeddings, contents, metadata)
         
         # Prepare data
         timestamp = int(datetime.now().timestamp())
@@ -166,6 +290,7 @@ class MilvusVectorStore:
         collection = Collection(collection_name)
         collection.insert(data)
         collection.flush()
+        self._record_write(collection_name)
         
         logger.info(f"✅ Inserted {len(ids)} vectors into '{collection_name}'")
         return len(ids)
@@ -193,9 +318,12 @@ class MilvusVectorStore:
         # Normalize query embedding
         query_normalized = query_embedding / np.linalg.norm(query_embedding)
         
-        # Load collection into memory
+        # Load collection into memory (once; Milvus keeps it loaded and
+        # makes newly flushed inserts searchable)
         collection = Collection(collection_name)
-        collection.load()
+        if collection_name not in self._loaded_collections:
+            collection.load()
+            self._loaded_collections.add(collection_name)
         
         # Search parameters
         search_params = {
@@ -203,63 +331,42 @@ class MilvusVectorStore:
             "params": {"nprobe": 10}
         }
         
+        # Quantized index: oversample, then rescore with the raw vectors Milvus keeps
+        rerank = self.quantization == "int8" and self.rerank_factor > 1
+        output_fields = ["content", "metadata"] + (["embedding"] if rerank else [])
+        
         # Perform search
         results = collection.search(
             data=[query_normalized.tolist()],
             anns_field="embedding",
             param=search_params,
-            limit=top_k,
+            limit=top_k * self.rerank_factor if rerank else top_k,
             expr=filter_expr,
-            output_fields=["content", "metadata"]
+            output_fields=output_fields
         )
         
         # Parse results
         search_results = []
         for hits in results:
             for hit in hits:
+                score = float(hit.score)
+                if rerank:
+                    score = float(np.asarray(hit.entity.get('embedding'), dtype=np.float32) @ query_normalized)
                 search_results.append(SearchResult(
                     id=hit.id,
                     content=hit.entity.get('content'),
                     metadata=hit.entity.get('metadata', {}),
-                    score=float(hit.score),
+                    score=score,
                     collection=collection_name
                 ))
         
+        if rerank:
+            search_results.sort(key=lambda r: r.score, reverse=True)
+            search_results = search_results[:top_k]
+        
         logger.debug(f"🔍 Found {len(search_results)} results in '{collection_name}'")
         return search_results
     
-    def search_all_collections(
-        self,
-        query_embedding: np.ndarray,
-        top_k_per_collection: int = 3
-    ) -> List[SearchResult]:
-        """Search across all collections and merge results.
-        
-        Args:
-            query_embedding: Query vector
-            top_k_per_collection: Results per collection
-            
-        Returns:
-            Merged and sorted list of SearchResult objects
-        """
-        all_results = []
-        
-        for collection_name in ["code", "docs", "issues"]:
-            try:
-                results = self.search(
-                    collection_name=collection_name,
-                    query_embedding=query_embedding,
-                    top_k=top_k_per_collection
-                )
-                all_results.extend(results)
-            except Exception as e:
-                logger.warning(f"⚠️ Search failed for '{collection_name}': {e}")
-        
-        # Sort by score (highest first)
-        all_results.sort(key=lambda x: x.score, reverse=True)
-        
-        return all_results
-    
     def delete(
         self,
         collection_name: str,
@@ -294,6 +401,7 @@ class MilvusVectorStore:
 
         logger.info("🗑️ Deleting from '%s' with expr: %s", collection_name, expr)
         result = collection.delete(expr)
+        self._record_write(collection_name)
 
         # pymilvus MutationResult exposes delete_count attribute for newer releases
         delete_count = getattr(result, "delete_count", None)
@@ -325,4 +433,31 @@ class MilvusVectorStore:
         from pymilvus import connections
         
         connections.disconnect("default")
+        self._loaded_collections.clear()
         logger.info("👋 Disconnected from Milvus")
+
+
+def create_vector_store(
+    backend: Optional[str] = None,
+    embedding_dim: int = 768,
+    **kwargs
+) -> VectorStore:
+    """Create a vector store for the configured backend.
+    
+    Args:
+        backend: 'milvus' or 'embedded' (default: RAG_VECTOR_BACKEND env, then 'milvus')
+        embedding_dim: Dimension of embedding vectors
+        **kwargs: Backend-specific options (host/port/quantization, persist_dir/dtype/index_type, ...)
+        
+    Returns:
+        VectorStore instance
+    """
+    backend = (backend or os.getenv("RAG_VECTOR_BACKEND") or "milvus").lower()
+    
+    if backend == "milvus":
+        return MilvusVectorStore(embedding_dim=embedding_dim, **kwargs)
+    if backend == "embedded":
+        from .embedded_vector_store import EmbeddedVectorStore
+        return EmbeddedVectorStore(embedding_dim=embedding_dim, **kwargs)
+    
+    raise ValueError(f"Unsupported vector store backend: {backend}")
@@ -26,6 +26,8 @@ import subprocess
 import json
 import yaml
 
+from engine.core.shared_token_bucket import get_shared_token_bucket, resolve_bucket_account
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,6 +113,9 @@ class BotAgent:
         self.rate_limit_threshold = self.config.get("rate_limiting", {}).get(
             "pause_threshold", 4800
         )
+        # Hourly API budget shared with all other processes using this token
+        self.token_bucket = get_shared_token_bucket()
+        self.bucket_account, self.bucket_budget = resolve_bucket_account(self.github_token)
         self.retry_attempts = self.config.get("behavior", {}).get("retry_attempts", 3)
         self.retry_delay = self.config.get("behavior", {}).get("retry_delay", 5)
         
@@ -246,7 +251,7 @@ class BotAgent:
         raise RuntimeError(f"GitHub operation failed after {self.retry_attempts} attempts: {last_error}")
     
     async def _check_rate_limit(self):
-        """Check GitHub API rate limit and pause if needed."""
+        """Check GitHub API rate limit, pause if needed and take a shared API token."""
         try:
             result = subprocess.run(
                 ["gh", "api", "rate_limit"],
@@ -266,6 +271,7 @@ class BotAgent:
                 if reset_timestamp:
                     # GitHub API timestamps are UTC
                     self.metrics.rate_limit_reset = datetime.fromtimestamp(reset_timestamp, tz=timezone.utc)
+                    self.token_bucket.observe(self.bucket_account, remaining, reset_timestamp, self.bucket_budget)
                 
                 # Pause if below threshold
                 if remaining < self.rate_limit_threshold and self.metrics.rate_limit_reset:
@@ -279,6 +285,9 @@ class BotAgent:
         
         except Exception as e:
             logger.warning(f"Failed to check rate limit: {e}")
+        
+        # Wait for a token from the host-wide budget (shared with polling and agents)
+        await self.token_bucket.acquire(self.bucket_account, self.bucket_budget)
     
     def _record_operation(
         self,
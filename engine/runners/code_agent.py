@@ -10,6 +10,7 @@ Model: Configurable (default: qwen2.5-coder:7b)
 """
 
 import argparse
+import asyncio
 import json
 import sys
 import os
@@ -32,6 +33,7 @@ except ImportError:
 # Import from engine modules
 from engine.operations.workspace_tools import WorkspaceTools
 from engine.core.context_manager import ContextManager
+from engine.core.llm_response_cache import get_llm_response_cache, make_key
 from engine.operations.file_editor import FileEditor
 from engine.operations.terminal_operations import TerminalOperations
 from engine.operations.test_runner import TestRunner
@@ -425,17 +427,18 @@ class CodeAgent:
                 api_rate_limit_remaining=api_rate_limit
             )
     
-    def query_qwen(self, prompt: str, system_prompt: Optional[str] = None, stream: bool = False) -> str:
+    def query_qwen(self, prompt: str, system_prompt: Optional[str] = None, stream: bool = False,
+                   cache: Optional[bool] = None) -> str:
         """
         Query Qwen2.5-Coder via Ollama API (using /api/chat endpoint).
         
         DEPRECATED: Use query_llm() instead for multi-provider support.
         This method is kept for backward compatibility.
         """
-        return self.query_llm(prompt, system_prompt, stream)
+        return self.query_llm(prompt, system_prompt, stream, cache=cache)
     
     def query_llm(self, prompt: str, system_prompt: Optional[str] = None, 
-                  stream: bool = False, model: Optional[str] = None) -> str:
+                  stream: bool = False, model: Optional[str] = None, cache: Optional[bool] = None) -> str:
         """
         Query LLM (OpenAI, Anthropic, Google, or local Ollama).
         
@@ -450,6 +453,9 @@ class CodeAgent:
             system_prompt: Optional system prompt for context
             stream: Whether to stream response (only for Ollama)
             model: Optional model override
+            cache: True serves repeated prompts from the LLM response cache,
+                False bypasses it, None (default) caches only deterministic
+                (temperature 0) completions; streamed responses are never cached
             
         Returns:
             str: Generated text response
@@ -474,7 +480,8 @@ class CodeAgent:
                     messages=messages,
                     model=model_to_use,
                     temperature=0.7,
-                    max_tokens=4096
+                    max_tokens=4096,
+                    cache=cache
                 )
                 
                 self.print_success(f"✅ {self.llm_provider_name.upper()} response received ({response.usage.get('total_tokens', 0)} tokens)")
@@ -499,6 +506,16 @@ class CodeAgent:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        # Ollama samples at its default temperature: only cache on explicit request
+        response_cache = get_llm_response_cache() if cache and not stream else None
+        cache_key = None
+        if response_cache is not None:
+            cache_key = make_key(f"ollama:{self.ollama_url}", model_to_use, messages)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                self.print_info("💾 Using cached Ollama response")
+                return cached["content"]
+        
         try:
             self.print_info(f"Ollama chat URL: {self.ollama_url}/api/chat")
             self.print_info(f"Ollama payload roles: {[m['role'] for m in messages]}")
@@ -530,8 +547,10 @@ class CodeAgent:
                 print()  # New line after streaming
                 return result
             else:
-                result = response.json()
-                return result.get('message', {}).get('content', '')
+                content = response.json().get('message', {}).get('content', '')
+                if response_cache is not None and content:
+                    response_cache.put(cache_key, {"content": content, "model": model_to_use})
+                return content
         
         except requests.exceptions.RequestException as e:
             error_text = ""
@@ -540,7 +559,88 @@ class CodeAgent:
                 self.print_error(f"Ollama error body: {error_text}")
             self.print_error(f"Failed to query Qwen: {e}")
             return ""
-    
+
+    async def aquery_llm(self, prompt: str, system_prompt: Optional[str] = None,
+                         model: Optional[str] = None, cache: Optional[bool] = None) -> str:
+        """
+        Async variant of query_llm() for callers running in an event loop.
+
+        Uses the provider's pooled async client (falls back to Ollama the same
+        way query_llm() does) so the loop is not blocked while waiting.
+
+        Args:
+            prompt: User prompt text
+            system_prompt: Optional system prompt for context
+            model: Optional model override
+            cache: Response cache policy, as in query_llm()
+
+        Returns:
+            str: Generated text response ("" on Ollama failure)
+        """
+        from engine.core.llm_providers import LLMMessage, LocalProvider
+
+        model_to_use = model or self.model
+        messages = []
+        if system_prompt:
+            messages.append(LLMMessage(role="system", content=system_prompt))
+        messages.append(LLMMessage(role="user", content=prompt))
+
+        if self.llm_provider_name != "local" and self.llm_provider:
+            try:
+                self.print_info(f"🌐 Querying {self.llm_provider_name.upper()}: {model_to_use}...")
+                response = await self.llm_provider.achat_completion(
+                    messages=messages,
+                    model=model_to_use,
+                    temperature=0.7,
+                    max_tokens=4096,
+                    cache=cache
+                )
+                self.print_success(f"✅ {self.llm_provider_name.upper()} response received ({response.usage.get('total_tokens', 0)} tokens)")
+
+                if self.monitor:
+                    self._update_metrics(api_calls=1)
+
+                return response.content
+
+            except Exception as e:
+                self.print_error(f"❌ {self.llm_provider_name.upper()} error: {e}")
+                self.print_info("   Falling back to Ollama...")
+
+        self.print_info(f"🏠 Querying Ollama: {model_to_use}...")
+
+        # Same request and cache entry as query_llm(): no sampling options, 5 minute timeout
+        response_cache = get_llm_response_cache() if cache else None
+        cache_key = None
+        if response_cache is not None:
+            cache_key = make_key(
+                f"ollama:{self.ollama_url}",
+                model_to_use,
+                [{"role": m.role, "content": m.content} for m in messages]
+            )
+            cached = await asyncio.to_thread(response_cache.get, cache_key)
+            if cached is not None:
+                self.print_info("💾 Using cached Ollama response")
+                return cached["content"]
+
+        try:
+            response = await LocalProvider(base_url=self.ollama_url).achat_completion(
+                messages=messages,
+                model=model_to_use,
+                temperature=None,
+                max_tokens=None,
+                cache=False,
+                timeout=300
+            )
+        except Exception as e:
+            self.print_error(f"Failed to query Qwen: {e}")
+            return ""
+
+        if response_cache is not None and response.content:
+            await asyncio.to_thread(
+                response_cache.put, cache_key, {"content": response.content, "model": model_to_use}
+            )
+        return response.content
+
     def execute_phase(self, phase_num: int, dry_run: bool = False) -> bool:
         """Execute a specific phase of Issue #7"""
         if phase_num not in self.phases:
@@ -189,6 +189,11 @@ class IssueFilter:
                 logger.info(f"   ❌ Skipping: already completed")
                 return False
             
+            # Skip if our workflow is still running (claims may expire mid-run)
+            if self.state_manager.is_in_flight(issue_key):
+                logger.info(f"   ❌ Skipping: workflow in flight")
+                return False
+            
             # Skip if valid claim exists (local state check)
             if self._is_claim_valid(issue_key):
                 return False
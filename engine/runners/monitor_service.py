@@ -7,6 +7,7 @@ This service provides:
 - Progress tracking with phase information
 - Historical activity timeline
 - Health metrics (CPU, memory, API usage)
+- Cache hit rates (e.g. the LLM response cache)
 """
 
 import asyncio
@@ -100,6 +101,7 @@ class AgentMonitor:
         """
         self.agents: Dict[str, AgentState] = {}
         self.services: Dict[str, dict] = {}  # Service health status
+        self.cache_metrics: Dict[str, dict] = {}  # cache name -> hit/miss counters
         self.logs: Dict[str, deque] = {}  # agent_id -> deque of LogEntry
         self.activity: deque = deque(maxlen=max_activity_events)
         self.max_logs_per_agent = max_logs_per_agent
@@ -256,6 +258,29 @@ class AgentMonitor:
         """
         return self.services.copy()
     
+    def update_cache_metrics(self, cache_name: str, metrics: Dict[str, float]):
+        """
+        Update hit-rate metrics of a cache.
+        
+        Args:
+            cache_name: Cache identifier (e.g. "llm_responses")
+            metrics: Counters such as hits, misses, hit_rate, stores, evictions
+        """
+        self.cache_metrics[cache_name] = {
+            "name": cache_name,
+            **metrics,
+            "last_update": time.time()
+        }
+    
+    def get_cache_metrics(self) -> Dict[str, dict]:
+        """
+        Get hit-rate metrics of all caches.
+        
+        Returns:
+            Dictionary of cache name -> metrics
+        """
+        return {name: metrics.copy() for name, metrics in self.cache_metrics.items()}
+    
     def update_agent_metrics(
         self,
         agent_id: str,
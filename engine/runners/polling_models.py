@@ -17,10 +17,19 @@ class PollingConfig:
     github_token: Optional[str] = None
     github_username: Optional[str] = None  # Must be configured via YAML or environment
     repositories: List[str] = field(default_factory=list)  # ["owner/repo", ...]
+    github_max_concurrency: int = 8  # Max in-flight GitHub API requests during a poll fan-out
+    github_use_graphql: bool = True  # Fetch one GraphQL snapshot per repo per cycle (REST fallback)
     watch_labels: List[str] = field(default_factory=lambda: ["agent-ready", "auto-assign"])  # labels
     detection_method: str = "assignee"  # Options: "assignee", "labels", "both", "mentions", "all"
     monitor_mentions: bool = True  # Monitor @bot mentions in comments
-    max_concurrent_issues: int = 3
+    max_concurrent_issues: int = 3  # Workflow worker pool size
+    max_concurrent_per_repo: int = 2  # Running workflows per repository (0 = no cap)
+    issue_label_priorities: Dict[str, int] = field(default_factory=lambda: {
+        "priority:critical": 0,
+        "priority:high": 10,
+        "bug": 50,
+        "priority:low": 200
+    })  # Scheduling order: lower first, unlisted labels = 100
     claim_timeout_minutes: int = 60
     state_file: str = "data/polling_state.json"  # Sensible default path
 
@@ -36,6 +45,7 @@ class PollingConfig:
     pr_review_strategy: Optional[str] = None  # Must be configured: dedicated, round-robin, all
     reviewer_agent_id: Optional[str] = None  # Must be configured via YAML
     reviewer_agents: List[Dict[str, str]] = field(default_factory=list)  # [{"agent_id": "...", "username": "...", "llm_model": "..."}]
+    pr_review_workers: int = 2  # PR reviews running in parallel on the review thread pool
     
     # PR Review Configuration (NEW)
     pr_use_llm: bool = True
@@ -62,6 +72,10 @@ class PollingConfig:
     issue_opener_skip_labels: List[str] = field(default_factory=list)
     issue_opener_agent_id: Optional[str] = None  # Must be configured via YAML
     
+    # Webhook Ingestion (event-driven dispatch, polling becomes reconciliation)
+    webhooks_enabled: bool = False
+    webhook_reconcile_interval_seconds: int = 1800  # Polling sweep interval when webhooks are on
+    
     def __post_init__(self):
         """Initialize default values."""
         if self.github_token is None:
@@ -80,3 +94,5 @@ class IssueState:
     error_count: int = 0
     completed: bool = False
     completed_at: Optional[str] = None
+    in_flight: bool = False  # Workflow currently running in this process
+    started_at: Optional[str] = None
@@ -5,7 +5,9 @@ starts the IssueHandler workflow when new actionable issues are detected.
 
 Features:
 - Configurable polling intervals (default: 5 minutes)
-- Multi-repository support
+- Multi-repository support with concurrent, connection-pooled GitHub queries
+- Optional webhook-driven dispatch (polling then acts as reconciliation sweep)
+- Bounded workflow worker pool with per-repo caps and label priorities
 - Label-based filtering (agent-ready, auto-assign)
 - Issue locking to prevent duplicate work by multiple agents
 - State persistence across restarts
@@ -15,12 +17,10 @@ Features:
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
 import time
-import subprocess
 import fcntl
 from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
@@ -33,6 +33,9 @@ from engine.runners.polling_models import PollingConfig, IssueState
 from engine.runners.config_override_handler import ConfigOverrideHandler
 from engine.runners.state_manager import StateManager
 from engine.runners.issue_filter import IssueFilter
+from engine.runners.workflow_scheduler import WorkflowScheduler
+from engine.runners.review_executor import ReviewExecutor
+from engine.utils.review_lock import ReviewLock
 from engine.utils.environment_config import EnvironmentConfig
 
 
@@ -124,6 +127,10 @@ except Exception:  # pragma: no cover
     psutil = None  # type: ignore
 
 from engine.operations.github_api_helper import GitHubAPIHelper
+from engine.operations.async_github_api_helper import AsyncGitHubAPIHelper
+from engine.operations.repo_snapshot import RepoSnapshot, RepoSnapshotFetcher
+from engine.operations.github_api_helper import format_issue
+from engine.operations.webhook_handler import WebhookEvent, WebhookEventQueue, get_webhook_queue
 from engine.operations.creative_status import generate_issue_motif
 
 logger = logging.getLogger(__name__)
@@ -224,8 +231,39 @@ class PollingService:
         self.reviewed_prs_max_size = 1000  # Maximum entries before cleanup
         self.reviewed_prs_max_age_days = 7  # Remove entries older than 7 days
         
-        # Initialize GitHub API helper
+        # Initialize GitHub API helpers (sync for legacy callers, async for polling)
         self.github_api = GitHubAPIHelper(token=self.config.github_token)
+        self.async_github_api = AsyncGitHubAPIHelper(
+            token=self.config.github_token,
+            max_connections=self.config.github_max_concurrency
+        )
+        
+        # Claim status prefetched concurrently at the start of each poll cycle
+        # {issue_key: claimed}
+        self._claim_status: Dict[str, bool] = {}
+        
+        # Per-cycle GraphQL snapshots {repo: RepoSnapshot}; repos missing here use REST
+        self.snapshot_fetcher = RepoSnapshotFetcher(self.async_github_api)
+        self._snapshots: Dict[str, RepoSnapshot] = {}
+        
+        # Issues between claim check and state registration (poll and webhooks race here)
+        self._claiming: Set[str] = set()
+        
+        # Issue workflows run as background tasks that outlive poll cycles
+        self.scheduler = WorkflowScheduler(
+            run_workflow=self.start_issue_workflow,
+            max_workers=self.config.max_concurrent_issues,
+            max_per_repo=self.config.max_concurrent_per_repo,
+            label_priorities=self.config.issue_label_priorities,
+            is_in_flight=self.state_manager.is_in_flight
+        )
+        
+        # PR reviews are blocking (LLM + GitHub calls) and run on a thread pool,
+        # sharing lock files with PRReviewAgent and GitHub Actions
+        self.review_executor = ReviewExecutor(
+            max_workers=self.config.pr_review_workers,
+            review_lock=ReviewLock(lock_dir=str(Path(__file__).resolve().parent.parent.parent / "data" / "review_locks"))
+        )
         
         # Register with monitor if enabled
         if enable_monitoring:
@@ -298,6 +336,8 @@ class PollingService:
             token = gh.get('token')
             if isinstance(token, str) and token.strip():
                 cfg.github_token = token.strip()
+            cfg.github_max_concurrency = int(gh.get('max_concurrency', cfg.github_max_concurrency))
+            cfg.github_use_graphql = bool(gh.get('use_graphql', cfg.github_use_graphql))
             
             # Repositories & labels
             repos = data.get('repositories') or []
@@ -324,6 +364,10 @@ class PollingService:
                 cfg.watch_labels = [str(l) for l in labels]
             # Concurrency & state
             cfg.max_concurrent_issues = int(data.get('max_concurrent_issues', cfg.max_concurrent_issues))
+            cfg.max_concurrent_per_repo = int(data.get('max_concurrent_per_repo', cfg.max_concurrent_per_repo))
+            label_priorities = data.get('issue_label_priorities')
+            if isinstance(label_priorities, dict):
+                cfg.issue_label_priorities = {str(k): int(v) for k, v in label_priorities.items()}
             cfg.claim_timeout_minutes = int(data.get('claim_timeout_minutes', cfg.claim_timeout_minutes))
             state_file = data.get('state_file')
             if isinstance(state_file, str) and state_file.strip():
@@ -356,6 +400,8 @@ class PollingService:
             if isinstance(strategy, str) and strategy.strip():
                 cfg.pr_review_strategy = strategy.strip()
             
+            cfg.pr_review_workers = int(pr_mon.get('review_workers', cfg.pr_review_workers))
+            
             # PR Review Configuration (NEW)
             review_config = pr_mon.get('review_config', {}) or {}
             cfg.pr_use_llm = bool(review_config.get('use_llm', True))
@@ -403,6 +449,13 @@ class PollingService:
             opener_id = issue_opener.get('agent_id')
             if isinstance(opener_id, str) and opener_id.strip():
                 cfg.issue_opener_agent_id = opener_id.strip()
+            
+            # Webhook Ingestion
+            webhooks = data.get('webhooks', {}) or {}
+            cfg.webhooks_enabled = bool(webhooks.get('enabled', cfg.webhooks_enabled))
+            cfg.webhook_reconcile_interval_seconds = int(
+                webhooks.get('reconcile_interval_seconds', cfg.webhook_reconcile_interval_seconds)
+            )
                 
         except Exception as e:
             logger.error(f"❌ Error parsing YAML config values: {e}; continuing with partial defaults")
@@ -497,6 +550,99 @@ class PollingService:
         """
         return f"{repo}#{issue_number}"
     
+    def _github_semaphore(self) -> asyncio.Semaphore:
+        """Create a semaphore bounding in-flight GitHub requests for one fan-out."""
+        return asyncio.Semaphore(max(1, self.config.github_max_concurrency))
+    
+    async def _fetch_labeled_issues(self, repo: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Fetch open issues carrying any watch label for a single repository.
+        
+        GitHub uses AND logic for comma-separated labels, so each label is
+        queried separately (concurrently) and the results merged (OR logic).
+        
+        Args:
+            repo: Repository (owner/repo)
+            semaphore: Shared semaphore bounding concurrent requests
+            
+        Returns:
+            Deduplicated list of issue dictionaries with repository field set
+        """
+        owner, repo_name = repo.split('/')
+        
+        async def fetch_label(label: str) -> List[Dict]:
+            async with semaphore:
+                label_issues = await self.async_github_api.list_issues(
+                    owner=owner,
+                    repo=repo_name,
+                    labels=[label],  # Single label query
+                    state="open",
+                    per_page=100,
+                    bypass_rate_limit=True
+                )
+            self.api_calls += 1
+            return label_issues
+        
+        results = await asyncio.gather(*(fetch_label(label) for label in self.config.watch_labels))
+        
+        issues = []
+        seen_issue_ids = set()
+        for label_issues in results:
+            # Deduplicate: only add issues we haven't seen yet
+            for issue in label_issues:
+                issue_number = issue.get('number')
+                if not issue_number:
+                    logger.warning(f"⚠️ Issue missing number field, skipping: {issue.get('title', 'unknown')}")
+                    continue
+                if issue_number not in seen_issue_ids:
+                    issue['repository'] = repo
+                    issues.append(issue)
+                    seen_issue_ids.add(issue_number)
+        
+        return issues
+    
+    async def fetch_snapshots(self) -> Dict[str, RepoSnapshot]:
+        """Fetch GraphQL snapshots for all repositories for this poll cycle.
+        
+        One paginated query per repository returns the labeled issues
+        (with latest comments for claim detection) and open PRs needed by
+        the rest of the cycle. Repositories whose snapshot fails are left
+        out, so their checks fall back to the REST endpoints.
+        
+        Returns:
+            Dict mapping repository to RepoSnapshot
+        """
+        labels = list(self.config.watch_labels)
+        if self.config.issue_opener_enabled:
+            labels += [
+                label for label in self.config.issue_opener_trigger_labels
+                if label not in labels
+            ]
+        
+        semaphore = self._github_semaphore()
+        
+        async def fetch(repo: str) -> RepoSnapshot:
+            async with semaphore:
+                snapshot = await self.snapshot_fetcher.fetch(
+                    repo,
+                    labels=labels,
+                    include_pull_requests=self.config.pr_monitoring_enabled
+                )
+            self.api_calls += snapshot.pages
+            return snapshot
+        
+        repos = list(self.config.repositories)
+        results = await asyncio.gather(*(fetch(repo) for repo in repos), return_exceptions=True)
+        
+        self._snapshots = {}
+        for repo, result in zip(repos, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"⚠️ GraphQL snapshot failed for {repo}, using REST: {result}")
+                continue
+            self._snapshots[repo] = result
+        
+        logger.info(f"📸 Fetched {len(self._snapshots)}/{len(repos)} repository snapshots")
+        return self._snapshots
+    
     async def check_assigned_issues(self) -> List[Dict]:
         """Query GitHub API for issues with agent-ready labels.
         
@@ -504,69 +650,33 @@ class PollingService:
         regardless of assignee. The polling service will then check if they're actionable
         based on claim status and other criteria.
         
+        Repositories with a snapshot for this cycle are answered from it;
+        the rest are queried concurrently per label, bounded by
+        ``github_max_concurrency`` in-flight requests.
+        
         Returns:
             List of issue dictionaries with agent-ready labels
         """
         logger.info("Checking for issues with agent-ready labels...")
         
-        all_issues = []
+        semaphore = self._github_semaphore()
         
-        for repo in self.config.repositories:
-            try:
-                owner, repo_name = repo.split('/')
-                
-                # Get ALL open issues with watch labels (not filtered by assignee)
-                # This allows any agent to pick up unclaimed agent-ready issues
-                # 
-                # Note: GitHub API uses AND logic for comma-separated labels,
-                # so we query each label separately and merge results (OR logic)
-                issues = []
-                seen_issue_ids = set()
-                
-                for label in self.config.watch_labels:
-                    try:
-                        # Query for each label individually
-                        path = f"/repos/{owner}/{repo_name}/issues?state=open&per_page=100&labels={label}"
-                        stdout = subprocess.run(
-                            ["gh", "api", path],
-                            text=True,
-                            capture_output=True
-                        )
-                        if stdout.returncode != 0:
-                            raise RuntimeError(stdout.stderr.strip() or "gh api failed")
-                        label_issues = json.loads(stdout.stdout or "[]")
-                    except Exception:
-                        # Fallback to REST API helper
-                        label_issues = self.github_api.list_issues(
-                            owner=owner,
-                            repo=repo_name,
-                            labels=[label],  # Single label query
-                            state="open",
-                            per_page=100,
-                            bypass_rate_limit=True
-                        )
-                        # Increment API call counter
-                        self.api_calls += 1
-                    
-                    # Deduplicate: only add issues we haven't seen yet
-                    for issue in label_issues:
-                        issue_number = issue.get('number')
-                        if not issue_number:
-                            logger.warning(f"⚠️ Issue missing number field, skipping: {issue.get('title', 'unknown')}")
-                            continue
-                        if issue_number not in seen_issue_ids:
-                            issues.append(issue)
-                            seen_issue_ids.add(issue_number)
-                
-                # Add repository field to each issue
-                for issue in issues:
-                    issue['repository'] = repo
-                all_issues.extend(issues)
-                
-                logger.info(f"Found {len(issues)} issues with agent-ready labels in {repo}")
-                
-            except Exception as e:
-                logger.error(f"Failed to query issues for {repo}: {e}")
+        async def fetch(repo: str) -> List[Dict]:
+            snapshot = self._snapshots.get(repo)
+            if snapshot is not None:
+                return snapshot.issues_with_labels(self.config.watch_labels)
+            return await self._fetch_labeled_issues(repo, semaphore)
+        
+        repos = list(self.config.repositories)
+        results = await asyncio.gather(*(fetch(repo) for repo in repos), return_exceptions=True)
+        
+        all_issues = []
+        for repo, result in zip(repos, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to query issues for {repo}: {result}")
+                continue
+            all_issues.extend(result)
+            logger.info(f"Found {len(result)} issues with agent-ready labels in {repo}")
         
         logger.info(f"Total issues with agent-ready labels found: {len(all_issues)}")
         return all_issues
@@ -592,9 +702,49 @@ class PollingService:
         logger.info(f"🐛 DEBUG: filter_actionable_issues returning {len(actionable)} issues")
         return actionable
     
+    def _has_active_claim(self, repo: str, issue_number: int, comments: List[Dict]) -> bool:
+        """Check issue comments for an unexpired agent claim.
+        
+        Args:
+            repo: Repository (owner/repo)
+            issue_number: Issue number
+            comments: Issue comments (gh CLI or REST format)
+            
+        Returns:
+            True if a claim comment younger than claim_timeout_minutes exists
+        """
+        now = _utc_now()
+        timeout = timedelta(minutes=self.config.claim_timeout_minutes)
+        
+        logger.info(f"🐛 DEBUG: Checking {len(comments)} comments for claims (timeout: {self.config.claim_timeout_minutes}min)")
+        
+        for comment in comments:
+            body = comment.get('body', '')
+            if '🤖 Agent' in body and 'started working on this issue' in body:
+                # Check timestamp
+                created_str = comment.get('createdAt') or comment.get('created_at')
+                if not created_str:
+                    # If missing, treat as not claimed
+                    continue
+                created_at = _parse_iso_timestamp(created_str)
+                age_minutes = (now - created_at).total_seconds() / 60
+                logger.info(f"🐛 DEBUG: Found claim comment - age: {age_minutes:.1f} min (timeout: {self.config.claim_timeout_minutes} min)")
+                logger.info(f"🐛 DEBUG: Comment created: {created_at}, Now: {now}")
+                if now - created_at < timeout:
+                    logger.info(f"Issue {repo}#{issue_number} claimed by another agent")
+                    return True
+                else:
+                    logger.info(f"🐛 DEBUG: Claim expired! Age {age_minutes:.1f}min > timeout {self.config.claim_timeout_minutes}min")
+        
+        return False
+    
     def is_issue_claimed(self, repo: str, issue_number: int) -> bool:
         """Check if issue is already claimed by another agent.
         
+        Synchronous variant used as the IssueFilter claim checker. Answers from
+        the claim status prefetched for the current poll cycle when available,
+        otherwise falls back to a blocking REST call.
+        
         Args:
             repo: Repository (owner/repo)
             issue_number: Issue number
@@ -602,60 +752,75 @@ class PollingService:
         Returns:
             True if already claimed and claim is still valid
         """
+        issue_key = self.get_issue_key(repo, issue_number)
+        if issue_key in self._claim_status:
+            return self._claim_status[issue_key]
+        
         try:
             owner, repo_name = repo.split('/')
-            # Prefer gh CLI for tests; fallback to REST helper
-            try:
-                path = f"/repos/{owner}/{repo_name}/issues/{issue_number}/comments"
-                stdout = subprocess.run(
-                    ["gh", "api", path],
-                    text=True,
-                    capture_output=True
-                )
-                if stdout.returncode != 0:
-                    raise RuntimeError(stdout.stderr.strip() or "gh api failed")
-                data = json.loads(stdout.stdout or "[]")
-                if isinstance(data, dict) and 'comments' in data:
-                    comments = data['comments']
-                else:
-                    comments = data
-            except Exception:
-                comments = self.github_api.get_issue_comments(
-                    owner=owner,
-                    repo=repo_name,
-                    issue_number=issue_number
-                )
-            
-            # Check for agent claim comments
-            now = _utc_now()
-            timeout = timedelta(minutes=self.config.claim_timeout_minutes)
-            
-            logger.info(f"🐛 DEBUG: Checking {len(comments)} comments for claims (timeout: {self.config.claim_timeout_minutes}min)")
+            comments = self.github_api.get_issue_comments(
+                owner=owner,
+                repo=repo_name,
+                issue_number=issue_number
+            )
+            return self._has_active_claim(repo, issue_number, comments)
             
-            for comment in comments:
-                body = comment.get('body', '')
-                if '🤖 Agent' in body and 'started working on this issue' in body:
-                    # Check timestamp
-                    created_str = comment.get('createdAt') or comment.get('created_at')
-                    if not created_str:
-                        # If missing, treat as not claimed
-                        continue
-                    created_at = _parse_iso_timestamp(created_str)
-                    age_minutes = (now - created_at).total_seconds() / 60
-                    logger.info(f"🐛 DEBUG: Found claim comment - age: {age_minutes:.1f} min (timeout: {self.config.claim_timeout_minutes} min)")
-                    logger.info(f"🐛 DEBUG: Comment created: {created_at}, Now: {now}")
-                    if now - created_at < timeout:
-                        logger.info(f"Issue {repo}#{issue_number} claimed by another agent")
-                        return True
-                    else:
-                        logger.info(f"🐛 DEBUG: Claim expired! Age {age_minutes:.1f}min > timeout {self.config.claim_timeout_minutes}min")
+        except Exception as e:
+            logger.error(f"Error checking claim status: {e}")
+            return False  # Assume not claimed on error
+    
+    async def is_issue_claimed_async(self, repo: str, issue_number: int) -> bool:
+        """Check if issue is already claimed by another agent without blocking the loop.
+        
+        Args:
+            repo: Repository (owner/repo)
+            issue_number: Issue number
             
-            return False
+        Returns:
+            True if already claimed and claim is still valid
+        """
+        try:
+            owner, repo_name = repo.split('/')
+            comments = await self.async_github_api.get_issue_comments(
+                owner=owner,
+                repo=repo_name,
+                issue_number=issue_number
+            )
+            self.api_calls += 1
+            return self._has_active_claim(repo, issue_number, comments)
             
         except Exception as e:
             logger.error(f"Error checking claim status: {e}")
             return False  # Assume not claimed on error
     
+    async def prefetch_claim_status(self, issues: List[Dict]) -> None:
+        """Concurrently resolve GitHub claim status for candidate issues.
+        
+        Results are stored for the current cycle so the synchronous
+        IssueFilter claim checker does not block the event loop.
+        Issues already completed in local state are skipped, and issues
+        from a snapshot are resolved from their embedded comments without
+        any API call.
+        
+        Args:
+            issues: Issue dictionaries from check_assigned_issues
+        """
+        semaphore = self._github_semaphore()
+        candidates = [
+            issue for issue in issues
+            if not self.state_manager.is_completed(self.get_issue_key(issue['repository'], issue['number']))
+        ]
+        
+        async def resolve(issue: Dict):
+            if 'comments' in issue:
+                claimed = self._has_active_claim(issue['repository'], issue['number'], issue['comments'])
+            else:
+                async with semaphore:
+                    claimed = await self.is_issue_claimed_async(issue['repository'], issue['number'])
+            self._claim_status[self.get_issue_key(issue['repository'], issue['number'])] = claimed
+        
+        await asyncio.gather(*(resolve(issue) for issue in candidates))
+    
     def _select_reviewers(self, pr_author: str) -> List[Dict[str, str]]:
         """Select reviewer agent(s) for a PR based on configured strategy.
         
@@ -713,6 +878,89 @@ class PollingService:
             # Fallback to dedicated
             return [{"agent_id": self.config.reviewer_agent_id, "username": "unknown", "llm_model": "unknown"}]
     
+    def _should_review_pr(self, repo: str, pr: Dict) -> bool:
+        """Decide whether a PR needs an automatic review now.
+        
+        Shared by polling (check_pull_requests) and webhook dispatch.
+        
+        Args:
+            repo: Repository (owner/repo)
+            pr: PR dictionary (REST format)
+            
+        Returns:
+            True if the reviewer agent should be triggered
+        """
+        pr_number = pr.get('number')
+        if not pr_number:
+            logger.warning(f"⚠️ PR missing number field, skipping")
+            return False
+        
+        pr_title = pr.get('title', 'Untitled')
+        pr_user = pr.get('user', {}).get('login', '')
+        pr_labels = [label.get('name', '') for label in pr.get('labels', [])]
+        is_draft = pr.get('draft', False)
+        
+        logger.debug(f"🔍 Checking PR #{pr_number} by {pr_user}: {pr_title} (draft: {is_draft})")
+        
+        # Smart draft handling:
+        # - Skip draft PRs UNLESS they have 'critical-issues' or 'has-conflicts' labels
+        # - These labels indicate the PR was auto-converted by our system
+        # - We want to auto-review them when new commits are pushed (fixes)
+        if is_draft:
+            has_auto_converted_label = any(
+                label in ['critical-issues', 'has-conflicts'] 
+                for label in pr_labels
+            )
+            if not has_auto_converted_label:
+                logger.debug(f"📝 Skipping draft PR #{pr_number} - work in progress (no auto-converted labels)")
+                return False
+            else:
+                logger.info(f"🔄 Draft PR #{pr_number} has auto-converted labels - will re-review on commits")
+        
+        # Check if user is in skip list (admin accounts)
+        if pr_user in self.config.pr_skip_review_users:
+            logger.debug(f"⏭️ Skipping PR #{pr_number} - user {pr_user} in skip list")
+            return False
+        
+        # Check if user is in auto-review list (bot accounts)
+        if self.config.pr_auto_review_users and pr_user not in self.config.pr_auto_review_users:
+            logger.debug(f"⏭️ Skipping PR #{pr_number} - user {pr_user} not in auto-review list")
+            return False
+        
+        # Check if PR has required labels (if configured)
+        if self.config.pr_review_labels:
+            has_required_label = any(label in self.config.pr_review_labels for label in pr_labels)
+            if not has_required_label:
+                logger.debug(f"⏭️ Skipping PR #{pr_number} - missing required labels")
+                return False
+        
+        # Check if a review is already queued or running on the worker pool
+        pr_key = f"{repo}#{pr_number}"
+        if self.review_executor.is_active(repo, pr_number):
+            logger.debug(f"⏳ Review for PR #{pr_number} already in progress")
+            return False
+        
+        # Check if already reviewed (with commit SHA tracking for re-reviews)
+        head_sha = pr.get('head', {}).get('sha', '')
+        
+        # For draft PRs with auto-converted labels, check if HEAD commit changed
+        if is_draft and any(label in ['critical-issues', 'has-conflicts'] for label in pr_labels):
+            # Check if we've reviewed this specific commit
+            reviewed_entry = self.reviewed_prs.get(pr_key, {})
+            reviewed_sha = reviewed_entry.get('sha') if isinstance(reviewed_entry, dict) else reviewed_entry
+            if reviewed_sha == head_sha:
+                logger.debug(f"✅ Already reviewed PR #{pr_number} at commit {head_sha[:7]}")
+                return False
+            elif reviewed_sha:
+                logger.info(f"🔄 Re-reviewing PR #{pr_number} - new commits since last review")
+        else:
+            # For normal PRs, review only once
+            if pr_key in self.reviewed_prs:
+                logger.debug(f"✅ Already reviewed PR #{pr_number}")
+                return False
+        
+        return True
+    
     async def check_pull_requests(self):
         """Check for new PRs needing automatic review.
         
@@ -724,18 +972,30 @@ class PollingService:
         
         logger.info("🔍 Checking for PRs needing review...")
         
-        for repo in self.config.repositories:
-            try:
-                owner, repo_name = repo.split('/')
-                
-                # Fetch open PRs (bypass rate limit for internal polling)
-                logger.debug(f"🔍 Fetching open PRs for {repo}")
-                prs = self.github_api.list_pull_requests(
+        semaphore = self._github_semaphore()
+        
+        async def fetch_prs(repo: str) -> List[Dict]:
+            snapshot = self._snapshots.get(repo)
+            if snapshot is not None:
+                return snapshot.pull_requests
+            owner, repo_name = repo.split('/')
+            logger.debug(f"🔍 Fetching open PRs for {repo}")
+            async with semaphore:
+                # Bypass rate limit for internal polling
+                return await self.async_github_api.list_pull_requests(
                     owner=owner,
                     repo=repo_name,
                     state='open',
                     bypass_rate_limit=True
                 )
+        
+        repos = list(self.config.repositories)
+        all_prs = await asyncio.gather(*(fetch_prs(repo) for repo in repos), return_exceptions=True)
+        
+        for repo, prs in zip(repos, all_prs):
+            try:
+                if isinstance(prs, BaseException):
+                    raise prs
                 
                 if not prs:
                     logger.debug(f"🔍 No open PRs in {repo}")
@@ -745,73 +1005,12 @@ class PollingService:
                 
                 # Filter PRs for auto-review
                 for pr in prs:
-                    pr_number = pr.get('number')
-                    if not pr_number:
-                        logger.warning(f"⚠️ PR missing number field, skipping")
+                    if not self._should_review_pr(repo, pr):
                         continue
                     
-                    pr_title = pr.get('title', 'Untitled')
-                    pr_user = pr.get('user', {}).get('login', '')
-                    pr_labels = [label.get('name', '') for label in pr.get('labels', [])]
-                    is_draft = pr.get('draft', False)
-                    
-                    logger.debug(f"🔍 Checking PR #{pr_number} by {pr_user}: {pr_title} (draft: {is_draft})")
-                    
-                    # Smart draft handling:
-                    # - Skip draft PRs UNLESS they have 'critical-issues' or 'has-conflicts' labels
-                    # - These labels indicate the PR was auto-converted by our system
-                    # - We want to auto-review them when new commits are pushed (fixes)
-                    if is_draft:
-                        has_auto_converted_label = any(
-                            label in ['critical-issues', 'has-conflicts'] 
-                            for label in pr_labels
-                        )
-                        if not has_auto_converted_label:
-                            logger.debug(f"📝 Skipping draft PR #{pr_number} - work in progress (no auto-converted labels)")
-                            continue
-                        else:
-                            logger.info(f"🔄 Draft PR #{pr_number} has auto-converted labels - will re-review on commits")
-                    
-                    # Check if user is in skip list (admin accounts)
-                    if pr_user in self.config.pr_skip_review_users:
-                        logger.debug(f"⏭️ Skipping PR #{pr_number} - user {pr_user} in skip list")
-                        continue
-                    
-                    # Check if user is in auto-review list (bot accounts)
-                    if self.config.pr_auto_review_users and pr_user not in self.config.pr_auto_review_users:
-                        logger.debug(f"⏭️ Skipping PR #{pr_number} - user {pr_user} not in auto-review list")
-                        continue
-                    
-                    # Check if PR has required labels (if configured)
-                    if self.config.pr_review_labels:
-                        has_required_label = any(label in self.config.pr_review_labels for label in pr_labels)
-                        if not has_required_label:
-                            logger.debug(f"⏭️ Skipping PR #{pr_number} - missing required labels")
-                            continue
-                    
-                    # Check if already reviewed (with commit SHA tracking for re-reviews)
-                    pr_key = f"{repo}#{pr_number}"
-                    head_sha = pr.get('head', {}).get('sha', '')
-                    
-                    # For draft PRs with auto-converted labels, check if HEAD commit changed
-                    if is_draft and any(label in ['critical-issues', 'has-conflicts'] for label in pr_labels):
-                        # Check if we've reviewed this specific commit
-                        reviewed_entry = self.reviewed_prs.get(pr_key, {})
-                        reviewed_sha = reviewed_entry.get('sha') if isinstance(reviewed_entry, dict) else reviewed_entry
-                        if reviewed_sha == head_sha:
-                            logger.debug(f"✅ Already reviewed PR #{pr_number} at commit {head_sha[:7]}")
-                            continue
-                        elif reviewed_sha:
-                            logger.info(f"🔄 Re-reviewing PR #{pr_number} - new commits since last review")
-                    else:
-                        # For normal PRs, review only once
-                        if pr_key in self.reviewed_prs:
-                            logger.debug(f"✅ Already reviewed PR #{pr_number}")
-                            continue
-                    
                     # Trigger reviewer agent
-                    logger.info(f"🤖 Triggering review for PR #{pr_number}: {pr_title}")
-                    await self.trigger_pr_review(repo, pr_number, pr)
+                    logger.info(f"🤖 Triggering review for PR #{pr['number']}: {pr.get('title', 'Untitled')}")
+                    await self.trigger_pr_review(repo, pr['number'], pr)
                     
             except Exception as e:
                 logger.error(f"❌ Error checking PRs for {repo}: {e}", exc_info=True)
@@ -828,18 +1027,30 @@ class PollingService:
         
         logger.info("🔍 Checking for issues to auto-open...")
         
-        for repo in self.config.repositories:
-            try:
-                owner, repo_name = repo.split('/')
-                
-                # Fetch open issues
-                logger.debug(f"🔍 Fetching open issues for {repo}")
-                issues = self.github_api.list_issues(
+        semaphore = self._github_semaphore()
+        
+        async def fetch_issues(repo: str) -> List[Dict]:
+            snapshot = self._snapshots.get(repo)
+            if snapshot is not None:
+                # Snapshot holds every issue carrying a trigger label
+                return snapshot.issues
+            owner, repo_name = repo.split('/')
+            logger.debug(f"🔍 Fetching open issues for {repo}")
+            async with semaphore:
+                return await self.async_github_api.list_issues(
                     owner=owner,
                     repo=repo_name,
                     state='open',
                     bypass_rate_limit=True  # Internal polling operation
                 )
+        
+        repos = list(self.config.repositories)
+        all_issues = await asyncio.gather(*(fetch_issues(repo) for repo in repos), return_exceptions=True)
+        
+        for repo, issues in zip(repos, all_issues):
+            try:
+                if isinstance(issues, BaseException):
+                    raise issues
                 
                 if not issues:
                     logger.debug(f"🔍 No open issues in {repo}")
@@ -887,7 +1098,11 @@ class PollingService:
                             continue
                     
                     # Check if currently claimed (not expired)
-                    if self.is_issue_claimed(repo, issue_number):
+                    if 'comments' in issue:
+                        claimed = self._has_active_claim(repo, issue_number, issue['comments'])
+                    else:
+                        claimed = await self.is_issue_claimed_async(repo, issue_number)
+                    if claimed:
                         logger.debug(f"✅ Issue #{issue_number} already claimed")
                         continue
                     
@@ -898,8 +1113,45 @@ class PollingService:
             except Exception as e:
                 logger.error(f"❌ Error checking issues for {repo}: {e}", exc_info=True)
     
-    async def trigger_pr_review(self, repo: str, pr_number: int, pr_data: Dict):
-        """Trigger PR Reviewer Agent for a pull request with intelligent merge.
+    async def trigger_pr_review(self, repo: str, pr_number: int, pr_data: Dict) -> bool:
+        """Queue PR Reviewer Agent for a pull request on the review worker pool.
+        
+        The review itself is blocking (LLM calls, GitHub API) and runs in
+        ReviewExecutor threads, so the polling loop and webhook consumer are not
+        stalled while PRs are reviewed. The PR is marked as reviewed on the
+        event loop once the review completes.
+        
+        Args:
+            repo: Repository (owner/repo)
+            pr_number: PR number
+            pr_data: PR data dictionary from GitHub API
+            
+        Returns:
+            True if the review was queued, False if already running or locked elsewhere
+        """
+        pr_key = f"{repo}#{pr_number}"
+        head_sha = pr_data.get('head', {}).get('sha', '')
+        
+        def mark_reviewed(result: Optional[Dict]):
+            if result is None:
+                return
+            # Mark as reviewed with commit SHA and timestamp (for memory leak prevention)
+            self.reviewed_prs[pr_key] = {
+                'sha': head_sha,
+                'reviewed_at': time.time()
+            }
+            logger.debug(f"📝 Marked PR {pr_key} as reviewed at commit {head_sha[:7] if head_sha else 'unknown'}")
+        
+        task = self.review_executor.submit(
+            repo,
+            pr_number,
+            lambda: self._run_pr_review(repo, pr_number, pr_data),
+            on_complete=mark_reviewed
+        )
+        return task is not None
+    
+    def _run_pr_review(self, repo: str, pr_number: int, pr_data: Dict) -> Optional[Dict]:
+        """Run PR Reviewer Agent for a pull request with intelligent merge (blocking).
         
         Uses intelligent reviewer selection and automated merge based on config:
         - dedicated: Always use configured reviewer_agent_id
@@ -914,6 +1166,9 @@ class PollingService:
             repo: Repository (owner/repo)
             pr_number: PR number
             pr_data: PR data dictionary from GitHub API
+            
+        Returns:
+            Workflow result dictionary, or None if the review failed
         """
         try:
             from engine.operations.pr_review_agent import PRReviewAgent
@@ -975,17 +1230,11 @@ class PollingService:
             
             logger.info(f"✅ PR review completed for {pr_key}: {decision} ({issue_count} issues found)")
             
-            # Mark as reviewed with commit SHA and timestamp (for memory leak prevention)
-            import time
-            head_sha = pr_data.get('head', {}).get('sha', '')
-            self.reviewed_prs[pr_key] = {
-                'sha': head_sha,
-                'reviewed_at': time.time()
-            }
-            logger.debug(f"📝 Marked PR {pr_key} as reviewed at commit {head_sha[:7] if head_sha else 'unknown'}")
+            return result
             
         except Exception as e:
-            logger.error(f"❌ Failed to trigger PR review for {repo}#{pr_number}: {e}", exc_info=True)
+            logger.error(f"❌ Failed to run PR review for {repo}#{pr_number}: {e}", exc_info=True)
+            return None
     
     async def check_and_fix_draft_prs(self):
         """Check draft PRs created by bot and mark ready if approved."""
@@ -1006,8 +1255,12 @@ class PollingService:
             for repo in self.config.repositories:
                 logger.info(f"🔍 Checking draft PRs in {repo}...")
                 
-                # List draft PRs by bot account
-                draft_prs = bot.list_draft_prs_by_author(repo)
+                # List draft PRs by bot account (snapshot already has review state)
+                snapshot = self._snapshots.get(repo)
+                if snapshot is not None:
+                    draft_prs = snapshot.draft_prs_by_author(bot.username)
+                else:
+                    draft_prs = bot.list_draft_prs_by_author(repo)
                 
                 if not draft_prs:
                     logger.debug(f"   No draft PRs found in {repo}")
@@ -1140,24 +1393,15 @@ class PollingService:
         try:
             owner, repo_name = repo.split('/')
             comment = f"🤖 Agent **{self.config.github_username}** started working on this issue at {_utc_iso()}"
-            # Prefer gh CLI for tests; fallback to REST helper
-            try:
-                path = f"/repos/{owner}/{repo_name}/issues/{issue_number}/comments"
-                # Use -f to send form body
-                res = subprocess.run(
-                    ["gh", "api", "-X", "POST", path, "-f", f"body={comment}"],
-                    text=True,
-                    capture_output=True
-                )
-                if res.returncode != 0:
-                    raise RuntimeError(res.stderr.strip() or "gh api failed")
-            except Exception:
-                self.github_api.create_issue_comment(
-                    owner=owner,
-                    repo=repo_name,
-                    issue_number=issue_number,
-                    body=comment
-                )
+            await self.async_github_api.create_issue_comment(
+                owner=owner,
+                repo=repo_name,
+                issue_number=issue_number,
+                body=comment
+            )
+            
+            # Our own claim is now active for the rest of this cycle
+            self._claim_status[self.get_issue_key(repo, issue_number)] = True
             
             logger.info(f"Claimed issue {repo}#{issue_number}")
             return True
@@ -1179,28 +1423,36 @@ class PollingService:
         issue_number = issue['number']
         issue_key = self.get_issue_key(repo, issue_number)
         
-        logger.info(f"Starting workflow for {issue_key}: {issue['title']}")
+        if issue_key in self._claiming:
+            logger.info(f"⏭️ Issue {issue_key} is already being dispatched, skipping")
+            return False
         
-        # Check if issue is already claimed by ANY agent (not just ours)
-        # This prevents spamming "started working" comments
-        if self.is_issue_claimed(repo, issue_number):
-            logger.info(f"✅ Issue {issue_key} already claimed, proceeding with workflow without adding new claim")
-        else:
-            # No valid claim exists, add one
-            logger.info(f"🔖 Adding claim for {issue_key}")
-            if not await self.claim_issue(repo, issue_number):
-                logger.error(f"Failed to claim issue {issue_key}")
-                return False
-
+        logger.info(f"Starting workflow for {issue_key}: {issue['title']}")
         
-        # Update state
-        self.state[issue_key] = IssueState(
-            issue_number=issue_number,
-            repository=repo,
-            claimed_by=self.config.github_username,
-            claimed_at=_utc_iso()
-        )
-        self.save_state()
+        self._claiming.add(issue_key)
+        try:
+            # Check if issue is already claimed by ANY agent (not just ours)
+            # This prevents spamming "started working" comments
+            if await self.is_issue_claimed_async(repo, issue_number):
+                logger.info(f"✅ Issue {issue_key} already claimed, proceeding with workflow without adding new claim")
+            else:
+                # No valid claim exists, add one
+                logger.info(f"🔖 Adding claim for {issue_key}")
+                if not await self.claim_issue(repo, issue_number):
+                    logger.error(f"Failed to claim issue {issue_key}")
+                    return False
+            
+            # Update state
+            self.state[issue_key] = IssueState(
+                issue_number=issue_number,
+                repository=repo,
+                claimed_by=self.config.github_username,
+                claimed_at=_utc_iso()
+            )
+            self.state_manager.mark_in_flight(issue_key)
+            self.save_state()
+        finally:
+            self._claiming.discard(issue_key)
         
         try:
             # Get agent from registry (wait if not available yet)
@@ -1276,18 +1528,110 @@ class PollingService:
             self.save_state()
             
             return False
+        
+        finally:
+            if self.state_manager.is_in_flight(issue_key):
+                self.state_manager.clear_in_flight(issue_key)
+                self.save_state()
     
     def get_processing_count(self) -> int:
         """Get count of currently processing issues.
         
         Returns:
-            Number of issues being processed
+            Number of issues being processed (including ones being claimed)
         """
-        return sum(
+        return len(self._claiming) + sum(
             1 for state in self.state.values()
             if not state.completed
         )
     
+    async def handle_webhook_event(self, event: WebhookEvent) -> bool:
+        """Dispatch a webhook event to the issue workflow or PR review path.
+        
+        Issue and issue comment events re-evaluate the issue with the same
+        IssueFilter used by polling and schedule its workflow; pull request
+        events go through the same checks as check_pull_requests. Issue
+        Opener and draft PR handling remain polling-only.
+        
+        Args:
+            event: Verified webhook event
+            
+        Returns:
+            True if a workflow or review was started
+        """
+        repo = event.repository
+        if repo not in self.config.repositories:
+            logger.debug(f"⏭️ Ignoring {event.event} webhook for unmonitored repository {repo}")
+            return False
+        
+        if event.event in ('issues', 'issue_comment'):
+            return await self._dispatch_issue_event(repo, event)
+        if event.event == 'pull_request':
+            return await self._dispatch_pull_request_event(repo, event)
+        return False
+    
+    async def _dispatch_issue_event(self, repo: str, event: WebhookEvent) -> bool:
+        """Schedule the issue workflow for an actionable issue from a webhook."""
+        if event.event == 'issues' and event.action not in ('opened', 'reopened', 'labeled', 'assigned'):
+            return False
+        
+        raw_issue = event.payload.get('issue') or {}
+        if not raw_issue.get('number') or 'pull_request' in raw_issue:
+            return False
+        
+        issue = format_issue(raw_issue)
+        issue['repository'] = repo
+        if issue['state'] != 'open':
+            return False
+        if not any(label['name'] in self.config.watch_labels for label in issue['labels']):
+            return False
+        
+        issue_key = self.get_issue_key(repo, issue['number'])
+        await self.prefetch_claim_status([issue])
+        try:
+            actionable = self.filter_actionable_issues([issue])
+        finally:
+            # Webhook lookups must not leak into the current poll cycle's view
+            self._claim_status.pop(issue_key, None)
+        
+        if not actionable:
+            return False
+        
+        logger.info(f"📬 Webhook {event.event}.{event.action}: scheduling workflow for {issue_key}")
+        return self.scheduler.submit(issue)
+    
+    async def _dispatch_pull_request_event(self, repo: str, event: WebhookEvent) -> bool:
+        """Trigger a PR review from a webhook."""
+        if not self.config.pr_monitoring_enabled:
+            return False
+        if event.action not in ('opened', 'reopened', 'synchronize', 'ready_for_review', 'labeled'):
+            return False
+        
+        pr = event.payload.get('pull_request') or {}
+        if pr.get('state', 'open') != 'open' or not self._should_review_pr(repo, pr):
+            return False
+        
+        logger.info(f"📬 Webhook pull_request.{event.action}: reviewing {repo}#{pr['number']}")
+        return await self.trigger_pr_review(repo, pr['number'], pr)
+    
+    async def run_webhook_consumer(self, queue: Optional[WebhookEventQueue] = None):
+        """Consume webhook events until the service stops.
+        
+        Args:
+            queue: Event queue (uses global queue if None)
+        """
+        queue = queue or get_webhook_queue()
+        logger.info("📬 Webhook consumer started")
+        
+        while self.running:
+            event = await queue.get()
+            try:
+                await self.handle_webhook_event(event)
+            except Exception as e:
+                logger.error(f"❌ Error handling {event.event} webhook {event.delivery_id}: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+    
     async def poll_once(self):
         """Perform one polling cycle."""
         logger.info("=== Starting polling cycle ===")
@@ -1307,6 +1651,10 @@ class PollingService:
             )
         
         try:
+            # One GraphQL snapshot per repo feeds every check below
+            if self.config.github_use_graphql:
+                await self.fetch_snapshots()
+            
             # Check assigned issues
             issues = await self.check_assigned_issues()
             
@@ -1315,6 +1663,9 @@ class PollingService:
             if issues:
                 logger.info(f"🐛 DEBUG: First issue keys: {list(issues[0].keys())}")
             
+            # Resolve GitHub claims concurrently so filtering doesn't block the loop
+            await self.prefetch_claim_status(issues)
+            
             # Filter actionable
             actionable = self.filter_actionable_issues(issues)
             
@@ -1337,24 +1688,22 @@ class PollingService:
                         message=f"Found {len(actionable)} actionable issues"
                     )
             
-            # Check capacity
-            processing_count = self.get_processing_count()
-            available_slots = self.config.max_concurrent_issues - processing_count
+            # Hand actionable issues to the worker pool; running workflows
+            # continue in the background across poll cycles
+            for issue in actionable:
+                self.scheduler.submit(issue)
             
-            if available_slots <= 0:
-                logger.info(f"At max capacity ({self.config.max_concurrent_issues} concurrent issues)")
+            if self.scheduler.available_slots <= 0:
+                logger.info(
+                    f"At max capacity ({self.scheduler.running_count}/{self.config.max_concurrent_issues} running, "
+                    f"{self.scheduler.pending_count} queued)"
+                )
                 if self.monitor:
                     self.monitor.add_log(
                         agent_id="polling-service",
                         level="WARNING",
                         message=f"At max capacity ({self.config.max_concurrent_issues} concurrent)"
                     )
-            elif actionable:
-                # Start workflows for available slots
-                for issue in actionable[:available_slots]:
-                    await self.start_issue_workflow(issue)
-                    # Small delay between starts
-                    await asyncio.sleep(2)
             
             # Check for PRs needing review (if enabled)
             if self.config.pr_monitoring_enabled:
@@ -1373,6 +1722,10 @@ class PollingService:
         except Exception as e:
             logger.error(f"Error in polling cycle: {e}")
         finally:
+            # Claim status and snapshots are only valid for the cycle they were fetched in
+            self._claim_status.clear()
+            self._snapshots = {}
+            
             # Update metrics
             self.update_metrics()
             
@@ -1471,15 +1824,25 @@ class PollingService:
         
         self.running = True
         
+        # With webhooks, polling only reconciles missed deliveries
+        interval = self.config.interval_seconds
+        consumer = None
+        if self.config.webhooks_enabled:
+            interval = self.config.webhook_reconcile_interval_seconds
+            logger.info(f"📬 Webhook dispatch enabled, reconciliation sweep every {interval}s")
+        
         # Initial delay to allow agent registry injection
         logger.info("Waiting 3s for agent registry initialization...")
         await asyncio.sleep(3)
         
+        if self.config.webhooks_enabled:
+            consumer = asyncio.create_task(self.run_webhook_consumer())
+        
         try:
             while self.running:
                 await self.poll_once()
-                logger.info(f"Sleeping for {self.config.interval_seconds}s...")
-                await asyncio.sleep(self.config.interval_seconds)
+                logger.info(f"Sleeping for {interval}s...")
+                await asyncio.sleep(interval)
                 
         except KeyboardInterrupt:
             logger.info("Polling service stopped by user")
@@ -1487,6 +1850,11 @@ class PollingService:
             logger.error(f"Fatal error in polling service: {e}")
         finally:
             self.running = False
+            if consumer is not None:
+                consumer.cancel()
+            await self.scheduler.shutdown()
+            await self.review_executor.shutdown()
+            await self.async_github_api.aclose()
             logger.info("Polling service shut down")
     
     def stop(self):
@@ -1566,9 +1934,13 @@ async def main():
         service.config.watch_labels = args.labels
     if args.max_concurrent is not None:
         service.config.max_concurrent_issues = args.max_concurrent
+        service.scheduler.max_workers = max(1, args.max_concurrent)
     
     if args.once:
         await service.poll_once()
+        await service.scheduler.join()
+        await service.review_executor.join()
+        await service.async_github_api.aclose()
     else:
         await service.run()
 
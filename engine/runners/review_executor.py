@@ -0,0 +1,152 @@
+"""Review worker pool for running PR reviews off the event loop.
+
+PRReviewAgent is synchronous: every LLM call and GitHub request in a review
+blocks its caller. ReviewExecutor runs reviews in a dedicated thread pool so
+the polling loop (issue dispatch, webhook handling, monitor heartbeats)
+keeps running, and multiple PRs across repositories are reviewed in parallel.
+
+Integration with ReviewLock:
+- PRs locked by another process (e.g. GitHub Actions) are not submitted
+- PRs already queued or running in this process are not submitted twice
+- Locks of running reviews are refreshed periodically, so long LLM reviews
+  do not outlive the lock timeout and get picked up by someone else
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from engine.utils.review_lock import ReviewLock
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewExecutor:
+    """Bounded thread pool for blocking PR review workflows."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        review_lock: Optional[ReviewLock] = None,
+        lock_refresh_seconds: float = 60.0
+    ):
+        """Initialize review executor.
+
+        Args:
+            max_workers: Number of reviews running in parallel
+            review_lock: Lock manager shared with PRReviewAgent (same lock_dir)
+            lock_refresh_seconds: Interval for refreshing locks of running reviews
+        """
+        self.max_workers = max(1, max_workers)
+        self.review_lock = review_lock
+        self.lock_refresh_seconds = lock_refresh_seconds
+
+        # Created lazily so idle services do not start threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._active: Dict[str, asyncio.Task] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="pr-review"
+            )
+        return self._executor
+
+    def is_active(self, repo: str, pr_number: int) -> bool:
+        """Check if a review for the PR is queued or running in this process."""
+        return f"{repo}#{pr_number}" in self._active
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def submit(
+        self,
+        repo: str,
+        pr_number: int,
+        review_fn: Callable[[], Any],
+        on_complete: Optional[Callable[[Any], None]] = None
+    ) -> Optional[asyncio.Task]:
+        """Schedule a blocking review on the pool.
+
+        Args:
+            repo: Repository (owner/repo)
+            pr_number: PR number
+            review_fn: Blocking callable performing the review
+            on_complete: Called on the event loop with the review result
+                (not called if the review raised)
+
+        Returns:
+            Task tracking the review, or None if skipped (already active or locked)
+        """
+        pr_key = f"{repo}#{pr_number}"
+        if pr_key in self._active:
+            logger.debug(f"⏭️ Review for {pr_key} already queued or running")
+            return None
+        if self.review_lock and self.review_lock.is_locked(repo, pr_number):
+            logger.info(f"⏭️ Review for {pr_key} locked by another process, skipping")
+            return None
+
+        task = asyncio.create_task(
+            self._run(repo, pr_number, review_fn, on_complete),
+            name=f"review:{pr_key}"
+        )
+        self._active[pr_key] = task
+        logger.info(f"📥 Queued review for {pr_key} ({len(self._active)} active, {self.max_workers} workers)")
+        return task
+
+    async def _run(
+        self,
+        repo: str,
+        pr_number: int,
+        review_fn: Callable[[], Any],
+        on_complete: Optional[Callable[[Any], None]]
+    ) -> Any:
+        """Run review in the pool while keeping its lock fresh."""
+        pr_key = f"{repo}#{pr_number}"
+        loop = asyncio.get_running_loop()
+        heartbeat = asyncio.create_task(self._refresh_lock(repo, pr_number)) if self.review_lock else None
+
+        try:
+            result = await loop.run_in_executor(self._get_executor(), review_fn)
+            if on_complete:
+                on_complete(result)
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Review for {pr_key} failed: {e}", exc_info=True)
+            return None
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+            self._active.pop(pr_key, None)
+
+    async def _refresh_lock(self, repo: str, pr_number: int):
+        """Touch the review lock until cancelled."""
+        while True:
+            await asyncio.sleep(self.lock_refresh_seconds)
+            self.review_lock.refresh(repo, pr_number)
+
+    async def join(self):
+        """Wait for all queued and running reviews."""
+        while self._active:
+            await asyncio.gather(*list(self._active.values()), return_exceptions=True)
+
+    async def shutdown(self):
+        """Drop queued reviews and stop the pool.
+
+        Reviews already running in a thread cannot be interrupted; they
+        finish in the background and release their locks themselves.
+        """
+        tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._active.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -10,7 +10,7 @@ import logging
 from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 from engine.runners.polling_models import IssueState
 
@@ -72,6 +72,13 @@ class StateManager:
                         for key, value in data.items()
                     }
                     logger.info(f"Loaded state: {len(self.state)} tracked issues")
+                    
+                    # Workflows from a previous process are gone; claims still apply
+                    stale = [key for key, value in self.state.items() if value.in_flight]
+                    for key in stale:
+                        self.state[key].in_flight = False
+                    if stale:
+                        logger.info(f"Reset {len(stale)} stale in-flight workflows: {stale}")
                 finally:
                     # Release lock
                     fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -184,6 +191,43 @@ class StateManager:
         """
         return key in self.state
     
+    def mark_in_flight(self, key: str) -> None:
+        """Mark issue workflow as running.
+        
+        Args:
+            key: Issue key (repo#number)
+        """
+        state = self.get(key)
+        if state is not None:
+            state.in_flight = True
+            state.started_at = _utc_now().isoformat().replace("+00:00", "Z")
+    
+    def clear_in_flight(self, key: str) -> None:
+        """Mark issue workflow as no longer running.
+        
+        Args:
+            key: Issue key (repo#number)
+        """
+        state = self.get(key)
+        if state is not None:
+            state.in_flight = False
+    
+    def is_in_flight(self, key: str) -> bool:
+        """Check if issue workflow is currently running.
+        
+        Args:
+            key: Issue key (repo#number)
+            
+        Returns:
+            True if a workflow is running for the issue
+        """
+        state = self.get(key)
+        return state is not None and state.in_flight
+    
+    def in_flight_keys(self) -> List[str]:
+        """Return keys of all running issue workflows."""
+        return [key for key, state in self.state.items() if state.in_flight]
+    
     def is_completed(self, key: str) -> bool:
         """Check if issue is marked as completed.
         
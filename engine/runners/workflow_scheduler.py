@@ -0,0 +1,167 @@
+"""Bounded scheduler for issue workflows.
+
+Runs issue workflows as asyncio tasks so a poll cycle (or webhook event)
+only enqueues work instead of awaiting a pipeline run that can take half an
+hour. Provides:
+
+- A global worker limit (max_concurrent_issues)
+- Per-repository concurrency caps
+- A priority queue ordered by issue labels (lower value runs first,
+  FIFO within the same priority)
+- Deduplication of queued and running issues across poll cycles
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PRIORITY = 100
+
+
+class WorkflowScheduler:
+    """Priority task pool for issue workflows."""
+
+    def __init__(
+        self,
+        run_workflow: Callable[[Dict], Awaitable[bool]],
+        max_workers: int,
+        max_per_repo: int = 0,
+        label_priorities: Optional[Dict[str, int]] = None,
+        is_in_flight: Optional[Callable[[str], bool]] = None
+    ):
+        """Initialize workflow scheduler.
+
+        Args:
+            run_workflow: Coroutine function running one issue workflow
+            max_workers: Maximum workflows running at once
+            max_per_repo: Maximum running workflows per repository (0 = no cap)
+            label_priorities: Label -> priority (lower runs first)
+            is_in_flight: Optional callback reporting issues already running elsewhere
+        """
+        self.run_workflow = run_workflow
+        self.max_workers = max(1, max_workers)
+        self.max_per_repo = max_per_repo
+        self.label_priorities = label_priorities or {}
+        self.is_in_flight = is_in_flight
+
+        self._pending: List[Tuple[int, int, str, Dict]] = []  # heap of (priority, seq, key, issue)
+        self._pending_keys: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._seq = itertools.count()
+
+    @staticmethod
+    def issue_key(issue: Dict) -> str:
+        return f"{issue['repository']}#{issue['number']}"
+
+    def priority_for(self, issue: Dict) -> int:
+        """Return scheduling priority for an issue (lowest matching label wins).
+
+        Args:
+            issue: Issue dictionary
+
+        Returns:
+            Priority value (lower runs first)
+        """
+        priorities = [
+            self.label_priorities[label.get('name', '')]
+            for label in issue.get('labels', [])
+            if label.get('name', '') in self.label_priorities
+        ]
+        return min(priorities) if priorities else DEFAULT_PRIORITY
+
+    def submit(self, issue: Dict) -> bool:
+        """Queue an issue workflow.
+
+        Args:
+            issue: Issue dictionary (must include 'repository' and 'number')
+
+        Returns:
+            True if queued, False if already queued or running
+        """
+        key = self.issue_key(issue)
+        if key in self._pending_keys or key in self._running:
+            logger.debug(f"⏭️ {key} already scheduled")
+            return False
+        if self.is_in_flight and self.is_in_flight(key):
+            logger.debug(f"⏭️ {key} already in flight")
+            return False
+
+        priority = self.priority_for(issue)
+        heapq.heappush(self._pending, (priority, next(self._seq), key, issue))
+        self._pending_keys.add(key)
+        logger.info(f"📥 Queued workflow for {key} (priority {priority}, {len(self._pending)} pending)")
+
+        self._dispatch()
+        return True
+
+    def _repo_running(self, repo: str) -> int:
+        return sum(1 for key in self._running if key.rsplit('#', 1)[0] == repo)
+
+    def _dispatch(self):
+        """Start queued workflows while worker and per-repo capacity allow."""
+        if not self._pending or len(self._running) >= self.max_workers:
+            return
+
+        deferred = []
+        while self._pending and len(self._running) < self.max_workers:
+            entry = heapq.heappop(self._pending)
+            _, _, key, issue = entry
+            if self.max_per_repo and self._repo_running(issue['repository']) >= self.max_per_repo:
+                # Repo is saturated; keep its place in line and try lower priorities
+                deferred.append(entry)
+                continue
+
+            self._pending_keys.discard(key)
+            task = asyncio.create_task(self._run(key, issue), name=f"workflow:{key}")
+            self._running[key] = task
+
+        for entry in deferred:
+            heapq.heappush(self._pending, entry)
+
+    async def _run(self, key: str, issue: Dict):
+        """Run one workflow and release its slot."""
+        logger.info(f"🚀 Workflow slot taken by {key} ({len(self._running)}/{self.max_workers} running)")
+        try:
+            await self.run_workflow(issue)
+        except asyncio.CancelledError:
+            logger.warning(f"⏹️ Workflow for {key} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Workflow for {key} crashed: {e}", exc_info=True)
+        finally:
+            self._running.pop(key, None)
+            self._dispatch()
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @property
+    def available_slots(self) -> int:
+        return max(0, self.max_workers - len(self._running))
+
+    def running_keys(self) -> List[str]:
+        return list(self._running)
+
+    async def join(self):
+        """Wait until no workflows are queued or running."""
+        while self._running:
+            await asyncio.gather(*list(self._running.values()), return_exceptions=True)
+
+    async def shutdown(self):
+        """Drop queued workflows and cancel running ones."""
+        self._pending.clear()
+        self._pending_keys.clear()
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -81,12 +81,31 @@ class ReviewLock:
             logger.error(f"❌ Error acquiring lock for {pr_key}: {e}")
             return False
     
-    def release(self, repo: str, pr_number: int):
+    def is_locked(self, repo: str, pr_number: int) -> bool:
+        """Check if a PR is currently locked (lock file exists and is not stale).
+        
+        Args:
+            repo: Repository (owner/repo)
+            pr_number: PR number
+        
+        Returns:
+            True if a fresh lock exists
+        """
+        lock_file = self.lock_dir / f"{repo.replace('/', '_')}_pr{pr_number}.lock"
+        
+        try:
+            lock_age = time.time() - lock_file.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return lock_age <= self.lock_timeout
+    
+    def release(self, repo: str, pr_number: int, requester: Optional[str] = None):
         """Release lock for PR review.
         
         Args:
             repo: Repository (owner/repo)
             pr_number: PR number
+            requester: Identifier of releasing process (for logging)
         """
         pr_key = f"{repo}#{pr_number}"
         lock_file = self.lock_dir / f"{repo.replace('/', '_')}_pr{pr_number}.lock"
@@ -100,7 +119,7 @@ class ReviewLock:
             # Remove lock file
             if lock_file.exists():
                 lock_file.unlink()
-                logger.info(f"🔓 Released review lock for {pr_key}")
+                logger.info(f"🔓 Released review lock for {pr_key}" + (f" (requester: {requester})" if requester else ""))
         except Exception as e:
             logger.error(f"❌ Error releasing lock for {pr_key}: {e}")
     
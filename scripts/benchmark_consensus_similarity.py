@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark fix-similarity grouping in ConsensusEngine.
+
+Builds realistic 5-10 KB proposals for one bug in a generated Python module,
+as four providers would return them:
+    claude    unified diff with 6 lines of context
+    gpt4      the same fix with 3 lines of context and an added comment
+    qwen      the same fix with 8 lines of context, other file paths and reformatted lines
+    deepseek  a different fix touching other functions
+
+and times grouping with:
+    legacy    difflib.SequenceMatcher.ratio() on whitespace-normalized characters (previous code)
+    cold      FixSimilarity with empty caches (sketches built on the fly)
+    warm      FixSimilarity with cached sketches/scores, as when streaming
+              consensus re-groups after every new response
+
+Usage:
+    python scripts/benchmark_consensus_similarity.py
+    python scripts/benchmark_consensus_similarity.py --functions 60 --rounds 5
+"""
+
+import argparse
+import difflib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.operations.consensus_engine import ConsensusEngine
+from engine.operations.multi_llm_orchestrator import LLMProvider, LLMResponse
+
+WEIGHTS = {LLMProvider.GPT4: 1.0, LLMProvider.CLAUDE: 0.9, LLMProvider.QWEN: 0.7, LLMProvider.DEEPSEEK: 0.8}
+
+
+def build_module(functions: int) -> list:
+    lines = ['"""Inventory accounting helpers."""', "", "import math", ""]
+    for i in range(functions):
+        lines += [
+            "",
+            f"def adjust_stock_{i}(items, delta, minimum=0):",
+            f'    """Apply delta to every item of batch {i} without dropping below minimum."""',
+            "    adjusted = []",
+            "    for item in items:",
+            "        quantity = item['quantity'] - delta",
+            "        if quantity < minimum:",
+            "            quantity = minimum",
+            f"        adjusted.append({{**item, 'quantity': quantity, 'batch': {i}}})",
+            "    return adjusted",
+        ]
+    return lines
+
+
+def fix_lines(lines: list, functions, old: str, new: str) -> list:
+    fixed, current = [], None
+    for line in lines:
+        if line.startswith("def adjust_stock_"):
+            current = int(line.split("_")[2].split("(")[0])
+        fixed.append(line.replace(old, new) if current in functions else line)
+    return fixed
+
+
+def unified_diff(before: list, after: list, context: int, path: str = "inventory.py") -> str:
+    return "\n".join(difflib.unified_diff(before, after, f"a/{path}", f"b/{path}", lineterm="", n=context))
+
+
+def build_fixes(functions: int):
+    base = build_module(functions)
+    buggy = set(range(0, functions, 3))
+    fixed = fix_lines(base, buggy, "item['quantity'] - delta", "item['quantity'] + delta")
+    commented = fixed[:4] + ["# Fix: delta is an increase, not a decrease"] + fixed[4:]
+    reformatted = fix_lines(base, buggy, "item['quantity'] - delta", "item[ 'quantity' ] +delta")
+    different = fix_lines(base, set(range(1, functions, 3)), "if quantity < minimum:", "if quantity <= minimum:")
+    return {
+        LLMProvider.CLAUDE: unified_diff(base, fixed, 6),
+        LLMProvider.GPT4: unified_diff(base, commented, 3),
+        LLMProvider.QWEN: unified_diff(base, reformatted, 8, path="src/inventory.py"),
+        LLMProvider.DEEPSEEK: unified_diff(base, different, 6),
+    }
+
+
+def legacy_similarity(text1: str, text2: str) -> float:
+    """Previous ConsensusEngine._calculate_similarity"""
+    normalized1 = " ".join(text1.split())
+    normalized2 = " ".join(text2.split())
+    return difflib.SequenceMatcher(None, normalized1, normalized2).ratio()
+
+
+def responses_for(fixes):
+    return [
+        LLMResponse(provider=p, analysis="", proposed_fix=fix, confidence=0.8, reasoning="")
+        for p, fix in fixes.items()
+    ]
+
+
+def time_grouping(engine: ConsensusEngine, responses, rounds: int, reset: bool):
+    timings, groups = [], None
+    for _ in range(rounds):
+        if reset:
+            engine.fix_similarity = type(engine.fix_similarity)()
+        started = time.perf_counter()
+        groups = engine._group_similar_fixes(responses, WEIGHTS)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, [sorted(p.value for p in g["providers"]) for g in groups]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ConsensusEngine fix grouping")
+    parser.add_argument("--functions", type=int, default=40, help="Functions in the generated module (~225 bytes each)")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds per scenario")
+    args = parser.parse_args()
+
+    fixes = build_fixes(args.functions)
+    responses = responses_for(fixes)
+    print("\n📊 Proposed fixes: " + ", ".join(f"{p.value} {len(f) / 1024:.1f} KB" for p, f in fixes.items()))
+
+    legacy = ConsensusEngine()
+    legacy._calculate_similarity = lambda a, b, threshold=None: legacy_similarity(a, b)
+    engine = ConsensusEngine()
+
+    print(f"\n{'scorer':<10} {'mean ms':>10} {'min ms':>10}   groups")
+    for label, scorer, reset in [("legacy", legacy, False), ("cold", engine, True), ("warm", engine, False)]:
+        timings, groups = time_grouping(scorer, responses, args.rounds, reset)
+        print(f"{label:<10} {statistics.mean(timings):>10.2f} {min(timings):>10.2f}   {groups}")
+
+    print(f"\nPair scores (legacy char ratio / new token score):")
+    similarity = engine.fix_similarity
+    providers = list(fixes)
+    for i, first in enumerate(providers):
+        for second in providers[i + 1:]:
+            old = legacy_similarity(fixes[first], fixes[second])
+            new = similarity.similarity(fixes[first], fixes[second])
+            print(f"  {first.value:>8} ~ {second.value:<8} {old:.3f} / {new:.3f}")
+    print(f"\nDecisions: {similarity.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call overhead of the LLM provider HTTP layer.
+
+Starts a local OpenAI-compatible stub server (keep-alive HTTP/1.1, fixed
+response, optional artificial latency) and times:
+    one-shot requests.post   the previous provider implementation (new connection per call)
+    chat_completion          sync facade over the shared keep-alive session
+    achat_completion         async calls over the shared aiohttp session, sequential
+    achat_completion xN      N concurrent async calls
+    astream_chat_completion  time to first chunk and to last chunk
+
+Response caching is bypassed (cache=False) so every call reaches the stub.
+The stub is plain HTTP on localhost, so the numbers show the connection and
+client overhead only; against real HTTPS endpoints every avoided connection
+also saves a TLS handshake (typically tens of milliseconds).
+
+Usage:
+    python scripts/benchmark_llm_providers.py --calls 200
+    python scripts/benchmark_llm_providers.py --latency-ms 50 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.core.llm_providers import LLMMessage, OpenAIProvider, close_aio_session
+
+MESSAGES = [LLMMessage(role="user", content="Write a haiku about connection pools")]
+COMPLETION = {
+    "model": "stub-model",
+    "usage": {"prompt_tokens": 8, "completion_tokens": 12, "total_tokens": 20},
+    "choices": [{"message": {"role": "assistant", "content": "Sockets stay open"}, "finish_reason": "stop"}],
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Keep-alive responses are written in two parts
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        if payload.get("stream"):
+            words = ["Sockets ", "stay ", "open"]
+            body = "".join(
+                f"data: {json.dumps({'choices': [{'delta': {'content': w}, 'finish_reason': None}]})}\n\n" for w in words
+            ) + "data: [DONE]\n\n"
+        else:
+            body = json.dumps(COMPLETION)
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if payload.get("stream") else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_stub(latency: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def report(label: str, latencies_ms, wall_s: float = None):
+    calls = len(latencies_ms)
+    wall = wall_s if wall_s is not None else sum(latencies_ms) / 1000
+    print(
+        f"{label:<28} {statistics.mean(latencies_ms):>9.2f} {statistics.median(latencies_ms):>9.2f} "
+        f"{sorted(latencies_ms)[int(calls * 0.95) - 1]:>9.2f} {calls / wall:>10.0f}"
+    )
+
+
+def bench_one_shot(base_url: str, calls: int):
+    """Previous behaviour: requests.post per call, no session reuse."""
+    latencies = []
+    payload = {"model": "stub-model", "messages": [{"role": m.role, "content": m.content} for m in MESSAGES]}
+    for _ in range(calls):
+        started = time.perf_counter()
+        response = requests.post(f"{base_url}/chat/completions", headers={"Authorization": "Bearer x"}, json=payload, timeout=60)
+        response.raise_for_status()
+        response.json()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def bench_sync(provider: OpenAIProvider, calls: int):
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        provider.chat_completion(MESSAGES, "stub-model", cache=False)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def bench_async(provider: OpenAIProvider, calls: int, concurrency: int):
+    async def timed_call():
+        started = time.perf_counter()
+        await provider.achat_completion(MESSAGES, "stub-model", cache=False)
+        return (time.perf_counter() - started) * 1000
+
+    sequential = [await timed_call() for _ in range(calls)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            return await timed_call()
+
+    started = time.perf_counter()
+    concurrent = await asyncio.gather(*(limited() for _ in range(calls)))
+    concurrent_wall = time.perf_counter() - started
+
+    first_chunk, last_chunk = [], []
+    for _ in range(calls):
+        started = time.perf_counter()
+        first = None
+        async for _chunk in provider.astream_chat_completion(MESSAGES, "stub-model"):
+            if first is None:
+                first = (time.perf_counter() - started) * 1000
+        first_chunk.append(first)
+        last_chunk.append((time.perf_counter() - started) * 1000)
+
+    await close_aio_session()
+    return sequential, list(concurrent), concurrent_wall, first_chunk, last_chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM provider per-call overhead against a local stub")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial server latency per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent async calls")
+    args = parser.parse_args()
+
+    server = start_stub(args.latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    provider = OpenAIProvider("stub-key", base_url=base_url)
+
+    # Warm up imports and the connection pools
+    bench_one_shot(base_url, 3)
+    bench_sync(provider, 3)
+
+    print(f"\n📊 {args.calls} calls per scenario, server latency {args.latency_ms:.0f} ms\n")
+    print(f"{'client':<28} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'calls/s':>10}")
+    report("one-shot requests.post", bench_one_shot(base_url, args.calls))
+    report("chat_completion (pooled)", bench_sync(provider, args.calls))
+
+    sequential, concurrent, wall, first_chunk, last_chunk = asyncio.run(
+        bench_async(provider, args.calls, args.concurrency)
+    )
+    report("achat_completion", sequential)
+    report(f"achat_completion x{args.concurrency}", concurrent, wall)
+    report("astream first chunk", first_chunk)
+    report("astream last chunk", last_chunk)
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark Ollama embedding throughput against a local stub server.
+
+The stub emulates /api/tags, /api/embed and /api/embeddings with a fixed
+per-request latency plus a per-text cost, so the numbers show what batching
+and concurrency save in round-trips, independent of model speed.
+
+Usage:
+    python scripts/benchmark_ollama_embed.py --texts 2000 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.rag.embedding_service import EmbeddingService
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Ollama
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"models": []})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        texts = payload["input"] if self.path == "/api/embed" else [payload["prompt"]]
+        time.sleep(self.server.latency + self.server.per_text * len(texts))
+        vectors = [[float(len(text) % 7)] * self.server.dim for text in texts]
+        if self.path == "/api/embed":
+            self._reply({"embeddings": vectors})
+        else:
+            self._reply({"embedding": vectors[0]})
+
+
+def start_stub(latency: float, per_text: float, dim: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.per_text = per_text
+    server.dim = dim
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_benchmark(args) -> None:
+    server = start_stub(args.latency_ms / 1000, args.per_text_ms / 1000, args.dim)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    texts = [f"def function_{i}(value):\n    return value * {i}\n" for i in range(args.texts)]
+
+    modes = [
+        ("sequential (1 text/request)", dict(batch_size=1, max_concurrency=1), False),
+        (f"batched ({args.batch_size}/request)", dict(batch_size=args.batch_size, max_concurrency=1), False),
+        (f"batched + {args.concurrency} in flight", dict(batch_size=args.batch_size, max_concurrency=args.concurrency), False),
+        (f"async batched + {args.concurrency} in flight", dict(batch_size=args.batch_size, max_concurrency=args.concurrency), True),
+    ]
+
+    print(f"\n📊 Ollama embedding benchmark: {args.texts} texts, "
+          f"{args.latency_ms}ms/request + {args.per_text_ms}ms/text\n")
+    print(f"{'Mode':<40} {'Seconds':>9} {'Texts/sec':>11}")
+    print("-" * 62)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, options, use_async in modes:
+            service = EmbeddingService(
+                backend="ollama", ollama_url=url, cache_dir=Path(cache_dir), use_cache=False, **options
+            )
+            start = time.perf_counter()
+            if use_async:
+                async def run():
+                    try:
+                        return await service.aembed(texts)
+                    finally:
+                        await service.aclose()
+                embeddings = asyncio.run(run())
+            else:
+                embeddings = service.embed(texts)
+            elapsed = time.perf_counter() - start
+            service.close()
+
+            assert embeddings.shape == (args.texts, args.dim)
+            print(f"{label:<40} {elapsed:>9.2f} {args.texts / elapsed:>11.0f}")
+
+    server.shutdown()
+    server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched Ollama embeddings against a stub server")
+    parser.add_argument('--texts', type=int, default=2000, help='Number of texts to embed')
+    parser.add_argument('--batch-size', type=int, default=64, help='Texts per /api/embed request')
+    parser.add_argument('--concurrency', type=int, default=4, help='Batches in flight')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Stub latency per request')
+    parser.add_argument('--per-text-ms', type=float, default=0.2, help='Stub cost per text')
+    parser.add_argument('--dim', type=int, default=768, help='Embedding dimension')
+    run_benchmark(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark quantized vector storage (float16 / int8) against float32.
+
+Embeds the project's own Python code (the same chunks CodeIndexer stores),
+loads the vectors into embedded vector stores of each precision and reports
+per configuration:
+    scan MB    bytes scanned per brute-force query (vectors.bin + scales.bin)
+    disk MB    all vector files, including the full-precision rerank copy
+    latency    mean / p95 query time
+    recall@k   overlap with the exact float32 top-k
+
+Queries are the names and docstrings of randomly sampled chunks, i.e. short
+natural-language queries against code. --synthetic skips the embedding model
+and uses clustered random vectors instead (no model download needed).
+
+Usage:
+    python scripts/benchmark_vector_quantization.py --backend sentence-transformers
+    python scripts/benchmark_vector_quantization.py --synthetic 50000 --dim 768
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.embedding_service import EmbeddingService
+from engine.rag.indexers.code_indexer import parse_python_file
+
+CONFIGS = [
+    ("float32", 1),
+    ("float16", 1),
+    ("float16", 4),
+    ("int8", 1),
+    ("int8", 4),
+]
+INSERT_BATCH = 4096
+
+
+def project_vectors(root: Path, backend: str, model: str, n_queries: int, rng):
+    """Embed the project's code chunks and sampled name/docstring queries."""
+    chunks = []
+    for path in sorted(root.rglob("*.py")):
+        if any(part in {".git", "venv", ".venv", "node_modules", "__pycache__"} for part in path.parts):
+            continue
+        chunks.extend(parse_python_file(path, root))
+    if not chunks:
+        raise SystemExit(f"No Python chunks found under {root}")
+
+    service = EmbeddingService(backend=backend, model_name=model)
+    print(f"🧮 Embedding {len(chunks)} chunks with {backend} ({service.model_name})...")
+    vectors = service.embed([chunk.content for chunk in chunks])
+
+    sample = rng.choice(len(chunks), size=min(n_queries, len(chunks)), replace=False)
+    queries = [
+        f"{chunks[i].name} {(chunks[i].docstring or '').splitlines()[0] if chunks[i].docstring else ''}".strip()
+        for i in sample
+    ]
+    return np.asarray(vectors, dtype=np.float32), np.asarray(service.embed(queries), dtype=np.float32)
+
+
+def synthetic_vectors(n: int, dim: int, n_queries: int, rng):
+    """Clustered random vectors (embeddings are far from uniform on the sphere)."""
+    centers = rng.normal(size=(max(1, n // 200), dim)).astype(np.float32)
+    vectors = centers[rng.integers(len(centers), size=n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    queries = vectors[rng.choice(n, size=n_queries, replace=False)] + 0.4 * rng.normal(size=(n_queries, dim))
+    return vectors, queries.astype(np.float32)
+
+
+def build_store(persist_dir: Path, vectors: np.ndarray, dtype: str, rerank_factor: int) -> EmbeddedVectorStore:
+    store = EmbeddedVectorStore(
+        embedding_dim=vectors.shape[1], persist_dir=str(persist_dir), dtype=dtype, rerank_factor=rerank_factor
+    )
+    for start in range(0, len(vectors), INSERT_BATCH):
+        batch = vectors[start:start + INSERT_BATCH]
+        ids = [str(i) for i in range(start, start + len(batch))]
+        store.insert("code", ids, batch, [""] * len(batch), [{}] * len(batch))
+    return store
+
+
+def file_mb(*paths: Path) -> float:
+    return sum(path.stat().st_size for path in paths if path.exists()) / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized RAG vector storage")
+    parser.add_argument("--root", default=str(Path(__file__).parent.parent), help="Code to index (default: this repo)")
+    parser.add_argument("--backend", default="sentence-transformers", help="Embedding backend")
+    parser.add_argument("--model", help="Embedding model (backend default if omitted)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Use N synthetic vectors instead of the code index")
+    parser.add_argument("--dim", type=int, default=768, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=10, help="k for recall@k")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.synthetic:
+        vectors, queries = synthetic_vectors(args.synthetic, args.dim, args.queries, rng)
+        source = f"{len(vectors)} synthetic {args.dim}D vectors"
+    else:
+        vectors, queries = project_vectors(Path(args.root), args.backend, args.model, args.queries, rng)
+        source = f"{len(vectors)} code chunks from {args.root} ({vectors.shape[1]}D)"
+
+    print(f"\n📊 {source}, {len(queries)} queries, recall@{args.top_k}\n")
+    print(f"{'storage':<20} {'scan MB':>8} {'disk MB':>8} {'mean ms':>8} {'p95 ms':>8} {'recall':>8}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype, rerank_factor in CONFIGS:
+            persist_dir = Path(tmp) / f"{dtype}-{rerank_factor}"
+            store = build_store(persist_dir, vectors, dtype, rerank_factor)
+            store.search("code", queries[0], top_k=args.top_k)  # Warm up (map files)
+
+            latencies, results = [], []
+            for query in queries:
+                started = time.perf_counter()
+                hits = store.search("code", query, top_k=args.top_k)
+                latencies.append((time.perf_counter() - started) * 1000)
+                results.append({hit.id for hit in hits})
+            store.close()
+
+            if baseline is None:
+                baseline = results
+            recall = np.mean([len(found & exact) / max(len(exact), 1) for found, exact in zip(results, baseline)])
+
+            collection_dir = persist_dir / "code"
+            scan = file_mb(collection_dir / "vectors.bin", collection_dir / "scales.bin")
+            disk = file_mb(collection_dir / "vectors.bin", collection_dir / "scales.bin", collection_dir / "vectors.f32.bin")
+            label = dtype if dtype == "float32" else f"{dtype} " + (f"rerank x{rerank_factor}" if rerank_factor > 1 else "no rerank")
+            print(
+                f"{label:<20} {scan:>8.1f} {disk:>8.1f} {np.mean(latencies):>8.2f} "
+                f"{np.percentile(latencies, 95):>8.2f} {recall:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from engine.rag.embedding_service import EmbeddingService
-from engine.rag.vector_store import MilvusVectorStore
+from engine.rag.vector_store import create_vector_store
 from engine.rag.indexers import CodeIndexer, DocsIndexer, IssueIndexer
 from engine.rag.retriever import RAGRetriever
 
@@ -30,26 +30,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def print_pipeline_stats(stats):
+    """Print per-stage throughput of an indexing run."""
+    if stats is None:
+        return
+    print("\n⏱️  Pipeline throughput:")
+    for line in stats.summary().splitlines():
+        print(f"  {line}")
+
+
 def cmd_index_code(args):
     """Index Python code."""
     logger.info(f"📦 Indexing code from: {args.workspace}")
     
-    indexer = CodeIndexer(root_dir=Path(args.workspace))
-    count = indexer.index_workspace()
+    indexer = CodeIndexer(root_dir=Path(args.workspace), parse_workers=args.workers)
+    count = indexer.index_workspace(full=args.full)
+    stats = indexer.last_stats
     indexer.close()
     
-    print(f"\n✅ Indexed {count} code chunks")
+    print(f"\n✅ Indexed {count} code chunks "
+          f"({stats['files_changed']} changed, {stats['files_removed']} removed, "
+          f"{stats['files_total']} files tracked)")
+    print_pipeline_stats(indexer.pipeline_stats)
 
 
 def cmd_index_docs(args):
     """Index markdown documentation."""
     logger.info(f"📚 Indexing documentation from: {args.workspace}")
     
-    indexer = DocsIndexer()
+    indexer = DocsIndexer(parse_workers=args.workers)
     count = indexer.index_workspace(args.workspace)
     indexer.close()
     
     print(f"\n✅ Indexed {count} documentation chunks")
+    print_pipeline_stats(indexer.pipeline_stats)
 
 
 def cmd_index_issues(args):
@@ -61,7 +75,8 @@ def cmd_index_issues(args):
         owner=args.owner,
         repo=args.repo,
         state=args.state,
-        limit=args.limit
+        limit=args.limit,
+        full=args.full
     )
     indexer.close()
     
@@ -74,17 +89,19 @@ def cmd_index_all(args):
     
     # Index code
     print("\n📦 Indexing code...")
-    code_indexer = CodeIndexer(root_dir=Path(args.workspace))
+    code_indexer = CodeIndexer(root_dir=Path(args.workspace), parse_workers=args.workers)
     code_count = code_indexer.index_workspace()
     code_indexer.close()
     print(f"✅ Indexed {code_count} code chunks")
+    print_pipeline_stats(code_indexer.pipeline_stats)
     
     # Index docs
     print("\n📚 Indexing documentation...")
-    docs_indexer = DocsIndexer()
+    docs_indexer = DocsIndexer(parse_workers=args.workers)
     docs_count = docs_indexer.index_workspace(args.workspace)
     docs_indexer.close()
     print(f"✅ Indexed {docs_count} documentation chunks")
+    print_pipeline_stats(docs_indexer.pipeline_stats)
     
     # Index issues (if repo specified)
     if args.owner and args.repo:
@@ -134,7 +151,7 @@ def cmd_stats(args):
     """Show RAG statistics."""
     logger.info("📊 Gathering statistics...")
     
-    vector_store = MilvusVectorStore()
+    vector_store = create_vector_store()
     
     print("\n📊 RAG Statistics\n")
     print(f"{'='*80}")
@@ -164,7 +181,7 @@ def cmd_clear(args):
             print("❌ Aborted")
             return
     
-    vector_store = MilvusVectorStore()
+    vector_store = create_vector_store()
     
     for collection in collections:
         try:
@@ -184,16 +201,25 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     
+    parser.add_argument(
+        '--backend',
+        choices=['milvus', 'embedded'],
+        help='Vector store backend (default: RAG_VECTOR_BACKEND env, then milvus)'
+    )
+    
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
     # Index code
     index_code_parser = subparsers.add_parser('index-code', help='Index Python code')
     index_code_parser.add_argument('workspace', help='Workspace path')
+    index_code_parser.add_argument('--full', action='store_true', help='Reindex all files, not only changed ones')
+    index_code_parser.add_argument('--workers', type=int, help='Parse processes (default: RAG_PARSE_WORKERS env, then CPU count)')
     index_code_parser.set_defaults(func=cmd_index_code)
     
     # Index docs
     index_docs_parser = subparsers.add_parser('index-docs', help='Index documentation')
     index_docs_parser.add_argument('workspace', help='Workspace path')
+    index_docs_parser.add_argument('--workers', type=int, help='Parse processes (default: RAG_PARSE_WORKERS env, then CPU count)')
     index_docs_parser.set_defaults(func=cmd_index_docs)
     
     # Index issues
@@ -202,6 +228,7 @@ def main():
     index_issues_parser.add_argument('repo', help='Repository name')
     index_issues_parser.add_argument('--state', default='closed', choices=['open', 'closed', 'all'])
     index_issues_parser.add_argument('--limit', type=int, help='Maximum issues to fetch')
+    index_issues_parser.add_argument('--full', action='store_true', help='Ignore the checkpoint and refetch every issue')
     index_issues_parser.set_defaults(func=cmd_index_issues)
     
     # Index all
@@ -211,6 +238,7 @@ def main():
     index_all_parser.add_argument('--repo', help='Repository name (for issues)')
     index_all_parser.add_argument('--state', default='closed', choices=['open', 'closed', 'all'])
     index_all_parser.add_argument('--limit', type=int, default=100, help='Max issues to fetch')
+    index_all_parser.add_argument('--workers', type=int, help='Parse processes (default: RAG_PARSE_WORKERS env, then CPU count)')
     index_all_parser.set_defaults(func=cmd_index_all)
     
     # Search
@@ -236,6 +264,9 @@ def main():
         parser.print_help()
         return 1
     
+    if args.backend:
+        os.environ['RAG_VECTOR_BACKEND'] = args.backend
+    
     try:
         args.func(args)
         return 0
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Replay recorded GitHub webhook deliveries.
+
+Re-sends payloads recorded by the webhook receiver (GITHUB_WEBHOOK_RECORD_DIR)
+or saved from the GitHub "Recent Deliveries" page, signed with the webhook
+secret, so event-driven dispatch can be tested offline against a local
+monitoring server.
+
+Recorded files contain {"event": ..., "delivery_id": ..., "payload": {...}}.
+Raw payload files (just the JSON body) need --event.
+
+Usage:
+    # Replay every recording in a directory (sorted by name)
+    python3 scripts/replay_webhooks.py data/webhook_recordings/
+
+    # Replay a raw payload as an issues event
+    python3 scripts/replay_webhooks.py payload.json --event issues
+
+    # Target another server, with a delay between deliveries
+    python3 scripts/replay_webhooks.py recordings/ --url http://localhost:7997/api/webhooks/github --delay 1
+
+Environment Variables:
+    GITHUB_WEBHOOK_SECRET - Secret used to sign replayed deliveries
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from engine.operations.webhook_handler import SIGNATURE_HEADER, compute_signature
+
+
+DEFAULT_URL = "http://localhost:7997/api/webhooks/github"
+
+
+def load_deliveries(paths, event_override=None):
+    """Load deliveries from files and directories.
+
+    Args:
+        paths: Files or directories containing JSON deliveries
+        event_override: Event name for raw payload files
+
+    Returns:
+        List of (source, event, delivery_id, payload) tuples
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.json")))
+        else:
+            files.append(path)
+
+    deliveries = []
+    for file in files:
+        data = json.loads(file.read_text(encoding='utf-8'))
+        if 'payload' in data and 'event' in data:
+            event = event_override or data['event']
+            delivery_id = data.get('delivery_id')
+            payload = data['payload']
+        else:
+            if not event_override:
+                print(f"⚠️  Skipping {file}: raw payload needs --event")
+                continue
+            event, delivery_id, payload = event_override, None, data
+        deliveries.append((file, event, delivery_id, payload))
+    return deliveries
+
+
+def replay(url, secret, event, payload, delivery_id=None, new_delivery_id=False):
+    """Send one signed delivery.
+
+    Args:
+        url: Webhook receiver URL
+        secret: Webhook secret
+        event: X-GitHub-Event value
+        payload: JSON payload
+        delivery_id: Original delivery ID (receiver drops duplicates)
+        new_delivery_id: Generate a fresh delivery ID instead
+
+    Returns:
+        requests.Response
+    """
+    body = json.dumps(payload).encode()
+    if new_delivery_id or not delivery_id:
+        delivery_id = str(uuid.uuid4())
+    headers = {
+        'Content-Type': 'application/json',
+        'X-GitHub-Event': event,
+        'X-GitHub-Delivery': delivery_id,
+        SIGNATURE_HEADER: compute_signature(secret, body)
+    }
+    return requests.post(url, data=body, headers=headers, timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded GitHub webhook deliveries")
+    parser.add_argument("paths", nargs="+", help="Recorded delivery files or directories")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Webhook receiver URL (default: {DEFAULT_URL})")
+    parser.add_argument("--event", help="Event name for raw payloads (overrides recorded event)")
+    parser.add_argument("--secret", help="Webhook secret (default: GITHUB_WEBHOOK_SECRET)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between deliveries")
+    parser.add_argument("--new-ids", action="store_true",
+                        help="Send fresh delivery IDs so the receiver does not drop repeats")
+    args = parser.parse_args()
+
+    secret = args.secret or os.getenv("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        print("❌ No webhook secret (use --secret or GITHUB_WEBHOOK_SECRET)")
+        return 1
+
+    deliveries = load_deliveries(args.paths, args.event)
+    if not deliveries:
+        print("❌ No deliveries found")
+        return 1
+
+    failures = 0
+    for source, event, delivery_id, payload in deliveries:
+        try:
+            response = replay(args.url, secret, event, payload, delivery_id, args.new_ids)
+            status = response.json().get('status', '') if response.ok else response.text
+            print(f"{'✅' if response.ok else '❌'} {source.name}: {event} -> {response.status_code} {status}")
+            failures += 0 if response.ok else 1
+        except requests.exceptions.RequestException as e:
+            print(f"❌ {source.name}: {e}")
+            failures += 1
+        if args.delay:
+            time.sleep(args.delay)
+
+    print(f"📊 Replayed {len(deliveries)} deliveries, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
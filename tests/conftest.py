@@ -0,0 +1,195 @@
+"""Shared pytest configuration."""
+import json
+import threading
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from engine.core.shared_token_bucket import reset_shared_token_bucket
+from engine.operations.github_response_cache import reset_response_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_llm_response_cache(monkeypatch):
+    """Keep the on-disk LLM response cache out of tests (stubbed LLM answers must not leak between tests)."""
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "0")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_github_state(monkeypatch, tmp_path):
+    """Point the shared GitHub token bucket and ETag cache at per-test files instead of data/."""
+    monkeypatch.setenv("GITHUB_TOKEN_BUCKET_PATH", str(tmp_path / "github_token_buckets.db"))
+    monkeypatch.setenv("GITHUB_ETAG_CACHE_PATH", str(tmp_path / "github_etag_cache.db"))
+    reset_shared_token_bucket()
+    reset_response_cache()
+    yield
+    reset_shared_token_bucket()
+    reset_response_cache()
+
+
+@dataclass
+class StubRequest:
+    """One request received by a StubServer."""
+    method: str
+    path: str
+    query: Dict[str, str]
+    payload: Any
+    headers: Dict[str, str]
+    status: Optional[int] = None
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local keep-alive HTTP/1.1 server answering with a test-supplied route function.
+
+    ``route(server, request)`` returns ``(status, body)`` or ``(status, body, headers)``;
+    dict/list bodies are sent as JSON. Every request is recorded in ``requests``, and
+    ``connections``/``max_in_flight`` track connection reuse and concurrency. Extra keyword
+    arguments become attributes the route can read and tests can change.
+    """
+    daemon_threads = True
+
+    def __init__(self, route: Callable, **attrs):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.route = route
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        for name, value in attrs.items():
+            setattr(self, name, value)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def payloads(self) -> List[Any]:
+        return [request.payload for request in self.requests]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Keep-alive responses are written in two parts
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _handle(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        request = StubRequest(
+            method=self.command,
+            path=parsed.path,
+            query={key: values[0] for key, values in parse_qs(parsed.query).items()},
+            payload=json.loads(raw) if raw else None,
+            headers=dict(self.headers),
+        )
+        with server.lock:
+            server.requests.append(request)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            status, body, *extra = server.route(server, request)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        request.status = status
+
+        if isinstance(body, str):
+            data = body.encode()
+        elif isinstance(body, bytes):
+            data = body
+        else:
+            data = json.dumps(body).encode()
+        headers = {"Content-Type": "application/json", **(extra[0] if extra else {})}
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = _handle
+
+
+@pytest.fixture
+def stub_server():
+    """Factory starting StubServers in background threads: ``stub_server(route, **attrs)``."""
+    servers = []
+
+    def start(route: Callable, **attrs) -> StubServer:
+        server = StubServer(route, **attrs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeEmbeddings:
+    """Fake embedding service recording every call and the thread it ran on.
+
+    Args:
+        dim: Embedding dimension.
+        constant: Give every text the same vector (dense search can't discriminate);
+            otherwise each text gets a deterministic vector seeded by its content.
+        fail_after: Raise RuntimeError once this many calls have succeeded.
+    """
+
+    def __init__(self, dim: int = 8, constant: bool = False, fail_after: Optional[int] = None):
+        self.embedding_dim = dim
+        self.constant = constant
+        self.fail_after = fail_after
+        self.calls: List[List[str]] = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    @property
+    def batches(self) -> List[int]:
+        return [len(texts) for texts in self.calls]
+
+    @property
+    def embedded(self) -> List[str]:
+        return [text for texts in self.calls for text in texts]
+
+    def embed(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        with self.lock:
+            if self.fail_after is not None and len(self.calls) >= self.fail_after:
+                raise RuntimeError("embedding backend down")
+            self.calls.append(list(texts))
+            self.threads.add(threading.current_thread().name)
+        if self.constant:
+            return np.ones((len(texts), self.embedding_dim), dtype=np.float32)
+        return np.array([
+            np.random.default_rng(zlib.crc32(text.encode())).normal(size=self.embedding_dim)
+            for text in texts
+        ], dtype=np.float32).reshape(len(texts), self.embedding_dim)
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.threads.clear()
+
+
+@pytest.fixture
+def fake_embeddings():
+    """Factory for FakeEmbeddings: ``fake_embeddings(constant=True)``, ``fake_embeddings(fail_after=2)``."""
+    return FakeEmbeddings
@@ -0,0 +1,184 @@
+"""Tests for the asyncio-native GitHub API helper."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from engine.core.rate_limiter import reset_rate_limiter
+from engine.core.shared_token_bucket import SharedTokenBucket
+from engine.operations.async_github_api_helper import AsyncGitHubAPIHelper
+from engine.operations.github_response_cache import ConditionalRequestCache
+
+
+def _raw_issue(number, pull_request=False):
+    issue = {
+        'number': number,
+        'title': f'Issue {number}',
+        'labels': [{'name': 'agent-ready', 'color': 'fff'}],
+        'assignees': [],
+        'html_url': f'https://github.com/owner/repo/issues/{number}',
+        'created_at': '2025-01-01T00:00:00Z',
+        'updated_at': '2025-01-02T00:00:00Z',
+        'state': 'open',
+        'body': 'text'
+    }
+    if pull_request:
+        issue['pull_request'] = {}
+    return issue
+
+
+@pytest.fixture
+def helper(tmp_path):
+    reset_rate_limiter()
+    return AsyncGitHubAPIHelper(
+        token="test-token",
+        max_connections=4,
+        response_cache=ConditionalRequestCache(db_path=str(tmp_path / "etag.db"))
+    )
+
+
+def _install_transport(helper, handler):
+    """Attach a mock transport to the helper's pooled client."""
+    helper._client = httpx.AsyncClient(
+        base_url=helper.BASE_URL,
+        headers=helper.headers,
+        transport=httpx.MockTransport(handler)
+    )
+    helper._client_loop = asyncio.get_running_loop()
+
+
+@pytest.mark.asyncio
+async def test_list_issues_formats_and_skips_prs(helper):
+    """Test issues are returned in gh CLI format without pull requests."""
+    seen = {}
+
+    def handler(request):
+        seen['params'] = dict(request.url.params)
+        seen['auth'] = request.headers['Authorization']
+        return httpx.Response(200, json=[_raw_issue(1), _raw_issue(2, pull_request=True)])
+
+    _install_transport(helper, handler)
+    issues = await helper.list_issues("owner", "repo", labels=["agent-ready"], bypass_rate_limit=True)
+    await helper.aclose()
+
+    assert [issue['number'] for issue in issues] == [1]
+    assert issues[0]['labels'] == [{'name': 'agent-ready'}]
+    assert issues[0]['createdAt'] == '2025-01-01T00:00:00Z'
+    assert seen['params']['labels'] == 'agent-ready'
+    assert seen['auth'] == 'Bearer test-token'
+
+
+@pytest.mark.asyncio
+async def test_get_issue_comments_formats(helper):
+    """Test comments are converted to gh CLI format."""
+    def handler(request):
+        return httpx.Response(200, json=[{
+            'user': {'login': 'bot'},
+            'body': 'hello',
+            'created_at': '2025-01-01T00:00:00Z',
+            'updated_at': '2025-01-01T00:00:00Z'
+        }])
+
+    _install_transport(helper, handler)
+    comments = await helper.get_issue_comments("owner", "repo", 5)
+    await helper.aclose()
+
+    assert comments == [{
+        'author': {'login': 'bot'},
+        'body': 'hello',
+        'createdAt': '2025-01-01T00:00:00Z',
+        'updatedAt': '2025-01-01T00:00:00Z'
+    }]
+
+
+@pytest.mark.asyncio
+async def test_http_error_is_raised(helper):
+    """Test HTTP errors propagate as httpx errors."""
+    _install_transport(helper, lambda request: httpx.Response(500, json={}))
+
+    with pytest.raises(httpx.HTTPError):
+        await helper.list_pull_requests("owner", "repo", bypass_rate_limit=True)
+    await helper.aclose()
+
+
+@pytest.mark.asyncio
+async def test_not_modified_serves_cached_body(helper):
+    """Test a 304 revalidation returns the cached issues."""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[_raw_issue(3)], headers={'ETag': '"v1"'})
+
+    _install_transport(helper, handler)
+    first = await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    second = await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    await helper.aclose()
+
+    assert first == second
+    assert requests_seen == [None, '"v1"']
+    assert helper.rate_limiter.get_stats()['conditional_cache'] == {
+        'hits': 1, 'misses': 1, 'not_modified': 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_within_loop(helper):
+    """Test a single pooled client is shared by all calls on one loop."""
+    client = helper._get_client()
+    assert helper._get_client() is client
+    await helper.aclose()
+    assert helper._client is None
+
+
+@pytest.mark.asyncio
+async def test_budget_wait_is_capped(helper, tmp_path):
+    """Test an exhausted budget raises after max_token_wait instead of waiting for the refill."""
+    helper.token_bucket = SharedTokenBucket(db_path=str(tmp_path / "buckets.db"))
+    helper.bucket_budget = 1
+    helper.max_token_wait = 0.05
+    _install_transport(helper, lambda request: httpx.Response(200, json=[]))
+
+    await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="budget"):
+        await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    await helper.aclose()
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_stores_are_used_off_the_loop(helper, monkeypatch):
+    """Test ETag cache and token bucket calls run in worker threads, not on the event loop."""
+    loop_thread = threading.get_ident()
+    threads = {}
+
+    def recording(name, method):
+        def wrapper(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.get_ident())
+            return method(*args, **kwargs)
+        return wrapper
+
+    for obj, name in [(helper.response_cache, 'get'), (helper.response_cache, 'store'),
+                      (helper.token_bucket, 'try_acquire'), (helper.token_bucket, 'refund'),
+                      (helper.token_bucket, 'observe')]:
+        monkeypatch.setattr(obj, name, recording(name, getattr(obj, name)))
+
+    def handler(request):
+        headers = {'ETag': '"v1"', 'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': str(int(time.time()) + 600)}
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=[_raw_issue(3)], headers=headers)
+
+    _install_transport(helper, handler)
+    await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    await helper.list_issues("owner", "repo", bypass_rate_limit=True)
+    await helper.aclose()
+
+    assert set(threads) == {'get', 'store', 'try_acquire', 'refund', 'observe'}
+    assert all(loop_thread not in idents for idents in threads.values())
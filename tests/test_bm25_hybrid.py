@@ -0,0 +1,195 @@
+"""Tests for the BM25 lexical index and hybrid (vector + BM25) retrieval."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from engine.rag.bm25_index import LOOKUP_BATCH, BM25Index, tokenize
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.indexers.code_indexer import CodeIndexer
+from engine.rag.retriever import RAGRetriever, reciprocal_rank_fusion
+from engine.rag.vector_store import SearchResult
+
+
+DIM = 8
+
+
+def _result(doc_id, score=0.0, collection="code"):
+    return SearchResult(id=doc_id, content=doc_id, metadata={}, score=score, collection=collection)
+
+
+class FixedStore:
+    """Vector store stub returning fixed (id, cosine) hits per collection."""
+
+    def __init__(self, hits):
+        self.hits = hits
+
+    def search(self, collection_name, query_embedding, top_k=5, filter_expr=None):
+        return [_result(doc_id, score, collection_name) for doc_id, score in self.hits.get(collection_name, [])][:top_k]
+
+    def collection_version(self, collection_name):
+        return 0
+
+    def close(self):
+        pass
+
+
+def test_tokenize_splits_identifiers():
+    """Test identifiers are indexed whole and by their snake/camel parts, stopwords dropped."""
+    tokens = tokenize("def get_repo_cache(self): return HTTPClientError in the path")
+    assert "get_repo_cache" in tokens and {"repo", "cache"} <= set(tokens)
+    assert {"httpclienterror", "http", "client", "error"} <= set(tokens)
+    assert "the" not in tokens and "in" not in tokens
+
+
+def test_bm25_ranking_and_persistence(tmp_path):
+    """Test rarer, more frequent terms rank higher and the index survives reopening."""
+    index = BM25Index("docs", tmp_path)
+    index.add(
+        ["a", "b", "c"],
+        ["webhook signature verification with hmac", "configure the webhook url", "retry failed requests"],
+        [{"file_path": "a.md"}, {"file_path": "b.md"}, {"file_path": "c.md"}]
+    )
+    results = index.search("webhook hmac", top_k=5)
+    assert [r.id for r in results] == ["a", "b"]
+    assert results[0].metadata == {"file_path": "a.md"} and results[0].collection == "docs"
+    index.close()
+
+    assert BM25Index.exists("docs", tmp_path) and not BM25Index.exists("code", tmp_path)
+    reopened = BM25Index("docs", tmp_path)
+    assert reopened.count() == 3
+    assert [r.id for r in reopened.search("retry", top_k=5)] == ["c"]
+    reopened.close()
+
+
+def test_bm25_upsert_and_delete(tmp_path):
+    """Test re-adding an ID replaces its postings and deletes drop unused terms."""
+    index = BM25Index("code", tmp_path)
+    index.add(["x"], ["alpha beta"])
+    version = index.version()
+    index.add(["x"], ["gamma"])
+    assert index.version() > version
+    assert index.count() == 1
+    assert index.search("alpha") == []
+    assert [r.id for r in index.search("gamma")] == ["x"]
+
+    assert index.delete(["x", "missing"]) == 1
+    assert index.count() == 0 and index.search("gamma") == []
+    assert index._db.execute("SELECT COUNT(*) FROM terms").fetchone()[0] == 0
+    index.close()
+
+
+def test_bm25_search_batches_term_lookups(tmp_path):
+    """Test queries with more terms than SQLite's host-parameter limit still search."""
+    index = BM25Index("docs", tmp_path)
+    index.add(["a", "b"], ["alpha beta", "gamma"])
+    index._db.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, LOOKUP_BATCH)
+    query = " ".join(f"filler{i}" for i in range(3 * LOOKUP_BATCH)) + " gamma"
+    assert [r.id for r in index.search(query)] == ["b"]
+    index.close()
+
+
+def test_reciprocal_rank_fusion():
+    """Test results found by both rankings win and a double first place scores 1.0."""
+    dense = [_result("a", 0.9), _result("b", 0.8), _result("c", 0.7)]
+    lexical = [_result("c", 12.0), _result("a", 3.0)]
+    fused = reciprocal_rank_fusion([dense, lexical], k=60)
+    assert [r.id for r in fused] == ["a", "c", "b"]
+    assert fused[0].score < 1.0
+    assert reciprocal_rank_fusion([[_result("a")], [_result("a")]], top_k=1)[0].score == pytest.approx(1.0)
+
+
+def test_indexer_keeps_bm25_in_sync(tmp_path, fake_embeddings):
+    """Test the code indexer updates BM25 incrementally from the same manifest as the vectors."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "billing.py").write_text("def compute_invoice_total(items):\n    return sum(items)\n")
+    (root / "auth.py").write_text("def verify_webhook_signature(payload):\n    return payload\n")
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "vectors"))
+    indexer = CodeIndexer(
+        root_dir=root, embedding_service=fake_embeddings(constant=True), vector_store=store,
+        manifest_path=tmp_path / "manifest.json", parse_workers=1
+    )
+    indexer.index_workspace()
+    lexical = indexer.lexical_index
+    assert lexical.path == tmp_path / "vectors" / "bm25" / "code.db"
+    assert lexical.count() == store.count("code") == 2
+
+    (root / "billing.py").write_text("def compute_refund_total(items):\n    return -sum(items)\n")
+    (root / "auth.py").unlink()
+    indexer.index_workspace()
+    assert lexical.count() == store.count("code") == 1
+    assert lexical.search("invoice") == []
+    assert lexical.search("webhook") == []
+    assert [r.metadata["name"] for r in lexical.search("refund")] == ["compute_refund_total"]
+
+    # A missing BM25 index is rebuilt from scratch on the next run
+    lexical.clear()
+    assert indexer.index_workspace() == 1
+    assert lexical.count() == 1
+    indexer.close()
+
+
+def test_hybrid_retrieve_finds_exact_identifier(tmp_path, fake_embeddings):
+    """Test an identifier query ranks the matching chunk first even when vectors can't tell chunks apart."""
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path))
+    names = ["load_config", "parse_args", "rotate_github_token", "render_template"]
+    store.insert(
+        "code", names, np.ones((4, DIM), dtype=np.float32),
+        [f"def {name}():\n    pass" for name in names], [{"name": name} for name in names]
+    )
+    lexical = BM25Index("code", tmp_path / "bm25")
+    lexical.add(names, [f"def {name}():\n    pass" for name in names], [{"name": name} for name in names])
+
+    retriever = RAGRetriever(embedding_service=fake_embeddings(constant=True), vector_store=store, min_score=0.0)
+    results = retriever.retrieve("where is rotate_github_token defined?", sources=["code"], top_k=3)
+    assert results[0].metadata["name"] == "rotate_github_token"
+    assert len(results) == 3
+
+    # Writing to the BM25 index invalidates cached results
+    retriever.retrieve("where is rotate_github_token defined?", sources=["code"], top_k=3)
+    assert retriever.cache_stats['result_hits'] == 1
+    lexical.add(["refresh_github_token"], ["def refresh_github_token():\n    pass"], [{"name": "refresh_github_token"}])
+    retriever.retrieve("where is rotate_github_token defined?", sources=["code"], top_k=3)
+    assert retriever.cache_stats['result_hits'] == 1
+
+    dense_only = RAGRetriever(embedding_service=fake_embeddings(constant=True), vector_store=store, min_score=0.0, hybrid=False)
+    assert all(r.score == pytest.approx(1.0) for r in dense_only.retrieve("rotate_github_token", sources=["code"]))
+    lexical.close()
+    retriever.close()
+
+
+def test_min_score_applies_to_fused_scores(tmp_path, fake_embeddings):
+    """Test vector hits below min_score still count in fusion and survive when BM25 agrees."""
+    store = FixedStore({"code": [("rotate_token", 0.1), ("load_config", 0.05)]})
+    lexical = BM25Index("code", tmp_path)
+    lexical.add(["rotate_token"], ["def rotate_token(): rotate the github token"])
+
+    retriever = RAGRetriever(
+        embedding_service=fake_embeddings(constant=True), vector_store=store, bm25_dir=tmp_path, min_score=0.6
+    )
+    results = retriever.retrieve("rotate token", sources=["code"])
+    assert [r.content for r in results] == ["rotate_token"]
+    assert results[0].score == pytest.approx(1.0)
+    lexical.close()
+    retriever.close()
+
+
+def test_collections_share_one_score_scale(tmp_path, fake_embeddings):
+    """Test results of collections with and without a BM25 index are ranked on the same fused scale."""
+    store = FixedStore({
+        "code": [("rotate_token", 0.8), ("load_config", 0.7)],
+        "docs": [("token_guide", 0.9)],  # No BM25 index for docs
+    })
+    lexical = BM25Index("code", tmp_path)
+    lexical.add(["rotate_token"], ["def rotate_token(): rotate the github token"])
+
+    retriever = RAGRetriever(embedding_service=fake_embeddings(constant=True), vector_store=store, bm25_dir=tmp_path)
+    results = retriever.retrieve("rotate token", sources=["code", "docs"])
+    assert [r.content for r in results] == ["rotate_token", "token_guide", "load_config"]
+    assert all(0 < r.score <= 1 for r in results)
+    # Without BM25 agreement the cosine order across collections decides
+    assert results[1].score > results[2].score
+    lexical.close()
+    retriever.close()
@@ -0,0 +1,145 @@
+"""Tests for incremental, manifest-driven code reindexing."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import engine.rag.indexers.code_indexer as code_indexer
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.indexers.code_indexer import CodeIndexer
+
+
+DIM = 8
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+
+
+def _module(name, n_funcs=2):
+    funcs = "\n\n".join(
+        f"def {name}_func_{i}(value):\n    \"\"\"Doc {i}.\"\"\"\n    return value + {i}\n"
+        for i in range(n_funcs)
+    )
+    return f'"""Module {name}."""\n\n{funcs}'
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "venv" / "lib").mkdir(parents=True)
+    for name in ("alpha", "beta", "gamma"):
+        (root / "pkg" / f"{name}.py").write_text(_module(name))
+    (root / "pkg" / "env_tools.py").write_text(_module("env_tools"))
+    (root / "venv" / "lib" / "ignored.py").write_text(_module("ignored"))
+    return root
+
+
+def _indexer(tmp_path, root, embeddings, store):
+    return CodeIndexer(
+        root_dir=root,
+        embedding_service=embeddings,
+        vector_store=store,
+        manifest_path=tmp_path / "manifest.json"
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "vectors"))
+    yield store
+    store.close()
+
+
+def test_reindex_without_changes_embeds_nothing(tmp_path, workspace, store, fake_embeddings):
+    """Test the manifest persists and unchanged files are skipped (no git)."""
+    embeddings = fake_embeddings()
+    first = _indexer(tmp_path, workspace, embeddings, store).index_workspace()
+    assert first == 4 * 3  # 2 functions + module chunk per file; venv/ excluded
+    assert store.count("code") == 12
+
+    embeddings.reset()
+    indexer = _indexer(tmp_path, workspace, embeddings, store)
+    assert set(indexer.indexed_files) == {"pkg/alpha.py", "pkg/beta.py", "pkg/gamma.py", "pkg/env_tools.py"}
+    assert indexer.index_workspace() == 0
+    assert embeddings.embedded == []
+
+
+def test_changed_and_removed_files_replace_chunks(tmp_path, workspace, store, fake_embeddings):
+    """Test a changed file is re-embedded alone and removed files lose their chunks."""
+    embeddings = fake_embeddings()
+    _indexer(tmp_path, workspace, embeddings, store).index_workspace()
+
+    (workspace / "pkg" / "alpha.py").write_text(_module("alpha", n_funcs=3))
+    (workspace / "pkg" / "gamma.py").unlink()
+    embeddings.reset()
+
+    indexer = _indexer(tmp_path, workspace, embeddings, store)
+    assert indexer.index_workspace() == 4
+    assert all("alpha" in text for text in embeddings.embedded)
+    assert indexer.last_stats['files_removed'] == 1
+    assert store.count("code") == 4 + 3 + 3  # alpha (new), beta, env_tools; no duplicates
+    assert "pkg/gamma.py" not in indexer.indexed_files
+
+
+def test_failed_run_removes_its_stored_batches(tmp_path, workspace, store, fake_embeddings):
+    """Test batches stored before a pipeline failure are deleted, not left untracked."""
+    _indexer(tmp_path, workspace, fake_embeddings(), store).index_workspace()
+    for name in ("alpha", "beta"):
+        (workspace / "pkg" / f"{name}.py").write_text(_module(name, n_funcs=3))
+
+    indexer = _indexer(tmp_path, workspace, fake_embeddings(fail_after=1), store)
+    indexer.batch_size = 4
+    with pytest.raises(RuntimeError, match="embedding backend down"):
+        indexer.index_workspace()
+    assert store.count("code") == 3 + 3  # gamma, env_tools
+    assert indexer.lexical_index.count() == 3 + 3
+
+    indexer = _indexer(tmp_path, workspace, fake_embeddings(), store)
+    assert indexer.index_workspace() == 4 + 4
+    assert store.count("code") == 4 + 4 + 3 + 3
+    assert indexer.lexical_index.count() == 4 + 4 + 3 + 3
+
+
+def test_git_diff_drives_candidates(tmp_path, workspace, store, monkeypatch, fake_embeddings):
+    """Test reindexing in a git checkout only hashes files from the diff since the last commit."""
+    _git(workspace, 'init', '--quiet')
+    _git(workspace, 'add', '-A')
+    _git(workspace, 'commit', '--quiet', '-m', 'init')
+
+    embeddings = fake_embeddings()
+    _indexer(tmp_path, workspace, embeddings, store).index_workspace()
+
+    (workspace / "pkg" / "beta.py").write_text(_module("beta", n_funcs=1))
+    _git(workspace, 'commit', '--quiet', '-am', 'shrink beta')
+    (workspace / "pkg" / "new.py").write_text(_module("new", n_funcs=1))  # untracked
+
+    hashed = []
+    real_hash = code_indexer.file_hash
+    monkeypatch.setattr(code_indexer, 'file_hash', lambda p: hashed.append(Path(p).name) or real_hash(p))
+
+    embeddings.reset()
+    indexer = _indexer(tmp_path, workspace, embeddings, store)
+    assert indexer.index_workspace() == 4
+    assert sorted(hashed) == ["beta.py", "new.py"]
+    assert store.count("code") == 3 + 2 + 3 + 3 + 2
+
+
+def test_update_file_deletes_old_chunks(tmp_path, workspace, store, fake_embeddings):
+    """Test update_file replaces a file's chunks instead of accumulating duplicates."""
+    embeddings = fake_embeddings()
+    indexer = _indexer(tmp_path, workspace, embeddings, store)
+    indexer.index_workspace()
+
+    for _ in range(3):
+        assert indexer.update_file(workspace / "pkg" / "alpha.py") == 3
+    assert store.count("code") == 12
+
+    (workspace / "pkg" / "alpha.py").unlink()
+    assert indexer.update_file(Path("pkg/alpha.py")) == 0
+    assert store.count("code") == 9
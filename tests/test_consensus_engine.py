@@ -0,0 +1,110 @@
+"""Tests for ConsensusEngine fix grouping and the FixSimilarity scorer."""
+
+import asyncio
+import difflib
+
+from engine.operations.consensus_engine import ConsensusEngine
+from engine.operations.fix_similarity import FixSimilarity, normalize_fix
+from engine.operations.multi_llm_orchestrator import LLMProvider, LLMResponse
+
+WEIGHTS = {LLMProvider.GPT4: 1.0, LLMProvider.CLAUDE: 0.9, LLMProvider.QWEN: 0.7, LLMProvider.DEEPSEEK: 0.8}
+
+BASE = []
+for i in range(30):
+    BASE += [
+        f"def total_{i}(values):",
+        f"    result = sum(values) - {i}",
+        "    if result < 0:",
+        "        result = 0",
+        "    return result",
+        "",
+    ]
+
+
+def _diff(after, context, path="calc.py"):
+    return "\n".join(difflib.unified_diff(BASE, after, f"a/{path}", f"b/{path}", lineterm="", n=context))
+
+
+def _fixed(old, new, every=3, offset=0):
+    return [
+        line.replace(old, new) if (index // 6) % every == offset else line
+        for index, line in enumerate(BASE)
+    ]
+
+
+def _response(provider, fix):
+    return LLMResponse(provider=provider, analysis="", proposed_fix=fix, confidence=0.8, reasoning="")
+
+
+def test_normalize_fix_keeps_only_changed_lines():
+    """Test diff headers, hunk positions and context are dropped and whitespace collapsed."""
+    fix = _diff(_fixed("sum(values) - ", "sum(values)  +  "), context=5)
+    lines = normalize_fix(fix)
+    assert lines[:2] == ["- result = sum(values) - 0", "+ result = sum(values) + 0"]
+    assert all(line[0] in "+-" and not line.startswith(("+++", "---")) for line in lines)
+    assert normalize_fix("x = 1\n\n   y  =  2\n") == ["x = 1", "y = 2"]
+
+
+def test_same_fix_with_different_context_groups_together():
+    """Test fixes differing only in context width, file path and spacing are grouped; other fixes are not."""
+    engine = ConsensusEngine(similarity_threshold=0.7)
+    fixed = _fixed("sum(values) - ", "sum(values) + ")
+    responses = [
+        _response(LLMProvider.CLAUDE, _diff(fixed, 6)),
+        _response(LLMProvider.GPT4, _diff(fixed, 2, path="src/calc.py")),
+        _response(LLMProvider.QWEN, _diff(_fixed("sum(values) - ", "sum( values )+ "), 9)),
+        _response(LLMProvider.DEEPSEEK, _diff(_fixed("if result < 0:", "if result <= 0:", offset=1), 6)),
+    ]
+    groups = engine._group_similar_fixes(responses, WEIGHTS)
+    assert [sorted(p.value for p in g["providers"]) for g in groups] == [["claude", "gpt4", "qwen"], ["deepseek"]]
+
+    decision = engine.reach_consensus(responses, WEIGHTS)
+    assert decision.has_consensus and decision.chosen_fix == responses[0].proposed_fix
+
+
+def test_prefilters_and_pair_cache():
+    """Test length and token-multiset bounds skip exact scoring and pair scores are reused."""
+    similarity = FixSimilarity()
+    short = "+ return a + b"
+    long = "\n".join(f"+ value_{i} = compute({i})" for i in range(50))
+    disjoint = "\n".join(f"+ other_{i} : build [ x ]" for i in range(50))
+
+    assert similarity.similarity(short, long, threshold=0.7) < 0.7
+    assert similarity.stats.length_filtered == 1
+    assert similarity.similarity(long, disjoint, threshold=0.7) < 0.7
+    assert similarity.stats.quick_filtered == 1 and similarity.stats.exact == 0
+
+    partial = long.replace("value_1 ", "value_x ")
+    score = similarity.similarity(long, partial)
+    assert 0.9 < score < 1.0 and similarity.stats.exact == 1
+    assert similarity.similarity(partial, long) == score
+    assert similarity.stats.cached == 1 and similarity.stats.exact == 1
+    assert similarity.similarity(long, long + "\n+ extra = 1", threshold=0.7) >= 0.9
+    assert similarity.stats.minhash_decided == 1 and similarity.stats.exact == 1
+    assert similarity.similarity(long, long) == 1.0
+    assert similarity.similarity("", long) == 0.0
+
+
+def test_streaming_waits_while_pending_low_confidence_could_sink_the_lead():
+    """Test early exit waits when a pending provider joining the lead could drop it below min_confidence."""
+    engine = ConsensusEngine(min_confidence=0.75)
+    fix = _diff(_fixed("sum(values) - ", "sum(values) + "), context=3)
+    answers = [
+        LLMResponse(provider=LLMProvider.GPT4, analysis="", proposed_fix=fix, confidence=0.9, reasoning=""),
+        LLMResponse(provider=LLMProvider.CLAUDE, analysis="", proposed_fix=fix, confidence=0.9, reasoning=""),
+        LLMResponse(provider=LLMProvider.QWEN, analysis="", proposed_fix=fix, confidence=0.1, reasoning=""),
+    ]
+
+    async def stream():
+        for answer in answers:
+            yield answer
+
+    decision, received = asyncio.run(engine.reach_consensus_streaming(
+        stream(), WEIGHTS, expected_providers=[LLMProvider.GPT4, LLMProvider.CLAUDE, LLMProvider.QWEN]
+    ))
+
+    # GPT4 + CLAUDE alone reach 0.9, but with QWEN at 0.1 the group falls to 0.68
+    assert engine.reach_consensus(answers[:2], WEIGHTS).has_consensus
+    assert len(received) == 3
+    assert decision.has_consensus is False
+    assert decision.has_consensus == engine.reach_consensus(answers, WEIGHTS).has_consensus
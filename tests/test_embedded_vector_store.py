@@ -0,0 +1,211 @@
+"""Tests for the embedded (in-process) vector store backend."""
+
+import numpy as np
+import pytest
+
+from engine.rag.embedded_vector_store import EmbeddedVectorStore, _expr_to_sql
+from engine.rag.retriever import RAGRetriever
+from engine.rag.vector_store import VectorStore, create_vector_store
+
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def _insert(store, collection, vectors, prefix="c"):
+    ids = [f"{prefix}{i}" for i in range(len(vectors))]
+    store.insert(
+        collection_name=collection,
+        ids=ids,
+        embeddings=vectors,
+        contents=[f"content {i}" for i in range(len(vectors))],
+        metadata=[{"file_path": f"f{i % 3}.py", "n": i} for i in range(len(vectors))]
+    )
+    return ids
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "vectors"))
+    yield store
+    store.close()
+
+
+def test_create_vector_store_embedded(tmp_path, monkeypatch):
+    """Test the factory picks the backend from RAG_VECTOR_BACKEND."""
+    monkeypatch.setenv("RAG_VECTOR_BACKEND", "embedded")
+    store = create_vector_store(embedding_dim=DIM, persist_dir=str(tmp_path))
+    assert isinstance(store, EmbeddedVectorStore)
+    assert isinstance(store, VectorStore)
+    with pytest.raises(ValueError):
+        create_vector_store(backend="faiss")
+
+
+def test_search_matches_brute_force(store):
+    """Test top-k ordering and scores equal exact cosine similarity."""
+    vectors = _vectors(200)
+    _insert(store, "code", vectors)
+    query = vectors[17] + 0.01
+
+    results = store.search("code", query, top_k=5)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert [r.id for r in results] == [f"c{i}" for i in expected]
+    assert results[0].id == "c17"
+    assert results[0].score == pytest.approx(1.0, abs=1e-3)
+    assert results[0].content == "content 17"
+    assert results[0].metadata == {"file_path": "f2.py", "n": 17}
+    assert results[0].collection == "code"
+
+
+def test_upsert_delete_and_filters(store):
+    """Test re-inserting an ID overwrites it and deletes/filters use Milvus-style expressions."""
+    vectors = _vectors(30)
+    _insert(store, "docs", vectors)
+    assert store.count("docs") == 30
+
+    store.insert("docs", ["c0"], vectors[5:6], ["replaced"], [{"file_path": "new.py"}])
+    assert store.count("docs") == 30
+    top = store.search("docs", vectors[5], top_k=2)
+    assert {r.id for r in top} == {"c0", "c5"}
+
+    filtered = store.search("docs", vectors[0], top_k=50, filter_expr='metadata["file_path"] == "f1.py"')
+    assert filtered and all(r.metadata["file_path"] == "f1.py" for r in filtered)
+
+    assert store.delete("docs", ids=["c1", "c2", "missing"]) == 2
+    assert store.delete("docs", expr='metadata["file_path"] in ["new.py"]') == 1
+    assert store.count("docs") == 27
+    assert not {"c0", "c1", "c2"} & {r.id for r in store.search("docs", vectors[1], top_k=30)}
+
+    assert store.delete("docs", expr="id != ''") == 27
+    assert store.search("docs", vectors[0]) == []
+
+
+def test_persistence_and_float16(tmp_path):
+    """Test data survives reopening and float16 storage keeps ranking."""
+    vectors = _vectors(50)
+    first = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path), dtype="float16")
+    _insert(first, "issues", vectors)
+    first.close()
+
+    reopened = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path))
+    assert reopened.count("issues") == 50
+    assert reopened.search("issues", vectors[42], top_k=1)[0].id == "c42"
+    assert (tmp_path / "issues" / "vectors.bin").stat().st_size == 50 * DIM * 2
+    reopened.close()
+
+    with pytest.raises(ValueError):
+        EmbeddedVectorStore(embedding_dim=DIM * 2, persist_dir=str(tmp_path)).count("issues")
+
+
+def test_compaction_renumbers_rows(store):
+    """Test dead rows are compacted away without changing search results."""
+    vectors = _vectors(3000)
+    ids = _insert(store, "code", vectors)
+    store.delete("code", ids=ids[:2000])
+
+    assert (store.persist_dir / "code" / "vectors.bin").stat().st_size == 1000 * DIM * 4
+    assert store.count("code") == 1000
+    assert store.search("code", vectors[2500], top_k=1)[0].id == "c2500"
+
+
+def test_int8_rerank_matches_float32(tmp_path):
+    """Test int8 storage with full-precision rerank returns the exact float32 top-k."""
+    vectors = _vectors(2000, seed=3)
+    exact = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "f32"))
+    quantized = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "i8"), dtype="int8")
+    _insert(exact, "code", vectors)
+    ids = _insert(quantized, "code", vectors)
+
+    for seed in range(10):
+        query = _vectors(1, seed=100 + seed)[0]
+        expected = exact.search("code", query, top_k=5)
+        found = quantized.search("code", query, top_k=5)
+        assert [r.id for r in found] == [r.id for r in expected]
+        assert [r.score for r in found] == pytest.approx([r.score for r in expected], abs=1e-5)
+
+    collection_dir = tmp_path / "i8" / "code"
+    assert (collection_dir / "vectors.bin").stat().st_size == 2000 * DIM
+    assert (collection_dir / "scales.bin").stat().st_size == 2000 * 4
+    assert (collection_dir / "vectors.f32.bin").stat().st_size == 2000 * DIM * 4
+
+    # Compaction rewrites the matrix, scales and full-precision copy together
+    quantized.delete("code", ids=ids[:1500])
+    assert (collection_dir / "vectors.f32.bin").stat().st_size == 500 * DIM * 4
+    assert quantized.search("code", vectors[1800], top_k=1)[0].id == "c1800"
+    assert quantized.search("code", vectors[1800], top_k=1)[0].score == pytest.approx(1.0, abs=1e-5)
+    exact.close()
+    quantized.close()
+
+
+def test_int8_without_rerank(tmp_path):
+    """Test rerank_factor=1 stores no full-precision copy and scores approximately."""
+    vectors = _vectors(300, seed=4)
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path), dtype="int8", rerank_factor=1)
+    _insert(store, "docs", vectors)
+
+    result = store.search("docs", vectors[123], top_k=1)[0]
+    assert result.id == "c123"
+    assert result.score == pytest.approx(1.0, abs=0.02)
+    assert not (tmp_path / "docs" / "vectors.f32.bin").exists()
+    store.close()
+
+    # Reopening with reranking enabled keeps the collection's stored layout
+    reopened = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path), dtype="int8")
+    assert reopened.search("docs", vectors[7], top_k=1)[0].id == "c7"
+    reopened.close()
+
+
+def test_ivf_index_recall(tmp_path):
+    """Test IVF search finds the same neighbours as brute force for most queries."""
+    vectors = _vectors(4000, seed=1)
+    flat = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "flat"))
+    ivf = EmbeddedVectorStore(
+        embedding_dim=DIM, persist_dir=str(tmp_path / "ivf"),
+        index_type="ivf", ivf_min_rows=1000, nlist=32, nprobe=8
+    )
+    _insert(flat, "code", vectors)
+    _insert(ivf, "code", vectors)
+    assert (tmp_path / "ivf" / "code" / "ivf.npz").exists()
+
+    # Rows added after the build are still searchable
+    extra = _vectors(10, seed=2)
+    _insert(ivf, "code", extra, prefix="new")
+    assert ivf.search("code", extra[3], top_k=1)[0].id == "new3"
+
+    queries = _vectors(50, seed=3)
+    hits = 0
+    for query in queries:
+        expected = {r.id for r in flat.search("code", query, top_k=10)}
+        got = {r.id for r in ivf.search("code", query, top_k=10) if not r.id.startswith("new")}
+        hits += len(expected & got)
+    assert hits / (10 * len(queries)) > 0.6
+
+
+def test_expr_to_sql_rejects_unsupported():
+    """Test unsupported filter syntax is an error, not a silent match-all."""
+    assert _expr_to_sql('id in ["a", "b"]') == ("id IN (?,?)", ["a", "b"])
+    with pytest.raises(ValueError):
+        _expr_to_sql("timestamp > 5")
+
+
+def test_retriever_works_on_embedded_backend(store):
+    """Test RAGRetriever runs unchanged on the embedded backend."""
+    vectors = _vectors(20)
+    _insert(store, "code", vectors)
+
+    class FakeEmbeddings:
+        embedding_dim = DIM
+
+        def embed(self, texts):
+            return vectors[[7]]
+
+    retriever = RAGRetriever(embedding_service=FakeEmbeddings(), vector_store=store, min_score=0.5)
+    results = retriever.retrieve("anything", top_k=3)
+    assert results[0].source == "code"
+    assert results[0].metadata["n"] == 7
+    assert "```python" in results[0].formatted_context
@@ -0,0 +1,180 @@
+"""Tests for the persistent embedding cache."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from engine.rag.embedding_cache import EmbeddingCache, text_digest
+from engine.rag.embedding_service import EmbeddingService
+
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def _keys(n, prefix="text"):
+    return [text_digest(f"{prefix} {i}") for i in range(n)]
+
+
+def test_get_many_resolves_hits_and_misses(tmp_path):
+    """Test stored vectors come back exactly and unknown keys are reported as misses."""
+    cache = EmbeddingCache(tmp_path, "ollama", "nomic-embed-text", DIM)
+    keys = _keys(5)
+    vectors = _vectors(5)
+    cache.put_many(keys[:3], vectors[:3])
+
+    got, found = cache.get_many([keys[2], keys[4], keys[0], keys[2]])
+    assert found.tolist() == [True, False, True, True]
+    np.testing.assert_array_equal(got[0], vectors[2])
+    np.testing.assert_array_equal(got[2], vectors[0])
+    np.testing.assert_array_equal(got[3], vectors[2])
+    assert not got[1].any()
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.put_many(keys[:2], _vectors(2, seed=9))  # Existing keys are not rewritten
+    assert len(cache) == 3
+    assert (cache.path / "vectors.f32").stat().st_size == 3 * DIM * 4
+    cache.close()
+
+
+def test_cache_persists_and_is_namespaced(tmp_path):
+    """Test entries survive reopening and other models or dimensions do not see them."""
+    keys = _keys(4)
+    vectors = _vectors(4)
+    first = EmbeddingCache(tmp_path, "ollama", "nomic-embed-text", DIM)
+    first.put_many(keys, vectors)
+    first.close()
+
+    reopened = EmbeddingCache(tmp_path, "ollama", "nomic-embed-text", DIM)
+    got, found = reopened.get_many(keys)
+    assert found.all()
+    np.testing.assert_array_equal(got, vectors)
+    reopened.close()
+
+    other_model = EmbeddingCache(tmp_path, "ollama", "mxbai-embed-large", DIM)
+    assert not other_model.get_many(keys)[1].any()
+    other_model.close()
+
+    resized = EmbeddingCache(tmp_path, "ollama", "nomic-embed-text", DIM * 2)
+    assert len(resized) == 0
+    resized.close()
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    """Test the cache stays under max_bytes and evicts least recently used entries first."""
+    cache = EmbeddingCache(tmp_path, "ollama", "m", DIM, max_bytes=100 * DIM * 4)
+    keys = _keys(150)
+    vectors = _vectors(150)
+    cache.put_many(keys[:90], vectors[:90])
+
+    # Make the oldest entries the most recently used ones
+    with cache._db:
+        cache._db.execute("UPDATE entries SET last_used = 0")
+    cache.get_many(keys[:10])
+
+    cache.put_many(keys[90:], vectors[90:])
+    assert len(cache) == 80
+    assert cache.vectors_path.stat().st_size == 80 * DIM * 4
+    assert sorted(cache.path.glob("vectors*")) == [cache.vectors_path]
+
+    got, found = cache.get_many(keys[:10])
+    assert found.all()
+    np.testing.assert_array_equal(got, vectors[:10])
+    got, found = cache.get_many(keys[80:])
+    assert found.all()
+    np.testing.assert_array_equal(got, vectors[80:])
+    assert not cache.get_many(keys[10:80])[1].any()
+    cache.close()
+
+
+class _FailingCommit:
+    """sqlite3 connection wrapper whose compaction commit fails mid-transaction."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __enter__(self):
+        return self._db.__enter__()
+
+    def __exit__(self, *exc):
+        return self._db.__exit__(*exc)
+
+    def execute(self, sql, *args):
+        if "key = 'generation'" in sql and sql.startswith("UPDATE"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._db.execute(sql, *args)
+
+
+def test_failed_eviction_keeps_mapping_and_matrix_consistent(tmp_path):
+    """Test a compaction that fails before committing leaves the old matrix in use."""
+    cache = EmbeddingCache(tmp_path, "ollama", "m", DIM, max_bytes=100 * DIM * 4)
+    keys = _keys(120)
+    vectors = _vectors(120)
+    cache.put_many(keys[:90], vectors[:90])
+
+    db = cache._db
+    cache._db = _FailingCommit(db)
+    with pytest.raises(sqlite3.OperationalError):
+        cache.put_many(keys[90:], vectors[90:])
+    cache._db = db
+
+    got, found = cache.get_many(keys)
+    assert found.all()
+    np.testing.assert_array_equal(got, vectors)
+
+    # The next compaction cleans up the abandoned matrix file
+    cache.put_many(_keys(10, "more"), _vectors(10, seed=1))
+    assert sorted(cache.path.glob("vectors*")) == [cache.vectors_path]
+    cache.close()
+
+
+@pytest.fixture
+def service_factory(tmp_path, monkeypatch):
+    """EmbeddingService on a fake backend that records the texts it embeds."""
+    embedded = []
+
+    def fake_init(self, model_name):
+        self.embedding_dim = DIM
+
+    def fake_embed(self, texts):
+        embedded.extend(texts)
+        return np.stack([
+            np.random.default_rng(abs(hash(text)) % 2 ** 32).normal(size=DIM) for text in texts
+        ]).astype(np.float32)
+
+    monkeypatch.setattr(EmbeddingService, '_init_sentence_transformers', fake_init)
+    monkeypatch.setattr(EmbeddingService, '_sentence_transformers_embed', fake_embed)
+
+    def factory(**kwargs):
+        return EmbeddingService(cache_dir=tmp_path / "cache", **kwargs)
+
+    factory.embedded = embedded
+    return factory
+
+
+def test_service_sends_only_misses_to_backend(service_factory):
+    """Test embed() serves hits from disk, dedupes misses and keeps input order."""
+    service = service_factory()
+    first = service.embed(["a", "b", "a"])
+    assert service_factory.embedded == ["a", "b"]
+    np.testing.assert_array_equal(first[0], first[2])
+
+    service_factory.embedded.clear()
+    second = service_factory().embed(["c", "b", "a", "c"])
+    assert service_factory.embedded == ["c"]
+    np.testing.assert_array_equal(second[1], first[1])
+    np.testing.assert_array_equal(second[2], first[0])
+    np.testing.assert_array_equal(second[0], second[3])
+
+    service_factory.embedded.clear()
+    uncached = service_factory(use_cache=False)
+    assert uncached.cache is None
+    uncached.embed(["a", "b"])
+    assert service_factory.embedded == ["a", "b"]
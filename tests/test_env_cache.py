@@ -0,0 +1,123 @@
+"""Tests for cached test virtualenvs."""
+
+import fcntl
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from engine.core.pipeline_orchestrator import PipelineConfig, PipelineOrchestrator
+from engine.operations.env_cache import READY_MARKER, EnvCacheError, EnvCacheManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    # No extra packages: requirements files with only comments install offline
+    return EnvCacheManager(cache_dir=str(tmp_path / "cache"), extra_packages=())
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    req = workspace / "requirements.txt"
+    req.write_text("# no dependencies\n")
+    return req
+
+
+def test_env_key_depends_on_requirements_and_python(cache, requirements):
+    """Test the key changes with requirements content and includes the Python version."""
+    key = cache.env_key(requirements)
+    assert key.startswith(f"py{sys.version_info.major}.{sys.version_info.minor}-")
+
+    requirements.write_text("# no dependencies\nrequests\n")
+    assert cache.env_key(requirements) != key
+
+
+def test_build_once_then_skip_install(cache, requirements):
+    """Test the first run builds an isolated venv and the second one reuses it."""
+    with cache.environment("owner/repo", requirements) as env:
+        assert env.cache_hit is False
+        prefix = subprocess.run(
+            [str(env.python), '-c', 'import sys; print(sys.prefix)'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        assert Path(prefix) == env.path
+
+    with patch.object(cache, '_build', side_effect=AssertionError("install must be skipped")):
+        with cache.environment("owner/repo", requirements) as env:
+            assert env.cache_hit is True
+
+
+def test_overlapping_cache_hits_do_not_wait(cache, requirements):
+    """Test a cache hit proceeds while another run still holds the venv."""
+    import threading
+
+    with cache.environment("owner/repo", requirements):
+        pass
+
+    entered = threading.Event()
+
+    def second_run():
+        with cache.environment("owner/repo", requirements) as env:
+            assert env.cache_hit is True
+            entered.set()
+
+    with cache.environment("owner/repo", requirements) as env:
+        assert env.cache_hit is True
+        worker = threading.Thread(target=second_run, daemon=True)
+        worker.start()
+        assert entered.wait(5), "cache hit blocked behind another run's shared lock"
+    worker.join(5)
+
+
+def test_failed_build_is_not_cached(cache, requirements):
+    """Test a failing pip install raises and leaves no half-built venv behind."""
+    requirements.write_text("--definitely-not-a-pip-option\n")
+    with pytest.raises(EnvCacheError):
+        with cache.environment("owner/repo", requirements):
+            pass
+    assert not (cache.cache_dir / "owner__repo" / cache.env_key(requirements)).exists()
+
+
+def test_gc_evicts_lru_and_skips_in_use(cache, tmp_path):
+    """Test eviction removes least recently used venvs but never ones in use."""
+    repo_dir = cache.cache_dir / "owner__repo"
+    now = time.time()
+    for age, name in [(300, "py3.11-old"), (200, "py3.11-busy"), (100, "py3.11-new")]:
+        env_dir = repo_dir / name
+        env_dir.mkdir(parents=True)
+        (env_dir / "blob").write_bytes(b"x" * 1000)
+        (env_dir / READY_MARKER).touch()
+        os.utime(env_dir / READY_MARKER, (now - age, now - age))
+
+    cache.max_disk_bytes = 1500
+    with open(repo_dir / "py3.11-busy.lock", 'w') as busy:
+        fcntl.flock(busy, fcntl.LOCK_SH)
+        stats = cache.gc()
+
+    assert stats['envs_evicted'] == 2
+    assert not (repo_dir / "py3.11-old").exists()
+    assert (repo_dir / "py3.11-busy").exists()
+    assert not (repo_dir / "py3.11-new").exists()
+
+
+def test_orchestrator_runs_tests_in_cached_venv(tmp_path, requirements):
+    """Test PipelineOrchestrator runs pytest with the cached venv's interpreter."""
+    orchestrator = PipelineOrchestrator(PipelineConfig(env_cache_dir=str(tmp_path / "cache")))
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="1 passed", stderr="")
+
+    with patch.object(orchestrator.env_cache, '_build', side_effect=lambda env_dir, req: env_dir.mkdir(parents=True)):
+        with patch('subprocess.run', side_effect=fake_run):
+            assert orchestrator._run_workspace_tests("owner/repo", str(requirements.parent)) is None
+
+    env_dir = tmp_path / "cache" / "owner__repo" / orchestrator.env_cache.env_key(requirements)
+    assert calls == [[str(env_dir / "bin" / "python"), '-m', 'pytest', '-q']]
@@ -0,0 +1,111 @@
+"""Tests for the GitHub conditional request (ETag) cache."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from engine.core.rate_limiter import reset_rate_limiter
+from engine.operations.github_api_helper import GitHubAPIHelper
+from engine.operations.github_response_cache import ConditionalRequestCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConditionalRequestCache(db_path=str(tmp_path / "etag.db"), max_entries=3)
+
+
+def _response(status, body=None, headers=None):
+    response = Mock()
+    response.status_code = status
+    response.json.return_value = body
+    response.headers = headers or {}
+    response.raise_for_status = Mock()
+    return response
+
+
+class TestConditionalRequestCache:
+    """Test cache storage and key handling."""
+
+    def test_get_missing_does_not_create_database(self, cache):
+        """Test lookups before any store leave no file behind."""
+        assert cache.get("missing") is None
+        assert not cache.db_path.exists()
+
+    def test_store_and_get_roundtrip(self, cache):
+        """Test validators and body survive a roundtrip."""
+        cache.store("k", {'ETag': '"abc"', 'Last-Modified': 'Mon'}, [{'number': 1}])
+        entry = cache.get("k")
+        assert entry.etag == '"abc"'
+        assert entry.body == [{'number': 1}]
+        assert cache.conditional_headers(entry) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon'
+        }
+
+    def test_store_without_validator_is_skipped(self, cache):
+        """Test responses without ETag/Last-Modified are not cached."""
+        cache.store("k", {}, [1])
+        assert cache.get("k") is None
+
+    def test_persistent_across_instances(self, cache):
+        """Test a new cache instance sees stored entries."""
+        cache.store("k", {'ETag': '"x"'}, {'a': 1})
+        other = ConditionalRequestCache(db_path=str(cache.db_path))
+        assert other.get("k").body == {'a': 1}
+
+    def test_key_separates_tokens_and_params(self):
+        """Test keys differ per token and query, but not per param order."""
+        key = ConditionalRequestCache.make_key
+        assert key("/u", {'a': 1}, "t1") != key("/u", {'a': 1}, "t2")
+        assert key("/u", {'a': 1}, "t1") != key("/u", {'a': 2}, "t1")
+        assert key("/u", {'a': 1, 'b': 2}, "t1") == key("/u", {'b': 2, 'a': 1}, "t1")
+        assert "t1" not in key("/u", None, "t1")
+
+    def test_prune_enforces_max_entries(self, cache):
+        """Test eviction keeps only the most recent entries."""
+        cache.PRUNE_INTERVAL = 1
+        for i in range(5):
+            cache.store(f"k{i}", {'ETag': f'"{i}"'}, i)
+        assert cache.get("k0") is None
+        assert cache.get("k4").body == 4
+
+
+class TestGitHubAPIHelperConditionalRequests:
+    """Test GitHubAPIHelper uses the cache for polled reads."""
+
+    @pytest.fixture
+    def helper(self, cache):
+        reset_rate_limiter()
+        return GitHubAPIHelper(token="test-token", response_cache=cache)
+
+    def test_304_serves_cached_prs(self, helper):
+        """Test a 304 response returns the previously cached PR list."""
+        prs = [{'number': 9, 'title': 'PR'}]
+        responses = [
+            _response(200, prs, {'ETag': '"v1"'}),
+            _response(304)
+        ]
+        with patch.object(helper.session, 'get', side_effect=responses) as mock_get:
+            first = helper.list_pull_requests("owner", "repo", bypass_rate_limit=True)
+            second = helper.list_pull_requests("owner", "repo", bypass_rate_limit=True)
+
+        assert first == second == prs
+        assert mock_get.call_args_list[0].kwargs['headers'] == {}
+        assert mock_get.call_args_list[1].kwargs['headers'] == {'If-None-Match': '"v1"'}
+
+        stats = helper.rate_limiter.get_stats()['conditional_cache']
+        assert stats == {'hits': 1, 'misses': 1, 'not_modified': 1}
+
+    def test_changed_resource_refreshes_cache(self, helper):
+        """Test a 200 on revalidation replaces the cached body."""
+        responses = [
+            _response(200, [{'number': 1}], {'ETag': '"v1"'}),
+            _response(200, [{'number': 2}], {'ETag': '"v2"'})
+        ]
+        with patch.object(helper.session, 'get', side_effect=responses):
+            helper.get_pr_files("owner", "repo", 1)
+            files = helper.get_pr_files("owner", "repo", 1)
+
+        assert files == [{'number': 2}]
+        stats = helper.rate_limiter.get_stats()['conditional_cache']
+        assert stats == {'hits': 1, 'misses': 1, 'not_modified': 0}
@@ -0,0 +1,129 @@
+"""Tests for the parallel parse -> embed -> insert indexing pipeline."""
+
+import pytest
+
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.indexers.code_indexer import CodeIndexer, generate_chunk_id, parse_python_file
+from engine.rag.indexers.docs_indexer import DocsIndexer
+from engine.rag.indexers.pipeline import run_pipeline
+
+
+DIM = 8
+
+
+def _module(name, n_funcs):
+    funcs = "\n\n".join(
+        f"def {name}_func_{i}(value):\n    \"\"\"Doc {i}.\"\"\"\n    return value + {i}\n"
+        for i in range(n_funcs)
+    )
+    return f'"""Module {name}."""\n\nclass {name.title()}:\n    pass\n\n\n{funcs}'
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "docs").mkdir()
+    for i in range(24):
+        (root / "pkg" / f"mod{i}.py").write_text(_module(f"mod{i}", n_funcs=3))
+        (root / "docs" / f"guide{i}.md").write_text(
+            f"# Guide {i}\n\n" + f"Guide {i} explains how the feature works in detail.\n" * 3
+            + f"\n## Setup {i}\n\n" + f"Install the package and configure guide {i}.\n" * 3
+        )
+    (root / "pkg" / "broken.py").write_text("def broken(:\n")
+    return root
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "vectors"))
+    yield store
+    store.close()
+
+
+def test_parse_python_file_extracts_chunks(workspace):
+    """Test functions, classes and module docstring are extracted with stable IDs."""
+    path = workspace / "pkg" / "mod0.py"
+    chunks = parse_python_file(path, workspace)
+
+    by_name = {chunk.name: chunk for chunk in chunks}
+    assert set(by_name) == {"Mod0", "mod0_func_0", "mod0_func_1", "mod0_func_2", "mod0"}
+    func = by_name["mod0_func_1"]
+    assert func.content.startswith("def mod0_func_1(value):") and func.content.endswith("return value + 1")
+    assert func.file_path == "pkg/mod0.py"
+    assert func.docstring == "Doc 1."
+    assert func.id == generate_chunk_id(path, func.start_line - 1, "function")
+    assert by_name["mod0"].chunk_type == "module"
+    assert parse_python_file(workspace / "pkg" / "broken.py", workspace) == []
+
+
+def test_parallel_code_indexing_matches_serial(tmp_path, workspace, store, fake_embeddings):
+    """Test a process pool produces the same chunks and stores them via the worker threads."""
+    serial_store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "serial"))
+    serial = CodeIndexer(
+        root_dir=workspace, embedding_service=fake_embeddings(), vector_store=serial_store,
+        manifest_path=tmp_path / "serial.json", parse_workers=1
+    )
+    embeddings = fake_embeddings()
+    parallel = CodeIndexer(
+        root_dir=workspace, embedding_service=embeddings, vector_store=store,
+        manifest_path=tmp_path / "parallel.json", parse_workers=2, batch_size=16
+    )
+
+    assert parallel.index_workspace() == serial.index_workspace() == 24 * 5
+    assert parallel.manifest.files == serial.manifest.files
+    assert store.count("code") == serial_store.count("code") == 120
+    serial_store.close()
+
+    stats = parallel.pipeline_stats
+    assert stats.workers == 2
+    assert stats.parse.items == 25
+    assert stats.embed.items == stats.insert.items == 120
+    assert max(embeddings.batches) == 16
+    assert embeddings.threads == {"index-embed"}
+
+
+def test_parallel_docs_indexing(tmp_path, workspace, store, fake_embeddings):
+    """Test docs are found, parsed in parallel and stored in batches."""
+    embeddings = fake_embeddings()
+    indexer = DocsIndexer(embedding_service=embeddings, vector_store=store, parse_workers=2, batch_size=10)
+
+    assert indexer.index_workspace(str(workspace)) == 48
+    assert store.count("docs") == 48
+    assert indexer.pipeline_stats.workers == 2
+    assert indexer.pipeline_stats.parse.items == 24
+    assert max(embeddings.batches) == 10
+
+
+def test_insert_failure_propagates(tmp_path, workspace, store, fake_embeddings):
+    """Test a failing stage aborts the run and the manifest does not record unstored files."""
+    class FailingStore(EmbeddedVectorStore):
+        def insert(self, *args, **kwargs):
+            raise RuntimeError("store down")
+
+    failing = FailingStore(embedding_dim=DIM, persist_dir=str(tmp_path / "failing"))
+    indexer = CodeIndexer(
+        root_dir=workspace, embedding_service=fake_embeddings(), vector_store=failing,
+        manifest_path=tmp_path / "manifest.json", parse_workers=2, batch_size=8
+    )
+    with pytest.raises(RuntimeError, match="store down"):
+        indexer.index_workspace()
+    assert indexer.manifest.files == {}
+    assert not (tmp_path / "manifest.json").exists()
+    failing.close()
+
+
+def test_run_pipeline_keeps_task_order():
+    """Test results come back per task in task order (in-process path)."""
+    inserted = []
+    results, stats = run_pipeline(
+        tasks=[3, 0, 2],
+        parse_fn=lambda n: list(range(n)),
+        embed_fn=lambda batch: [x * 10 for x in batch],
+        insert_fn=lambda batch, embedded: inserted.extend(zip(batch, embedded)),
+        workers=1,
+        batch_size=2
+    )
+    assert results == [[0, 1, 2], [], [0, 1]]
+    assert inserted == [(0, 0), (1, 10), (2, 20), (0, 0), (1, 10)]
+    assert stats.parse.items == 3 and stats.insert.items == 5
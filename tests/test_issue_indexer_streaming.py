@@ -0,0 +1,127 @@
+"""Tests for streaming, checkpointed issue indexing against a stub GitHub API."""
+
+import json
+from urllib.parse import urlencode
+
+import pytest
+
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.indexers.issue_indexer import IssueIndexer
+
+
+DIM = 8
+
+
+def _issue(number, state="closed", hour=0, body=None):
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": body or f"Crash number {number} when parsing the config file on startup",
+        "state": state,
+        "created_at": "2026-01-01T00:00:00Z",
+        "updated_at": f"2026-01-01T{hour:02d}:{number % 60:02d}:00Z",  # Shared by n and n + 60
+        "closed_at": "2026-01-02T00:00:00Z" if state == "closed" else None,
+        "html_url": f"https://github.com/acme/app/issues/{number}",
+        "labels": [{"name": "bug"}],
+        "assignees": [],
+    }
+
+
+def _issues_endpoint(server, request):
+    """Issues endpoint with state/since filters, updated-asc sorting and Link pagination."""
+    query = request.query
+    issues = sorted(server.issues.values(), key=lambda i: (i["updated_at"], i["number"]))
+    if query.get("state", "open") != "all":
+        issues = [i for i in issues if i["state"] == query.get("state", "open")]
+    if "since" in query:
+        issues = [i for i in issues if i["updated_at"] >= query["since"]]
+
+    per_page, page = int(query["per_page"]), int(query.get("page", 1))
+    headers = {}
+    if page * per_page < len(issues):
+        next_query = urlencode({**query, "page": page + 1})
+        headers["Link"] = f'<{server.url}{request.path}?{next_query}>; rel="next"'
+    return 200, issues[(page - 1) * per_page:page * per_page], headers
+
+
+@pytest.fixture
+def github(stub_server):
+    pull_request = {**_issue(999), "pull_request": {"url": "https://example.invalid"}}
+    issues = [_issue(n) for n in range(1, 251)] + [_issue(300, state="open"), pull_request]
+    return stub_server(_issues_endpoint, issues={issue["number"]: issue for issue in issues})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path / "vectors"))
+    yield store
+    store.close()
+
+
+def _indexer(github, store, tmp_path, embeddings):
+    return IssueIndexer(
+        embedding_service=embeddings, vector_store=store, github_token="dummy",
+        batch_size=40, page_size=100, checkpoint_dir=tmp_path / "checkpoints", api_url=github.url
+    )
+
+
+def test_streams_pages_in_bounded_batches(tmp_path, github, store, fake_embeddings):
+    """Test issues are fetched page by page and embedded/stored in bounded batches."""
+    embeddings = fake_embeddings()
+    indexer = _indexer(github, store, tmp_path, embeddings)
+
+    assert indexer.index_repository("acme", "app") == 250
+    assert store.count("issues") == 250
+    assert indexer.lexical_index.count() == 250
+    assert max(embeddings.batches) == 40 and sum(embeddings.batches) == 250
+    assert len(github.requests) == 3
+    assert github.requests[0].query == {"state": "closed", "sort": "updated", "direction": "asc", "per_page": "100"}
+
+    checkpoint = json.loads((tmp_path / "checkpoints" / "issues-acme-app.json").read_text())
+    assert checkpoint["since"] == max(i["updated_at"] for i in github.issues.values() if i["state"] == "closed"
+                                      and "pull_request" not in i)
+    assert checkpoint["indexed"] == 250
+    indexer.close()
+
+
+def test_rerun_fetches_only_updated_issues(tmp_path, github, store, fake_embeddings):
+    """Test reruns pass since=, replace updated issues and drop reopened ones."""
+    _indexer(github, store, tmp_path, fake_embeddings()).index_repository("acme", "app")
+
+    github.issues[5] = _issue(5, hour=3, body="Crash when the config file has a BOM, fixed by stripping it")
+    github.issues[7] = _issue(7, state="open", hour=4)
+    embeddings = fake_embeddings()
+    indexer = _indexer(github, store, tmp_path, embeddings)
+    github.requests.clear()
+
+    assert indexer.index_repository("acme", "app") == 1
+    assert github.requests[0].query["state"] == "all" and "since" in github.requests[0].query
+    assert embeddings.batches == [1]
+    assert store.count("issues") == 249
+    assert indexer.lexical_index.count() == 249
+    assert [r.metadata["issue_number"] for r in indexer.lexical_index.search("BOM")] == [5]
+    assert 7 not in {r.metadata["issue_number"] for r in indexer.lexical_index.search("Crash number 7", top_k=300)}
+
+    # Nothing changed: the issues at exactly the checkpoint time are not re-embedded
+    assert indexer.index_repository("acme", "app") == 0
+    assert embeddings.batches == [1]
+    indexer.close()
+
+
+def test_failed_run_resumes_from_checkpoint(tmp_path, github, store, fake_embeddings):
+    """Test a failure keeps stored batches and the next run continues after them."""
+    failing = _indexer(github, store, tmp_path, fake_embeddings(fail_after=2))
+    with pytest.raises(RuntimeError, match="backend down"):
+        failing.index_repository("acme", "app")
+    assert store.count("issues") == 80
+
+    embeddings = fake_embeddings()
+    indexer = _indexer(github, store, tmp_path, embeddings)
+    assert indexer.index_repository("acme", "app") == 170
+    assert sum(embeddings.batches) == 170
+    assert store.count("issues") == 250
+
+    # full=True ignores the checkpoint and replaces everything
+    assert indexer.index_repository("acme", "app", full=True) == 250
+    assert store.count("issues") == 250
+    indexer.close()
@@ -0,0 +1,180 @@
+"""Tests for pooled, async and streaming LLM provider calls against a stub server."""
+
+import asyncio
+import json
+
+import pytest
+
+from engine.core.llm_providers import (
+    AnthropicProvider, GoogleProvider, HTTPLLMProvider, LLMMessage, LLMProvider, LLMResponse, LocalProvider,
+    OpenAIProvider, ProviderRequest, close_aio_session
+)
+
+
+MESSAGES = [LLMMessage(role="system", content="Be brief."), LLMMessage(role="user", content="Say hello")]
+WORDS = ["Hel", "lo ", "there"]
+
+
+def _sse(events):
+    return "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+
+
+def _llm_endpoints(server, request):
+    """OpenAI, Anthropic, Gemini and Ollama chat endpoints, streamed or not."""
+    payload, path = request.payload, request.path
+    stream = payload.get("stream") or "streamGenerateContent" in path
+
+    if path.endswith("/chat/completions"):
+        if stream:
+            body = _sse([{"choices": [{"delta": {"content": w}, "finish_reason": None}]} for w in WORDS]
+                        + [{"choices": [{"delta": {}, "finish_reason": "stop"}]}])
+        else:
+            body = json.dumps({
+                "model": payload["model"], "usage": {"total_tokens": 3},
+                "choices": [{"message": {"content": "".join(WORDS)}, "finish_reason": "stop"}]
+            })
+    elif path.endswith("/v1/messages"):
+        body = "".join(
+            f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            for event in [{"type": "message_start", "message": {"model": payload["model"]}}]
+            + [{"type": "content_block_delta", "delta": {"type": "text_delta", "text": w}} for w in WORDS]
+            + [{"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 3}}]
+        )
+    elif "streamGenerateContent" in path:
+        body = _sse([{"candidates": [{"content": {"parts": [{"text": w}]}}]} for w in WORDS])
+    elif path == "/api/chat":
+        if stream:
+            body = "".join(json.dumps({"message": {"content": w}, "done": False}) + "\n" for w in WORDS)
+            body += json.dumps({"message": {"content": ""}, "done": True, "done_reason": "stop", "eval_count": 3}) + "\n"
+        else:
+            body = json.dumps({"model": payload["model"], "message": {"content": "".join(WORDS)}, "eval_count": 3})
+    else:
+        return 404, b""
+    return 200, body, {"Content-Type": "text/event-stream" if stream else "application/json"}
+
+
+@pytest.fixture
+def server(stub_server):
+    return stub_server(_llm_endpoints)
+
+
+def test_sync_calls_reuse_connections(server):
+    """Test the sync facade keeps its API and shares one keep-alive connection across providers."""
+    openai = OpenAIProvider("key", base_url=f"{server.url}/v1")
+    local = LocalProvider(base_url=server.url)
+    for _ in range(5):
+        response = openai.chat_completion(MESSAGES, "gpt-4o", temperature=0.1)
+        assert response.content == "Hello there" and response.provider == "openai"
+    assert local.chat_completion(MESSAGES, "qwen2.5-coder").usage["completion_tokens"] == 3
+
+    assert server.connections == 1
+    assert server.payloads[0]["temperature"] == 0.1 and "stream" not in server.payloads[0]
+
+
+def test_async_calls_share_pooled_session(server):
+    """Test achat_completion runs concurrently over the shared pool."""
+    openai = OpenAIProvider("key", base_url=f"{server.url}/v1")
+
+    async def run():
+        first = await openai.achat_completion(MESSAGES, "gpt-4o")
+        rest = await asyncio.gather(*(openai.achat_completion(MESSAGES, "gpt-4o") for _ in range(8)))
+        sequential = [await openai.achat_completion(MESSAGES, "gpt-4o") for _ in range(5)]
+        await close_aio_session()
+        return [first, *rest, *sequential]
+
+    responses = asyncio.run(run())
+    assert [r.content for r in responses] == ["Hello there"] * 14
+    assert server.connections <= 9  # At most one per concurrent request, reused afterwards
+
+
+@pytest.mark.parametrize("provider_factory", [
+    lambda url: OpenAIProvider("key", base_url=f"{url}/v1"),
+    lambda url: AnthropicProvider("key", base_url=url),
+    lambda url: GoogleProvider("key", base_url=f"{url}/v1"),
+    lambda url: LocalProvider(base_url=url),
+], ids=["openai", "anthropic", "google", "local"])
+def test_streaming_sync_and_async(server, provider_factory):
+    """Test every provider streams text deltas through both iterator APIs."""
+    provider = provider_factory(server.url)
+    chunks = list(provider.stream_chat_completion(MESSAGES, "model-x"))
+    assert "".join(c.content for c in chunks) == "Hello there"
+    assert len([c for c in chunks if c.content]) == 3
+
+    async def run():
+        collected = [chunk async for chunk in provider.astream_chat_completion(MESSAGES, "model-x")]
+        await close_aio_session()
+        return collected
+
+    assert "".join(c.content for c in asyncio.run(run())) == "Hello there"
+    if not isinstance(provider, GoogleProvider):
+        assert chunks[-1].finish_reason in ("stop", "end_turn")
+
+
+def test_custom_provider_gets_async_fallback():
+    """Test providers that only implement chat_completion still support the async and streaming APIs."""
+    class EchoProvider(LLMProvider):
+        def chat_completion(self, messages, model, temperature=0.7, max_tokens=4096, **kwargs):
+            return LLMResponse(messages[-1].content, model, "echo", "stop", {})
+
+        def test_connection(self):
+            return True
+
+        def get_available_models(self):
+            return ["echo"]
+
+    provider = EchoProvider("")
+    assert asyncio.run(provider.achat_completion(MESSAGES, "echo")).content == "Say hello"
+    assert [c.content for c in provider.stream_chat_completion(MESSAGES, "echo")] == ["Say hello"]
+
+
+def test_http_provider_requires_wire_format_hooks():
+    """Test an HTTP provider missing a wire-format hook cannot be instantiated."""
+    class PartialProvider(HTTPLLMProvider):
+        def _build_request(self, messages, model, temperature, max_tokens, stream, **kwargs):
+            return ProviderRequest("http://localhost", {}, model)
+
+        def test_connection(self):
+            return True
+
+        def get_available_models(self):
+            return []
+
+    with pytest.raises(TypeError, match="_parse_response"):
+        PartialProvider("")
+
+
+def test_code_agent_async_ollama_matches_sync(server, monkeypatch, tmp_path):
+    """Test aquery_llm sends query_llm's Ollama payload and timeout and shares its cache entries."""
+    import engine.core.llm_response_cache as llm_response_cache
+    from engine.runners.code_agent import CodeAgent
+
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setattr(llm_response_cache, "_global_llm_cache", None)
+    agent = CodeAgent(project_root=str(tmp_path), llm_provider="local")
+    agent.ollama_url = server.url
+
+    timeouts = []
+    build_request = LocalProvider._build_request
+
+    def recording_build_request(self, *args, **kwargs):
+        request = build_request(self, *args, **kwargs)
+        timeouts.append(request.timeout)
+        return request
+
+    monkeypatch.setattr(LocalProvider, "_build_request", recording_build_request)
+
+    async def run(prompt, cache):
+        content = await agent.aquery_llm(prompt, system_prompt="Be brief.", cache=cache)
+        await close_aio_session()
+        return content
+
+    assert asyncio.run(run("Say hello", cache=False)) == "Hello there"
+    assert agent.query_llm("Say hello", system_prompt="Be brief.", cache=False) == "Hello there"
+    assert server.payloads[0] == server.payloads[1]
+    assert "options" not in server.payloads[0] and timeouts == [300]
+
+    assert agent.query_llm("Say hi", system_prompt="Be brief.", cache=True) == "Hello there"
+    assert asyncio.run(run("Say hi", cache=True)) == "Hello there"
+    assert len(server.payloads) == 3
+    llm_response_cache._global_llm_cache.close()
@@ -0,0 +1,216 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import asyncio
+import json
+
+import pytest
+
+import engine.core.llm_response_cache as llm_response_cache
+from engine.core.llm_providers import LLMMessage, LLMProvider, OpenAIProvider, close_aio_session
+from engine.core.llm_response_cache import LLMResponseCache, make_key, normalize_text
+from engine.operations.pr_review_logic import ReviewLogic
+from engine.runners.monitor_service import get_monitor
+
+
+def _chat_completions(server, request):
+    """OpenAI chat/completions endpoint numbering its answers."""
+    return 200, {
+        "model": "gpt-4o", "usage": {"total_tokens": 5},
+        "choices": [{"message": {"content": f"answer {len(server.requests)}"}, "finish_reason": "stop"}]
+    }
+
+
+@pytest.fixture
+def server(stub_server):
+    return stub_server(_chat_completions)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"))
+    yield cache
+    cache.close()
+
+
+def test_key_normalization():
+    """Test formatting noise shares a key while content, indentation and sampling params do not."""
+    messages = [LLMMessage("system", "Review code."), LLMMessage("user", "def f():\n    return 1\n")]
+    noisy = [LLMMessage("system", "Review code.  \r\n"), LLMMessage("user", "\n def f():   \n    return 1\n\n\n\n")]
+    key = make_key("openai:x", "gpt-4o", messages, {"temperature": 0.3})
+
+    assert normalize_text("a  \r\n\n\n\nb\n") == "a\n\nb"
+    assert make_key("openai:x", "gpt-4o", noisy[:1] + [LLMMessage("user", "def f():   \n    return 1\n\n\n")],
+                    {"temperature": 0.3}) == key
+    assert make_key("openai:x", "gpt-4o", [{"role": m.role, "content": m.content} for m in messages],
+                    {"temperature": 0.30000001}) == key
+    assert make_key("openai:x", "gpt-4o", [messages[0], LLMMessage("user", "def f():\n  return 1")],
+                    {"temperature": 0.3}) != key
+    assert make_key("openai:x", "gpt-4o", messages, {"temperature": 0.7}) != key
+    assert make_key("openai:x", "gpt-4o-mini", messages, {"temperature": 0.3}) != key
+    assert make_key("local:x", "gpt-4o", messages, {"temperature": 0.3}) != key
+
+
+def test_provider_calls_are_cached(server, cache):
+    """Test repeated deterministic sync and async completions hit the cache and cache=False bypasses it."""
+    provider = OpenAIProvider("key", base_url=f"{server.url}/v1")
+    provider.response_cache = cache
+    cache.REPORT_INTERVAL = 0
+    messages = [LLMMessage("user", "Summarize issue #7")]
+
+    first = provider.chat_completion(messages, "gpt-4o", temperature=0)
+    assert provider.chat_completion(messages, "gpt-4o", temperature=0).content == first.content == "answer 1"
+    assert provider.chat_completion(messages, "gpt-4o", temperature=0, cache=False).content == "answer 2"
+    assert provider.chat_completion(messages, "gpt-4o", temperature=0.1, cache=True).content == "answer 3"
+
+    async def run():
+        response = await provider.achat_completion([LLMMessage("user", "Summarize issue #7  \n")], "gpt-4o", temperature=0)
+        await close_aio_session()
+        return response
+
+    cached = asyncio.run(run())
+    assert cached.content == "answer 1" and cached.usage == {"total_tokens": 5}
+    assert len(server.payloads) == 3
+    assert cache.stats.hits == 2 and cache.stats.misses == 2 and cache.stats.stores == 2
+
+    metrics = get_monitor().get_cache_metrics()["llm_responses"]
+    assert metrics["hits"] == 2 and metrics["hit_rate"] == 0.5
+
+
+def test_sampled_calls_are_not_cached_by_default(server, cache):
+    """Test temperature > 0 completions are not stored unless cache=True, also via the thread fallback."""
+    provider = OpenAIProvider("key", base_url=f"{server.url}/v1")
+    provider.response_cache = cache
+    messages = [LLMMessage("user", "Write a patch")]
+
+    assert provider.chat_completion(messages, "gpt-4o").content == "answer 1"
+    assert provider.chat_completion(messages, "gpt-4o").content == "answer 2"
+
+    class ThreadedProvider(LLMProvider):
+        """Custom provider (achat_completion runs chat_completion in a thread)."""
+        def chat_completion(self, messages, model, cache=None, **kwargs):
+            seen.append(cache)
+            return provider.chat_completion(messages, model, cache=cache, **kwargs)
+
+        def test_connection(self):
+            return True
+
+        def get_available_models(self):
+            return ["gpt-4o"]
+
+    seen = []
+    threaded = ThreadedProvider("key")
+    asyncio.run(threaded.achat_completion(messages, "gpt-4o", cache=False))
+    assert seen == [False]
+    assert cache.stats.stores == 0 and len(server.payloads) == 3
+
+
+def test_ttl_expiry(cache):
+    """Test expired entries are not served and are removed."""
+    cache.put("k", {"content": "x"})
+    assert cache.get("k") == {"content": "x"}
+    cache.ttl = -1
+    assert cache.get("k") is None
+    assert cache.info()["entries"] == 0
+
+
+def test_size_eviction_keeps_recently_used(cache):
+    """Test least recently used entries are evicted once stored responses exceed max_bytes."""
+    cache.PRUNE_INTERVAL = 1
+    entry = {"content": "y" * 100}
+    cache.max_bytes = 3 * len(json.dumps(entry))
+    for key in ["a", "b", "c"]:
+        cache.put(key, entry)
+    cache.get("a")  # Most recently used now
+    cache.put("d", entry)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ["a", "c", "d"])
+    assert cache.info()["entries"] == 3 and cache.stats.evictions == 1
+
+
+def test_pr_review_logic_reuses_review(monkeypatch, tmp_path):
+    """Test re-reviewing an unchanged file does not query Ollama again when caching is requested."""
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setattr(llm_response_cache, "_global_llm_cache", None)
+
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def json(self):
+            return {"response": "- [WARNING] Division by zero is not handled"}
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append(json)
+        return FakeResponse()
+
+    monkeypatch.setattr("engine.operations.pr_review_logic.requests.post", fake_post)
+    logic = ReviewLogic(use_llm=True)
+    first = logic.llm_review_file("calc.py", "+return a / b", cache=True)
+    assert logic.llm_review_file("calc.py", "+return a / b", cache=True) == first
+    assert first == ["🤖 LLM: [WARNING] Division by zero is not handled"]
+    assert len(calls) == 1
+
+    # Sampled at temperature 0.3: not cached unless the caller opts in
+    logic.llm_review_file("calc.py", "+return a / b")
+    logic.llm_review_file("calc.py", "+return a / b", cache=False)
+    assert len(calls) == 3
+    logic.review_python_file("calc.py", "+return a / b", "def div(a, b):\n    return a / b\n")
+    assert len(calls) == 3
+    llm_response_cache._global_llm_cache.close()
+
+
+def test_file_editor_and_complexity_analysis_hit_the_cache(monkeypatch, tmp_path):
+    """Test a retried file edit and a re-polled issue analysis are answered from the cache."""
+    from engine.operations.issue_complexity_analyzer import IssueComplexityAnalyzer
+    from engine.operations.llm_file_editor import LLMFileEditor
+    from engine.runners.code_agent import CodeAgent
+
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setattr(llm_response_cache, "_global_llm_cache", None)
+
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        text = ""
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"message": {"content": "print('hello')\n"}}
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append(json)
+        return FakeResponse()
+
+    monkeypatch.setattr("engine.runners.code_agent.requests.post", fake_post)
+    (tmp_path / "project").mkdir()
+    agent = CodeAgent(project_root=str(tmp_path / "project"), llm_provider="local")
+
+    editor = LLMFileEditor(agent)
+    assert editor.edit_file("hello.py", "Print hello")['success']
+    (tmp_path / "project" / "hello.py").unlink()
+    assert editor.edit_file("hello.py", "Print hello")['success']
+    assert len(calls) == 1
+
+    analyzer = IssueComplexityAnalyzer(llm_agent=agent)
+    analyzer._llm_semantic_analysis("Crash on start", "Traceback ...")
+    analyzer._llm_semantic_analysis("Crash on start", "Traceback ...")
+    assert len(calls) == 2
+    llm_response_cache._global_llm_cache.close()
+
+
+def test_monitor_reports_are_throttled(cache):
+    """Test lookups publish counters at most every REPORT_INTERVAL, and close() flushes them."""
+    cache.REPORT_INTERVAL = 3600
+    for _ in range(3):
+        cache.get("missing")
+    assert get_monitor().get_cache_metrics()["llm_responses"]["misses"] == 1
+
+    cache.close()
+    assert get_monitor().get_cache_metrics()["llm_responses"]["misses"] == 3
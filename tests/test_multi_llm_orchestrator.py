@@ -0,0 +1,230 @@
+"""Tests for MultiLLMOrchestrator against a stub OpenAI/Anthropic-compatible server."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from engine.operations.consensus_engine import ConsensusEngine
+from engine.operations.multi_llm_orchestrator import (
+    LatencyHistogram, LLMProvider, MultiLLMOrchestrator, ProviderLatency
+)
+
+
+def _answer(provider):
+    return json.dumps({
+        "analysis": f"{provider} analysis",
+        "proposed_fix": "--- a/app.py\n+++ b/app.py\n-return a - b\n+return a + b",
+        "reasoning": "Operator is wrong",
+        "confidence": 0.8,
+    })
+
+
+def _chat_endpoints(server, request):
+    """chat/completions and Anthropic messages, answering after the model's configured delay."""
+    model = request.payload["model"]
+    with server.lock:
+        delay = server.delays.get(model)
+        if isinstance(delay, list):
+            delay = delay.pop(0) if delay else None
+    if delay:
+        threading.Event().wait(delay)
+
+    if request.path.endswith("/messages"):
+        return 200, {"content": [{"type": "text", "text": _answer(model)}]}
+    return 200, {"choices": [{"message": {"content": f"```json\n{_answer(model)}\n```"}}]}
+
+
+@pytest.fixture
+def server(stub_server):
+    # delays: model -> seconds, or a list of per-request seconds consumed in order
+    return stub_server(_chat_endpoints, delays={})
+
+
+@pytest.fixture
+def orchestrator(server, tmp_path):
+    orchestrator = MultiLLMOrchestrator(config_path=str(tmp_path / "missing.yaml"))
+    orchestrator.api_keys = {"openai": "k", "anthropic": "k", "openrouter": "k"}
+    for provider, config in orchestrator.providers_config.items():
+        path = "/v1/messages" if provider == LLMProvider.CLAUDE else "/v1/chat/completions"
+        config.api_endpoint = f"{server.url}{path}"
+        config.model = provider.value
+    return orchestrator
+
+
+BUG = dict(
+    bug_description="add() subtracts",
+    code_context={"app.py": "def add(a, b):\n    return a - b\n"},
+    test_failures=["test_add failed: assert -1 == 3"],
+)
+
+
+def _analyze(orchestrator, **kwargs):
+    return orchestrator.analyze_bug(**BUG, **kwargs)
+
+
+def test_session_is_reused_across_calls(server, orchestrator):
+    """Test repeated analyses reuse pooled keep-alive connections and shutdown closes them."""
+    async def run():
+        async with orchestrator:
+            for _ in range(3):
+                responses = await _analyze(orchestrator)
+                assert [r.error for r in responses] == [None] * 4
+                assert {r.analysis for r in responses} == {f"{p.value} analysis" for p in LLMProvider}
+            session = orchestrator._session
+        assert session.closed and orchestrator._session is None
+
+    asyncio.run(run())
+    assert len(server.requests) == 12
+    assert server.connections <= 4  # One per parallel provider call, reused by later iterations
+
+
+def test_per_host_connection_limit(server, orchestrator):
+    """Test max_connections_per_host caps concurrent connections to one API host."""
+    orchestrator.max_connections_per_host = 1
+
+    async def run():
+        async with orchestrator:
+            await asyncio.gather(*(_analyze(orchestrator) for _ in range(3)))
+
+    asyncio.run(run())
+    assert len(server.requests) == 12
+    assert server.connections == 1
+
+
+
+def test_session_from_previous_loop_is_closed(server, orchestrator):
+    """Test a session left behind by another event loop is closed when it is replaced."""
+    async def run():
+        await _analyze(orchestrator, providers=[LLMProvider.GPT4])
+        return orchestrator._session
+
+    # Owning loop finished (asyncio.run returned without aclose)
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    assert first.closed and first is not second
+
+    # Owning loop still running in another thread
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        third = asyncio.run_coroutine_threadsafe(run(), other_loop).result(timeout=10)
+        assert second.closed
+        asyncio.run(run())
+        deadline = time.monotonic() + 5
+        while not third.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert third.closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+        asyncio.run(orchestrator.aclose())
+
+def test_latency_stats(server, orchestrator):
+    """Test connect / time-to-first-byte / total histograms per provider."""
+    server.delays["deepseek"] = 0.12
+
+    async def run():
+        async with orchestrator:
+            await _analyze(orchestrator)
+            await _analyze(orchestrator)
+
+    asyncio.run(run())
+    stats = orchestrator.get_provider_latency_stats()
+    assert set(stats) == set(LLMProvider)
+    for provider_stats in stats.values():
+        assert provider_stats["total"]["count"] == 2
+        assert provider_stats["new_connections"] + provider_stats["reused_connections"] == 2
+        assert provider_stats["reused_connections"] >= 1
+        assert provider_stats["ttfb"]["mean_ms"] <= provider_stats["total"]["mean_ms"]
+
+    deepseek = stats[LLMProvider.DEEPSEEK]
+    assert deepseek["ttfb"]["mean_ms"] >= 120 and deepseek["total"]["p95_ms"] == 250
+    assert deepseek["total"]["buckets"]["le_250ms"] == 2
+
+
+def test_latency_histogram_percentiles():
+    """Test bucket counts and bucket-bound percentile estimates."""
+    histogram = LatencyHistogram()
+    for seconds in [0.001, 0.02, 0.02, 0.3, 90]:
+        histogram.observe(seconds)
+    summary = histogram.to_dict()
+    assert summary["count"] == 5
+    assert summary["p50_ms"] == 25 and summary["p95_ms"] == 90000
+    assert summary["buckets"]["le_5ms"] == 1 and summary["buckets"]["inf"] == 1
+
+
+def test_streaming_consensus_exits_early(server, orchestrator):
+    """Test consensus is declared without waiting for a slow provider, whose call is cancelled."""
+    server.delays["deepseek"] = 5.0
+    engine = ConsensusEngine(min_confidence=0.6, min_agreement=2)
+
+    async def run():
+        async with orchestrator:
+            started = time.perf_counter()
+            decision, responses = await engine.reach_consensus_streaming(
+                orchestrator.iter_bug_analyses(**BUG),
+                orchestrator.get_provider_weights(),
+                expected_providers=list(orchestrator.providers_config)
+            )
+            return decision, responses, time.perf_counter() - started
+
+    decision, responses, elapsed = asyncio.run(run())
+    assert decision.has_consensus and elapsed < 2
+    assert LLMProvider.DEEPSEEK not in {r.provider for r in responses}
+    assert 2 <= len(responses) <= 3  # Two agreeing high-weight providers can already be decisive
+
+
+def test_hedged_request_wins_over_slow_primary(server, orchestrator):
+    """Test a call exceeding the provider's p95 gets a duplicate request and the faster answer is used."""
+    stats = orchestrator.latency.setdefault(LLMProvider.GPT4, ProviderLatency())
+    for _ in range(orchestrator.hedge_min_samples):
+        stats.total.observe(0.02)
+    server.delays["gpt4"] = [3.0]  # Only the first (primary) request is slow
+    config = orchestrator.providers_config[LLMProvider.GPT4]
+    config.backup_endpoint = config.api_endpoint.replace("127.0.0.1", "localhost")
+
+    async def run():
+        async with orchestrator:
+            started = time.perf_counter()
+            responses = await _analyze(orchestrator, providers=[LLMProvider.GPT4], hedge=True)
+            return responses, time.perf_counter() - started
+
+    responses, elapsed = asyncio.run(run())
+    assert [r.error for r in responses] == [None] and elapsed < 2
+    assert len(server.requests) == 2
+    assert server.requests[1].headers["Host"].startswith("localhost")
+    gpt4 = orchestrator.get_provider_latency_stats()[LLMProvider.GPT4]
+    assert gpt4["hedged_requests"] == 1 and gpt4["hedge_wins"] == 1
+
+
+def test_no_hedge_without_distinct_backup_endpoint(server, orchestrator):
+    """Test a slow call is not duplicated to the endpoint that is already slow."""
+    stats = orchestrator.latency.setdefault(LLMProvider.GPT4, ProviderLatency())
+    for _ in range(orchestrator.hedge_min_samples):
+        stats.total.observe(0.02)
+    server.delays["gpt4"] = [0.3]
+    config = orchestrator.providers_config[LLMProvider.GPT4]
+    config.backup_endpoint = config.api_endpoint
+
+    async def run():
+        async with orchestrator:
+            return await _analyze(orchestrator, providers=[LLMProvider.GPT4], hedge=True)
+
+    assert [r.error for r in asyncio.run(run())] == [None]
+    assert len(server.requests) == 1
+    assert orchestrator.get_provider_latency_stats()[LLMProvider.GPT4]["hedged_requests"] == 0
+
+
+def test_no_hedge_without_latency_history(server, orchestrator):
+    """Test hedging stays off until a provider has enough latency samples."""
+    async def run():
+        async with orchestrator:
+            return await _analyze(orchestrator, providers=[LLMProvider.GPT4], hedge=True)
+
+    assert [r.error for r in asyncio.run(run())] == [None]
+    assert len(server.requests) == 1
@@ -0,0 +1,108 @@
+"""Tests for batched, concurrent Ollama embedding requests against a stub server."""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from engine.rag.embedding_service import EmbeddingService
+
+
+DIM = 4
+
+
+def _vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0, 0.5]
+
+
+def _ollama(server, request):
+    """Minimal Ollama embedding API; ``batch_api=False`` emulates servers without /api/embed."""
+    if request.method == "GET":
+        return 200, {"models": []}
+    if request.path == "/api/embed" and not server.batch_api:
+        return 404, {"error": "not found"}
+    time.sleep(server.latency)
+    if request.path == "/api/embed":
+        return 200, {"embeddings": [_vector(text) for text in request.payload["input"]]}
+    return 200, {"embedding": _vector(request.payload["prompt"])}
+
+
+@pytest.fixture
+def stub(stub_server):
+    def start(batch_api=True, latency=0.0):
+        return stub_server(_ollama, batch_api=batch_api, latency=latency)
+
+    return start
+
+
+def _service(tmp_path, server, **kwargs):
+    service = EmbeddingService(
+        backend="ollama", ollama_url=server.url, cache_dir=tmp_path, use_cache=False, **kwargs
+    )
+    server.requests.clear()
+    return service
+
+
+def test_batches_preserve_order_with_bounded_concurrency(tmp_path, stub):
+    """Test texts go out in batch_size requests, at most max_concurrency at a time, in order."""
+    server = stub(latency=0.05)
+    service = _service(tmp_path, server, batch_size=10, max_concurrency=3)
+    assert service.embedding_dim == DIM
+
+    texts = [f"text number {i}" for i in range(95)]
+    embeddings = service.embed(texts)
+
+    np.testing.assert_array_equal(embeddings, np.array([_vector(t) for t in texts]))
+    assert sorted(len(payload["input"]) for payload in server.payloads) == [5] + [10] * 9
+    assert 1 < server.max_in_flight <= 3
+    service.close()
+
+
+def test_falls_back_to_single_text_endpoint(tmp_path, stub):
+    """Test servers without /api/embed are served through /api/embeddings."""
+    server = stub(batch_api=False)
+    service = _service(tmp_path, server, batch_size=4)
+
+    texts = [f"t{i}" for i in range(6)]
+    np.testing.assert_array_equal(service.embed(texts), np.array([_vector(t) for t in texts]))
+    assert {r.path for r in server.requests if r.status == 200} == {"/api/embeddings"}
+    service.close()
+
+
+def test_aembed_matches_embed(tmp_path, stub):
+    """Test the async variant batches concurrently and returns the same embeddings."""
+    server = stub(latency=0.05)
+    service = _service(tmp_path, server, batch_size=8, max_concurrency=4)
+    texts = [f"async {i}" for i in range(40)]
+
+    async def run():
+        try:
+            return await service.aembed(texts)
+        finally:
+            await service.aclose()
+
+    embeddings = asyncio.run(run())
+    np.testing.assert_array_equal(embeddings, np.array([_vector(t) for t in texts]))
+    assert len(server.requests) == 5
+    assert 1 < server.max_in_flight <= 4
+    service.close()
+
+
+def test_aembed_uses_cache(tmp_path, stub):
+    """Test aembed() only requests texts missing from the embedding cache."""
+    server = stub()
+    service = EmbeddingService(backend="ollama", ollama_url=server.url, cache_dir=tmp_path)
+    service.embed(["cached"])
+    server.requests.clear()
+
+    async def run():
+        try:
+            return await service.aembed(["cached", "fresh"])
+        finally:
+            await service.aclose()
+
+    embeddings = asyncio.run(run())
+    np.testing.assert_array_equal(embeddings, np.array([_vector("cached"), _vector("fresh")]))
+    assert [payload["input"] for payload in server.payloads] == [["fresh"]]
+    service.close()
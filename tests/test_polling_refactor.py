@@ -126,6 +126,30 @@ class TestStateManager:
             assert loaded.issue_number == 42
             assert loaded.claimed_by == "bot"
     
+    def test_in_flight_tracking_resets_on_load(self):
+        """Test in-flight markers persist but are cleared for a new process."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_file = Path(tmpdir) / "state.json"
+            manager = StateManager(state_file)
+            manager.set("owner/repo#7", IssueState(
+                issue_number=7,
+                repository="owner/repo",
+                claimed_by="bot",
+                claimed_at="2025-10-11T12:00:00Z"
+            ))
+            
+            manager.mark_in_flight("owner/repo#7")
+            manager.mark_in_flight("owner/repo#missing")  # No state, ignored
+            assert manager.is_in_flight("owner/repo#7")
+            assert manager.in_flight_keys() == ["owner/repo#7"]
+            assert manager.get("owner/repo#7").started_at is not None
+            manager.save()
+            
+            manager2 = StateManager(state_file)
+            manager2.load()
+            assert not manager2.is_in_flight("owner/repo#7")
+            assert manager2.get("owner/repo#7").claimed_by == "bot"
+    
     def test_cleanup_old_entries(self):
         """Test cleanup of old completed issues."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -277,6 +301,34 @@ class TestIssueFilter:
             
             assert len(actionable) == 0
     
+    def test_skip_in_flight_with_expired_claim(self):
+        """Test a running workflow is not restarted when its claim ages out."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_manager = StateManager(Path(tmpdir) / "state.json")
+            old_time = datetime.now(timezone.utc) - timedelta(minutes=120)
+            state_manager.set("owner/repo#1", IssueState(
+                issue_number=1,
+                repository="owner/repo",
+                claimed_by="bot",
+                claimed_at=old_time.isoformat()
+            ))
+            state_manager.mark_in_flight("owner/repo#1")
+            
+            filter = IssueFilter(
+                state_manager=state_manager,
+                watch_labels=["agent-ready"],
+                claim_timeout_minutes=60
+            )
+            issues = [{
+                "number": 1,
+                "repository": "owner/repo",
+                "title": "Long running",
+                "labels": [{"name": "agent-ready"}]
+            }]
+            
+            assert filter.filter_actionable_issues(issues) == []
+            assert state_manager.has("owner/repo#1")
+    
     def test_allow_expired_claims(self):
         """Test that issues with expired claims are allowed."""
         with tempfile.TemporaryDirectory() as tmpdir:
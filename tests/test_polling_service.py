@@ -283,88 +283,263 @@ class TestPollingService:
     @pytest.mark.asyncio
     async def test_claim_issue_success(self, polling_service):
         """Test successful issue claiming."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(returncode=0, stdout='', stderr='')
-            
+        with patch.object(polling_service.async_github_api, 'create_issue_comment',
+                          new_callable=AsyncMock) as mock_comment:
             result = await polling_service.claim_issue("owner/repo", 123)
             assert result is True
-            mock_run.assert_called_once()
+            mock_comment.assert_awaited_once()
+            assert polling_service.is_issue_claimed("owner/repo", 123) is True
     
     @pytest.mark.asyncio
     async def test_claim_issue_failure(self, polling_service):
         """Test failed issue claiming."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.side_effect = Exception("API error")
+        with patch.object(polling_service.async_github_api, 'create_issue_comment',
+                          new_callable=AsyncMock) as mock_comment:
+            mock_comment.side_effect = Exception("API error")
             
             result = await polling_service.claim_issue("owner/repo", 123)
             assert result is False
     
     def test_is_issue_claimed_not_claimed(self, polling_service):
         """Test checking unclaimed issue."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(
-                returncode=0,
-                stdout=json.dumps({'comments': []}),
-                stderr=''
-            )
-            
+        with patch.object(polling_service.github_api, 'get_issue_comments', return_value=[]):
             result = polling_service.is_issue_claimed("owner/repo", 123)
             assert result is False
     
     def test_is_issue_claimed_recently(self, polling_service):
         """Test checking recently claimed issue."""
-        recent_time = _utc_iso()
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(
-                returncode=0,
-                stdout=json.dumps({
-                    'comments': [{
-                        'body': '🤖 Agent test-bot started working on this issue',
-                        'createdAt': recent_time
-                    }]
-                }),
-                stderr=''
-            )
-            
+        comments = [{
+            'body': '🤖 Agent test-bot started working on this issue',
+            'createdAt': _utc_iso()
+        }]
+        with patch.object(polling_service.github_api, 'get_issue_comments', return_value=comments):
             result = polling_service.is_issue_claimed("owner/repo", 123)
             assert result is True
     
     def test_is_issue_claimed_expired(self, polling_service):
         """Test checking issue with expired claim."""
-        old_time = _utc_iso(-timedelta(hours=2))
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(
-                returncode=0,
-                stdout=json.dumps({
-                    'comments': [{
-                        'body': '🤖 Agent test-bot started working on this issue',
-                        'createdAt': old_time
-                    }]
-                }),
-                stderr=''
-            )
-            
+        comments = [{
+            'body': '🤖 Agent test-bot started working on this issue',
+            'createdAt': _utc_iso(-timedelta(hours=2))
+        }]
+        with patch.object(polling_service.github_api, 'get_issue_comments', return_value=comments):
             result = polling_service.is_issue_claimed("owner/repo", 123)
             assert result is False  # Claim expired
     
+    @pytest.mark.asyncio
+    async def test_is_issue_claimed_async(self, polling_service):
+        """Test async claim check uses the pooled async client."""
+        comments = [{
+            'body': '🤖 Agent test-bot started working on this issue',
+            'createdAt': _utc_iso()
+        }]
+        with patch.object(polling_service.async_github_api, 'get_issue_comments',
+                          new_callable=AsyncMock, return_value=comments) as mock_comments:
+            result = await polling_service.is_issue_claimed_async("owner/repo", 123)
+            assert result is True
+            mock_comments.assert_awaited_once_with(owner="owner", repo="repo", issue_number=123)
+    
+    @pytest.mark.asyncio
+    async def test_prefetch_claim_status_feeds_sync_checker(self, polling_service):
+        """Test prefetched claims answer the sync checker without blocking calls."""
+        issues = [
+            {'number': 1, 'repository': 'owner/repo', 'title': 'Issue 1', 'labels': []},
+            {'number': 2, 'repository': 'owner/repo', 'title': 'Issue 2', 'labels': []}
+        ]
+        claimed = [{
+            'body': '🤖 Agent other-bot started working on this issue',
+            'createdAt': _utc_iso()
+        }]
+        
+        async def fake_comments(owner, repo, issue_number):
+            return claimed if issue_number == 1 else []
+        
+        with patch.object(polling_service.async_github_api, 'get_issue_comments',
+                          side_effect=fake_comments), \
+             patch.object(polling_service.github_api, 'get_issue_comments') as mock_sync:
+            await polling_service.prefetch_claim_status(issues)
+            assert polling_service.is_issue_claimed("owner/repo", 1) is True
+            assert polling_service.is_issue_claimed("owner/repo", 2) is False
+            mock_sync.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_check_assigned_issues(self, polling_service):
         """Test checking assigned issues via GitHub API."""
-        mock_issues = [
-            {'number': 1, 'title': 'Test 1', 'labels': [], 'assignees': []},
-            {'number': 2, 'title': 'Test 2', 'labels': [], 'assignees': []}
+        polling_service.config.repositories = ["owner/repo1", "owner/repo2"]
+        
+        async def fake_list_issues(owner, repo, labels, **kwargs):
+            return [
+                {'number': 1, 'title': 'Test 1', 'labels': [], 'assignees': []},
+                {'number': 2, 'title': 'Test 2', 'labels': [], 'assignees': []}
+            ]
+        
+        with patch.object(polling_service.async_github_api, 'list_issues',
+                          side_effect=fake_list_issues) as mock_list:
+            issues = await polling_service.check_assigned_issues()
+            assert len(issues) == 4  # 2 repos × 2 issues (deduplicated across labels)
+            assert all('repository' in issue for issue in issues)
+            # One request per repo per watch label
+            assert mock_list.call_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_check_assigned_issues_bounded_concurrency(self, polling_service):
+        """Test repo/label fan-out never exceeds github_max_concurrency."""
+        polling_service.config.repositories = [f"owner/repo{i}" for i in range(6)]
+        polling_service.config.github_max_concurrency = 3
+        in_flight = 0
+        peak = 0
+        
+        async def fake_list_issues(owner, repo, labels, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+        
+        with patch.object(polling_service.async_github_api, 'list_issues',
+                          side_effect=fake_list_issues) as mock_list:
+            await polling_service.check_assigned_issues()
+        
+        assert mock_list.call_count == 12
+        assert 1 < peak <= 3
+    
+    @pytest.mark.asyncio
+    async def test_check_assigned_issues_isolates_repo_errors(self, polling_service):
+        """Test a failing repository does not drop results from the others."""
+        polling_service.config.repositories = ["owner/good", "owner/bad"]
+        
+        async def fake_list_issues(owner, repo, labels, **kwargs):
+            if repo == "bad":
+                raise RuntimeError("boom")
+            return [{'number': 7, 'title': 'Good', 'labels': [], 'assignees': []}]
+        
+        with patch.object(polling_service.async_github_api, 'list_issues',
+                          side_effect=fake_list_issues):
+            issues = await polling_service.check_assigned_issues()
+        
+        assert [issue['repository'] for issue in issues] == ["owner/good"]
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_serves_issues_and_claims(self, polling_service):
+        """Test a cycle snapshot replaces per-label and per-issue REST calls."""
+        from engine.operations.repo_snapshot import RepoSnapshot
+        
+        polling_service.config.repositories = ["owner/repo1", "owner/repo2"]
+        claimed = {
+            'author': {'login': 'other-bot'},
+            'body': '🤖 Agent other-bot started working on this issue',
+            'createdAt': _utc_iso()
+        }
+        snapshot_issues = [
+            {'number': 1, 'title': 'Claimed', 'labels': [{'name': 'agent-ready'}],
+             'repository': 'owner/repo1', 'comments': [claimed]},
+            {'number': 2, 'title': 'Free', 'labels': [{'name': 'test-label'}],
+             'repository': 'owner/repo1', 'comments': []},
+            {'number': 3, 'title': 'Opener only', 'labels': [{'name': 'needs-opener'}],
+             'repository': 'owner/repo1', 'comments': []}
         ]
         
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(
-                returncode=0,
-                stdout=json.dumps(mock_issues),
-                stderr=''
+        async def fake_fetch(repo, labels, include_pull_requests=True):
+            if repo == "owner/repo2":
+                raise RuntimeError("graphql down")
+            return RepoSnapshot(repository=repo, issues=snapshot_issues, pages=1)
+        
+        async def fake_list_issues(owner, repo, labels, **kwargs):
+            return [{'number': 9, 'title': 'REST', 'labels': [], 'assignees': []}]
+        
+        with patch.object(polling_service.snapshot_fetcher, 'fetch', side_effect=fake_fetch), \
+             patch.object(polling_service.async_github_api, 'list_issues',
+                          side_effect=fake_list_issues) as mock_list, \
+             patch.object(polling_service.async_github_api, 'get_issue_comments',
+                          new_callable=AsyncMock, return_value=[]) as mock_comments:
+            await polling_service.fetch_snapshots()
+            issues = await polling_service.check_assigned_issues()
+            await polling_service.prefetch_claim_status(
+                [issue for issue in issues if issue['repository'] == 'owner/repo1']
+            )
+        
+        # repo1 from snapshot (watch labels only), repo2 falls back to REST per label
+        assert sorted((i['repository'], i['number']) for i in issues) == [
+            ('owner/repo1', 1), ('owner/repo1', 2), ('owner/repo2', 9)
+        ]
+        assert mock_list.call_count == 2
+        assert polling_service.is_issue_claimed("owner/repo1", 1) is True
+        assert polling_service.is_issue_claimed("owner/repo1", 2) is False
+        mock_comments.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_check_pull_requests_uses_snapshot(self, polling_service):
+        """Test PR monitoring reviews PRs from the snapshot without listing them."""
+        from engine.operations.repo_snapshot import RepoSnapshot
+        
+        polling_service.config.repositories = ["owner/repo1"]
+        polling_service.config.pr_monitoring_enabled = True
+        pr = {'number': 5, 'title': 'PR', 'draft': False, 'user': {'login': 'bot'},
+              'labels': [], 'head': {'sha': 'abc123'}}
+        polling_service._snapshots = {
+            "owner/repo1": RepoSnapshot(repository="owner/repo1", pull_requests=[pr])
+        }
+        
+        with patch.object(polling_service.async_github_api, 'list_pull_requests',
+                          new_callable=AsyncMock) as mock_list, \
+             patch.object(polling_service, 'trigger_pr_review',
+                          new_callable=AsyncMock) as mock_review:
+            await polling_service.check_pull_requests()
+        
+        mock_list.assert_not_called()
+        mock_review.assert_awaited_once_with("owner/repo1", 5, pr)
+    
+    @pytest.mark.asyncio
+    async def test_workflow_tracked_in_flight(self, polling_service):
+        """Test a running workflow is in flight in StateManager until it finishes."""
+        release = asyncio.Event()
+        seen = {}
+        
+        async def slow_pipeline(repo, number):
+            seen['in_flight'] = polling_service.state_manager.is_in_flight("owner/repo#4")
+            await release.wait()
+            return {'success': True}
+        
+        orchestrator = Mock(handle_new_issue=slow_pipeline)
+        polling_service.agent_registry = Mock(get_agent=Mock(return_value=object()))
+        polling_service.is_issue_claimed_async = AsyncMock(return_value=False)
+        polling_service.claim_issue = AsyncMock(return_value=True)
+        
+        with patch('engine.core.pipeline_orchestrator.get_orchestrator', return_value=orchestrator):
+            assert polling_service.scheduler.submit(
+                {'repository': 'owner/repo', 'number': 4, 'title': 'Slow', 'labels': []}
             )
+            await asyncio.sleep(0.01)
             
-            issues = await polling_service.check_assigned_issues()
-            assert len(issues) == 4  # 2 repos × 2 issues
-            assert all('repository' in issue for issue in issues)
+            # Next cycle sees it in flight and does not resubmit
+            assert polling_service.state_manager.in_flight_keys() == ["owner/repo#4"]
+            assert not polling_service.scheduler.submit(
+                {'repository': 'owner/repo', 'number': 4, 'title': 'Slow', 'labels': []}
+            )
+            
+            release.set()
+            await polling_service.scheduler.join()
+        
+        assert seen['in_flight'] is True
+        assert not polling_service.state_manager.is_in_flight("owner/repo#4")
+        assert polling_service.state["owner/repo#4"].completed
+    
+    @pytest.mark.asyncio
+    async def test_pr_review_runs_on_worker_pool(self, polling_service):
+        """Test PR reviews are queued off the loop and marked reviewed on success."""
+        polling_service.review_executor.review_lock = None
+        pr = {'number': 8, 'head': {'sha': 'def456'}, 'user': {'login': 'bot'}}
+        
+        with patch.object(polling_service, '_run_pr_review', return_value={'merged': False}) as mock_run:
+            assert await polling_service.trigger_pr_review("owner/repo", 8, pr)
+            # Second trigger while queued is deduplicated
+            assert not await polling_service.trigger_pr_review("owner/repo", 8, pr)
+            assert not polling_service._should_review_pr("owner/repo", pr)
+            await polling_service.review_executor.join()
+        
+        mock_run.assert_called_once_with("owner/repo", 8, pr)
+        assert polling_service.reviewed_prs["owner/repo#8"]['sha'] == 'def456'
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,130 @@
+"""Tests for RateLimiter sliding-window counters."""
+
+import itertools
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from engine.core.rate_limiter import (
+    OperationType,
+    RateLimitConfig,
+    RateLimiter,
+    SlidingWindowCounter
+)
+
+
+class TestSlidingWindowCounter:
+    """Test bucketed ring counter."""
+
+    def test_counts_and_expires(self):
+        counter = SlidingWindowCounter(60, bucket_seconds=1)
+        counter.add(1000.0)
+        counter.add(1000.5)
+        counter.add(1030.0)
+        assert counter.count(1030.0) == 3
+        assert counter.count(1059.9) == 3
+        assert counter.count(1061.0) == 1  # first bucket expired
+        assert counter.count(1091.0) == 0
+
+    def test_long_idle_resets(self):
+        counter = SlidingWindowCounter(3600, bucket_seconds=60)
+        for i in range(100):
+            counter.add(i * 10.0)
+        assert counter.count(990.0) == 100
+        assert counter.count(10 * 86400.0) == 0
+        counter.add(10 * 86400.0)
+        assert counter.count(10 * 86400.0) == 1
+
+    def test_clock_going_backwards_is_counted(self):
+        counter = SlidingWindowCounter(60, bucket_seconds=1)
+        counter.add(500.0)
+        counter.add(499.0)
+        assert counter.count(500.0) == 2
+
+
+class TestRateLimiterWindows:
+    """Test limits and stats backed by the counters."""
+
+    def test_comment_minute_limit(self):
+        limiter = RateLimiter(RateLimitConfig(comment_cooldown=0, comments_per_minute=3))
+        clock = [10_000.0]
+        with patch('engine.core.rate_limiter.time.time', side_effect=lambda: clock[0]):
+            for _ in range(3):
+                limiter.record_operation(OperationType.ISSUE_COMMENT, "o/r#1")
+                clock[0] += 1
+            allowed, reason = limiter.check_rate_limit(OperationType.ISSUE_COMMENT, "o/r#1")
+            assert not allowed and "3/min" in reason
+
+            clock[0] += 61
+            allowed, _ = limiter.check_rate_limit(OperationType.ISSUE_COMMENT, "o/r#1")
+            assert allowed
+
+    def test_stats_and_burst(self):
+        limiter = RateLimiter(RateLimitConfig(max_burst_operations=10))
+        clock = [50_000.0]
+        with patch('engine.core.rate_limiter.time.time', side_effect=lambda: clock[0]):
+            for i in range(10):
+                limiter.record_operation(OperationType.API_READ, f"o/r#{i}")
+            stats = limiter.get_stats()
+            assert stats['operations_last_minute'] == 10
+            assert stats['by_type']['api_read'] == 10
+            assert stats['by_type']['pr_create'] == 0
+            assert limiter._is_burst_detected(clock[0])
+
+            clock[0] += 7200
+            stats = limiter.get_stats()
+            assert (stats['operations_last_minute'], stats['operations_last_hour'], stats['operations_last_day']) == (0, 0, 10)
+            assert not limiter._is_burst_detected(clock[0])
+
+
+    def test_concurrent_records_keep_exact_totals(self):
+        """Test records from several threads, spanning bucket expiries, lose no counts."""
+        limiter = RateLimiter()
+        ticks = itertools.count()  # Thread-safe, unlike a generator
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(500):
+                limiter.record_operation(OperationType.API_READ, "o/r")
+
+        with patch('engine.core.rate_limiter.time.time', side_effect=lambda: 1_000_000.0 + next(ticks) * 0.01):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = limiter.get_stats()
+        assert stats['operations_last_hour'] == stats['operations_last_day'] == 4000
+        assert stats['by_type']['api_read'] == 4000
+
+
+def test_check_latency_benchmark_10k_ops():
+    """Micro-benchmark: check_rate_limit latency with 10k recorded operations.
+
+    The previous implementation rescanned the 10k-entry history (three passes
+    per check plus one for burst detection); counters keep checks O(1).
+    """
+    limiter = RateLimiter()
+    base = 100_000.0
+    # 10k operations spread over the last 30 minutes
+    timestamps = iter(base + i * 0.18 for i in range(10_000))
+    with patch('engine.core.rate_limiter.time.time', side_effect=lambda: next(timestamps)):
+        for i in range(10_000):
+            limiter.record_operation(OperationType.ISSUE_UPDATE, f"o/r#{i}")
+    assert len(limiter.operations) == 10_000
+    assert limiter.operation_counts.hour.count(base + 1800) == 10_000
+
+    iterations = 2_000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        limiter._check_operation_limits(OperationType.ISSUE_UPDATE, base + 1800)
+        limiter._is_burst_detected(base + 1800)
+        limiter.operation_counts.counts(base + 1800)
+    per_check_us = (time.perf_counter() - start) / iterations * 1e6
+
+    print(f"\nRateLimiter check + stats at 10k ops: {per_check_us:.1f}µs per call")
+    # Full-history scans took milliseconds here; counters stay in the microsecond range
+    assert per_check_us < 500
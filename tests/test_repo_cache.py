@@ -0,0 +1,165 @@
+"""Tests for the git mirror cache and worktree checkouts."""
+
+import os
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from engine.core.pipeline_orchestrator import PipelineConfig, PipelineOrchestrator
+from engine.operations.repo_cache import RepoCacheError, RepoCacheManager
+
+
+def _git(*args, cwd=None):
+    result = subprocess.run(
+        ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Local bare repository standing in for github.com/owner/repo."""
+    origin = tmp_path / "remote" / "owner" / "repo.git"
+    origin.mkdir(parents=True)
+    _git('init', '--bare', '--quiet', '--initial-branch=main', cwd=origin)
+
+    seed = tmp_path / "seed"
+    _git('clone', '--quiet', str(origin), str(seed))
+    (seed / "README.md").write_text("hello\n")
+    _git('add', '-A', cwd=seed)
+    _git('commit', '--quiet', '-m', 'init', cwd=seed)
+    _git('push', '--quiet', 'origin', 'HEAD:main', cwd=seed)
+    return origin, seed
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RepoCacheManager(
+        cache_dir=str(tmp_path / "cache"),
+        url_template=str(tmp_path / "remote" / "{repo}.git")
+    )
+
+
+def test_checkout_commit_push_and_release(cache, remote):
+    """Test a worktree run can commit and push, and leaves no trace after release."""
+    origin, _ = remote
+    checkout = cache.checkout("owner/repo", "fix-issue-1", token="secret-token")
+
+    assert checkout.base_ref == "main"
+    assert (checkout.path / "README.md").read_text() == "hello\n"
+    assert 'secret-token' not in (checkout.mirror / "config").read_text()
+
+    (checkout.path / "fix.py").write_text("x = 1\n")
+    _git('add', '-A', cwd=checkout.path)
+    _git('commit', '--quiet', '-m', 'fix', cwd=checkout.path)
+    subprocess.run(['git', 'push', '--quiet', 'origin', 'fix-issue-1'], cwd=checkout.path, env=checkout.env, check=True)
+    assert _git('rev-parse', 'fix-issue-1', cwd=origin)
+
+    cache.release(checkout)
+    assert not checkout.path.exists()
+    assert 'fix-issue-1' not in _git('branch', '--list', cwd=checkout.mirror)
+
+
+def test_mirror_is_reused_and_fetched_incrementally(cache, remote):
+    """Test the second run fetches new commits into the existing mirror."""
+    _, seed = remote
+    with cache.workspace("owner/repo", "run-1") as first:
+        mirror_inode = os.stat(first.mirror).st_ino
+
+    (seed / "NEW.md").write_text("new\n")
+    _git('add', '-A', cwd=seed)
+    _git('commit', '--quiet', '-m', 'second', cwd=seed)
+    _git('push', '--quiet', 'origin', 'HEAD:main', cwd=seed)
+
+    with cache.workspace("owner/repo", "run-2") as second:
+        assert os.stat(second.mirror).st_ino == mirror_inode
+        assert (second.path / "NEW.md").exists()
+
+
+def test_concurrent_worktrees_and_existing_branch(cache, remote):
+    """Test parallel runs get separate worktrees; PR branches start from origin."""
+    _, seed = remote
+    _git('push', '--quiet', 'origin', 'HEAD:feature', cwd=seed)
+
+    a = cache.checkout("owner/repo", "fix-issue-1")
+    b = cache.checkout("owner/repo", "feature", start_point="origin/feature")
+    assert a.path != b.path
+    assert _git('rev-parse', '--abbrev-ref', 'HEAD', cwd=b.path) == "feature"
+
+    # Same branch cannot be checked out twice at once
+    with pytest.raises(RepoCacheError):
+        cache.checkout("owner/repo", "fix-issue-1")
+
+    cache.release(a)
+    cache.release(b)
+
+
+def test_gc_removes_stale_worktrees_and_enforces_quota(tmp_path, remote):
+    """Test gc prunes abandoned runs and evicts idle mirrors over quota."""
+    origin, _ = remote
+    other = tmp_path / "remote" / "owner" / "other.git"
+    _git('clone', '--quiet', '--bare', str(origin), str(other))
+
+    cache = RepoCacheManager(
+        cache_dir=str(tmp_path / "cache"),
+        url_template=str(tmp_path / "remote" / "{repo}.git"),
+        stale_after_seconds=3600
+    )
+    abandoned = cache.checkout("owner/repo", "crashed-run")
+    old = time.time() - 7200
+    os.utime(abandoned.path, (old, old))
+    cache.ensure_mirror("owner/other")
+    in_use = cache.checkout("owner/repo", "live-run")
+
+    cache.max_disk_bytes = 1  # Force eviction
+    stats = cache.gc()
+
+    assert stats == {'worktrees_removed': 1, 'mirrors_evicted': 1}
+    assert not abandoned.path.exists()
+    assert not cache.mirror_path("owner/other").exists()
+    assert cache.mirror_path("owner/repo").exists()  # live worktree protects it
+    cache.release(in_use)
+
+
+def test_gc_skips_mirror_locked_by_another_run(cache, remote):
+    """Test quota eviction leaves a mirror alone while its lock is held (fetch or checkout in progress)."""
+    cache.ensure_mirror("owner/repo")
+    cache.max_disk_bytes = 1
+
+    with cache._locked("owner/repo"):
+        assert cache.gc()['mirrors_evicted'] == 0
+    assert cache.mirror_path("owner/repo").exists()
+
+    assert cache.gc()['mirrors_evicted'] == 1
+    assert not cache.mirror_path("owner/repo").exists()
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_create_pull_request_uses_worktree(tmp_path, remote):
+    """Test PipelineOrchestrator pushes generated files from a cached worktree."""
+    origin, _ = remote
+    orchestrator = PipelineOrchestrator(PipelineConfig(repo_cache_dir=str(tmp_path / "cache")))
+    orchestrator.repo_cache.url_template = str(tmp_path / "remote" / "{repo}.git")
+
+    response = Mock(status_code=201, json=Mock(return_value={'number': 5, 'html_url': 'https://example/pr/5'}))
+    with patch('requests.post', return_value=response):
+        result = await orchestrator._create_pull_request(
+            "owner/repo",
+            7,
+            {'title': 'Add module'},
+            {
+                'files': ['src/mod.py'],
+                'module_path': 'src/mod.py',
+                'module_content': 'VALUE = 1\n'
+            },
+            token="secret-token"
+        )
+
+    assert result['success'] is True
+    assert _git('show', 'fix-issue-7:src/mod.py', cwd=origin) == "VALUE = 1"
+    assert not any((tmp_path / "cache" / "worktrees" / "owner__repo").iterdir())
@@ -0,0 +1,148 @@
+"""Tests for GraphQL repository snapshots."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from engine.core.rate_limiter import reset_rate_limiter
+from engine.operations.async_github_api_helper import AsyncGitHubAPIHelper
+from engine.operations.github_response_cache import ConditionalRequestCache
+from engine.operations.repo_snapshot import RepoSnapshotFetcher
+
+
+def _issue_node(number, labels, comments=()):
+    return {
+        'number': number,
+        'title': f'Issue {number}',
+        'body': 'text',
+        'url': f'https://github.com/owner/repo/issues/{number}',
+        'state': 'OPEN',
+        'createdAt': '2025-01-01T00:00:00Z',
+        'updatedAt': '2025-01-02T00:00:00Z',
+        'labels': {'nodes': [{'name': label} for label in labels]},
+        'assignees': {'nodes': []},
+        'comments': {'nodes': list(comments)}
+    }
+
+
+def _pr_node(number, draft=False, review=None, comments=()):
+    return {
+        'number': number,
+        'title': f'PR {number}',
+        'url': f'https://github.com/owner/repo/pull/{number}',
+        'isDraft': draft,
+        'headRefOid': f'sha{number}',
+        'headRefName': f'branch-{number}',
+        'baseRefName': 'main',
+        'createdAt': '2025-01-01T00:00:00Z',
+        'updatedAt': '2025-01-02T00:00:00Z',
+        'author': {'login': 'bot'},
+        'labels': {'nodes': []},
+        'reviews': {'nodes': [{'state': review}] if review else []},
+        'comments': {'nodes': [{'body': body} for body in comments]}
+    }
+
+
+def _page(nodes, cursor=None):
+    return {
+        'pageInfo': {'hasNextPage': cursor is not None, 'endCursor': cursor},
+        'nodes': nodes
+    }
+
+
+@pytest.fixture
+def helper(tmp_path):
+    reset_rate_limiter()
+    return AsyncGitHubAPIHelper(
+        token="test-token",
+        response_cache=ConditionalRequestCache(db_path=str(tmp_path / "etag.db"))
+    )
+
+
+def _install_transport(helper, handler):
+    """Attach a mock transport to the helper's pooled client."""
+    helper._client = httpx.AsyncClient(
+        base_url=helper.BASE_URL,
+        headers=helper.headers,
+        transport=httpx.MockTransport(handler)
+    )
+    helper._client_loop = asyncio.get_running_loop()
+
+
+@pytest.mark.asyncio
+async def test_fetch_paginates_issues_and_prs(helper):
+    """Test both connections are paged independently and converted."""
+    seen_variables = []
+
+    def handler(request):
+        variables = json.loads(request.content)['variables']
+        seen_variables.append(variables)
+        repository = {}
+        if variables['withIssues']:
+            if variables['issueCursor'] is None:
+                repository['issues'] = _page([_issue_node(1, ['agent-ready'], [{
+                    'author': None, 'body': 'hi',
+                    'createdAt': '2025-01-03T00:00:00Z', 'updatedAt': '2025-01-03T00:00:00Z'
+                }])], cursor='i1')
+            else:
+                repository['issues'] = _page([_issue_node(2, ['auto-assign'])])
+        if variables['withPRs']:
+            repository['pullRequests'] = _page([
+                _pr_node(10, draft=True, review='APPROVED', comments=['looks fine']),
+                _pr_node(11, draft=True, review='CHANGES_REQUESTED', comments=['❌ broken test'])
+            ])
+        return httpx.Response(200, json={'data': {'repository': repository}})
+
+    _install_transport(helper, handler)
+    snapshot = await RepoSnapshotFetcher(helper).fetch("owner/repo", ['agent-ready', 'auto-assign'])
+    await helper.aclose()
+
+    assert snapshot.pages == 2
+    assert seen_variables[0]['labels'] == ['agent-ready', 'auto-assign']
+    assert seen_variables[1]['withPRs'] is False
+    assert seen_variables[1]['issueCursor'] == 'i1'
+
+    assert [issue['number'] for issue in snapshot.issues] == [1, 2]
+    issue = snapshot.issues[0]
+    assert issue['repository'] == "owner/repo"
+    assert issue['labels'] == [{'name': 'agent-ready'}]
+    assert issue['state'] == 'open'
+    assert issue['comments'][0]['author'] == {'login': 'ghost'}
+    assert [i['number'] for i in snapshot.issues_with_labels(['auto-assign'])] == [2]
+
+    approved, blocked = snapshot.draft_prs_by_author('bot')
+    assert approved['head']['sha'] == 'sha10'
+    assert approved['latest_review_state'] == 'APPROVED'
+    assert approved['has_unresolved_issues'] is False
+    assert blocked['critical_issues'] == ['❌ broken test']
+    assert snapshot.draft_prs_by_author('someone-else') == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_without_labels_skips_issues(helper):
+    """Test no issue connection is requested when no labels are watched."""
+    def handler(request):
+        variables = json.loads(request.content)['variables']
+        assert variables['withIssues'] is False
+        return httpx.Response(200, json={'data': {'repository': {'pullRequests': _page([])}}})
+
+    _install_transport(helper, handler)
+    snapshot = await RepoSnapshotFetcher(helper).fetch("owner/repo", [])
+    await helper.aclose()
+
+    assert snapshot.pages == 1
+    assert snapshot.issues == []
+
+
+@pytest.mark.asyncio
+async def test_graphql_errors_raise(helper):
+    """Test GraphQL error payloads surface as RuntimeError."""
+    _install_transport(helper, lambda request: httpx.Response(
+        200, json={'data': None, 'errors': [{'message': 'Could not resolve to a Repository'}]}
+    ))
+
+    with pytest.raises(RuntimeError, match="Could not resolve"):
+        await RepoSnapshotFetcher(helper).fetch("owner/missing", ['agent-ready'])
+    await helper.aclose()
@@ -0,0 +1,122 @@
+"""Tests for RAGRetriever fan-out, caches and batch retrieval."""
+
+import threading
+import time
+
+import pytest
+
+import engine.rag.retriever as retriever_module
+from engine.rag.embedded_vector_store import EmbeddedVectorStore
+from engine.rag.retriever import RAGRetriever
+from engine.rag.vector_store import SearchResult
+
+
+DIM = 8
+
+
+class SlowStore:
+    """Vector store stub whose searches take a fixed time."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.searches = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def search(self, collection_name, query_embedding, top_k=5, filter_expr=None):
+        time.sleep(self.delay)
+        with self.lock:
+            self.searches.append((collection_name, top_k))
+            self.threads.add(threading.current_thread().name)
+        return [
+            SearchResult(id=f"{collection_name}{i}", content=f"{collection_name} {i}", metadata={},
+                         score=0.9 - i * 0.01, collection=collection_name)
+            for i in range(top_k)
+        ]
+
+    def collection_version(self, collection_name):
+        return 0
+
+    def close(self):
+        pass
+
+
+def test_collections_are_searched_concurrently(fake_embeddings):
+    """Test code, docs and issues are searched in parallel, not one after another."""
+    store = SlowStore(delay=0.2)
+    retriever = RAGRetriever(embedding_service=fake_embeddings(), vector_store=store, min_score=0.0)
+
+    started = time.perf_counter()
+    results = retriever.retrieve("how are webhooks verified?", top_k=4)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert len(results) == 4
+    assert {source for source, _ in store.searches} == {"code", "docs", "issues"}
+    assert all(name.startswith("rag-search") for name in store.threads)
+    retriever.close()
+
+
+def test_retrieve_many_embeds_in_one_call_and_caches(fake_embeddings):
+    """Test batch retrieval embeds unique queries once and reuses cached embeddings and results."""
+    embeddings = fake_embeddings()
+    store = SlowStore(delay=0)
+    retriever = RAGRetriever(embedding_service=embeddings, vector_store=store, min_score=0.0)
+
+    batches = retriever.retrieve_many(["fix login", "add retries", "fix login"], sources=["code", "docs"], top_k=3)
+    assert len(batches) == 3 and all(len(results) == 3 for results in batches)
+    assert embeddings.calls == [["fix login", "add retries"]]
+    assert len(store.searches) == 4  # Duplicate query searched once
+
+    # Same query (whitespace variant), smaller top_k: no model call, no search
+    results = retriever.retrieve("fix   login\n", sources=["code"], top_k=2)
+    assert [r.content for r in results] == ["code 0", "code 1"]
+    assert len(embeddings.calls) == 1
+    assert len(store.searches) == 4
+
+    # Larger top_k than cached needs a fresh search
+    retriever.retrieve("fix login", sources=["code"], top_k=6)
+    assert store.searches[-1] == ("code", 6)
+    assert retriever.cache_stats['embedding_misses'] == 2
+    retriever.close()
+
+
+def test_result_cache_ttl(monkeypatch, fake_embeddings):
+    """Test cached results expire after cache_ttl seconds."""
+    now = [1000.0]
+    monkeypatch.setattr(retriever_module.time, "monotonic", lambda: now[0])
+    store = SlowStore(delay=0)
+    retriever = RAGRetriever(
+        embedding_service=fake_embeddings(), vector_store=store, min_score=0.0, cache_ttl=60
+    )
+
+    retriever.retrieve("query", sources=["docs"])
+    now[0] += 30
+    retriever.retrieve("query", sources=["docs"])
+    assert len(store.searches) == 1
+    now[0] += 31
+    retriever.retrieve("query", sources=["docs"])
+    assert len(store.searches) == 2
+    retriever.close()
+
+
+def test_reindex_invalidates_cached_results(tmp_path, fake_embeddings):
+    """Test a write to a collection, even from another store instance, invalidates its cached results."""
+    embeddings = fake_embeddings()
+    store = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path))
+    query_vector = embeddings.embed("retry logic")[0]
+    store.insert("code", ["old"], query_vector[None, :] + 0.5, ["old code"], [{"file_path": "a.py"}])
+    store.insert("docs", ["doc"], query_vector[None, :], ["doc text"], [{"file_path": "a.md"}])
+
+    retriever = RAGRetriever(embedding_service=embeddings, vector_store=store, min_score=0.0)
+    assert [r.content for r in retriever.retrieve("retry logic", sources=["code", "docs"])] == ["doc text", "old code"]
+
+    # Reindex code through a separate store on the same directory
+    writer = EmbeddedVectorStore(embedding_dim=DIM, persist_dir=str(tmp_path))
+    writer.insert("code", ["new"], query_vector[None, :], ["new code"], [{"file_path": "b.py"}])
+    writer.close()
+
+    results = retriever.retrieve("retry logic", sources=["code", "docs"])
+    assert {r.content for r in results} == {"doc text", "new code", "old code"}
+    assert retriever.cache_stats['result_hits'] == 1  # docs unchanged, still cached
+    retriever.close()
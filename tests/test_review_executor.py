@@ -0,0 +1,82 @@
+"""Tests for the PR review worker pool."""
+
+import asyncio
+import tempfile
+import threading
+import time
+
+import pytest
+
+from engine.runners.review_executor import ReviewExecutor
+from engine.utils.review_lock import ReviewLock
+
+
+@pytest.mark.asyncio
+async def test_reviews_run_in_parallel_off_loop():
+    """Test blocking reviews run concurrently without stalling the event loop."""
+    executor = ReviewExecutor(max_workers=2)
+    threads = []
+    results = []
+
+    def review():
+        threads.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return {'ok': True}
+
+    start = time.monotonic()
+    executor.submit("o/a", 1, review, on_complete=results.append)
+    executor.submit("o/b", 2, review, on_complete=results.append)
+
+    # Event loop keeps ticking while reviews block their threads
+    ticks = 0
+    while executor.active_count:
+        await asyncio.sleep(0.01)
+        ticks += 1
+
+    assert time.monotonic() - start < 0.35
+    assert ticks > 5
+    assert results == [{'ok': True}, {'ok': True}]
+    assert all(name.startswith("pr-review") for name in threads)
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_and_locked_prs_skipped():
+    """Test active reviews and PRs locked elsewhere are not submitted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lock = ReviewLock(lock_dir=tmpdir)
+        ReviewLock(lock_dir=tmpdir).acquire("o/r", 2, "github-actions")
+        executor = ReviewExecutor(max_workers=1, review_lock=lock)
+        release = threading.Event()
+
+        assert executor.submit("o/r", 1, release.wait) is not None
+        assert executor.is_active("o/r", 1)
+        assert executor.submit("o/r", 1, release.wait) is None
+        assert executor.submit("o/r", 2, release.wait) is None
+
+        release.set()
+        await executor.join()
+        assert not executor.is_active("o/r", 1)
+        await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_review_skips_completion_and_refreshes_lock():
+    """Test errors are contained and long reviews keep their lock fresh."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lock = ReviewLock(lock_dir=tmpdir)
+        refreshed = []
+        lock.refresh = lambda repo, number: refreshed.append((repo, number))
+        executor = ReviewExecutor(max_workers=1, review_lock=lock, lock_refresh_seconds=0.02)
+        completed = []
+
+        def failing_review():
+            time.sleep(0.1)
+            raise RuntimeError("LLM down")
+
+        executor.submit("o/r", 5, failing_review, on_complete=completed.append)
+        await executor.join()
+
+        assert completed == []
+        assert refreshed and refreshed[0] == ("o/r", 5)
+        await executor.shutdown()
@@ -182,6 +182,26 @@ class TestReviewLock:
             # Lock file should be removed
             assert not lock_file.exists()
 
+    
+    def test_is_locked(self):
+        """Test is_locked reports fresh locks and ignores stale ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lock = ReviewLock(lock_dir=tmpdir, lock_timeout=60)
+            assert not lock.is_locked("owner/repo", 123)
+            
+            lock.acquire("owner/repo", 123, "agent1")
+            assert lock.is_locked("owner/repo", 123)
+            
+            # Backdate lock file beyond timeout
+            lock_file = Path(tmpdir) / "owner_repo_pr123.lock"
+            old = time.time() - 120
+            os.utime(lock_file, (old, old))
+            assert not lock.is_locked("owner/repo", 123)
+            
+            # Release accepts requester (used by PRWorkflowOrchestrator)
+            lock.release("owner/repo", 123, "agent1")
+            assert not lock_file.exists()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
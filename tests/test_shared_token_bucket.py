@@ -0,0 +1,157 @@
+"""Tests for the host-wide shared GitHub API token bucket."""
+
+import asyncio
+import multiprocessing
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from engine.core.account_manager import GitHubAccount
+from engine.core.rate_limiter import OperationType, reset_rate_limiter
+from engine.core.shared_token_bucket import (
+    DEFAULT_HOURLY_BUDGET,
+    SharedTokenBucket,
+    resolve_bucket_account
+)
+from engine.operations.github_api_helper import GitHubAPIHelper
+from engine.operations.github_response_cache import ConditionalRequestCache
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "buckets.db")
+
+
+def _drain(db_path, attempts, results):
+    """Worker process: try to take `attempts` tokens from a 100/h bucket."""
+    bucket = SharedTokenBucket(db_path=db_path)
+    results.put(sum(1 for _ in range(attempts) if bucket.try_acquire("bot", budget=100)[0]))
+
+
+class TestSharedTokenBucket:
+    """Test bucket accounting."""
+
+    def test_exhausts_and_reports_wait(self, db_path):
+        bucket = SharedTokenBucket(db_path=db_path)
+        for _ in range(3):
+            assert bucket.try_acquire("bot", budget=3)[0]
+
+        acquired, wait = bucket.try_acquire("bot", budget=3)
+        assert not acquired
+        assert 0 < wait <= 1200  # one token refills every 3600/3 seconds
+
+        # Other accounts have their own budget
+        assert bucket.try_acquire("coder", budget=3)[0]
+
+    def test_instances_share_state(self, db_path):
+        first = SharedTokenBucket(db_path=db_path)
+        second = SharedTokenBucket(db_path=db_path)
+        assert first.try_acquire("bot", budget=2)[0]
+        assert second.try_acquire("bot", budget=2)[0]
+        assert not first.try_acquire("bot", budget=2)[0]
+
+        first.refund("bot", budget=2)
+        assert second.try_acquire("bot", budget=2)[0]
+
+    def test_processes_never_overshoot_budget(self, db_path):
+        """Test concurrent processes together take exactly the budget."""
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_drain, args=(db_path, 50, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        assert sum(results.get(timeout=5) for _ in workers) == 100
+
+    def test_observe_clamps_to_github_and_blocks_until_reset(self, db_path):
+        bucket = SharedTokenBucket(db_path=db_path, reserve=100)
+        bucket.observe("bot", remaining=150, reset_time=int(time.time()) + 600)
+        assert bucket.available("bot") == pytest.approx(50, abs=1)
+
+        bucket.observe("bot", remaining=90, reset_time=int(time.time()) + 600)
+        acquired, wait = bucket.try_acquire("bot")
+        assert not acquired
+        assert 590 < wait <= 600
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_instead_of_refusing(self, db_path):
+        bucket = SharedTokenBucket(db_path=db_path)
+        budget = 36000  # refills 10 tokens per second
+        bucket.observe("bot", remaining=100, reset_time=0, budget=budget)  # drain via reserve
+        assert not bucket.try_acquire("bot", budget=budget)[0]
+
+        start = time.monotonic()
+        assert await bucket.acquire("bot", budget=budget, timeout=2)
+        assert 0.05 < time.monotonic() - start < 1.5
+
+        assert not await bucket.acquire("bot", budget=1, timeout=0.05)
+
+    def test_store_failure_fails_open(self, tmp_path):
+        (tmp_path / "dir.db").mkdir()
+        bucket = SharedTokenBucket(db_path=str(tmp_path / "dir.db"))
+        assert bucket.try_acquire("bot") == (True, 0.0)
+
+
+def test_resolve_bucket_account_uses_account_manager():
+    """Test tokens map to AccountManager accounts and their budgets."""
+    account = GitHubAccount(
+        username="m0nk111-post", email="", role="bot", description="",
+        token_file="", token_env="", capabilities=[], hourly_api_budget=1200
+    )
+    manager = Mock(get_account_by_token=lambda token: account if token == "known" else None)
+    with patch('engine.core.account_manager.get_account_manager', return_value=manager):
+        assert resolve_bucket_account("known") == ("m0nk111-post", 1200)
+        key, budget = resolve_bucket_account("unknown")
+
+    assert key.startswith("token:") and "unknown" not in key
+    assert budget == DEFAULT_HOURLY_BUDGET
+
+
+def test_sync_helper_refuses_after_waiting(db_path, tmp_path):
+    """Test GitHubAPIHelper blocks on the shared budget, then refuses."""
+    reset_rate_limiter()
+    bucket = SharedTokenBucket(db_path=db_path)
+    helper = GitHubAPIHelper(
+        token="test-token",
+        response_cache=ConditionalRequestCache(db_path=str(tmp_path / "etag.db")),
+        token_bucket=bucket,
+        max_token_wait=0.05
+    )
+    helper.bucket_budget = 1
+
+    assert helper._check_rate_limit(OperationType.API_READ, "owner/repo", bypass=True)
+    assert not helper._check_rate_limit(OperationType.API_READ, "owner/repo", bypass=True)
+
+
+def test_sync_helper_reads_take_tokens_and_304_refunds(db_path, tmp_path):
+    """Test every read takes a budget token and a 304 only returns the one it took."""
+    reset_rate_limiter()
+    bucket = SharedTokenBucket(db_path=db_path)
+    helper = GitHubAPIHelper(
+        token="test-token",
+        response_cache=ConditionalRequestCache(db_path=str(tmp_path / "etag.db")),
+        token_bucket=bucket,
+        max_token_wait=0.05
+    )
+    helper.bucket_budget = 3
+
+    def response(status, body=None):
+        return Mock(status_code=status, headers={'ETag': '"v1"'}, json=Mock(return_value=body), raise_for_status=Mock())
+
+    issue = {'number': 1, 'title': 't', 'state': 'open', 'labels': [], 'assignees': [], 'html_url': '',
+             'created_at': '', 'updated_at': ''}
+    with patch.object(helper.session, 'get', side_effect=[response(200, []), response(304), response(200, issue)]):
+        helper.get_issue_comments("owner", "repo", 1)
+        assert bucket.available(helper.bucket_account, 3) == pytest.approx(2, abs=0.01)
+        helper.get_issue_comments("owner", "repo", 1)  # 304: refunded
+        assert bucket.available(helper.bucket_account, 3) == pytest.approx(2, abs=0.01)
+        helper.get_issue("owner", "repo", 1)
+        assert bucket.available(helper.bucket_account, 3) == pytest.approx(1, abs=0.01)
+
+    with patch.object(helper.session, 'get', return_value=response(200, [])):
+        helper.get_pull_request_files("owner", "repo", 2)
+        with pytest.raises(RuntimeError):
+            helper.get_pull_request_files("owner", "repo", 2)
@@ -0,0 +1,123 @@
+"""Tests for the in-process trigram-indexed codebase search."""
+
+import os
+import subprocess
+
+import pytest
+
+from engine.operations.codebase_search import CodebaseSearch
+from engine.operations.trigram_index import GitIgnore, TrigramIndex, required_literals
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "billing.py").write_text(
+        "import os\n\n\nclass InvoiceBuilder:\n    def build(self):\n        return compute_total([])\n\n\n"
+        "def compute_total(items):\n    return sum(items)\n"
+    )
+    (tmp_path / "src" / "app.js").write_text("function computeTotal(items) {\n  return 0;\n}\n")
+    (tmp_path / "README.md").write_text("Call compute_total to sum an invoice.\n")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def no_subprocesses(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("search must not spawn processes")
+    monkeypatch.setattr(subprocess, "run", fail)
+    monkeypatch.setattr(subprocess, "Popen", fail)
+
+
+def test_result_format_and_context(project):
+    """Test results keep the grep_search format: relative path, 1-based line, context lines."""
+    results = CodebaseSearch(str(project)).grep_search("def compute_total", context_lines=2)
+    assert results == [{
+        "file": "src/billing.py",
+        "line_num": 9,
+        "line_content": "def compute_total(items):",
+        "context_before": ["", ""],
+        "context_after": ["    return sum(items)"],
+    }]
+
+
+def test_regex_case_and_file_pattern(project):
+    """Test regex, case sensitivity and file globs."""
+    search = CodebaseSearch(str(project))
+    assert [r["file"] for r in search.grep_search("COMPUTE_TOTAL")] == ["README.md", "src/billing.py", "src/billing.py"]
+    assert search.grep_search("COMPUTE_TOTAL", ignore_case=False) == []
+    assert search.grep_search("compute_?total", regex=True, ignore_case=False, file_pattern="*.js") == []
+    assert [r["file"] for r in search.grep_search("compute_?total", regex=True, file_pattern="src/*.js")] == ["src/app.js"]
+    assert len(search.grep_search("compute", max_results=2)) == 2
+    assert search.grep_search("bad(regex", regex=True) == []
+
+    assert [r["line_num"] for r in search.find_function("compute_total")] == [9]
+    assert [r["line_num"] for r in search.find_class("InvoiceBuilder")] == [4]
+
+
+def test_gitignore_is_honored(project):
+    """Test ignored files/directories, negations, nested .gitignore files and binary files are skipped."""
+    (project / ".gitignore").write_text("*.log\nbuild/\n/local.py\n!keep.log\n")
+    (project / "debug.log").write_text("compute_total failed\n")
+    (project / "keep.log").write_text("compute_total kept\n")
+    (project / "build").mkdir()
+    (project / "build" / "out.py").write_text("compute_total = None\n")
+    (project / "local.py").write_text("compute_total = 1\n")
+    (project / "src" / "local.py").write_text("compute_total = 2\n")
+    (project / "src" / ".gitignore").write_text("generated_*.py\n")
+    (project / "src" / "generated_api.py").write_text("compute_total = 3\n")
+    (project / "blob.bin").write_bytes(b"\0compute_total")
+    (project / ".git").mkdir()
+    (project / ".git" / "HEAD").write_text("compute_total\n")
+
+    files = {r["file"] for r in CodebaseSearch(str(project)).grep_search("compute_total", max_results=100)}
+    assert files == {"README.md", "keep.log", "src/billing.py", "src/local.py"}
+
+
+def test_gitignore_patterns():
+    """Test anchored, ** and directory-only gitignore rules."""
+    rules = GitIgnore(["docs/**/*.tmp", "cache/", "# comment", "!important.tmp"])
+    assert rules.match("docs/a/b/x.tmp", False) is True
+    assert rules.match("docs/x.tmp", False) is True
+    assert rules.match("src/docs/x.tmp", False) is None
+    assert rules.match("cache", True) is True and rules.match("cache", False) is None
+    assert rules.match("docs/important.tmp", False) is False
+
+
+def test_refresh_reindexes_only_changed_files(project):
+    """Test new, modified and deleted files are picked up from mtimes."""
+    index = TrigramIndex(str(project), refresh_interval=0)
+    assert index.refresh() == 3
+    assert index.refresh() == 0
+
+    target = project / "src" / "billing.py"
+    target.write_text("def compute_refund(items):\n    return -sum(items)\n")
+    os.utime(target, ns=(target.stat().st_atime_ns, target.stat().st_mtime_ns + 1_000_000))
+    (project / "README.md").unlink()
+    (project / "notes.txt").write_text("compute_refund is new\n")
+    assert index.refresh() == 3
+
+    assert [r["file"] for r in index.search("compute_total")] == []
+    assert [r["file"] for r in index.search("compute_refund")] == ["notes.txt", "src/billing.py"]
+    assert index.file_count == 3
+
+
+
+def test_search_right_after_write_sees_new_content(project):
+    """Test the shared index picks up a write made just after a previous search."""
+    search = CodebaseSearch(str(project))
+    assert search.grep_search("compute_refund") == []
+
+    target = project / "src" / "billing.py"
+    target.write_text("def compute_refund(items):\n    return -sum(items)\n")
+    os.utime(target, ns=(target.stat().st_atime_ns, target.stat().st_mtime_ns + 1_000_000))
+    assert [r["file"] for r in CodebaseSearch(str(project)).grep_search("compute_refund")] == ["src/billing.py"]
+
+def test_required_literals():
+    """Test the literals extracted from a regex are exactly the ones every match must contain."""
+    assert required_literals(r"def compute_total\(") == ["def compute_total("]
+    assert required_literals(r"class Foo[:(\[]") == ["class Foo"]
+    assert required_literals(r"(async )?def run") == ["def run"]
+    assert required_literals(r"import.*from ['\"].*utils") == ["import", "from ", "utils"]
+    assert required_literals(r"foo|bar") == []
+    assert required_literals(r"(?:abc)+xyz") == ["abc", "xyz"]
@@ -0,0 +1,258 @@
+"""Tests for GitHub webhook ingestion and dispatch."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from engine.operations.webhook_handler import (
+    SIGNATURE_HEADER,
+    WebhookEvent,
+    WebhookEventQueue,
+    compute_signature,
+    record_event,
+    setup_webhook_routes,
+    verify_signature
+)
+from engine.runners.polling_service import PollingService, PollingConfig
+
+
+SECRET = "test-secret"
+
+
+def _raw_issue(number=1, labels=("agent-ready",)):
+    return {
+        'number': number,
+        'title': f'Issue {number}',
+        'labels': [{'name': label} for label in labels],
+        'assignees': [],
+        'html_url': f'https://github.com/owner/repo/issues/{number}',
+        'created_at': '2025-01-01T00:00:00Z',
+        'updated_at': '2025-01-01T00:00:00Z',
+        'state': 'open',
+        'body': ''
+    }
+
+
+def _event(event, payload, delivery_id="d1"):
+    payload.setdefault('repository', {'full_name': 'owner/repo'})
+    return WebhookEvent(event=event, delivery_id=delivery_id, payload=payload)
+
+
+@pytest.fixture
+def queue():
+    return WebhookEventQueue(maxsize=2, dedup_window=10)
+
+
+@pytest.fixture
+def client(queue, tmp_path):
+    app = FastAPI()
+    setup_webhook_routes(app, queue=queue, secret=SECRET, record_dir=str(tmp_path / "recordings"))
+    return TestClient(app)
+
+
+def _post(client, event, payload, delivery_id="d1", secret=SECRET):
+    body = json.dumps(payload).encode()
+    return client.post(
+        "/api/webhooks/github",
+        content=body,
+        headers={
+            'X-GitHub-Event': event,
+            'X-GitHub-Delivery': delivery_id,
+            SIGNATURE_HEADER: compute_signature(secret, body)
+        }
+    )
+
+
+class TestSignature:
+    """Test HMAC signature verification."""
+
+    def test_valid_signature(self):
+        body = b'{"a": 1}'
+        assert verify_signature(SECRET, body, compute_signature(SECRET, body))
+
+    def test_rejects_tampered_body_and_missing_header(self):
+        signature = compute_signature(SECRET, b'{"a": 1}')
+        assert not verify_signature(SECRET, b'{"a": 2}', signature)
+        assert not verify_signature(SECRET, b'{"a": 1}', None)
+        assert not verify_signature("", b'{"a": 1}', signature)
+
+
+class TestWebhookRoute:
+    """Test the receiver endpoint."""
+
+    def test_queues_supported_event(self, client, queue, tmp_path):
+        payload = {'action': 'opened', 'issue': _raw_issue(), 'repository': {'full_name': 'owner/repo'}}
+        response = _post(client, "issues", payload)
+
+        assert response.status_code == 202
+        assert response.json()['status'] == "queued"
+        event = queue.queue.get_nowait()
+        assert (event.event, event.action, event.repository) == ("issues", "opened", "owner/repo")
+        # Recorded for replay
+        recordings = list((tmp_path / "recordings").glob("*.json"))
+        assert len(recordings) == 1
+        assert json.loads(recordings[0].read_text())['delivery_id'] == "d1"
+
+    def test_invalid_signature_rejected(self, client, queue):
+        response = _post(client, "issues", {'action': 'opened'}, secret="wrong")
+        assert response.status_code == 401
+        assert queue.qsize() == 0
+
+    def test_missing_secret_rejects_everything(self, queue):
+        app = FastAPI()
+        setup_webhook_routes(app, queue=queue, secret=None)
+        with patch.dict('os.environ', {}, clear=True):
+            response = _post(TestClient(app), "issues", {'action': 'opened'})
+        assert response.status_code == 503
+
+    def test_ping_and_unsupported_events_not_queued(self, client, queue):
+        assert _post(client, "ping", {'zen': 'hi'}).json() == {"status": "pong"}
+        assert _post(client, "star", {'action': 'created'}, delivery_id="d2").json()['status'] == "ignored"
+        assert queue.qsize() == 0
+
+    def test_duplicate_delivery_skipped(self, client, queue):
+        payload = {'action': 'opened', 'repository': {'full_name': 'owner/repo'}}
+        _post(client, "issues", payload, delivery_id="same")
+        response = _post(client, "issues", payload, delivery_id="same")
+        assert response.json()['status'] == "skipped"
+        assert queue.qsize() == 1
+        assert queue.stats['duplicates'] == 1
+
+    def test_full_queue_drops(self, queue):
+        for i in range(3):
+            queue.put(_event("issues", {'action': 'opened'}, delivery_id=f"d{i}"))
+        assert queue.qsize() == 2
+        assert queue.stats['dropped'] == 1
+
+
+def test_record_event_roundtrip(tmp_path):
+    """Test recordings hold everything needed for replay."""
+    path = record_event(_event("pull_request", {'action': 'opened'}), tmp_path)
+    data = json.loads(path.read_text())
+    assert data['event'] == "pull_request"
+    assert data['payload']['action'] == "opened"
+
+
+class TestPollingServiceDispatch:
+    """Test PollingService consumes webhook events."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        config = PollingConfig(
+            github_username="test-bot",
+            repositories=["owner/repo"],
+            watch_labels=["agent-ready"],
+            max_concurrent_issues=2,
+            state_file=str(tmp_path / "state.json"),
+            pr_monitoring_enabled=True
+        )
+        service = PollingService(config, enable_monitoring=False)
+        service.config.repositories = ["owner/repo"]  # Not overridden by environment config
+        service.is_issue_claimed_async = AsyncMock(return_value=False)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_labeled_issue_starts_workflow(self, service):
+        with patch.object(service.scheduler, 'run_workflow', new_callable=AsyncMock) as mock_start:
+            started = await service.handle_webhook_event(
+                _event("issues", {'action': 'labeled', 'issue': _raw_issue(7)})
+            )
+            await service.scheduler.join()
+
+        assert started is True
+        issue = mock_start.await_args.args[0]
+        assert (issue['repository'], issue['number']) == ("owner/repo", 7)
+        assert service._claim_status == {}
+
+    @pytest.mark.asyncio
+    async def test_ignores_unwatched_closed_and_foreign_issues(self, service):
+        closed = _raw_issue(2)
+        closed['state'] = 'closed'
+        events = [
+            _event("issues", {'action': 'labeled', 'issue': _raw_issue(1, labels=("bug",))}),
+            _event("issues", {'action': 'reopened', 'issue': closed}),
+            _event("issues", {'action': 'closed', 'issue': _raw_issue(3)}),
+            _event("issues", {'action': 'opened', 'issue': _raw_issue(4),
+                              'repository': {'full_name': 'other/repo'}})
+        ]
+        with patch.object(service, 'start_issue_workflow', new_callable=AsyncMock) as mock_start:
+            results = [await service.handle_webhook_event(event) for event in events]
+
+        assert results == [False, False, False, False]
+        mock_start.assert_not_called()
+        service.is_issue_claimed_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_claimed_issue_not_started(self, service):
+        service.is_issue_claimed_async = AsyncMock(return_value=True)
+        with patch.object(service, 'start_issue_workflow', new_callable=AsyncMock) as mock_start:
+            started = await service.handle_webhook_event(
+                _event("issue_comment", {'action': 'created', 'issue': _raw_issue(5)})
+            )
+        assert started is False
+        mock_start.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pull_request_triggers_review_once(self, service):
+        pr = {'number': 9, 'title': 'PR', 'state': 'open', 'draft': False,
+              'user': {'login': 'bot'}, 'labels': [], 'head': {'sha': 'abc'}}
+        with patch.object(service, 'trigger_pr_review', new_callable=AsyncMock) as mock_review:
+            assert await service.handle_webhook_event(
+                _event("pull_request", {'action': 'opened', 'pull_request': pr})
+            )
+            service.reviewed_prs["owner/repo#9"] = {'sha': 'abc'}
+            assert not await service.handle_webhook_event(
+                _event("pull_request", {'action': 'synchronize', 'pull_request': pr}, delivery_id="d2")
+            )
+        mock_review.assert_awaited_once_with("owner/repo", 9, pr)
+
+    @pytest.mark.asyncio
+    async def test_consumer_survives_handler_errors(self, service, queue):
+        service.running = True
+        handled = []
+
+        async def fake_handle(event):
+            handled.append(event.delivery_id)
+            if event.delivery_id == "bad":
+                raise RuntimeError("boom")
+            service.running = False
+            return True
+
+        queue.put(_event("issues", {'action': 'opened'}, delivery_id="bad"))
+        queue.put(_event("issues", {'action': 'opened'}, delivery_id="good"))
+        with patch.object(service, 'handle_webhook_event', side_effect=fake_handle):
+            await asyncio.wait_for(service.run_webhook_consumer(queue), timeout=2)
+
+        assert handled == ["bad", "good"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch_claims_once(tmp_path):
+    """Test poll and webhook racing on one issue only claim it once."""
+    config = PollingConfig(
+        github_username="test-bot",
+        repositories=["owner/repo"],
+        state_file=str(tmp_path / "state.json")
+    )
+    service = PollingService(config, enable_monitoring=False)
+
+    async def slow_unclaimed(repo, number):
+        await asyncio.sleep(0.01)
+        return False
+
+    service.is_issue_claimed_async = slow_unclaimed
+    service.claim_issue = AsyncMock(return_value=True)
+    issue = {'repository': 'owner/repo', 'number': 3, 'title': 'Race'}
+
+    results = await asyncio.gather(
+        service.start_issue_workflow(dict(issue)),
+        service.start_issue_workflow(dict(issue))
+    )
+
+    assert service.claim_issue.await_count == 1
+    assert results.count(False) == 2  # no agent registry, so neither proceeds past claiming
+    assert service._claiming == set()
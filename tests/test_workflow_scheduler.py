@@ -0,0 +1,167 @@
+"""Tests for the issue workflow scheduler."""
+
+import asyncio
+
+import pytest
+
+from engine.runners.workflow_scheduler import DEFAULT_PRIORITY, WorkflowScheduler
+
+
+def _issue(repo, number, labels=()):
+    return {
+        'repository': repo,
+        'number': number,
+        'title': f'Issue {number}',
+        'labels': [{'name': label} for label in labels]
+    }
+
+
+class Recorder:
+    """Workflow stub that blocks until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, issue):
+        self.started.append(f"{issue['repository']}#{issue['number']}")
+        await self.release.wait()
+        return True
+
+
+@pytest.mark.asyncio
+async def test_respects_worker_limit_and_dedups():
+    """Test only max_workers run and duplicates are rejected."""
+    recorder = Recorder()
+    scheduler = WorkflowScheduler(recorder, max_workers=2)
+
+    assert scheduler.submit(_issue("o/a", 1))
+    assert scheduler.submit(_issue("o/b", 2))
+    assert scheduler.submit(_issue("o/c", 3))
+    assert not scheduler.submit(_issue("o/a", 1))  # running
+    assert not scheduler.submit(_issue("o/c", 3))  # queued
+    await asyncio.sleep(0)
+
+    assert recorder.started == ["o/a#1", "o/b#2"]
+    assert (scheduler.running_count, scheduler.pending_count) == (2, 1)
+
+    recorder.release.set()
+    await scheduler.join()
+    assert recorder.started == ["o/a#1", "o/b#2", "o/c#3"]
+    assert scheduler.running_count == 0
+
+
+@pytest.mark.asyncio
+async def test_label_priority_orders_queue():
+    """Test higher-priority labels jump the queue, FIFO otherwise."""
+    recorder = Recorder()
+    scheduler = WorkflowScheduler(
+        recorder,
+        max_workers=1,
+        label_priorities={'priority:critical': 0, 'priority:low': 200}
+    )
+
+    scheduler.submit(_issue("o/r", 1))  # starts immediately
+    scheduler.submit(_issue("o/r", 2, labels=["priority:low"]))
+    scheduler.submit(_issue("o/r", 3))
+    scheduler.submit(_issue("o/r", 4, labels=["docs", "priority:critical"]))
+    assert scheduler.priority_for(_issue("o/r", 5)) == DEFAULT_PRIORITY
+
+    recorder.release.set()
+    await scheduler.join()
+    assert recorder.started == ["o/r#1", "o/r#4", "o/r#3", "o/r#2"]
+
+
+@pytest.mark.asyncio
+async def test_per_repo_cap_lets_other_repos_through():
+    """Test a saturated repo does not block lower-priority work elsewhere."""
+    recorder = Recorder()
+    scheduler = WorkflowScheduler(recorder, max_workers=3, max_per_repo=1)
+
+    scheduler.submit(_issue("o/busy", 1))
+    scheduler.submit(_issue("o/busy", 2))
+    scheduler.submit(_issue("o/other", 3))
+    await asyncio.sleep(0)
+
+    assert recorder.started == ["o/busy#1", "o/other#3"]
+    assert scheduler.pending_count == 1
+
+    recorder.release.set()
+    await scheduler.join()
+    assert recorder.started[-1] == "o/busy#2"
+
+
+@pytest.mark.asyncio
+async def test_crash_frees_slot_and_in_flight_check():
+    """Test failing workflows release capacity and in-flight issues are skipped."""
+    ran = []
+
+    async def flaky(issue):
+        ran.append(issue['number'])
+        if issue['number'] == 1:
+            raise RuntimeError("boom")
+        return True
+
+    scheduler = WorkflowScheduler(flaky, max_workers=1, is_in_flight=lambda key: key == "o/r#9")
+    assert not scheduler.submit(_issue("o/r", 9))
+    scheduler.submit(_issue("o/r", 1))
+    scheduler.submit(_issue("o/r", 2))
+    await scheduler.join()
+
+    assert ran == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_running():
+    """Test shutdown cancels running workflows and drops the queue."""
+    recorder = Recorder()
+    scheduler = WorkflowScheduler(recorder, max_workers=1)
+    scheduler.submit(_issue("o/r", 1))
+    scheduler.submit(_issue("o/r", 2))
+    await asyncio.sleep(0)
+
+    await scheduler.shutdown()
+    assert scheduler.running_count == 0
+    assert scheduler.pending_count == 0
+    assert recorder.started == ["o/r#1"]
+
+
+@pytest.mark.asyncio
+async def test_blocking_pipeline_stage_does_not_stall_other_workflows(monkeypatch, tmp_path):
+    """Test a workflow stuck in a subprocess stage leaves the loop free for the others."""
+    import subprocess
+    import threading
+
+    from engine.core.pipeline_orchestrator import PipelineConfig, PipelineOrchestrator
+
+    orchestrator = PipelineOrchestrator(PipelineConfig(
+        repo_cache_dir=str(tmp_path / "repos"), env_cache_dir=str(tmp_path / "envs")
+    ))
+    unblock = threading.Event()
+
+    def fake_run(cmd, **kwargs):
+        if 'tests/test_slow.py' in cmd:
+            assert unblock.wait(10)
+        return subprocess.CompletedProcess(cmd, 0, stdout="1 passed", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    finished = []
+
+    async def workflow(issue):
+        result = await orchestrator._run_tests([f"tests/test_{issue['title']}.py"])
+        finished.append(issue['number'])
+        return result['passed']
+
+    scheduler = WorkflowScheduler(workflow, max_workers=2)
+    scheduler.submit(dict(_issue("o/a", 1), title="slow"))
+    scheduler.submit(dict(_issue("o/b", 2), title="fast"))
+
+    for _ in range(200):
+        if finished:
+            break
+        await asyncio.sleep(0.01)
+    assert finished == [2]
+
+    unblock.set()
+    await scheduler.join()
+    assert finished == [2, 1]